@@ -0,0 +1,195 @@
+"""Process-wide, bounded LRU caches for the sidecar's derived state.
+
+The sidecar is stateless per REQUEST, not per process: the same de-identified
+export is read by every pane of a Study screen, so holding the parsed log (and
+what is derived from it) between requests is pure latency win with no change in
+semantics. Every cache here is keyed by a content fingerprint (path + size +
+mtime), so a new nightly export is a new key — a cache can be stale-free without
+any explicit invalidation call, and `discard` exists only to release memory early.
+
+Thread-safe: FastAPI runs sync work on a thread pool and the Study UI fires its
+panes concurrently, so `get_or_load` also serialises concurrent loads of ONE key
+(one parse per export, not one per racing request).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """An LRU map bounded by an approximate byte budget and/or an entry count.
+
+    `max_bytes=0` disables the cache entirely (every lookup misses and nothing is
+    retained) — the escape hatch for memory-constrained deployments. An entry
+    larger than the whole budget is returned to the caller but never retained.
+    `on_evict(key)` runs, outside the lock, for every entry the budget pushes out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        on_evict: Callable[[Hashable], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes != 0 and self.max_entries != 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._peek(key)
+            self._count(value)
+            return value
+
+    def _peek(self, key: Hashable) -> Any | None:
+        """The value under `key` (refreshing its recency), without counting."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    def _count(self, value: Any | None) -> None:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def put(self, key: Hashable, value: Any, nbytes: int = 0) -> None:
+        if not self.enabled:
+            return
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, nbytes)
+            self._bytes += nbytes
+            evicted = self._evict()
+        if self.on_evict is not None:
+            for old_key in evicted:
+                self.on_evict(old_key)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], tuple[Any, int]]) -> Any:
+        """Return the cached value for `key`, or run `loader` (which returns
+        ``(value, nbytes)``) exactly once across concurrent callers."""
+        with self._lock:
+            value = self._peek(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                # Decided once, after waiting: a racing caller that loaded the
+                # key meanwhile makes this request a hit, not a miss.
+                value = self._peek(key)
+                self._count(value)
+                if value is not None:
+                    return value
+            try:
+                value, nbytes = loader()
+                self.put(key, value, nbytes)
+                return value
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def resize(self, key: Hashable, nbytes: int) -> None:
+        """Re-charge a resident entry that grew in place (evicting past the
+        budget); a no-op once the entry is gone."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return
+            self._data[key] = (item[0], nbytes)
+            self._bytes += nbytes - item[1]
+            evicted = self._evict()
+        if self.on_evict is not None:
+            for old_key in evicted:
+                self.on_evict(old_key)
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key satisfies `predicate`; returns the count."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                self._bytes -= self._data.pop(k)[1]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def _evict(self) -> list[Hashable]:
+        evicted = []
+        while self._data and (
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+            or (self.max_entries is not None and len(self._data) > self.max_entries)
+        ):
+            key, (_value, nbytes) = self._data.popitem(last=False)
+            self._bytes -= nbytes
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+
+def frame_nbytes(*frames: Any) -> int:
+    """Approximate resident size of pandas frames (deep, so string columns count).
+    A categorical dictionary shared by several columns (app.encoding) counts once."""
+    return sum(frame_sizes(*frames))
+
+
+def frame_sizes(*frames: Any) -> list[int]:
+    """`frame_nbytes` of each frame; a shared dictionary counts in the first
+    frame that holds it."""
+    sizes = []
+    seen: set[int] = set()
+    for df in frames:
+        size = 0
+        if df is not None:
+            try:
+                size = int(df.memory_usage(index=True, deep=True).sum())
+                for dtype in df.dtypes:
+                    categories = getattr(dtype, "categories", None)
+                    if categories is None:
+                        continue
+                    if id(categories) in seen:
+                        size -= int(categories.memory_usage(deep=True))
+                    seen.add(id(categories))
+            except Exception:  # pragma: no cover - exotic frame types
+                size = 0
+        sizes.append(size)
+    return sizes
@@ -0,0 +1,141 @@
+"""Case × activity matrix for vectorized conformance (Part X §X.7).
+
+The per-case engine groups the pathway sub-log by case object, time-sorts each
+group and walks it row by row to build a first-occurrence timeline before calling
+the pathway's evaluator — pure Python per case. `CaseMatrix` computes the same
+facts for every case at once: the first timestamp (int64 ns) and occurrence
+count of each activity per case, the case's last timestamp, and row-level
+reductions (any / sum / max of a per-row column) grouped by case. The pathway
+rules in `app.pathways` are expressed as column operations on it.
+
+Cases are ordered as `DataFrame.groupby(case)` orders them (sorted ids), so the
+vectorized engine reports cases, samples and per-case verdicts in the per-case
+engine's order.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ocdfg import time_ns
+
+OCEL_ACTIVITY = "ocel:activity"
+OCEL_TIME = "ocel:timestamp"
+OCEL_OID = "ocel:oid"
+
+# Sentinel for "activity never observed in this case".
+MISSING_NS = np.iinfo(np.int64).min
+
+
+class CaseMatrix:
+    """First occurrences, counts and row reductions per case of a pathway sub-log.
+
+    `rows` is the sub-log (events of the pathway's activities joined to their
+    case objects); it keeps every event column, so attribute-based rules read the
+    same values the per-case evaluators did.
+    """
+
+    def __init__(self, rows: pd.DataFrame, activities: list[str]) -> None:
+        codes, cases = pd.factorize(rows[OCEL_OID], sort=True)
+        self.rows = rows
+        self.cases = cases
+        self.case_codes = codes
+        self.n = len(cases)
+        self.columns = set(rows.columns)
+        self.activities = list(activities)
+
+        times = time_ns(rows[OCEL_TIME]) if len(rows) else np.empty(0, dtype=np.int64)
+        self.times = times
+        act_index = {a: i for i, a in enumerate(self.activities)}
+        act_codes = rows[OCEL_ACTIVITY].map(act_index).to_numpy(dtype=np.float64)
+        known = ~np.isnan(act_codes)
+        acts = act_codes[known].astype(np.int64)
+        case_of = codes[known]
+        flat = case_of * len(self.activities) + acts
+
+        size = self.n * len(self.activities)
+        self._count = np.bincount(flat, minlength=size).reshape(self.n, len(self.activities))
+        never = np.iinfo(np.int64).max
+        first = np.full(size, never, dtype=np.int64)
+        # NaT (MISSING_NS) must not win the minimum: the per-case engine's
+        # time sort puts NaT last, so it is "first" only when nothing else is.
+        known_times = times[known]
+        np.minimum.at(first, flat, np.where(known_times == MISSING_NS, never, known_times))
+        first[first == never] = MISSING_NS
+        self._first = first.reshape(self.n, len(self.activities))
+
+        last = np.full(self.n, MISSING_NS, dtype=np.int64)
+        np.maximum.at(last, codes, times)
+        self.last_time = last
+        self._act_index = act_index
+
+    # --- per-activity columns ---
+
+    def _col(self, activity: str) -> int | None:
+        return self._act_index.get(activity)
+
+    def first(self, activity: str) -> np.ndarray:
+        """First timestamp (int64 ns) of `activity` per case; MISSING_NS if absent."""
+        i = self._col(activity)
+        return np.full(self.n, MISSING_NS, dtype=np.int64) if i is None else self._first[:, i]
+
+    def has(self, activity: str) -> np.ndarray:
+        return self.count(activity) > 0
+
+    def count(self, activity: str) -> np.ndarray:
+        i = self._col(activity)
+        return np.zeros(self.n, dtype=np.int64) if i is None else self._count[:, i]
+
+    # --- row reductions ---
+
+    def row_mask(self, activity: str) -> np.ndarray:
+        return (self.rows[OCEL_ACTIVITY] == activity).to_numpy()
+
+    def row_sum(self, mask: np.ndarray) -> np.ndarray:
+        return np.bincount(self.case_codes[mask], minlength=self.n)
+
+    def row_any(self, mask: np.ndarray) -> np.ndarray:
+        return self.row_sum(mask) > 0
+
+    def row_max(self, values: np.ndarray) -> np.ndarray:
+        """Max of float `values` per case, ignoring NaN (NaN where a case has none)."""
+        out = np.full(self.n, -np.inf)
+        ok = ~np.isnan(values)
+        np.maximum.at(out, self.case_codes[ok], values[ok])
+        out[np.isneginf(out)] = np.nan
+        return out
+
+    # --- output helpers ---
+
+    def timelines(self, wanted: np.ndarray) -> dict[int, dict[str, Any]]:
+        """The per-case engine's first-occurrence timeline for each wanted case
+        code: actual timestamps, in order of first occurrence (ties by sub-log
+        order, NaT last), from one sort of the sub-log."""
+        keep = np.isin(self.case_codes, wanted)
+        if not keep.any():
+            return {}
+        sel = self.rows[keep]
+        codes = self.case_codes[keep]
+        t = self.times[keep]
+        order = np.lexsort((np.arange(len(sel)), t, t == MISSING_NS, codes))
+        ordered = pd.DataFrame({
+            "case": codes[order],
+            "activity": sel[OCEL_ACTIVITY].to_numpy()[order],
+            "time": sel[OCEL_TIME].take(order).reset_index(drop=True),
+        }).drop_duplicates(["case", "activity"])
+        out: dict[int, dict[str, Any]] = {}
+        for case, activity, ts in zip(ordered["case"], ordered["activity"], ordered["time"]):
+            out.setdefault(int(case), {})[activity] = ts
+        return out
+
+
+def minutes_between(a_ns: np.ndarray, b_ns: np.ndarray) -> np.ndarray:
+    """(b - a) in minutes per case, NaN where either side is missing."""
+    missing = (a_ns == MISSING_NS) | (b_ns == MISSING_NS)
+    diff = (np.where(missing, 0, b_ns) - np.where(missing, 0, a_ns)).astype(np.float64)
+    out = diff / 1e9 / 60.0
+    out[missing] = np.nan
+    return out
@@ -9,6 +9,7 @@ flag so the whole subsystem ships disabled by default (§X.4).
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,10 +26,96 @@ class Settings(BaseSettings):
     # Default path the Laravel `ocel:export` writer targets on the shared volume;
     # a request may override with an inline doc or an explicit path.
     arena_ocel_export_path: str = "/data/ocel/ocel-export.json"
+    # Where columnar snapshots of JSON exports are written on first parse (the
+    # export volume is mounted read-only). Empty disables auto-snapshots.
+    arena_snapshot_dir: str = "/tmp/arena-snapshots"
+    # Dictionary-encode ocel:eid / oid / type / activity after loading (shared
+    # categorical dictionaries, so joins and masks run on integer codes).
+    arena_encode_ids: bool = True
 
     # --- mining bounds (§X.4 risk: object-centric discovery can be slow) ---
     arena_max_object_types: int = 12
     arena_default_activity_min_freq: int = 1
+    # Unpruned OC-DFGs kept per resident log + filters + object types, so a new
+    # activity_min_freq is a slice of the cached map rather than a re-mine.
+    arena_dfg_graph_cache_entries: int = 64
+    # Sampled discovery (`sample` on /discover, /discover/petrinet): objects drawn
+    # per type when a request sets no size or time budget, and the first round
+    # of a time-budgeted sample (doubled while the budget allows).
+    arena_sample_max_objects: int = 5000
+    arena_sample_initial_objects: int = 500
+    # OC-DFG engine: "native" (one vectorized pass over the E2O relations) or
+    # "pm4py" (per-object-type flattening + pm4py's DFG miner, the fallback).
+    arena_dfg_engine: Literal["native", "pm4py"] = "native"
+    # Hand-off engine: "native" (every object type in one sort + shift over the
+    # E2O relations) or "pm4py" (per-object-type flattening, the fallback).
+    arena_performance_engine: Literal["native", "pm4py"] = "native"
+    # Performance quantiles: past this many events medians / p90s come from
+    # mergeable sketches (relative error ≤ arena_quantile_relative_accuracy),
+    # streamed over partitions of this many objects, instead of exact series.
+    arena_performance_exact_max_events: int = 2_000_000
+    arena_quantile_relative_accuracy: float = 0.01
+    arena_performance_partition_objects: int = 50_000
+    # Replay / Petri-net engine: "variants" (mine and replay each object type's
+    # distinct activity sequences once, weighted by multiplicity) or "pm4py"
+    # (pm4py's miners and replayer on the flattened frames, the reference).
+    arena_replay_engine: Literal["variants", "pm4py"] = "variants"
+    arena_petrinet_engine: Literal["variants", "pm4py"] = "variants"
+    # Mined per-object-type Petri nets, keyed by (log, filters, miner, noise,
+    # object type): a memory LRU of this many nets in front of PNML files
+    # under this directory (empty disables the disk tier; swept at startup).
+    arena_net_cache_entries: int = 256
+    arena_net_store_dir: str = "/tmp/arena-nets"
+    # Conformance engine: "matrix" (case × activity matrix, rules as column ops)
+    # or "per_case" (the reference Python loop over each case's events).
+    arena_conformance_engine: Literal["matrix", "per_case"] = "matrix"
+    # Full per-case conformance results held for paging (/conformance/cases).
+    arena_conformance_cache_mb: int = 256
+    # Persistent per-case conformance verdicts (SQLite; empty, the default,
+    # disables), keyed by pathway + version + the case's event fingerprint,
+    # capped at this many rows. Point it at a volume the sidecar owns.
+    arena_verdict_cache_path: str = ""
+    arena_verdict_cache_rows: int = 2_000_000
+    # Online conformance (/conformance/stream): a case closes once idle this long
+    # in event time, or oldest-first past arena_stream_max_cases open cases; at
+    # most arena_stream_max_streams named streams are held at once, and one no
+    # batch has reached for arena_stream_ttl_seconds is dropped (0 keeps it).
+    arena_stream_idle_hours: float = 72
+    arena_stream_max_cases: int = 100_000
+    arena_stream_max_streams: int = 8
+    arena_stream_ttl_seconds: int = 3600
+
+    # --- mining executor (keeps pm4py off the event loop) ---
+    # "thread" shares the resident caches below; "process" mines in
+    # arena_mining_workers separate processes (true CPU parallelism, per-process
+    # caches). Each endpoint runs at most arena_mining_concurrency jobs with at
+    # most arena_mining_queue waiting; past that it answers 429 + Retry-After.
+    arena_mining_executor: Literal["thread", "process"] = "thread"
+    arena_mining_workers: int = 4
+    arena_mining_concurrency: int = 2
+    arena_mining_queue: int = 8
+    # Background jobs (/jobs): their own lane's queue bound, how long finished
+    # results are retained, and how many jobs are retained at most.
+    arena_job_queue: int = 32
+    arena_job_ttl_seconds: int = 3600
+    arena_job_max: int = 256
+    # /analyze/batch: threads running batched analyses side by side, shared by
+    # every batch in the process (per worker process under "process").
+    arena_batch_workers: int = 4
+
+    # --- resident caches ---
+    # Memory budget for parsed OCEL logs held between requests (LRU-evicted past
+    # it, keyed by path + size + mtime). 0 disables the cache.
+    arena_ocel_cache_mb: int = 2048
+    # Filtered logs memoized per (log fingerprint, canonical filter hash) — the
+    # Study UI sends one saved preset to several panes back to back.
+    arena_filter_cache_mb: int = 1024
+    arena_filter_cache_entries: int = 32
+    # Per-object-type flattened logs (+ their DFG), shared across the panes.
+    arena_flatten_cache_mb: int = 1024
+    # Lazily built per-log event indexes (time order, activity / attribute
+    # inverted indexes) that event filters read instead of scanning. 0 disables.
+    arena_event_index_cache_mb: int = 256
 
     # Performance analytics trim: an intra-lifecycle gap beyond this is treated as
     # a data artifact (e.g. a milestone with no real completion time), not a real
@@ -44,6 +131,8 @@ class Settings(BaseSettings):
     arena_ai_fitness_floor: float = 0.80
     # XO.2: object types the copilot proposes below this replay fitness get a caveat.
     arena_ai_structural_floor: float = 0.5
+    # /copilot/fitness/batch: most candidate models one request may score (422 beyond).
+    arena_ai_batch_max_proposals: int = 32
 
     @property
     def cors_origins_list(self) -> list[str]:
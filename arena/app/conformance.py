@@ -1,18 +1,50 @@
 """Conformance engine (Part X §X.7). Measures adherence of the live OCEL log to
 the reference care pathways — the established process-mining method for guideline
-compliance. For X3 this is a batch check over the projected log (the online
-prefix-alignment tail is a later refinement); every deviation it reports is an
+compliance. This is the batch check over the projected log (the online tail —
+incremental per-event state per case — is `app.streaming`); every deviation it reports is an
 *observed* departure from the standard, computed from the event sequence and
 timing, so it earns a signal rather than manufacturing a prediction.
+
+Pathways are judged over a case × activity matrix (`app.case_matrix`) with their
+rules as column operations (`evaluate_matrix`), so cost grows with the sub-log's
+size rather than with a Python loop per case. Pathways that share a case type
+share one sub-log: the relation join and the (case, time) ordering are built
+once per case type over the union of their activities, and each pathway takes
+its rows from that pre-sorted frame. The original per-case engine
+(time-sort each case, walk its rows, call `evaluate`) is kept as the reference
+and fallback: `arena_conformance_engine="per_case"` or a pathway without
+compiled rules selects it. Both return identical results.
+
+With the persistent verdict cache on (`app.verdicts`), each case is first looked
+up by its pathway + version + event fingerprint; only cases without a stored
+verdict are evaluated (by either engine), and the aggregates are rebuilt from
+the merged verdicts. Each result reports the cache's hits and misses.
+
+`evaluated` is the paginated surface's entry point: the full per-case result
+for a (log, filters, pathway, engine) is computed once and held in a resident
+LRU cache, so every page after the first — and an NDJSON stream of all of it —
+only slices memory (`page`, with opaque cursors bound to the export's
+fingerprint and to the query — pathway rules, filters, case ids). Inline logs
+have no fingerprint: each page re-evaluates the document, and its cursors are
+bound to the document's digest instead.
 """
 
 from __future__ import annotations
 
-from typing import Any
+import base64
+import hashlib
+import json
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
-from app.ocel_loader import read_ocel
+from app import verdicts
+from app.cache import LRUCache
+from app.case_matrix import CaseMatrix
+from app.config import get_settings
+from app.ocel_loader import ocel_fingerprint, read_ocel, register_derived
 from app.pathways import PATHWAYS
 
 OCEL_EID = "ocel:eid"
@@ -21,6 +53,19 @@ OCEL_TIME = "ocel:timestamp"
 OCEL_OID = "ocel:oid"
 OCEL_TYPE = "ocel:type"
 
+# Full per-case results behind /conformance/cases, per (log, filters, pathway, engine).
+_EVALUATED = register_derived(
+    LRUCache("conformance", max_bytes=get_settings().arena_conformance_cache_mb * 1024 * 1024)
+)
+
+
+class CursorError(ValueError):
+    """A page cursor that is malformed, or minted for another log or query."""
+
+    def __init__(self, detail: str, status_code: int = 422) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+
 
 def check(
     path: str,
@@ -29,6 +74,8 @@ def check(
     filters: "list[BaseFilter] | None" = None,
     per_case: bool = False,
     case_ids: "list[str] | None" = None,
+    engine: str | None = None,
+    verdict_cache: bool | None = None,
 ) -> list[dict[str, Any]]:
     """Run conformance for one pathway (or all) over the OCEL log at `path`.
 
@@ -36,90 +83,355 @@ def check(
     (`case_results`) — the seam the 4D Navigator's per-patient adherence
     surface reads (FLOW-4D plan §8 Phase A2, finding CF-2). `case_ids`
     restricts WHICH verdicts are returned; the aggregate counts always cover
-    the full log so rates never silently change meaning.
+    the full log so rates never silently change meaning. `engine` ("matrix" /
+    "per_case") overrides `arena_conformance_engine`; `verdict_cache=False`
+    bypasses the persistent verdict cache.
     """
+    ocel = _read(path, filters)
+    return _check_log(ocel, pathway_key, sample_limit, per_case, case_ids, engine, verdict_cache)
+
+
+def _read(path: str, filters: "list[BaseFilter] | None"):
     from app.filters import BaseFilter, apply_filters  # noqa: F401
 
     ocel = read_ocel(path)
-    if filters:
-        ocel = apply_filters(ocel, filters)
-    keys = [pathway_key] if pathway_key else list(PATHWAYS.keys())
-    return [
-        _check_one(ocel.events, ocel.relations, PATHWAYS[key], key, sample_limit, per_case, case_ids)
-        for key in keys
-        if key in PATHWAYS
-    ]
+    return apply_filters(ocel, filters) if filters else ocel
 
 
-def _check_one(
-    events,
-    relations,
+def _check_log(
+    ocel,
+    pathway_key: str | None,
+    sample_limit: int,
+    per_case: bool,
+    case_ids: "list[str] | None",
+    engine: str | None,
+    verdict_cache: bool | None,
+) -> list[dict[str, Any]]:
+    keys = [key for key in ([pathway_key] if pathway_key else PATHWAYS) if key in PATHWAYS]
+    use_matrix = (engine or get_settings().arena_conformance_engine) != "per_case"
+    shared = _case_type_logs(ocel.events, ocel.relations, [PATHWAYS[key] for key in keys])
+    store = verdicts.get_store() if verdict_cache is not False else None
+    results = []
+    for key in keys:
+        spec = PATHWAYS[key]
+        check_one = _check_matrix if _matrix_engine(spec, use_matrix) else _check_one
+        rows = _pathway_rows(shared[spec["case_type"]], spec)
+        if store is None:
+            results.append(check_one(rows, spec, key, sample_limit, per_case, case_ids))
+        else:
+            results.append(_check_cached(rows, spec, key, sample_limit, per_case, case_ids, check_one, store))
+    return results
+
+
+def evaluated(
+    path: str,
+    pathway_key: str | None = None,
+    filters: "list[BaseFilter] | None" = None,
+    engine: str | None = None,
+) -> tuple[str | None, list[dict[str, Any]]]:
+    """(log fingerprint, full results) — `check(per_case=True)` for every case,
+    memoized for resident logs (inline logs have no fingerprint and are
+    evaluated on every call)."""
+    ocel = _read(path, filters)
+    fp = ocel_fingerprint(ocel)
+    engine = engine or get_settings().arena_conformance_engine
+
+    def _load() -> tuple[list[dict[str, Any]], int]:
+        results = _check_log(ocel, pathway_key, 8, True, None, engine, None)
+        nbytes = sum(
+            512 + sum(160 + 48 * len(c["activity_timeline"]) + 24 * len(c["deviations"]) for c in r["case_results"])
+            for r in results
+        )
+        return results, nbytes
+
+    if fp is None:
+        return None, _load()[0]
+    base, _, fhash = fp.partition("/")
+    return fp, _EVALUATED.get_or_load((base, fhash or "-", pathway_key or "*", engine), _load)
+
+
+def cursor_query(
+    pathway_key: str | None,
+    filters: "list[BaseFilter] | None",
+    case_ids: "list[str] | None",
+    inline_doc: dict[str, Any] | None = None,
+) -> str:
+    """What a page cursor is bound to besides the export: the pathway(s) with
+    their version and rules, the filter pipeline, the case-id selection and, for
+    an inline log, the document itself (it has no fingerprint, so every page
+    re-evaluates it and only the same document may resume)."""
+    from app.filters import filter_hash
+
+    keys = [pathway_key] if pathway_key else sorted(PATHWAYS)
+    query = {
+        "pathways": {k: [PATHWAYS[k]["version"], _rules_digest(PATHWAYS[k])] if k in PATHWAYS else None for k in keys},
+        "filters": filter_hash(filters),
+        "case_ids": sorted(set(case_ids)) if case_ids is not None else None,
+        "doc": None if inline_doc is None else _digest(inline_doc),
+    }
+    return _digest(query)[:16]
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+def encode_cursor(fp: str | None, query: str, offset: int) -> str:
+    raw = json.dumps({"f": fp.partition("/")[0] if fp else None, "q": query, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, query: str) -> tuple[str | None, int] | None:
+    """``(export fingerprint, offset)`` of a cursor (None for no cursor), checked
+    against `query` (`cursor_query`) before anything is evaluated: a malformed
+    cursor or one minted for another query is a 422."""
+    if not cursor:
+        return None
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset = int(state["o"])
+        minted_fp, minted_query = state["f"], state["q"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise CursorError("malformed cursor") from exc
+    if minted_query != query or offset < 0:
+        raise CursorError("cursor belongs to a different query")
+    return minted_fp, offset
+
+
+def resume_offset(decoded: tuple[str | None, int] | None, fp: str | None) -> int:
+    """The case offset a decoded cursor resumes at (0 without one), once the
+    result's fingerprint is known: a cursor minted for an older export of the
+    log is gone (410)."""
+    if decoded is None:
+        return 0
+    minted_fp, offset = decoded
+    if minted_fp != (fp.partition("/")[0] if fp else None):
+        raise CursorError("cursor was issued for an earlier export of this log; start again without it", 410)
+    return offset
+
+
+def _selected(result: dict[str, Any], wanted: set[str] | None) -> list[dict[str, Any]]:
+    cases = result["case_results"]
+    return cases if wanted is None else [c for c in cases if c["case_id"] in wanted]
+
+
+def count_cases(results: list[dict[str, Any]], case_ids: "list[str] | None" = None) -> int:
+    wanted = set(case_ids) if case_ids is not None else None
+    return sum(len(_selected(r, wanted)) for r in results)
+
+
+def iter_cases(
+    results: list[dict[str, Any]], offset: int = 0, case_ids: "list[str] | None" = None
+) -> Iterator[dict[str, Any]]:
+    """Case rows across the pathways in `results` from `offset` on, each tagged
+    with its pathway — generated one at a time (nothing is copied up front)."""
+    wanted = set(case_ids) if case_ids is not None else None
+    position = 0
+    for result in results:
+        cases = _selected(result, wanted)
+        if position + len(cases) > offset:
+            for case in cases[max(offset - position, 0):]:
+                yield {"pathway": result["pathway"], **case}
+        position += len(cases)
+
+
+def page(
+    results: list[dict[str, Any]], offset: int, limit: int, case_ids: "list[str] | None" = None
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Case rows ``offset:offset+limit`` plus the next offset (None past the end)."""
+    rows = list(islice(iter_cases(results, offset, case_ids), limit + 1))
+    return (rows[:limit], offset + limit) if len(rows) > limit else (rows, None)
+
+
+def _matrix_engine(spec: dict[str, Any], preferred: bool) -> bool:
+    """Matrix when the pathway has compiled rules and either the matrix engine is
+    selected or there is no per-case evaluator to fall back to."""
+    return "evaluate_matrix" in spec and (preferred or "evaluate" not in spec)
+
+
+def _case_type_logs(events, relations, specs: list[dict[str, Any]]) -> dict[str, pd.DataFrame]:
+    """One sub-log per case type: the union of its pathways' activities joined to
+    its case objects (one row per event × case), stably sorted by (case, time) so
+    each case's rows are contiguous and in time order (NaT last)."""
+    activities: dict[str, set[str]] = {}
+    for spec in specs:
+        activities.setdefault(spec["case_type"], set()).update(spec["activities"])
+    out: dict[str, pd.DataFrame] = {}
+    for case_type, wanted in activities.items():
+        sub = events[events[OCEL_ACTIVITY].isin(wanted)]
+        rel = relations[relations[OCEL_TYPE] == case_type][[OCEL_EID, OCEL_OID]]
+        merged = sub.merge(rel, on=OCEL_EID, how="inner")
+        out[case_type] = merged.sort_values([OCEL_OID, OCEL_TIME], kind="stable", ignore_index=True)
+    return out
+
+
+def _pathway_rows(shared: pd.DataFrame, spec: dict[str, Any]) -> pd.DataFrame:
+    """A pathway's sub-log, taken from its case type's shared frame (order kept)."""
+    present = shared[OCEL_ACTIVITY].unique()
+    if set(present) <= set(spec["activities"]):
+        return shared
+    return shared[shared[OCEL_ACTIVITY].isin(spec["activities"])]
+
+
+def _check_matrix(
+    merged: pd.DataFrame,
     spec: dict[str, Any],
     key: str,
     sample_limit: int,
     per_case: bool = False,
     case_ids: "list[str] | None" = None,
 ) -> dict[str, Any]:
-    activities = spec["activities"]
-    trigger = spec["trigger"]
-    evaluate = spec["evaluate"]
-    wanted = set(case_ids) if case_ids is not None else None
+    merged = merged[merged[OCEL_OID].notna()]
+    m = CaseMatrix(merged, spec["activities"])
 
-    sub = events[events[OCEL_ACTIVITY].isin(activities)]
-    rel = relations[relations[OCEL_TYPE] == spec["case_type"]][[OCEL_EID, OCEL_OID]]
-    merged = sub.merge(rel, on=OCEL_EID, how="inner")
+    on = m.has(spec["trigger"])
+    columns = spec["evaluate_matrix"](m)
+    codes = list(columns)
+    flags = np.column_stack([np.asarray(columns[c], dtype=bool) & on for c in codes]) if codes else np.zeros((m.n, 0), dtype=bool)
+    deviant_mask = flags.any(axis=1)
+
+    cases = int(on.sum())
+    conformant = cases - int(deviant_mask.sum())
+
+    # Counted in the per-case engine's first-seen order (the first deviant case
+    # showing the code, then the evaluator's code order), which breaks ties.
+    seen = [(int(np.argmax(flags[:, j])), j) for j in range(len(codes)) if flags[:, j].any()]
+    ranked = _ranked(spec, {codes[j]: int(flags[:, j].sum()) for _first, j in sorted(seen)})
+
+    def deviations_of(i: int) -> list[str]:
+        return [codes[j] for j in np.flatnonzero(flags[i])]
+
+    samples = [
+        {"case_id": str(m.cases[i]), "deviations": deviations_of(i)}
+        for i in np.flatnonzero(deviant_mask)[:sample_limit]
+    ]
 
-    cases = 0
-    conformant = 0
-    deviation_counts: dict[str, int] = {}
-    samples: list[dict[str, Any]] = []
     case_results: list[dict[str, Any]] = []
+    if per_case:
+        selected = on.copy()
+        if case_ids is not None:
+            selected &= pd.Index(m.cases).astype(str).isin(set(case_ids))
+        chosen = np.flatnonzero(selected)
+        timelines = m.timelines(chosen)
+        for i in chosen:
+            devs = deviations_of(i)
+            case_results.append({
+                "case_id": str(m.cases[i]),
+                "conformant": not devs,
+                "deviations": devs,
+                "activity_timeline": {
+                    activity: pd.Timestamp(ts).isoformat()
+                    for activity, ts in timelines.get(int(i), {}).items()
+                },
+            })
 
-    for oid, group in merged.groupby(OCEL_OID):
-        ordered = group.sort_values(OCEL_TIME)
-        timeline: dict[str, Any] = {}
-        for _, row in ordered.iterrows():
-            activity = row[OCEL_ACTIVITY]
-            if activity not in timeline:
-                timeline[activity] = row[OCEL_TIME]
+    return _result(spec, key, cases, conformant, ranked, samples, case_results)
 
-        if trigger not in timeline:
-            continue
 
-        cases += 1
-        counts = ordered[OCEL_ACTIVITY].value_counts().to_dict()
-        deviations = evaluate(timeline, counts, ordered)
+def _rules_digest(spec: dict[str, Any]) -> str:
+    """Folded into case fingerprints so a rule edit without a version bump still
+    misses (rule-less pathways fall back to the evaluator's name)."""
+    rules = spec.get("rules") or getattr(spec.get("evaluate"), "__qualname__", "")
+    return hashlib.sha1(json.dumps(rules, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+
+def _check_cached(
+    merged: pd.DataFrame,
+    spec: dict[str, Any],
+    key: str,
+    sample_limit: int,
+    per_case: bool,
+    case_ids: "list[str] | None",
+    check_one: Any,
+    store: "verdicts.VerdictStore",
+) -> dict[str, Any]:
+    """`check_one` for only the cases whose fingerprint has no stored verdict;
+    the result is assembled from stored + fresh verdicts in case order."""
+    merged = merged[merged[OCEL_OID].notna()]
+    case_order, fingerprints = verdicts.case_fingerprints(merged, _rules_digest(spec))
+    known = store.get_many(key, spec["version"], fingerprints)
+    stale = [oid for oid, fp in zip(case_order, fingerprints) if fp not in known]
+    if stale:
+        fresh = check_one(merged[merged[OCEL_OID].isin(stale)], spec, key, 0, per_case=True)
+        by_case = {r["case_id"]: [r["deviations"], r["activity_timeline"]] for r in fresh["case_results"]}
+        # None marks a case that is not on the pathway (its trigger never occurs).
+        new = {fp: by_case.get(str(oid)) for oid, fp in zip(case_order, fingerprints) if fp not in known}
+        store.put_many(key, spec["version"], new)
+        known.update(new)
+    hits = len(case_order) - len(stale)
+    store.record(hits, len(stale))
+    cache = {"hits": hits, "misses": len(stale), "hit_rate": round(hits / len(case_order), 4) if len(case_order) else None}
+
+    def on_pathway() -> Iterator[tuple[str, list[str], Callable[[], dict[str, str]]]]:
+        # `merged` is in case order already (see _case_type_logs).
+        for oid, fp in zip(case_order, fingerprints):
+            verdict = known[fp]
+            if verdict is not None:
+                deviations, timeline = verdict
+                yield str(oid), deviations, lambda timeline=timeline: timeline
+
+    return _aggregate(spec, key, on_pathway(), sample_limit, per_case, case_ids, cache)
 
+
+def _ranked(spec: dict[str, Any], deviation_counts: dict[str, int]) -> list[dict[str, Any]]:
+    """Deviation codes by count, ties in the order `deviation_counts` lists them."""
+    return sorted(
+        (
+            {"code": code, "label": spec["deviation_labels"].get(code, code), "count": count}
+            for code, count in deviation_counts.items()
+        ),
+        key=lambda item: -item["count"],
+    )
+
+
+def _aggregate(
+    spec: dict[str, Any],
+    key: str,
+    on_pathway: Iterable[tuple[str, list[str], Callable[[], dict[str, str]]]],
+    sample_limit: int,
+    per_case: bool,
+    case_ids: "list[str] | None",
+    verdict_cache: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """A pathway result from the verdicts of its on-pathway cases, in case order,
+    as (case id, deviation codes, activity-timeline thunk) — the per-case engine
+    and the verdict cache share it."""
+    wanted = set(case_ids) if case_ids is not None else None
+    cases = conformant = 0
+    deviation_counts: dict[str, int] = {}
+    samples: list[dict[str, Any]] = []
+    case_results: list[dict[str, Any]] = []
+    for case_id, deviations, timeline in on_pathway:
+        cases += 1
         if deviations:
             for code in deviations:
                 deviation_counts[code] = deviation_counts.get(code, 0) + 1
             if len(samples) < sample_limit:
-                samples.append({"case_id": str(oid), "deviations": deviations})
+                samples.append({"case_id": case_id, "deviations": list(deviations)})
         else:
             conformant += 1
-
-        if per_case and (wanted is None or str(oid) in wanted):
+        if per_case and (wanted is None or case_id in wanted):
             case_results.append({
-                "case_id": str(oid),
+                "case_id": case_id,
                 "conformant": not deviations,
                 "deviations": list(deviations),
                 # First observed occurrence per activity — the expected-vs-
                 # observed lane the adherence panel renders.
-                "activity_timeline": {
-                    activity: pd.Timestamp(ts).isoformat()
-                    for activity, ts in timeline.items()
-                },
+                "activity_timeline": timeline(),
             })
+    return _result(spec, key, cases, conformant, _ranked(spec, deviation_counts), samples, case_results, verdict_cache)
 
-    deviant = cases - conformant
-    ranked = sorted(
-        (
-            {"code": code, "label": spec["deviation_labels"].get(code, code), "count": count}
-            for code, count in deviation_counts.items()
-        ),
-        key=lambda item: -item["count"],
-    )
 
+def _result(
+    spec: dict[str, Any],
+    key: str,
+    cases: int,
+    conformant: int,
+    ranked: list[dict[str, Any]],
+    samples: list[dict[str, Any]],
+    case_results: list[dict[str, Any]],
+    verdict_cache: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     return {
         "pathway": key,
         "label": spec["label"],
@@ -128,9 +440,41 @@ def _check_one(
         "case_type": spec["case_type"],
         "cases": cases,
         "conformant": conformant,
-        "deviant": deviant,
+        "deviant": cases - conformant,
         "conformance_rate": round(conformant / cases, 4) if cases else None,
         "deviations": ranked,
         "sample_deviant_cases": samples,
         "case_results": case_results,
+        "verdict_cache": verdict_cache,
     }
+
+
+def _check_one(
+    merged: pd.DataFrame,
+    spec: dict[str, Any],
+    key: str,
+    sample_limit: int,
+    per_case: bool = False,
+    case_ids: "list[str] | None" = None,
+) -> dict[str, Any]:
+    """The per-case reference engine (`merged` is already in (case, time) order)."""
+    trigger = spec["trigger"]
+    evaluate = spec["evaluate"]
+
+    def on_pathway() -> Iterator[tuple[str, list[str], Callable[[], dict[str, str]]]]:
+        for oid, ordered in merged.groupby(OCEL_OID):
+            timeline: dict[str, Any] = {}
+            for _, row in ordered.iterrows():
+                activity = row[OCEL_ACTIVITY]
+                if activity not in timeline:
+                    timeline[activity] = row[OCEL_TIME]
+            if trigger not in timeline:
+                continue
+            counts = ordered[OCEL_ACTIVITY].value_counts().to_dict()
+            yield (
+                str(oid),
+                evaluate(timeline, counts, ordered),
+                lambda timeline=timeline: {activity: pd.Timestamp(ts).isoformat() for activity, ts in timeline.items()},
+            )
+
+    return _aggregate(spec, key, on_pathway(), sample_limit, per_case, case_ids)
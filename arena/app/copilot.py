@@ -20,8 +20,9 @@ is withheld. Read-only, PHI-free (activity labels + de-identified object types o
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Any
+from typing import Any, Iterable
 
+from app import flattening
 from app.config import get_settings
 from app.ocel_loader import read_ocel
 
@@ -43,12 +44,33 @@ def model_fitness(
     plus the evidence a narrative cites: the busy real paths the model MISSES and the
     edges it INVENTED.
     """
+    return model_fitness_batch(path, [proposed_edges], fitness_floor=fitness_floor)[0]
+
+
+def model_fitness_batch(
+    path: str,
+    proposals: list[list[dict[str, str]]],
+    fitness_floor: float | None | list[float | None] = None,
+) -> list[dict[str, Any]]:
+    """`model_fitness` for several proposals against one log: the log is read,
+    and each touched object type's real DFG built, once for the whole batch;
+    each proposal is then scored with set operations against those maps.
+    `fitness_floor` is one floor for all proposals or one per proposal."""
     settings = get_settings()
-    floor = settings.arena_ai_fitness_floor if fitness_floor is None else float(fitness_floor)
+    per_proposal = fitness_floor if isinstance(fitness_floor, list) else [fitness_floor] * len(proposals)
+    floors = [settings.arena_ai_fitness_floor if f is None else float(f) for f in per_proposal]
 
     ocel = read_ocel(path)
     all_ots = set(pm4py.ocel_get_object_types(ocel))  # type: ignore[union-attr]
+    grouped = [_proposed_by_ot(edges) for edges in proposals]
+    # Only conformance-check object types that actually exist in the log; a proposed
+    # type the log has never seen is pure invention (counted against precision below).
+    checked = [[ot for ot in by_ot if ot in all_ots][: settings.arena_max_object_types] for by_ot in grouped]
+    real = real_dfgs(ocel, dict.fromkeys(ot for ots in checked for ot in ots))
+    return [_score(by_ot, ots, real, all_ots, floor) for by_ot, ots, floor in zip(grouped, checked, floors)]
+
 
+def _proposed_by_ot(proposed_edges: list[dict[str, str]]) -> dict[str, set[tuple[str, str]]]:
     proposed_by_ot: dict[str, set[tuple[str, str]]] = defaultdict(set)
     for edge in proposed_edges:
         ot = str(edge.get("object_type", ""))
@@ -56,11 +78,32 @@ def model_fitness(
         dst = str(edge.get("target", ""))
         if ot and src and dst:
             proposed_by_ot[ot].add((src, dst))
+    return proposed_by_ot
 
-    # Only conformance-check object types that actually exist in the log; a proposed
-    # type the log has never seen is pure invention (counted against precision below).
-    checked_ots = [ot for ot in proposed_by_ot if ot in all_ots][: settings.arena_max_object_types]
 
+def real_dfgs(ocel: Any, object_types: Iterable[str]) -> dict[str, dict[tuple[str, str], int]]:
+    """Each object type's real directly-follows frequencies, ``{(src, dst): freq}``
+    (types without events are left out)."""
+    real: dict[str, dict[tuple[str, str], int]] = {}
+    for ot in object_types:
+        try:
+            flat = flattening.flatten(ocel, ot)
+        except Exception:
+            continue
+        if flat is None or len(flat) == 0:
+            continue
+        dfg, _sa, _ea = flattening.dfg(ocel, ot)
+        real[ot] = {(str(a), str(b)): int(freq) for (a, b), freq in dfg.items()}
+    return real
+
+
+def _score(
+    proposed_by_ot: dict[str, set[tuple[str, str]]],
+    checked_ots: list[str],
+    real_by_ot: dict[str, dict[tuple[str, str], int]],
+    all_ots: set[str],
+    floor: float,
+) -> dict[str, Any]:
     real_total_freq = 0
     covered_freq = 0
     proposed_total = 0
@@ -69,36 +112,28 @@ def model_fitness(
     missing: list[dict[str, Any]] = []
 
     for ot in checked_ots:
-        try:
-            flat = pm4py.ocel_flattening(ocel, ot)  # type: ignore[union-attr]
-        except Exception:
-            continue
-        if flat is None or len(flat) == 0:
+        real = real_by_ot.get(ot)
+        if real is None:
             continue
-
-        dfg, _sa, _ea = pm4py.discover_dfg(flat)  # type: ignore[union-attr]
-        real = {(str(a), str(b)): int(freq) for (a, b), freq in dfg.items()}
         proposed = proposed_by_ot[ot]
+        hits = proposed & real.keys()
 
-        for edge, freq in real.items():
-            real_total_freq += freq
-            if edge in proposed:
-                covered_freq += freq
-            else:
-                missing.append({"object_type": ot, "source": edge[0], "target": edge[1], "frequency": freq})
+        real_total_freq += sum(real.values())
+        covered_freq += sum(real[edge] for edge in hits)
+        missing.extend(
+            {"object_type": ot, "source": a, "target": b, "frequency": freq}
+            for (a, b), freq in real.items() if (a, b) not in hits
+        )
 
         proposed_total += len(proposed)
-        for edge in proposed:
-            if edge in real:
-                grounded += 1
-            else:
-                invented.append({"object_type": ot, "source": edge[0], "target": edge[1]})
+        grounded += len(hits)
+        invented.extend({"object_type": ot, "source": a, "target": b} for (a, b) in sorted(proposed - hits))
 
     # Proposed edges for object types absent from the log are invented wholesale.
     for ot, edges in proposed_by_ot.items():
         if ot not in all_ots:
             proposed_total += len(edges)
-            invented.extend({"object_type": ot, "source": a, "target": b} for (a, b) in edges)
+            invented.extend({"object_type": ot, "source": a, "target": b} for (a, b) in sorted(edges))
 
     fitness = (covered_freq / real_total_freq) if real_total_freq > 0 else 0.0
     precision = (grounded / proposed_total) if proposed_total > 0 else 0.0
@@ -143,21 +178,37 @@ def structural_cross_check(
     the model asserts structure the data barely exhibits. A proposed type with NO
     events in the log earns a `no_events_in_log` warning — the strongest form of
     "structure that isn't there." Additive — this never changes the existing
-    DFG-fitness `published` decision; it arms the narrative with a caveat.
+    DFG-fitness `published` decision; it arms the narrative with a caveat. The
+    nets come from `app.net_store`, so repeated proposals on one export reuse them.
     """
-    from app.replay import fitness as replay_fitness
+    return structural_cross_check_batch(path, [proposed_edges], structural_floor)[0]
 
-    proposed_types = sorted({str(e.get("object_type", "")) for e in proposed_edges if e.get("object_type")})
-    if not proposed_types:
-        return {"structural_fitness_by_type": {}, "structural_warnings": []}
 
-    scored = replay_fitness(path, object_types=proposed_types)
-    by_type = {r["object_type"]: r["fitness"] for r in scored["by_object_type"]}
+def structural_cross_check_batch(
+    path: str,
+    proposals: list[list[dict[str, str]]],
+    structural_floor: float = 0.5,
+) -> list[dict[str, Any]]:
+    """`structural_cross_check` for several proposals: every proposed object type
+    is replayed once for the whole batch, then each proposal takes its own slice."""
+    from app.replay import fitness as replay_fitness
 
-    warnings: list[dict[str, Any]] = []
-    for ot in proposed_types:
-        if ot not in by_type:
-            warnings.append({"object_type": ot, "fitness": None, "floor": structural_floor, "reason": "no_events_in_log"})
-        elif by_type[ot] < structural_floor:
-            warnings.append({"object_type": ot, "fitness": by_type[ot], "floor": structural_floor, "reason": "below_floor"})
-    return {"structural_fitness_by_type": by_type, "structural_warnings": warnings}
+    proposed = [sorted({str(e.get("object_type", "")) for e in edges if e.get("object_type")}) for edges in proposals]
+    union = sorted({ot for ots in proposed for ot in ots})
+    # replay.fitness caps each call at arena_max_object_types; chunk so none is dropped.
+    step = max(1, get_settings().arena_max_object_types)
+    by_type: dict[str, float] = {}
+    for i in range(0, len(union), step):
+        scored = replay_fitness(path, object_types=union[i:i + step])
+        by_type.update((r["object_type"], r["fitness"]) for r in scored["by_object_type"])
+
+    out: list[dict[str, Any]] = []
+    for ots in proposed:
+        warnings: list[dict[str, Any]] = []
+        for ot in ots:
+            if ot not in by_type:
+                warnings.append({"object_type": ot, "fitness": None, "floor": structural_floor, "reason": "no_events_in_log"})
+            elif by_type[ot] < structural_floor:
+                warnings.append({"object_type": ot, "fitness": by_type[ot], "floor": structural_floor, "reason": "below_floor"})
+        out.append({"structural_fitness_by_type": {ot: by_type[ot] for ot in ots if ot in by_type}, "structural_warnings": warnings})
+    return out
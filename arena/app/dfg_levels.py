@@ -0,0 +1,121 @@
+"""Multi-resolution OC-DFG for the abstraction slider (Part X §X.5).
+
+The Study UI re-calls /discover with a new `activity_min_freq` each time the
+slider moves, and pruning is the only thing that changes. A `GraphLevels` holds
+the unpruned map once, nodes and edges in response order (frequency
+descending, stable), and answers any threshold as a slice:
+
+- the nodes kept at threshold t are a prefix (`k` = nodes with frequency ≥ t,
+  one binary search);
+- an edge is kept when both endpoints are, i.e. when the smaller of its two
+  endpoint frequencies (its *gate*) is ≥ t. Every threshold that keeps the same
+  `k` nodes keeps the same edges, so each distinct `k` selects its edges once
+  and later requests copy out the cached index list — O(output). At most
+  `MAX_LEVELS` index lists are kept per graph (oldest first out).
+
+Unpruned graphs of resident logs are cached per (log fingerprint, filter hash,
+engine, object types) (`arena_dfg_graph_cache_entries`); sampled maps and
+unfingerprinted logs are built per call. Cached graphs are shared between
+requests: `prune` hands out copies, down to the rows' list values. A graph's
+`nbytes` is its measured rows and arrays plus `MAX_LEVELS` full index lists.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Any, Callable
+
+import numpy as np
+
+from app.cache import LRUCache
+from app.config import get_settings
+from app.ocel_loader import ocel_fingerprint, register_derived
+
+_GRAPHS = register_derived(LRUCache("dfg_graphs", max_entries=get_settings().arena_dfg_graph_cache_entries))
+# Edge index lists kept per graph; a slider has far fewer distinct stops.
+MAX_LEVELS = 64
+
+
+class GraphLevels:
+    """An unpruned OC-DFG, prunable at any activity frequency threshold."""
+
+    def __init__(self, nodes: list[dict[str, Any]], edges: list[dict[str, Any]]) -> None:
+        self.nodes = sorted(nodes, key=lambda n: -n["frequency"])
+        self.edges = sorted(edges, key=lambda e: -e["frequency"])
+        freq = {n["id"]: n["frequency"] for n in self.nodes}
+        self._descending = np.asarray([-n["frequency"] for n in self.nodes], dtype=np.int64)
+        self._gate = np.asarray(
+            [min(freq.get(e["source"], 0), freq.get(e["target"], 0)) for e in self.edges], dtype=np.int64
+        )
+        self._levels: dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._nbytes = _rows_nbytes(self.nodes) + _rows_nbytes(self.edges) + self._descending.nbytes + self._gate.nbytes
+
+    @property
+    def nbytes(self) -> int:
+        """Measured size of the rows and arrays, plus the most the level index
+        lists can grow to (each is at most one int64 per edge)."""
+        return self._nbytes + MAX_LEVELS * self._gate.nbytes
+
+    def cut(self, min_freq: int) -> tuple[int, np.ndarray]:
+        """``(k, edge_indices)``: the first `k` nodes and these edges (ascending
+        indices into `edges`) have frequency / both endpoints ≥ `min_freq`."""
+        k = int(np.searchsorted(self._descending, -min_freq, side="right"))
+        idx = self._levels.get(k)
+        if idx is None:
+            floor = self.nodes[k - 1]["frequency"] if k else None
+            idx = np.flatnonzero(self._gate >= floor) if floor is not None else np.zeros(0, dtype=np.int64)
+            with self._lock:
+                idx = self._levels.setdefault(k, idx)
+                if len(self._levels) > MAX_LEVELS:
+                    del self._levels[next(iter(self._levels))]
+        return k, idx
+
+    def prune(self, min_freq: int) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """The nodes and edges kept at `min_freq`, in response order (copies)."""
+        k, idx = self.cut(min_freq)
+        return [_copy(n) for n in self.nodes[:k]], [_copy(self.edges[i]) for i in idx.tolist()]
+
+    def ladder(self, base: int, rungs: list[int]) -> list[dict[str, Any]]:
+        """Each rung (raised to `base`, the response's own threshold) as the
+        number of leading response nodes and the indices of the response edges
+        it keeps."""
+        _k, base_idx = self.cut(base)
+        out = []
+        for rung in rungs:
+            k, idx = self.cut(max(rung, base))
+            out.append({"activity_min_freq": rung, "nodes": k, "edges": np.searchsorted(base_idx, idx).tolist()})
+        return out
+
+
+def _copy(row: dict[str, Any]) -> dict[str, Any]:
+    return {k: list(v) if isinstance(v, list) else v for k, v in row.items()}
+
+
+def _rows_nbytes(rows: list[dict[str, Any]]) -> int:
+    """Deep size of a list of flat row dicts (list values included; a string
+    shared by several rows counts in each)."""
+    total = sys.getsizeof(rows)
+    for row in rows:
+        total += sys.getsizeof(row)
+        for value in row.values():
+            total += sys.getsizeof(value)
+            if isinstance(value, list):
+                total += sum(sys.getsizeof(v) for v in value)
+    return total
+
+
+def graph(ocel: Any, key: tuple[Any, ...], build: Callable[[], GraphLevels]) -> GraphLevels:
+    """The unpruned graph of `ocel` under `key` (engine, object types, …),
+    built once per resident log and filter set."""
+    fp = ocel_fingerprint(ocel)
+    if fp is None:
+        return build()
+    base, _, fhash = fp.partition("/")
+
+    def _load() -> tuple[GraphLevels, int]:
+        levels = build()
+        return levels, levels.nbytes
+
+    return _GRAPHS.get_or_load((base, fhash or "-", *key), _load)
@@ -5,15 +5,28 @@ the standard object-centric DFG view (Berti & van der Aalst): flattening PER
 OBJECT TYPE is legitimate (it is how the OC-DFG is defined), unlike flattening to
 one universal case, which is the convergence/divergence pathology X.1 warns of.
 
-pm4py does the mining; this module transforms its output into the flat
-nodes/edges contract the React Study UI renders as SVG.
+The default engine is native (`app.ocdfg`): one vectorized pass over the E2O
+relations for every object type. pm4py's per-type flatten + DFG miner stays as a
+selectable fallback (`engine="pm4py"` / `ARENA_DFG_ENGINE`); both produce the
+same flat nodes/edges contract the React Study UI renders as SVG.
+
+The unpruned map is held per resident log and filter set (`app.dfg_levels`),
+so moving the `activity_min_freq` slider re-slices it instead of re-mining;
+`ladder` returns several thresholds in one response.
+
+With `sample`, the map is estimated from whole objects sampled per type
+(`app.sampling`): frequencies are scaled back to the full log, every node and
+edge carries a `frequency_ci`, and the result is flagged `approximate` unless
+the sample covered every object. The sampled map is always mined natively.
 """
 
 from __future__ import annotations
 
+import time
 from collections import defaultdict
 from typing import Any
 
+from app import dfg_levels, flattening, ocdfg, sampling
 from app.config import get_settings
 from app.ocel_loader import read_ocel
 
@@ -47,8 +60,17 @@ def discover(
     object_types: list[str] | None = None,
     activity_min_freq: int | None = None,
     filters: "list[BaseFilter] | None" = None,
+    engine: str | None = None,
+    sample: dict[str, Any] | None = None,
+    ladder: list[int] | None = None,
 ) -> dict[str, Any]:
-    """Discover the object-centric DFG for the (optionally filtered) object types."""
+    """Discover the object-centric DFG for the (optionally filtered) object types.
+
+    `engine` selects "native" (vectorized, the default) or "pm4py" (per-type
+    flattening); unset falls back to `arena_dfg_engine`. `sample` (the fields
+    of `SamplingSpec`) estimates the map from sampled objects instead.
+    `ladder` adds the map at each of these thresholds as slices of this one.
+    """
     from app.filters import BaseFilter, apply_filters  # noqa: F401
 
     settings = get_settings()
@@ -56,17 +78,72 @@ def discover(
     if filters:
         ocel = apply_filters(ocel, filters)
 
-    all_ots = list(pm4py.ocel_get_object_types(ocel))  # type: ignore[union-attr]
+    all_ots = ocdfg.object_types(ocel)
     ots = [ot for ot in all_ots if object_types is None or ot in object_types]
     ots = ots[: settings.arena_max_object_types]
 
+    started = time.perf_counter()
+    drawn: sampling.Sample | None = None
+    if sample is not None:
+        confidence = sample.get("confidence", 0.95)
+        (node_freq, node_ots, node_ci, edges), drawn = sampling.run(
+            sampling.SamplePlan(ocel, ots, sample.get("seed", 0)),
+            lambda s: sampling.estimate_ocdfg(s, ots, confidence),
+            max_objects=sample.get("max_objects"),
+            time_budget_ms=sample.get("time_budget_ms"),
+        )
+        levels = _levels(node_freq, node_ots, edges, node_ci)
+    else:
+        engine = engine or settings.arena_dfg_engine
+        mine = _mine_pm4py if engine == "pm4py" else ocdfg.discover
+        levels = dfg_levels.graph(ocel, (engine, tuple(ots)), lambda: _levels(*mine(ocel, ots)))
+
+    min_freq = activity_min_freq if activity_min_freq is not None else settings.arena_default_activity_min_freq
+    nodes, edges = levels.prune(min_freq)
+
+    result = {
+        "object_types": ots,
+        "nodes": nodes,
+        "edges": edges,
+        "stats": {"object_types": len(ots), "nodes": len(nodes), "edges": len(edges)},
+    }
+    if ladder is not None:
+        result["ladder"] = levels.ladder(min_freq, ladder)
+    if drawn is not None:
+        result["approximate"] = not drawn.complete
+        result["sampling"] = {
+            "confidence": confidence,
+            "seconds": round(time.perf_counter() - started, 4),
+            "by_object_type": drawn.describe(),
+        }
+    return result
+
+
+def _levels(
+    node_freq: dict[str, int],
+    node_ots: dict[str, set[str]],
+    edges: list[dict[str, Any]],
+    node_ci: dict[str, list[int]] | None = None,
+) -> dfg_levels.GraphLevels:
+    nodes = [
+        {"id": act, "activity": act, "frequency": freq, "object_types": sorted(node_ots[act])}
+        for act, freq in node_freq.items()
+    ]
+    for node in nodes:
+        if node_ci and node["id"] in node_ci:
+            node["frequency_ci"] = node_ci[node["id"]]
+    return dfg_levels.GraphLevels(nodes, edges)
+
+
+def _mine_pm4py(ocel: Any, ots: list[str]) -> tuple[dict[str, int], dict[str, set[str]], list[dict[str, Any]]]:
+    """The pm4py fallback: flatten per object type and mine each flattened DFG."""
     node_freq: dict[str, int] = defaultdict(int)
     node_ots: dict[str, set[str]] = defaultdict(set)
     edges: list[dict[str, Any]] = []
 
     for ot in ots:
         try:
-            flat = pm4py.ocel_flattening(ocel, ot)  # type: ignore[union-attr]
+            flat = flattening.flatten(ocel, ot)
         except Exception:
             continue
         if flat is None or len(flat) == 0:
@@ -76,25 +153,8 @@ def discover(
             node_freq[str(act)] += int(cnt)
             node_ots[str(act)].add(ot)
 
-        dfg, _sa, _ea = pm4py.discover_dfg(flat)  # type: ignore[union-attr]
+        dfg, _sa, _ea = flattening.dfg(ocel, ot)
         for (a, b), freq in dfg.items():
             edges.append({"source": str(a), "target": str(b), "object_type": ot, "frequency": int(freq)})
 
-    min_freq = activity_min_freq if activity_min_freq is not None else settings.arena_default_activity_min_freq
-    nodes = [
-        {"id": act, "activity": act, "frequency": freq, "object_types": sorted(node_ots[act])}
-        for act, freq in node_freq.items()
-        if freq >= min_freq
-    ]
-    kept = {n["id"] for n in nodes}
-    edges = [e for e in edges if e["source"] in kept and e["target"] in kept]
-
-    nodes.sort(key=lambda n: -n["frequency"])
-    edges.sort(key=lambda e: -e["frequency"])
-
-    return {
-        "object_types": ots,
-        "nodes": nodes,
-        "edges": edges,
-        "stats": {"object_types": len(ots), "nodes": len(nodes), "edges": len(edges)},
-    }
+    return node_freq, node_ots, edges
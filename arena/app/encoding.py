@@ -0,0 +1,144 @@
+"""Dictionary-encoded OCEL identifiers (Part X §X.1).
+
+pm4py parses `ocel:eid`, `ocel:oid`, `ocel:type` and `ocel:activity` as Python
+object (string) columns, and every filter, join and grouping on the
+multi-million-row relations frame hashes and compares those strings. After
+loading, each identifier family is encoded once as a pandas categorical over ONE
+dictionary shared by every frame that carries it (events, relations, objects,
+o2o, e2e, object_changes): equal-category merges, `isin` masks and groupings then
+run on the integer codes, and each distinct string is stored once.
+
+Dictionaries are sorted, so sorting an encoded column orders it exactly like the
+strings (pm4py sorts flattened frames by case id). Values decode back to `str`
+wherever they are read one at a time — i.e. only when results are serialized.
+`arena_encode_ids` turns the stage off.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+OCEL_EID = "ocel:eid"
+OCEL_OID = "ocel:oid"
+OCEL_TYPE = "ocel:type"
+OCEL_ACTIVITY = "ocel:activity"
+
+# identifier family -> (frame, column) pairs that share its dictionary
+FAMILIES: dict[str, tuple[tuple[str, str], ...]] = {
+    "eid": (("events", OCEL_EID), ("relations", OCEL_EID), ("e2e", OCEL_EID), ("e2e", OCEL_EID + "_2")),
+    "oid": (
+        ("objects", OCEL_OID), ("relations", OCEL_OID), ("o2o", OCEL_OID), ("o2o", OCEL_OID + "_2"),
+        ("object_changes", OCEL_OID),
+    ),
+    "type": (("objects", OCEL_TYPE), ("relations", OCEL_TYPE), ("object_changes", OCEL_TYPE)),
+    "activity": (("events", OCEL_ACTIVITY), ("relations", OCEL_ACTIVITY)),
+}
+
+
+def encode_ocel(ocel: Any) -> Any:
+    """Encode `ocel`'s identifier columns over shared dictionaries. The frames are
+    replaced (never modified in place), so a reader still holding the parsed
+    frames — e.g. the background snapshot writer — is unaffected."""
+    frames = {name: getattr(ocel, name, None) for name in ("events", "objects", "relations", "o2o", "e2e", "object_changes")}
+    updates: dict[str, dict[str, pd.Categorical]] = {}
+    for family in FAMILIES.values():
+        columns = [
+            (name, col) for name, col in family
+            if frames[name] is not None and col in frames[name].columns
+        ]
+        if not columns:
+            continue
+        dictionary = _dictionary([frames[name][col] for name, col in columns])
+        if dictionary is None:
+            continue
+        for name, col in columns:
+            updates.setdefault(name, {})[col] = pd.Categorical(frames[name][col], categories=dictionary)
+    for name, columns in updates.items():
+        setattr(ocel, name, frames[name].assign(**columns))
+    return ocel
+
+
+def _dictionary(series: list[pd.Series]) -> pd.Index | None:
+    """The sorted union of the string values of `series`, or None when a column
+    holds anything but strings (left as parsed). Empty columns (a log without
+    o2o or e2e rows) carry no values and do not veto the dictionary."""
+    values: list[np.ndarray] = []
+    for s in series:
+        if not len(s):
+            continue
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            values.append(np.asarray(s.cat.categories, dtype=object))  # already a dictionary
+            continue
+        if not (pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype)):
+            return None
+        if s.isna().any():
+            return None
+        values.append(pd.unique(s.to_numpy(dtype=object)))
+    union = pd.unique(np.concatenate(values)) if values else np.array([], dtype=object)
+    if not all(isinstance(v, str) for v in union):
+        return None
+    return pd.Index(sorted(union), dtype="str")
+
+
+def decode_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """`frame` with every encoded column back as plain strings — for handing
+    frames to pm4py miners, which insist on string-typed id / activity columns."""
+    columns = {c: frame[c].astype(frame[c].cat.categories.dtype) for c in frame.columns if is_encoded(frame[c])}
+    return frame.assign(**columns) if columns else frame
+
+
+def decoded(ocel: Any) -> Any:
+    """A string-typed twin of an encoded `ocel` for pm4py-only code paths (the
+    log itself is left encoded). Returns `ocel` unchanged when nothing is encoded."""
+    names = ("events", "objects", "relations", "o2o", "e2e", "object_changes")
+    frames = {n: getattr(ocel, n) for n in names}
+    plain = {n: decode_frame(f) if f is not None else f for n, f in frames.items()}
+    if all(plain[n] is frames[n] for n in names):
+        return ocel
+    from pm4py.objects.ocel.obj import OCEL as PMOCEL
+
+    return PMOCEL(
+        events=plain["events"], objects=plain["objects"], relations=plain["relations"],
+        globals=ocel.globals, parameters=ocel.parameters, o2o=plain["o2o"], e2e=plain["e2e"],
+        object_changes=plain["object_changes"],
+    )
+
+
+def is_encoded(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def positions(index: pd.Series, target: pd.Series) -> np.ndarray:
+    """`pd.Index(index).get_indexer(target)` — the row of `index` holding each
+    value of `target` (−1 when absent; the last row for a repeated value). On
+    columns that share a dictionary this is two integer gathers."""
+    if _shared(index, target):
+        row_of = np.full(len(index.cat.categories) + 1, -1, dtype=np.int64)
+        codes = index.cat.codes.to_numpy()
+        row_of[codes] = np.arange(len(codes))  # code −1 (missing) lands in the spare slot
+        row_of[-1] = -1
+        return row_of[target.cat.codes.to_numpy()]
+    keys = pd.Index(index)
+    if keys.is_unique:
+        return keys.get_indexer(target)
+    last = ~keys.duplicated(keep="last")
+    found = keys[last].get_indexer(target)
+    return np.where(found >= 0, np.flatnonzero(last)[np.maximum(found, 0)], -1)
+
+
+def _shared(a: pd.Series, b: pd.Series) -> bool:
+    return is_encoded(a) and is_encoded(b) and a.cat.categories.equals(b.cat.categories)
+
+
+def member(target: pd.Series, values: pd.Series) -> np.ndarray:
+    """`target.isin(values)` as a boolean array. On columns that share a
+    dictionary it is a lookup table over the codes (no string hashing)."""
+    if _shared(target, values):
+        table = np.zeros(len(values.cat.categories) + 1, dtype=bool)
+        table[values.cat.codes.to_numpy()] = True
+        table[-1] = False
+        return table[target.cat.codes.to_numpy()]
+    return target.isin(set(values)).to_numpy()
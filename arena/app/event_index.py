@@ -0,0 +1,163 @@
+"""Precomputed event indexes for the filter engine (Part X, Phase XO.1).
+
+Event filters used to scan every event on every call: a time window re-parsed
+the timestamp column, an activity or attribute filter ran `isin` over all rows.
+For a resident (fingerprinted) log each filter instead reads a lazily built
+index piece, held in a derived cache keyed by the log fingerprint:
+
+- time: the event rows in time order (NaT dropped) with their timestamps as
+  int64 ns, so a window is two `searchsorted` calls and one slice;
+- activity: an inverted index — the event rows grouped by activity, one
+  contiguous slice per value (a permutation plus offsets);
+- attribute: the same per event attribute, over the string form
+  `EventAttributeFilter` compares;
+- row maps: for each relation (and o2o / e2e / object_changes row) the row of
+  the event and object it names, so a filtered view (`app.filters.FilteredOCEL`)
+  selects rows by integer gathers.
+
+A filter then marks only its matching rows, O(matches) after the first build.
+Each piece is built on first use, so a log that is never filtered by time never
+pays for its time index. Logs without a fingerprint (inline docs) are scanned
+directly: an index would cost more to build than the one scan it saves.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from app.cache import LRUCache
+from app.config import get_settings
+from app.encoding import positions
+from app.ocdfg import time_ns
+from app.ocel_loader import ocel_fingerprint, register_derived
+
+OCEL_EID = "ocel:eid"
+OCEL_OID = "ocel:oid"
+OCEL_ACTIVITY = "ocel:activity"
+OCEL_TIME = "ocel:timestamp"
+
+# frame -> ((column, referenced frame, its id column), ...)
+_REFERENCES: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "relations": ((OCEL_EID, "events", OCEL_EID), (OCEL_OID, "objects", OCEL_OID)),
+    "e2e": ((OCEL_EID, "events", OCEL_EID), (OCEL_EID + "_2", "events", OCEL_EID)),
+    "o2o": ((OCEL_OID, "objects", OCEL_OID), (OCEL_OID + "_2", "objects", OCEL_OID)),
+    "object_changes": ((OCEL_OID, "objects", OCEL_OID),),
+}
+
+NAT_NS = np.iinfo(np.int64).min  # time_ns of NaT
+
+_INDEXES = register_derived(
+    LRUCache("event_index", max_bytes=get_settings().arena_event_index_cache_mb * 1024 * 1024)
+)
+
+
+class TimeIndex:
+    """Event rows sorted by timestamp (stable), NaT excluded."""
+
+    __slots__ = ("rows", "times")
+
+    def __init__(self, timestamps: pd.Series) -> None:
+        ns = time_ns(timestamps)
+        order = np.argsort(ns, kind="stable")
+        order = order[ns[order] != NAT_NS]
+        self.rows = order.astype(np.int64)
+        self.times = ns[order]
+
+    def rows_between(self, start_ns: int | None, end_ns: int | None) -> np.ndarray:
+        """Rows with ``start <= time <= end`` (either bound optional)."""
+        lo = 0 if start_ns is None else int(np.searchsorted(self.times, start_ns, side="left"))
+        hi = len(self.times) if end_ns is None else int(np.searchsorted(self.times, end_ns, side="right"))
+        return self.rows[lo:hi] if hi > lo else self.rows[:0]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rows.nbytes + self.times.nbytes)
+
+
+class InvertedIndex:
+    """Rows grouped by value: ``rows[start:stop]`` are the rows holding one
+    value (NA rows are in no group)."""
+
+    __slots__ = ("rows", "slices")
+
+    def __init__(self, values: pd.Series) -> None:
+        codes, uniques = pd.factorize(values, sort=False)
+        order = np.argsort(codes, kind="stable")
+        order = order[codes[order] >= 0]
+        offsets = np.r_[0, np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))]
+        self.rows = order.astype(np.int64)
+        self.slices = {str(u): (int(offsets[i]), int(offsets[i + 1])) for i, u in enumerate(uniques)}
+
+    def rows_for(self, values: Iterable[Any]) -> np.ndarray:
+        spans = [self.slices[v] for v in dict.fromkeys(str(v) for v in values) if v in self.slices]
+        if not spans:
+            return self.rows[:0]
+        return np.concatenate([self.rows[a:b] for a, b in spans])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rows.nbytes + 100 * len(self.slices))
+
+
+class RowMap(tuple):
+    """Per referencing column, the referenced row of each row (−1 when absent)."""
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(a.nbytes for a in self))
+
+
+def _piece(ocel: Any, key: tuple[Hashable, ...], build: Callable[[], Any]) -> Any | None:
+    if not _INDEXES.enabled:
+        return None
+    fp = ocel_fingerprint(ocel)
+    if fp is None:
+        return None
+    base, _, fhash = fp.partition("/")
+
+    def _load() -> tuple[Any, int]:
+        piece = build()
+        return piece, piece.nbytes
+
+    return _INDEXES.get_or_load((base, fhash or "-", *key), _load)
+
+
+def time_index(ocel: Any) -> TimeIndex | None:
+    return _piece(ocel, ("time",), lambda: TimeIndex(ocel.events[OCEL_TIME]))
+
+
+def activity_index(ocel: Any) -> InvertedIndex | None:
+    return _piece(ocel, ("activity",), lambda: InvertedIndex(ocel.events[OCEL_ACTIVITY]))
+
+
+def attribute_index(ocel: Any, name: str) -> InvertedIndex | None:
+    return _piece(ocel, ("attribute", name), lambda: InvertedIndex(ocel.events[name].astype("string")))
+
+
+def row_map(ocel: Any, frame: str) -> RowMap:
+    """For each row of `frame` ("relations", "e2e", "o2o", "object_changes"),
+    the row of each event / object it references (OCEL ids are unique). Cached
+    for resident logs, computed directly otherwise."""
+
+    def _build() -> RowMap:
+        rows = getattr(ocel, frame)
+        out = []
+        for column, target, id_column in _REFERENCES[frame]:
+            if column in rows.columns:
+                out.append(positions(getattr(ocel, target)[id_column], rows[column]).astype(np.int64))
+            else:
+                out.append(np.full(len(rows), -1, dtype=np.int64))
+        return RowMap(out)
+
+    piece = _piece(ocel, ("rows", frame), _build)
+    return piece if piece is not None else _build()
+
+
+def bitmap(index: pd.Index, rows: np.ndarray, invert: bool = False) -> pd.Series:
+    """A boolean events mask that is True exactly at `rows` (or everywhere else)."""
+    bits = np.full(len(index), invert, dtype=bool)
+    bits[rows] = not invert
+    return pd.Series(bits, index=index)
@@ -0,0 +1,251 @@
+"""Mining executor — keeps CPU-bound pm4py work off the FastAPI event loop.
+
+Every analysis route is `async def`, so a mining call made inline blocks the
+worker's loop: one 30-second Petri-net discovery would stall /health and every
+other request. Routes instead hand their (synchronous) job to `run()`, which
+executes it on a bounded pool while the loop keeps serving.
+
+Admission is per endpoint: each endpoint ("lane") runs at most
+`arena_mining_concurrency` jobs at once with at most `arena_mining_queue` more
+waiting. A request past that is rejected immediately with 429 and a Retry-After
+estimated from the lane's recent job durations, rather than piling up behind the
+pool. A worker process that dies (e.g. OOM-killed) surfaces as 503 and the pool
+is rebuilt.
+
+`arena_mining_executor` picks the pool: "thread" (default) shares the resident
+log / filter / flattening caches with the rest of the process; "process" gives
+true CPU parallelism across `arena_mining_workers` processes, each with its own
+caches. Jobs are therefore module-level callables taking picklable arguments
+(the request model, not an inline-log token) and resolve the OCEL source
+themselves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from app.config import get_settings
+
+
+class MiningRejected(RuntimeError):
+    """The job was not run: its lane is saturated (429) or the pool broke (503)."""
+
+    def __init__(self, detail: str, status_code: int, retry_after: int) -> None:
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _Lane:
+    """Admission state of one endpoint."""
+
+    def __init__(self, limit: int, queue: int) -> None:
+        self.limit = limit
+        self.queue = queue
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.avg_seconds: float | None = None
+        # asyncio primitives bind to a loop; one per loop (tests run several).
+        self.semaphores: dict[int, asyncio.Semaphore] = {}
+
+    def semaphore(self) -> asyncio.Semaphore:
+        key = id(asyncio.get_running_loop())
+        sem = self.semaphores.get(key)
+        if sem is None:
+            sem = self.semaphores[key] = asyncio.Semaphore(self.limit)
+        return sem
+
+    def observe(self, seconds: float) -> None:
+        self.completed += 1
+        self.avg_seconds = seconds if self.avg_seconds is None else 0.8 * self.avg_seconds + 0.2 * seconds
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: the queue ahead drains `limit` at a time."""
+        per_job = self.avg_seconds if self.avg_seconds is not None else 1.0
+        return max(1, math.ceil(per_job * (self.waiting + 1) / self.limit))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_seconds": None if self.avg_seconds is None else round(self.avg_seconds, 3),
+        }
+
+
+class MiningExecutor:
+    """A bounded worker pool with per-endpoint concurrency limits and queues."""
+
+    def __init__(self, kind: str = "thread", workers: int = 2, concurrency: int = 2, queue: int = 4) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"unknown mining executor '{kind}' (expected 'thread' or 'process')")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.concurrency = max(1, min(concurrency, self.workers))
+        self.queue = max(0, queue)
+        self._lanes: dict[str, _Lane] = {}
+        self._queues: dict[str, int] = {}
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    # spawn, not fork: the parent runs uvicorn and pool threads.
+                    ctx = multiprocessing.get_context("spawn")
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="arena-mining")
+            return self._pool
+
+    def _lane(self, endpoint: str) -> _Lane:
+        lane = self._lanes.get(endpoint)
+        if lane is None:
+            lane = self._lanes[endpoint] = _Lane(self.concurrency, self._queues.get(endpoint, self.queue))
+        return lane
+
+    def set_queue(self, endpoint: str, queue: int) -> None:
+        """Give `endpoint` its own queue bound (e.g. background jobs wait longer)."""
+        self._queues[endpoint] = max(0, queue)
+        if endpoint in self._lanes:
+            self._lanes[endpoint].queue = self._queues[endpoint]
+
+    def admit(self, endpoint: str) -> None:
+        """Reserve a place in `endpoint`'s lane for a later `execute()`, or raise
+        `MiningRejected` (429) if it has no free slot and a full queue."""
+        lane = self._lane(endpoint)
+        if lane.running + lane.waiting >= lane.limit + lane.queue:
+            lane.rejected += 1
+            raise MiningRejected(
+                f"'{endpoint}' is saturated ({lane.running} running, {lane.waiting} queued); retry later",
+                status_code=429,
+                retry_after=lane.retry_after(),
+            )
+        lane.waiting += 1
+
+    def estimate(self, endpoint: str) -> float | None:
+        """The lane's smoothed job duration in seconds, once it has run a job."""
+        lane = self._lanes.get(endpoint)
+        return None if lane is None else lane.avg_seconds
+
+    async def run(self, endpoint: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool under `endpoint`'s limits and
+        return its result (or re-raise its exception)."""
+        self.admit(endpoint)
+        return await self.execute(endpoint, fn, *args, **kwargs)
+
+    async def execute(self, endpoint: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a job whose place was reserved by `admit()`. The job holds its lane
+        slot until it finishes, even if the awaiting request is cancelled (a
+        client disconnect cannot stop a pool thread)."""
+        lane = self._lane(endpoint)
+        semaphore = lane.semaphore()
+        try:
+            await semaphore.acquire()
+        finally:
+            lane.waiting -= 1
+        lane.running += 1
+        started = time.monotonic()
+
+        def _finished(_job: Any) -> None:
+            lane.observe(time.monotonic() - started)
+            lane.running -= 1
+            semaphore.release()
+
+        try:
+            job = asyncio.get_running_loop().run_in_executor(self._executor(), functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            _finished(None)
+            raise
+        job.add_done_callback(_finished)
+        try:
+            return await asyncio.shield(job)
+        except BrokenProcessPool as exc:
+            self._reset()
+            raise MiningRejected(
+                "a mining worker died; the pool has been restarted", status_code=503, retry_after=lane.retry_after()
+            ) from exc
+
+    def _reset(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "queue": self.queue,
+            "lanes": {name: lane.stats() for name, lane in sorted(self._lanes.items())},
+        }
+
+
+_EXECUTOR: MiningExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+_FANOUT: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> MiningExecutor:
+    """The process-wide executor, built from settings on first use."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            s = get_settings()
+            _EXECUTOR = MiningExecutor(
+                kind=s.arena_mining_executor,
+                workers=s.arena_mining_workers,
+                concurrency=s.arena_mining_concurrency,
+                queue=s.arena_mining_queue,
+            )
+        return _EXECUTOR
+
+
+def fanout_pool() -> ThreadPoolExecutor:
+    """Threads a running job may spread its own sub-work over (/analyze/batch's
+    analyses): `arena_batch_workers` of them, shared by every job in the
+    process, so concurrent jobs queue for them rather than each starting a pool
+    of its own outside the lanes' limits."""
+    global _FANOUT
+    with _EXECUTOR_LOCK:
+        if _FANOUT is None:
+            _FANOUT = ThreadPoolExecutor(
+                max_workers=max(1, get_settings().arena_batch_workers), thread_name_prefix="arena-fanout"
+            )
+        return _FANOUT
+
+
+async def run(endpoint: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Shorthand for ``get_executor().run(...)``."""
+    return await get_executor().run(endpoint, fn, *args, **kwargs)
+
+
+def shutdown() -> None:
+    global _EXECUTOR, _FANOUT
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+        fanout, _FANOUT = _FANOUT, None
+    if executor is not None:
+        executor.shutdown()
+    if fanout is not None:
+        fanout.shutdown(wait=True, cancel_futures=True)
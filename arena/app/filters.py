@@ -2,24 +2,39 @@
 
 Clean-room reimplementation (see arena/CLEAN-ROOM.md): each filter produces a
 boolean mask over the pm4py OCEL's `events` / `objects` DataFrames. Masks
-AND-combine; `apply_filters` slices the frames, prunes E2O relations to the
-surviving events and objects, drops any event left touching no object (the OCEL
-invariant the exporter validates), and rebuilds a pm4py OCEL. Read-only and
+AND-combine; `apply_filters` prunes E2O relations to the surviving events and
+objects, drops any event left touching no object (the OCEL invariant the
+exporter validates), and returns a lazy view (`FilteredOCEL`) usable wherever a
+pm4py OCEL is, whose frames are sliced on first access. Read-only and
 PHI-free — filters operate on de-identified ids, activity labels, timestamps and
 event attributes only.
+
+Filtered logs of a resident (cached) export are memoized by the log fingerprint
+plus a canonical hash of the filter pipeline: a saved preset sent to /discover,
+/performance and /conformance back to back is sliced once. On such a log the
+event filters read precomputed indexes (app.event_index) rather than scanning
+every event, so a new pipeline costs O(matches) per filter.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Literal, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 from pm4py.objects.ocel.obj import OCEL as PMOCEL
 from pydantic import BaseModel
 
+from app import event_index
+from app.cache import LRUCache
+from app.config import get_settings
+from app.ocel_loader import OCEL_FRAMES, frame_bytes, ocel_fingerprint, on_evicted, register_derived, tag_fingerprint
+
 OCEL_EID = "ocel:eid"
 OCEL_OID = "ocel:oid"
 OCEL_ACTIVITY = "ocel:activity"
@@ -59,6 +74,10 @@ class EventTypeFilter(BaseFilter):
     mode: Literal["include", "exclude"] = "include"
 
     def mask(self, ocel: PMOCEL) -> FilterResult:
+        index = event_index.activity_index(ocel)
+        if index is not None:
+            rows = index.rows_for(self.activities)
+            return FilterResult(events=event_index.bitmap(ocel.events.index, rows, invert=self.mode == "exclude"))
         m = ocel.events[OCEL_ACTIVITY].isin(self.activities)
         return FilterResult(events=~m if self.mode == "exclude" else m)
 
@@ -74,6 +93,13 @@ class TimeFrameFilter(BaseFilter):
     end: Optional[datetime] = None
 
     def mask(self, ocel: PMOCEL) -> FilterResult:
+        index = event_index.time_index(ocel)
+        if index is not None:
+            rows = index.rows_between(
+                None if self.start is None else _to_utc(self.start).as_unit("ns").value,
+                None if self.end is None else _to_utc(self.end).as_unit("ns").value,
+            )
+            return FilterResult(events=event_index.bitmap(ocel.events.index, rows))
         ts = pd.to_datetime(ocel.events[OCEL_TIME], utc=True)
         m = pd.Series(True, index=ocel.events.index)
         if self.start is not None:
@@ -93,6 +119,8 @@ class EventAttributeFilter(BaseFilter):
         events = ocel.events
         if self.name not in events.columns:
             base = pd.Series(False, index=events.index)
+        elif (index := event_index.attribute_index(ocel, self.name)) is not None:
+            base = event_index.bitmap(events.index, index.rows_for(self.values))
         else:
             base = events[self.name].astype("string").isin(self.values)
         return FilterResult(events=~base if self.mode == "exclude" else base)
@@ -117,18 +145,62 @@ def parse_filters(specs: Sequence[dict[str, Any]] | None) -> list[BaseFilter]:
     return out
 
 
+def filter_hash(filters: Sequence[BaseFilter] | None) -> str:
+    """Canonical hash of a filter pipeline. Masks AND-compose, so the pipeline is
+    order-independent: each filter is dumped to sorted-key JSON and the dumps are
+    sorted before hashing. An empty pipeline hashes to ``"-"``."""
+    if not filters:
+        return "-"
+    canon = sorted(
+        json.dumps(f.model_dump(mode="json"), sort_keys=True, separators=(",", ":")) for f in filters
+    )
+    return hashlib.sha1("\n".join(canon).encode("utf-8")).hexdigest()[:16]
+
+
+_settings = get_settings()
+_FILTERED = register_derived(
+    LRUCache(
+        "filtered",
+        max_bytes=_settings.arena_filter_cache_mb * 1024 * 1024,
+        max_entries=_settings.arena_filter_cache_entries,
+    )
+)
+# A view holds its base log: release the views of a parse the budget evicts.
+on_evicted(lambda fp: _FILTERED.discard(lambda k: k[0] == fp))
+
+
 def apply_filters(ocel: PMOCEL, filters: Sequence[BaseFilter] | None) -> PMOCEL:
-    """Return a new pm4py OCEL with the AND of all filter masks applied.
+    """Return a filtered view of `ocel` (a drop-in pm4py OCEL) with the AND of
+    all filter masks applied.
 
     In addition to slicing events/objects/relations, the optional OCEL 2.0 frames
     are pruned to the surviving ids: o2o edges where either endpoint was removed,
     object_changes for removed objects, and e2e edges where either event was
     removed are all dropped. The globals dict is carried through unchanged.
+
+    When `ocel` is a resident (fingerprinted) log the result is memoized and
+    tagged with the composite fingerprint ``<log>/<filter hash>``; like the base
+    log it is shared and must be treated as read-only.
     """
     if not filters:
         return ocel
 
-    events, objects, relations = ocel.events, ocel.objects, ocel.relations
+    base = ocel_fingerprint(ocel)
+    if base is None:
+        return _apply_filters(ocel, filters)
+
+    fhash = filter_hash(filters)
+
+    def _load() -> tuple[PMOCEL, int]:
+        filtered = _apply_filters(ocel, filters)
+        tag_fingerprint(filtered, f"{base}/{fhash}")
+        return filtered, filtered.nbytes()
+
+    return _FILTERED.get_or_load((base, fhash), _load)
+
+
+def _apply_filters(ocel: PMOCEL, filters: Sequence[BaseFilter]) -> "FilteredOCEL":
+    events, objects = ocel.events, ocel.objects
     ev_mask = pd.Series(True, index=events.index)
     ob_mask = pd.Series(True, index=objects.index)
 
@@ -139,34 +211,100 @@ def apply_filters(ocel: PMOCEL, filters: Sequence[BaseFilter] | None) -> PMOCEL:
         if res.objects is not None:
             ob_mask &= res.objects.reindex(objects.index, fill_value=False)
 
-    kept_oids = set(objects.loc[ob_mask, OCEL_OID])
-    kept_eids_by_event = set(events.loc[ev_mask, OCEL_EID])
-
-    rel = relations[
-        relations[OCEL_OID].isin(kept_oids) & relations[OCEL_EID].isin(kept_eids_by_event)
-    ]
-    surviving_eids = set(rel[OCEL_EID])
-
-    f_events = events[events[OCEL_EID].isin(surviving_eids)].reset_index(drop=True)
-    f_objects = objects[ob_mask].reset_index(drop=True)
-    f_relations = rel.reset_index(drop=True)
-
-    f_o2o = ocel.o2o[
-        ocel.o2o[OCEL_OID].isin(kept_oids) & ocel.o2o[OCEL_OID2].isin(kept_oids)
-    ].reset_index(drop=True)
-    f_object_changes = ocel.object_changes[
-        ocel.object_changes[OCEL_OID].isin(kept_oids)
-    ].reset_index(drop=True)
-    f_e2e = ocel.e2e[
-        ocel.e2e[OCEL_EID].isin(surviving_eids) & ocel.e2e[OCEL_EID2].isin(surviving_eids)
-    ].reset_index(drop=True)
-
-    return PMOCEL(
-        events=f_events,
-        objects=f_objects,
-        relations=f_relations,
-        globals=ocel.globals,
-        o2o=f_o2o,
-        e2e=f_e2e,
-        object_changes=f_object_changes,
-    )
+    return FilteredOCEL(ocel, ev_mask.to_numpy(dtype=bool), ob_mask.to_numpy(dtype=bool))
+
+
+def _kept(mask: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """`mask` gathered at `rows`; rows of −1 (no such event / object) are False."""
+    return (rows >= 0) & mask[np.maximum(rows, 0)] if len(mask) else np.zeros(len(rows), dtype=bool)
+
+
+class FilteredOCEL(PMOCEL):
+    """A filtered view of a pm4py OCEL that is drop-in for one: the filter masks
+    are kept and each of the six frames is sliced from the base log on first
+    access. An analysis reading only `events` and `relations` (conformance,
+    synchronization) never builds `objects`, `o2o`, `e2e` or `object_changes`.
+
+    Rows are selected by integer position: each relation's event row and object
+    row (`app.event_index.row_map`, cached per resident log) gather the event and
+    object masks, and the surviving events are scattered back from the kept
+    relations. Semantics are the eager pipeline's: a relation survives when both
+    its event and its object do, an event survives when a relation does, o2o /
+    object_changes follow the kept objects and e2e the surviving events.
+    """
+
+    _FRAMES = OCEL_FRAMES
+
+    def __init__(self, base: PMOCEL, ev_mask: np.ndarray, ob_mask: np.ndarray) -> None:
+        # pm4py's OCEL.__init__ would build the frames eagerly; copy only its
+        # column-name settings from the base log.
+        for attr in (
+            "event_id_column", "object_id_column", "object_type_column", "event_activity",
+            "event_timestamp", "qualifier", "changed_field",
+        ):
+            setattr(self, attr, getattr(base, attr))
+        self.globals = base.globals
+        self.parameters = base.parameters
+        self._base = base
+        self._ev_mask = ev_mask
+        self._ob_mask = ob_mask
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._masks: dict[str, np.ndarray] = {}
+
+    def _mask(self, name: str) -> np.ndarray:
+        mask = self._masks.get(name)
+        if mask is not None:
+            return mask
+        base = self._base
+        if name == "relations":
+            rows = event_index.row_map(base, "relations")
+            mask = _kept(self._ev_mask, rows[0]) & _kept(self._ob_mask, rows[1])
+        elif name == "events":
+            mask = np.zeros(len(base.events), dtype=bool)
+            event_rows = event_index.row_map(base, "relations")[0]
+            mask[event_rows[self._mask("relations")]] = True
+        elif name == "objects":
+            mask = self._ob_mask
+        elif name == "e2e":
+            rows = event_index.row_map(base, "e2e")
+            mask = _kept(self._mask("events"), rows[0]) & _kept(self._mask("events"), rows[1])
+        else:  # o2o, object_changes
+            rows = event_index.row_map(base, name)
+            mask = _kept(self._ob_mask, rows[0])
+            if name == "o2o":
+                mask &= _kept(self._ob_mask, rows[1])
+        self._masks[name] = mask
+        return mask
+
+    def _frame(self, name: str) -> pd.DataFrame:
+        frame = self._frames.get(name)
+        if frame is None:
+            frame = self._frames[name] = getattr(self._base, name)[self._mask(name)].reset_index(drop=True)
+        return frame
+
+    def nbytes(self) -> int:
+        """Estimated resident size once fully materialized: each base frame's
+        size (`ocel_loader.frame_bytes`, measured once per resident log) scaled
+        by the share of its rows the view keeps. The base itself is charged to
+        the parsed-log cache; a view is dropped when that cache evicts its base."""
+        sizes = frame_bytes(self._base)
+        total = 0
+        for name in self._FRAMES:
+            rows = len(getattr(self._base, name))
+            if rows:
+                total += sizes[name] * int(self._mask(name).sum()) // rows
+        return total
+
+
+def _frame_property(name: str) -> property:
+    def _get(self: FilteredOCEL) -> pd.DataFrame:
+        return self._frame(name)
+
+    def _set(self: FilteredOCEL, value: pd.DataFrame) -> None:
+        self._frames[name] = value
+
+    return property(_get, _set)
+
+
+for _name in FilteredOCEL._FRAMES:
+    setattr(FilteredOCEL, _name, _frame_property(_name))
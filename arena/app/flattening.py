@@ -0,0 +1,126 @@
+"""Shared per-object-type flattening store (Berti & van der Aalst: the OC-DFG is
+the union of per-type flattened DFGs).
+
+`pm4py.ocel_flattening(ocel, ot)` is the most expensive step after parsing, and
+discovery, performance, replay and the copilot gate each flatten the same types
+of the same log. Flattened frames (and, lazily, their DFG and variant table)
+are cached per (log fingerprint, filter hash, object type), so a /discover
+followed by a /performance on one log flattens nothing the second time. Logs without a
+fingerprint (inline docs, sample views) keep their entries beside the log object
+for as long as it lives, so one request flattens each of their types once too.
+
+Each entry carries its own lock for the lazy fields, so mining one type's DFG
+never waits on another log's or type's; the entry is re-charged to the cache
+budget as they are filled in.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import weakref
+from typing import Any, Callable
+
+from app import encoding, variants as variant_tables
+from app.cache import LRUCache, frame_nbytes
+from app.config import get_settings
+from app.ocel_loader import ocel_fingerprint, register_derived
+
+try:
+    import pm4py  # type: ignore
+except Exception:  # pragma: no cover
+    pm4py = None  # type: ignore
+
+_FLATTENED = register_derived(
+    LRUCache("flattened", max_bytes=get_settings().arena_flatten_cache_mb * 1024 * 1024)
+)
+# Guards `_SCRATCH` and its per-log dicts only.
+_LAZY_LOCK = threading.Lock()
+# Entries of unfingerprinted logs, per object type, keyed like ocel_loader's
+# fingerprints (id + weakref) and dropped with the log.
+_SCRATCH: dict[int, tuple["weakref.ref[Any]", dict[str, dict[str, Any]]]] = {}
+
+
+def _store_key(ocel: Any, object_type: str) -> tuple[str, str, str] | None:
+    fp = ocel_fingerprint(ocel)
+    if fp is None:
+        return None
+    base, _, fhash = fp.partition("/")
+    return (base, fhash or "-", object_type)
+
+
+def _entry(ocel: Any, object_type: str, key: tuple[str, str, str] | None) -> dict[str, Any]:
+    def _load() -> tuple[dict[str, Any], int]:
+        frame = encoding.decode_frame(pm4py.ocel_flattening(ocel, object_type))  # type: ignore[union-attr]
+        size = frame_nbytes(frame)
+        return {"frame": frame, "frame_nbytes": size, "dfg": None, "variants": None, "lock": threading.Lock()}, size
+
+    if key is None:
+        scratch = _scratch(ocel)
+        entry = scratch.get(object_type)
+        if entry is None:
+            entry = _load()[0]
+            with _LAZY_LOCK:
+                entry = scratch.setdefault(object_type, entry)
+        return entry
+    return _FLATTENED.get_or_load(key, _load)
+
+
+def _scratch(ocel: Any) -> dict[str, dict[str, Any]]:
+    key = id(ocel)
+    with _LAZY_LOCK:
+        found = _SCRATCH.get(key)
+        if found is not None and found[0]() is ocel:
+            return found[1]
+        entries: dict[str, dict[str, Any]] = {}
+
+        def _drop(ref: "weakref.ref[Any]") -> None:
+            if _SCRATCH.get(key, (None,))[0] is ref:
+                _SCRATCH.pop(key, None)
+
+        _SCRATCH[key] = (weakref.ref(ocel, _drop), entries)
+        return entries
+
+
+def flatten(ocel: Any, object_type: str):
+    """The flattened event log of `object_type` (pm4py's shape: concept:name /
+    case:concept:name / time:timestamp). Returned as a shallow copy — pandas
+    copy-on-write keeps the shared frame intact if a caller adds columns (as
+    pm4py's DFG miner does)."""
+    frame = _entry(ocel, object_type, _store_key(ocel, object_type))["frame"]
+    return frame if frame is None else frame.copy(deep=False)
+
+
+def _lazy(ocel: Any, object_type: str, field: str, build: Callable[[Any], Any]) -> Any:
+    """`entry[field]`, built from the entry's frame by its first caller."""
+    key = _store_key(ocel, object_type)
+    entry = _entry(ocel, object_type, key)
+    if entry[field] is None:
+        with entry["lock"]:
+            if entry[field] is None:
+                entry[field] = build(entry["frame"])
+                if key is not None:
+                    _FLATTENED.resize(key, _entry_nbytes(entry))
+    return entry[field]
+
+
+def _entry_nbytes(entry: dict[str, Any]) -> int:
+    size = entry["frame_nbytes"]
+    if entry["dfg"] is not None:
+        for part in entry["dfg"]:
+            size += sys.getsizeof(part) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in part.items())
+    if entry["variants"] is not None:
+        size += entry["variants"].nbytes
+    return size
+
+
+def dfg(ocel: Any, object_type: str) -> tuple[dict[tuple[str, str], int], dict[str, int], dict[str, int]]:
+    """pm4py's ``(dfg, start_activities, end_activities)`` for one object type,
+    mined once per store entry."""
+    return _lazy(ocel, object_type, "dfg", lambda frame: pm4py.discover_dfg(frame.copy(deep=False)))  # type: ignore[union-attr]
+
+
+def variants(ocel: Any, object_type: str) -> variant_tables.VariantTable:
+    """The variant table (distinct activity sequences × multiplicity) of one
+    object type, compressed once per store entry."""
+    return _lazy(ocel, object_type, "variants", variant_tables.compress)
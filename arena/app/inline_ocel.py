@@ -0,0 +1,304 @@
+"""Build a pm4py OCEL straight from an already-decoded OCEL 2.0 JSON document.
+
+An inline `ocel` request body arrives as a Python dict; round-tripping it through
+`json.dump` to a temp file so `pm4py.read_ocel2_json` can re-read and re-decode it
+costs a full serialize/deserialize cycle plus disk I/O on the copilot gate's hot
+path. This module assembles the frames column-wise instead: ids, activities and
+relation endpoints are gathered into flat lists, timestamps are parsed in one
+vectorized `to_datetime` call (pm4py parses each event's time twice, once more per
+relation), declared attribute types are coerced a column at a time (pm4py's
+importer semantics, reimplemented here rather than imported from its private
+parser), and each frame is built once from its columns. pm4py's own consistency
+and relation-propagation passes — already frame-level operations — run on the
+result, so the log is the one `read_ocel2_json` would have produced.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from dateutil import parser as dateutil_parser
+
+OCEL_EID = "ocel:eid"
+OCEL_OID = "ocel:oid"
+OCEL_ACTIVITY = "ocel:activity"
+OCEL_TYPE = "ocel:type"
+OCEL_TIME = "ocel:timestamp"
+OCEL_QUALIFIER = "ocel:qualifier"
+
+# Declared attribute types pm4py's importer coerces, by the token it looks for in
+# the declared type name (first match wins); everything else is kept verbatim.
+_KINDS = (("date", "date"), ("time", "date"), ("float", "float"), ("double", "float"), ("int", "int"), ("bool", "bool"))
+_INT_LITERAL = r"\s*[+-]?\d+\s*"
+
+
+def _dedupe_by_id(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """pm4py keys events/objects by id in a dict: first position, last content."""
+    last: dict[Any, int] = {}
+    for i, item in enumerate(items):
+        last[item["id"]] = i
+    if len(last) == len(items):
+        return items
+    return [items[i] for i in last.values()]
+
+
+def _kind(declared: Any) -> str | None:
+    name = str(declared or "").lower()
+    return next((kind for token, kind in _KINDS if token in name), None)
+
+
+def _from_iso(value: str) -> datetime:
+    """pm4py's ISO parser: a trailing Z is UTC and a naive time is taken as UTC."""
+    parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _coerce_one(value: Any, kind: str | None) -> Any:
+    """pm4py's importer coercion of one non-null value (`kind` from `_kind`); a
+    value that does not convert is kept verbatim."""
+    try:
+        if kind == "date":
+            try:
+                return _from_iso(value)
+            except (AttributeError, TypeError, ValueError):
+                return dateutil_parser.parse(value)  # pm4py's fallback, left as parsed
+        if kind == "float":
+            return float(value)
+        if kind == "int":
+            return int(value)
+        if kind == "bool":
+            if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+                return value.strip().lower() == "true"
+            return bool(value)
+    except (OverflowError, TypeError, ValueError):
+        return value
+    return value
+
+
+def _coerce(values: list[Any], kinds: np.ndarray) -> pd.Series | np.ndarray:
+    """`_coerce_one` over a column, one vectorized pass per kind: nulls (None /
+    "null") become None, numbers go through numpy's own float() / int() cast,
+    dates through one ISO-8601 parse; only values a pass rejects fall back to
+    `_coerce_one`. A column of one numeric or date kind that converted whole
+    comes back typed (nulls as NaN / NaT), anything else as an object array."""
+    col = pd.Series(values, dtype=object)
+    null = col.isna().to_numpy(copy=True)
+    if pd.api.types.infer_dtype(col, skipna=True) == "string":
+        is_str = ~null
+    else:
+        is_str = (col.map(type) == str).to_numpy()
+    text = col[is_str].astype("str").str.strip().str.lower()
+    null[is_str] = (text == "null").to_numpy()
+
+    out = col.to_numpy(copy=True)
+    out[null] = None
+    typed: pd.Series | None = None
+    for kind in ("date", "float", "int", "bool"):
+        rows = np.flatnonzero((kinds == kind) & ~null)
+        if not len(rows):
+            continue
+        sub = col.iloc[rows]
+        done = np.ones(len(rows), dtype=bool)
+        if kind == "date":
+            sub_str = is_str[rows]
+            parsed = pd.to_datetime(sub.where(sub_str), format="ISO8601", utc=True, errors="coerce").dt.as_unit("us")
+            done = parsed.notna().to_numpy()
+        elif kind in ("float", "int"):
+            try:
+                parsed = sub.astype("float64" if kind == "float" else "int64")
+            except (OverflowError, TypeError, ValueError):
+                done[:] = False
+        else:
+            words = text.reindex(sub.index)
+            flag = words.isin(["true", "false"]).to_numpy()
+            parsed = pd.Series(np.where(flag, (words == "true").to_numpy(), sub.astype(bool).to_numpy()), index=sub.index)
+        if done.all() and kind != "bool" and len(rows) == (~null).sum():
+            typed = parsed
+            continue
+        if done.any():
+            out[rows[done]] = parsed[done].astype(object).to_numpy()
+        for i in rows[~done]:
+            out[i] = _coerce_one(out[i], kind)
+    if typed is not None:
+        return typed.reindex(col.index)
+    return out
+
+
+def _attribute_columns(
+    items: list[dict[str, Any]],
+    type_of: list[str],
+    declared: dict[str, dict[str, str]],
+) -> dict[str, Any]:
+    """Gather per-item attribute lists into columns (first-seen column order, like
+    a records-built frame), applying pm4py's typed coercion only where declared."""
+    n = len(items)
+    gathered: dict[str, tuple[list[int], list[Any]]] = {}
+    for row, item in enumerate(items):
+        for attr in item.get("attributes") or ():
+            rows, values = gathered.get(attr["name"]) or gathered.setdefault(attr["name"], ([], []))
+            rows.append(row)
+            values.append(attr["value"])
+
+    owner_types = pd.Series(type_of, dtype=object)
+    columns: dict[str, Any] = {}
+    for name, (rows, values) in gathered.items():
+        owners = owner_types.take(rows)
+        kinds = owners.map({t: _kind(declared.get(t, {}).get(name)) for t in owners.unique()}).to_numpy(dtype=object)
+        coerced = _coerce(values, kinds)
+        if isinstance(coerced, pd.Series):
+            placed = coerced.set_axis(rows)
+            # A repeated name in one item: the last value wins.
+            columns[name] = placed[~placed.index.duplicated(keep="last")].reindex(range(n)).reset_index(drop=True)
+        else:
+            col = np.full(n, np.nan, dtype=object)
+            col[rows] = coerced
+            columns[name] = col.tolist()
+    return columns
+
+
+def build_ocel(doc: dict[str, Any]):
+    """Return the pm4py OCEL equivalent to ``pm4py.read_ocel2_json`` of `doc`."""
+    from pm4py.objects.ocel.obj import OCEL as PMOCEL
+    from pm4py.objects.log.util import dataframe_utils
+    from pm4py.objects.ocel.util import filtering_utils, ocel_consistency
+    from pm4py.util import constants as pm4_constants
+
+    event_attr_types = {et["name"]: {a["name"]: a["type"] for a in et.get("attributes", [])} for et in doc.get("eventTypes", [])}
+    object_attr_types = {ot["name"]: {a["name"]: a["type"] for a in ot.get("attributes", [])} for ot in doc.get("objectTypes", [])}
+
+    # --- objects (+ o2o, + timed attribute values => object_changes) ---
+    objs = _dedupe_by_id(doc.get("objects", []))
+    oids = [o["id"] for o in objs]
+    otypes = [o["type"] for o in objs]
+    type_of_oid = dict(zip(oids, otypes))
+
+    o2o_src: list[Any] = []
+    o2o_dst: list[Any] = []
+    o2o_q: list[Any] = []
+    base_attrs: list[dict[str, Any]] = []
+    changes: list[dict[str, Any]] = []
+    for obj in objs:
+        for rel in obj.get("relationships") or []:
+            o2o_src.append(obj["id"])
+            o2o_dst.append(rel["objectId"])
+            o2o_q.append(rel["qualifier"])
+        attrs = obj.get("attributes") or []
+        if not attrs:
+            base_attrs.append(obj)
+            continue
+        # First value per name is the object's attribute; later timed values are
+        # object_changes rows — pm4py's split, delegated to its own parser.
+        seen: dict[str, int] = {}
+        firsts: list[dict[str, Any]] = []
+        for attr in attrs:
+            if attr["name"] in seen:
+                changes.append({"_obj": obj, "_attr": attr})
+            else:
+                seen[attr["name"]] = 1
+                firsts.append(attr)
+        base_attrs.append({"attributes": firsts})
+
+    objects = pd.DataFrame({OCEL_OID: oids, OCEL_TYPE: otypes, **_attribute_columns(base_attrs, otypes, object_attr_types)})
+
+    # --- events ---
+    evs = _dedupe_by_id(doc.get("events", []))
+    activities = [e["type"] for e in evs]
+    times = pd.to_datetime(pd.Series([e["time"] for e in evs], dtype=object), utc=True, format="ISO8601").dt.as_unit("us")
+    events = pd.DataFrame(
+        {
+            OCEL_EID: [e["id"] for e in evs],
+            OCEL_TIME: times,
+            OCEL_ACTIVITY: activities,
+            **_attribute_columns(evs, activities, event_attr_types),
+        }
+    )
+
+    # --- E2O relations: one row per distinct (event, known object), last qualifier wins ---
+    rel_pos: list[int] = []
+    rel_oid: list[Any] = []
+    rel_q: list[Any] = []
+    for pos, ev in enumerate(evs):
+        links = ev.get("relationships")
+        if not links:
+            continue
+        quals: dict[Any, Any] = {}
+        for link in links:
+            quals[link["objectId"]] = link["qualifier"]
+        for oid, qual in quals.items():
+            if oid in type_of_oid:
+                rel_pos.append(pos)
+                rel_oid.append(oid)
+                rel_q.append(qual)
+    idx = np.asarray(rel_pos, dtype=np.int64)
+    relations = pd.DataFrame(
+        {
+            OCEL_EID: events[OCEL_EID].take(idx).reset_index(drop=True),
+            OCEL_ACTIVITY: events[OCEL_ACTIVITY].take(idx).reset_index(drop=True),
+            OCEL_TIME: times.take(idx).reset_index(drop=True),
+            OCEL_OID: rel_oid,
+            OCEL_TYPE: pd.Series(rel_oid, dtype=object).map(type_of_oid),
+            OCEL_QUALIFIER: rel_q,
+        }
+    )
+    if len(relations) == 0:
+        relations = relations[[OCEL_EID, OCEL_ACTIVITY, OCEL_TIME, OCEL_OID, OCEL_TYPE]]
+
+    # pm4py orders both frames by time, ties by construction order (stable).
+    events = events.sort_values(OCEL_TIME, kind="stable")
+    if len(relations) > 0:
+        relations = relations.sort_values(OCEL_TIME, kind="stable")
+
+    o2o = (
+        pd.DataFrame({OCEL_OID: o2o_src, OCEL_OID + "_2": o2o_dst, OCEL_QUALIFIER: o2o_q}) if o2o_src else None
+    )
+    object_changes = None
+    if changes:
+        times: list[Any] = []
+        for change in changes:
+            time_raw = change["_attr"].get("time")
+            # The epoch / "0" placeholders mark untimed values and stay verbatim.
+            untimed = time_raw is None or str(time_raw).startswith("1970-01-01T00:00:00") or str(time_raw) == "0"
+            try:
+                times.append(time_raw if untimed else _from_iso(time_raw))
+            except (AttributeError, TypeError, ValueError):
+                times.append(time_raw)
+        values = _coerce(
+            [change["_attr"]["value"] for change in changes],
+            np.asarray(
+                [_kind(object_attr_types.get(change["_obj"]["type"], {}).get(change["_attr"]["name"])) for change in changes],
+                dtype=object,
+            ),
+        )
+        rows = [
+            {
+                OCEL_OID: change["_obj"]["id"],
+                OCEL_TYPE: change["_obj"]["type"],
+                "ocel:field": change["_attr"]["name"],
+                change["_attr"]["name"]: value,
+                OCEL_TIME: time_val,
+            }
+            for change, value, time_val in zip(changes, values, times)
+        ]
+        object_changes = pd.DataFrame(rows)
+        object_changes = dataframe_utils.convert_timestamp_columns_in_df(
+            object_changes,
+            timest_format=pm4_constants.DEFAULT_XES_TIMESTAMP_PARSE_FORMAT,
+            timest_columns=[OCEL_TIME],
+        )
+        object_changes[OCEL_TYPE] = object_changes[OCEL_OID].map(type_of_oid)
+
+    globals_ = {"ocel:global-log": {}, "ocel:global-event": {}, "ocel:global-object": {}}
+    ocel = PMOCEL(
+        events=events,
+        objects=objects,
+        relations=relations,
+        o2o=o2o,
+        object_changes=object_changes,
+        globals=globals_,
+        parameters={},
+    )
+    ocel = ocel_consistency.apply(ocel, parameters={})
+    return filtering_utils.propagate_relations_filtering(ocel, parameters={})
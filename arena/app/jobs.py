@@ -0,0 +1,191 @@
+"""Background mining jobs — submit, poll, fetch (for work that outlives an HTTP call).
+
+A Petri-net discovery or replay fitness on a full log can run past the Laravel
+client's HTTP timeout. The orchestrator instead submits the same request body it
+would have POSTed synchronously to `/jobs` under a `kind`, polls `/jobs/{id}`,
+and fetches `/jobs/{id}/result` once it has succeeded.
+
+Jobs run on the mining executor (`app.executor`) in their own "jobs" lane, so the
+synchronous endpoints keep their capacity and a flood of submissions is refused
+with 429 at submit time rather than queued without bound. A job is identified by
+a hash of (kind, canonical request, source fingerprint): resubmitting an
+identical request while its job is queued, running or retained returns that job
+instead of mining twice, and a rewritten export hashes differently. Finished jobs
+are retained for `arena_job_ttl_seconds` (at most `arena_job_max`, oldest
+finished first) and then forgotten.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+from app import executor
+from app.config import get_settings
+from app.ocel_loader import OcelUnavailable, fingerprint
+
+JOBS_LANE = "jobs"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def request_hash(kind: str, request: dict[str, Any], ocel_path: str | None = None) -> str:
+    """Canonical hash of a job submission. A request without an inline doc
+    contributes the fingerprint (path + size + mtime) of the export it reads —
+    `ocel_path`, or the configured default export when unset — so a new export
+    is a new job."""
+    source = None
+    if request.get("ocel") is None:
+        try:
+            source = fingerprint(ocel_path or get_settings().arena_ocel_export_path)
+        except OSError:
+            source = None
+    blob = json.dumps([kind, request, source], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class Job:
+    """One submitted job and, once finished, its result or error."""
+
+    def __init__(self, kind: str, request_hash: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.request_hash = request_hash
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.result: Any = None
+        self.error: dict[str, Any] | None = None
+        self.task: asyncio.Task | None = None
+
+    def progress(self, expected_seconds: float | None) -> float | None:
+        """Estimated completion in [0, 1]: exact once finished, else elapsed time
+        against the lane's recent job duration (None before any job has run)."""
+        if self.status in (SUCCEEDED, FAILED):
+            return 1.0
+        if self.status == QUEUED:
+            return 0.0
+        if not expected_seconds or self.started_at is None:
+            return None
+        return round(min(0.99, (time.time() - self.started_at) / expected_seconds), 2)
+
+    def describe(self, expected_seconds: float | None = None) -> dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": None if self.started_at is None else round(end - self.started_at, 3),
+            "progress": self.progress(expected_seconds),
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """In-process job registry with request-hash dedup and TTL retention."""
+
+    def __init__(self, ttl_seconds: float, max_jobs: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max(1, max_jobs)
+        self._jobs: dict[str, Job] = {}
+        self._by_hash: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._deduplicated = 0
+
+    def _expire(self) -> None:
+        now = time.time()
+        finished = sorted(
+            (j for j in self._jobs.values() if j.finished_at is not None), key=lambda j: j.finished_at or 0.0
+        )
+        overflow = len(self._jobs) - self.max_jobs
+        for job in finished:
+            if now - (job.finished_at or now) > self.ttl_seconds or overflow > 0:
+                self._forget(job)
+                overflow -= 1
+
+    def _forget(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        if self._by_hash.get(job.request_hash) == job.id:
+            del self._by_hash[job.request_hash]
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def submit(self, kind: str, rhash: str, fn: Callable[..., Any], args: tuple, shape: Callable[[Any], Any]) -> tuple[Job, bool]:
+        """Return ``(job, deduplicated)``. A new job reserves a place in the jobs
+        lane (raising `executor.MiningRejected` if it is full) and starts; `shape`
+        turns the raw result into the endpoint's response body."""
+        with self._lock:
+            self._expire()
+            existing = self._jobs.get(self._by_hash.get(rhash, ""))
+            if existing is not None and existing.status != FAILED:
+                self._deduplicated += 1
+                return existing, True
+
+            pool = executor.get_executor()
+            pool.set_queue(JOBS_LANE, get_settings().arena_job_queue)
+            pool.admit(JOBS_LANE)
+            job = Job(kind, rhash)
+            self._jobs[job.id] = job
+            self._by_hash[rhash] = job.id
+        job.task = asyncio.get_running_loop().create_task(self._run(job, pool, fn, args, shape))
+        return job, False
+
+    async def _run(self, job: Job, pool: executor.MiningExecutor, fn: Callable[..., Any], args: tuple, shape: Callable[[Any], Any]) -> None:
+        def _started(*a: Any) -> Any:
+            job.status = RUNNING
+            job.started_at = time.time()
+            return fn(*a)
+
+        try:
+            # A process pool cannot run the closure; mark the start from the loop.
+            if pool.kind == "process":
+                job.status, job.started_at = RUNNING, time.time()
+                raw = await pool.execute(JOBS_LANE, fn, *args)
+            else:
+                raw = await pool.execute(JOBS_LANE, _started, *args)
+            job.result = shape(raw)
+            job.status = SUCCEEDED
+        except OcelUnavailable as exc:
+            job.error, job.status = {"status_code": 422, "detail": str(exc)}, FAILED
+        except executor.MiningRejected as exc:
+            job.error, job.status = {"status_code": exc.status_code, "detail": exc.detail}, FAILED
+        except Exception as exc:  # the job's failure is its result; never crash the loop
+            job.error, job.status = {"status_code": 500, "detail": f"{type(exc).__name__}: {exc}"}, FAILED
+        finally:
+            job.finished_at = time.time()
+            job.task = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts: dict[str, int] = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {**counts, "retained": len(self._jobs), "deduplicated": self._deduplicated}
+
+
+_STORE: JobStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> JobStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            s = get_settings()
+            _STORE = JobStore(ttl_seconds=s.arena_job_ttl_seconds, max_jobs=s.arena_job_max)
+        return _STORE
@@ -9,16 +9,32 @@ Laravel routes that call it.
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from app import __version__
+from app import __version__, executor, net_store, snapshot
 from app.config import get_settings
-from app.routers import capacity, conformance, copilot, discover, health, performance
+from app.routers import analyze, capacity, conformance, copilot, discover, health, jobs, performance, replay
 
 settings = get_settings()
 
-app = FastAPI(title="Zephyrus Patient-Flow Arena (OCPM sidecar)", version=__version__)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Snapshots of exports rewritten or removed while the sidecar was down.
+    if settings.arena_snapshot_dir:
+        snapshot.prune_snapshots(settings.arena_snapshot_dir)
+    # Stored nets of exports superseded while the sidecar was down.
+    if settings.arena_net_store_dir:
+        net_store.sweep()
+    yield
+    executor.shutdown()
+
+
+app = FastAPI(title="Zephyrus Patient-Flow Arena (OCPM sidecar)", version=__version__, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,12 +44,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(executor.MiningRejected)
+async def mining_rejected(_request: Request, exc: executor.MiningRejected) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 app.include_router(health.router)
 app.include_router(discover.router)
 app.include_router(conformance.router)
 app.include_router(performance.router)
 app.include_router(copilot.router)
 app.include_router(capacity.router)
+app.include_router(replay.router)
+app.include_router(jobs.router)
+app.include_router(analyze.router)
 
 
 @app.get("/")
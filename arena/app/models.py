@@ -5,9 +5,9 @@ so the frontend renders SVG directly via STATUS_VAR without post-processing.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class OcelSource(BaseModel):
@@ -18,14 +18,54 @@ class OcelSource(BaseModel):
     to the configured default export path. `filters` is an ordered list of filter
     specs (each an object with a `kind` discriminator) applied before analysis."""
 
-    ocel_path: str | None = Field(default=None, description="path to an OCEL 2.0 JSON file readable by the sidecar")
+    ocel_path: str | None = Field(
+        default=None,
+        description="path to an OCEL 2.0 JSON file, or a columnar snapshot directory (or its manifest.json), readable by the sidecar",
+    )
     ocel: dict[str, Any] | None = Field(default=None, description="an inline OCEL 2.0 JSON document")
     filters: list[dict[str, Any]] | None = Field(default=None, description="ordered OCEL filter pipeline; each item has a 'kind' discriminator")
 
+    @field_validator("ocel_path")
+    @classmethod
+    def _not_a_lent_log(cls, value: str | None) -> str | None:
+        # `inline:` tokens name logs lent inside this process (ocel_loader.lend);
+        # a client may not address one, only a path or its own inline doc.
+        from app.ocel_loader import INLINE_PREFIX
+
+        if value is not None and value.startswith(INLINE_PREFIX):
+            raise ValueError(f"'{INLINE_PREFIX}' sources are internal; send the document as `ocel`")
+        return value
+
+
+class SamplingSpec(BaseModel):
+    """Estimate from whole objects sampled per object type instead of the full log."""
+
+    max_objects: int | None = Field(default=None, ge=2, description="objects sampled per object type (default: arena_sample_max_objects, or unbounded under a time budget)")
+    time_budget_ms: int | None = Field(default=None, ge=1, description="double the sample while the next round is predicted to fit this budget")
+    confidence: float = Field(default=0.95, gt=0.0, lt=1.0, description="confidence level of the frequency intervals")
+    seed: int = Field(default=0, description="the same seed and size draw the same objects")
+
+
+class SampledObjectType(BaseModel):
+    object_type: str
+    objects: int                         # objects of the type in the (filtered) log
+    sampled: int                         # objects the estimate was built from
+
+
+class SamplingInfo(BaseModel):
+    confidence: float | None = None      # of every frequency_ci (DFG only)
+    seconds: float
+    by_object_type: list[SampledObjectType]
+
 
 class DiscoverRequest(OcelSource):
     object_types: list[str] | None = Field(default=None, description="restrict discovery to these object types (default: all)")
     activity_min_freq: int | None = Field(default=None, ge=0, description="drop activities below this occurrence count")
+    engine: Literal["native", "pm4py"] | None = Field(default=None, description="OC-DFG engine (default: sidecar arena_dfg_engine)")
+    sample: SamplingSpec | None = Field(default=None, description="estimate the map from sampled objects (approximate; omit for the exact run)")
+    ladder: list[Annotated[int, Field(ge=0)]] | None = Field(
+        default=None, max_length=32, description="also return the map at each of these activity_min_freq thresholds, as slices of this response"
+    )
 
     @model_validator(mode="after")
     def _bound_object_types(self) -> "DiscoverRequest":
@@ -41,6 +81,7 @@ class Node(BaseModel):
     activity: str
     frequency: int
     object_types: list[str]
+    frequency_ci: list[int] | None = None  # [low, high] when estimated from a sample
 
 
 class Edge(BaseModel):
@@ -52,6 +93,17 @@ class Edge(BaseModel):
     target: str
     object_type: str
     frequency: int
+    frequency_ci: list[int] | None = None  # [low, high] when estimated from a sample
+
+
+class DiscoverRung(BaseModel):
+    """The map at one slider threshold, as a slice of the response it came with:
+    its first `nodes` nodes and the edges at these indices. A threshold below the
+    request's activity_min_freq is raised to it."""
+
+    activity_min_freq: int
+    nodes: int
+    edges: list[int]
 
 
 class DiscoverResponse(BaseModel):
@@ -59,6 +111,9 @@ class DiscoverResponse(BaseModel):
     nodes: list[Node]
     edges: list[Edge]
     stats: dict[str, int]
+    ladder: list[DiscoverRung] | None = None
+    approximate: bool = False            # estimated from a sample that left objects out
+    sampling: SamplingInfo | None = None
 
 
 class SummaryResponse(BaseModel):
@@ -71,6 +126,11 @@ class SummaryResponse(BaseModel):
 class PerformanceRequest(OcelSource):
     object_types: list[str] | None = Field(default=None, description="restrict to these object types (default: all)")
     top: int = Field(default=25, ge=1, le=200, description="cap the ranked rows returned")
+    engine: Literal["native", "pm4py"] | None = Field(default=None, description="hand-off engine (default: sidecar arena_performance_engine)")
+    quantiles: Literal["exact", "approximate"] | None = Field(
+        default=None,
+        description="exact or sketched medians / p90s (default: approximate past arena_performance_exact_max_events)",
+    )
 
 
 class HandoffDuration(BaseModel):
@@ -91,9 +151,15 @@ class SynchronizationWait(BaseModel):
     p90_wait_sec: float
 
 
+class QuantileMode(BaseModel):
+    mode: Literal["exact", "approximate"]
+    relative_error: float = Field(description="bound on |reported − exact| / exact for medians and p90s (0 when exact)")
+
+
 class PerformanceResponse(BaseModel):
     handoffs: list[HandoffDuration]
     synchronization: list[SynchronizationWait]
+    quantiles: QuantileMode
 
 
 class ConformanceRequest(OcelSource):
@@ -105,6 +171,20 @@ class ConformanceRequest(OcelSource):
     )
 
 
+class ConformanceCasesRequest(ConformanceRequest):
+    """Per-case verdicts a page at a time. The full result is computed once per
+    log + filters + pathway and held server-side; `cursor` (opaque, from the
+    previous page's `next_cursor`) resumes after the last case returned.
+    `format="ndjson"` streams the remaining cases as one JSON object per line
+    (all of them unless `page_size` is given). `per_case` is implied. A cursor
+    only resumes the same query (pathway, filters, case_ids); an inline `ocel`
+    is re-evaluated on every page."""
+
+    page_size: int | None = Field(default=None, ge=1, le=10_000, description="cases per page (JSON default 500; NDJSON default: all)")
+    cursor: str | None = Field(default=None, description="next_cursor from the previous page")
+    format: Literal["json", "ndjson"] = "json"
+
+
 class DeviationCount(BaseModel):
     code: str
     label: str
@@ -140,6 +220,57 @@ class PathwayConformance(BaseModel):
     deviations: list[DeviationCount]
     sample_deviant_cases: list[SampleDeviantCase]
     case_results: list[CaseConformance] = Field(default_factory=list)
+    # Persistent verdict cache use for this pathway (hits, misses, hit_rate);
+    # None when the cache is off.
+    verdict_cache: dict[str, float | int | None] | None = None
+
+
+class StreamBatch(BaseModel):
+    """One batch for the online conformance engine. `objects` declares case
+    objects (OCEL 2.0 shape, only `id`/`type` are read) — an event's related
+    objects must be declared in this or an earlier batch to be tracked. `close`
+    ends cases explicitly; `flush` closes every open case after this batch."""
+
+    stream: str = Field(default="default", min_length=1, max_length=64, description="named stream the batch belongs to")
+    objects: list[dict[str, Any]] = Field(default_factory=list)
+    events: list[dict[str, Any]] = Field(default_factory=list, description="OCEL 2.0 events (id, type, time, attributes, relationships)")
+    close: list[str] = Field(default_factory=list, description="case object ids to close after this batch")
+    flush: bool = False
+
+
+class StreamDeviation(BaseModel):
+    pathway: str
+    case_id: str
+    code: str
+    label: str
+    event_id: str | None        # the event that showed it; None when judged at close
+    time: str | None
+    at_close: bool
+
+
+class StreamCaseVerdict(BaseModel):
+    pathway: str
+    case_id: str
+    conformant: bool
+    deviations: list[str]
+    reason: Literal["closed", "idle", "capacity", "flush"]
+
+
+class StreamResponse(BaseModel):
+    deviations: list[StreamDeviation]
+    closed: list[StreamCaseVerdict]
+    stats: dict[str, Any]
+
+
+class PathwayCaseConformance(CaseConformance):
+    pathway: str
+
+
+class ConformanceCasePage(BaseModel):
+    pathways: list[PathwayConformance]          # aggregates over the full log (case_results empty)
+    case_results: list[PathwayCaseConformance]  # this page, in pathway then case order
+    total_cases: int                            # rows across all pages (after case_ids)
+    next_cursor: str | None
 
 
 # --- X4 governed AI copilot: the conformance-fitness trust gate (§X.8.2) ---
@@ -185,9 +316,32 @@ class ModelFitnessResponse(BaseModel):
     structural_warnings: list[dict[str, Any]] = Field(default_factory=list)
 
 
+class ModelProposal(BaseModel):
+    """One copilot-proposed OC-DFG in a batch; `id` labels its verdict."""
+
+    id: str | None = Field(default=None, description="label echoed in the verdict (default: the proposal's index)")
+    proposed_edges: list[ProposedEdge] = Field(default_factory=list)
+    fitness_floor: float | None = Field(default=None, ge=0.0, le=1.0, description="override the batch fitness_floor for this proposal")
+
+
+class ModelFitnessBatchRequest(OcelSource):
+    proposals: list[ModelProposal] = Field(min_length=1, description="candidate models scored against one log (at most arena_ai_batch_max_proposals)")
+    fitness_floor: float | None = Field(default=None, ge=0.0, le=1.0, description="publish threshold for every proposal without its own (default: sidecar arena_ai_fitness_floor)")
+
+
+class ModelFitnessVerdict(ModelFitnessResponse):
+    id: str
+
+
+class ModelFitnessBatchResponse(BaseModel):
+    verdicts: list[ModelFitnessVerdict]  # in request order
+
+
 class PetriNetRequest(OcelSource):
     """OC Petri-net discovery request. Inherits the OCEL source + filter pipeline."""
 
+    sample: SamplingSpec | None = Field(default=None, description="mine from sampled objects (approximate; omit for the exact run)")
+
 
 class PetriNetPlace(BaseModel):
     id: str
@@ -218,6 +372,88 @@ class PetriNetResponse(BaseModel):
     object_types: list[str]
     nets: list[PetriNetSubnet]
     stats: dict[str, int]
+    approximate: bool = False
+    sampling: SamplingInfo | None = None
+
+
+class ReplayRequest(OcelSource):
+    """Per-object-type token-based replay fitness (XO.2) over the (filtered) log."""
+
+    object_types: list[str] | None = Field(default=None, description="restrict to these object types (default: all)")
+
+
+class ReplayFitness(BaseModel):
+    object_type: str
+    fitness: float               # token-based replay log fitness [0,1]
+    fitting_traces_pct: float    # share of perfectly fitting traces [0,100]
+
+
+class ReplayResponse(BaseModel):
+    by_object_type: list[ReplayFitness]
+    min_fitness: float | None
+    mean_fitness: float | None
+
+
+JobKind = Literal[
+    "ocel/summary", "discover", "discover/petrinet", "conformance", "performance", "replay", "copilot/model-fitness",
+    "copilot/fitness/batch",
+]
+
+
+class JobSubmitRequest(BaseModel):
+    """A background job: `request` is the body the synchronous `kind` endpoint takes."""
+
+    kind: JobKind
+    request: dict[str, Any] = Field(default_factory=dict, description="the request body of the matching synchronous endpoint")
+
+
+class JobError(BaseModel):
+    status_code: int
+    detail: str
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    created_at: float                    # epoch seconds
+    started_at: float | None = None
+    finished_at: float | None = None
+    elapsed_seconds: float | None = None
+    progress: float | None = None        # estimated [0,1]; null while no duration estimate exists
+    deduplicated: bool = False           # true when an identical submission returned this job
+    error: JobError | None = None
+    result_url: str
+
+
+BatchKind = Literal["ocel/summary", "discover", "discover/petrinet", "conformance", "performance", "replay"]
+
+
+class AnalysisSpec(BaseModel):
+    """One analysis of a batch: `params` is the kind's request body minus the
+    source and filters, which the batch shares."""
+
+    kind: BatchKind
+    id: str | None = Field(default=None, description="label echoed in the result (default: the kind)")
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(OcelSource):
+    analyses: list[AnalysisSpec] = Field(min_length=1, max_length=16)
+
+
+class AnalysisResult(BaseModel):
+    id: str
+    kind: str
+    status: Literal["ok", "error"]
+    seconds: float
+    result: Any = None                   # the kind's synchronous response body
+    error: JobError | None = None
+
+
+class BatchResponse(BaseModel):
+    results: list[AnalysisResult]        # in request order
+    timings: dict[str, float]            # load / filter / analyses / total seconds
 
 
 class CapacityRequest(BaseModel):
@@ -0,0 +1,225 @@
+"""Persistent per-object-type Petri nets (Part X, Phase XO.2).
+
+Every `/replay`, `/discover/petrinet` and copilot structural cross-check mines an
+inductive net per object type, yet the log only changes with the nightly export.
+Mined nets are therefore kept twice, both keyed by (log fingerprint, filter
+hash, miner, noise threshold, object type):
+
+- in memory, in a derived LRU of `(net, im, fm)` triples purged with the log
+  (`arena_net_cache_entries`);
+- on disk, as one PNML file per key under `arena_net_store_dir` (empty
+  disables), so a restarted or second worker process reads the net instead of
+  re-mining it. PNML rather than a pickled triple: pickle walks the net's arcs
+  recursively and overflows the stack on a long sequential net, and a PNML
+  file carries no code. Files are written atomically; an unreadable file is
+  re-mined and overwritten. The directory also carries the store layout and
+  pm4py versions, so an upgrade re-mines rather than trusting an old layout.
+
+A rewritten export drops its nets as soon as this process reads the new one.
+Each log's directory also records the export it came from (`source.json`), so
+`sweep` can remove, at startup, the nets of exports rewritten or removed while
+no worker was running, along with other layouts and pm4py versions.
+
+The miner flavour is part of the key: replay mines plain IM (`"im"`), the OC
+Petri net mines without fall-throughs or the strict sequence cut (`"ocpn"`).
+Nets are mined from the type's variant table (`app.variants`). Cached nets are
+shared between requests and must be treated as read-only. Logs without a
+fingerprint (inline docs) are mined per call and never stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Any
+
+from app import flattening, variants
+from app.cache import LRUCache
+from app.config import get_settings
+from app.ocel_loader import PM4PY_VERSION, export_key, ocel_fingerprint, on_superseded, register_derived
+
+STORE_VERSION = 1
+SOURCE = "source.json"
+_LAYOUT = re.compile(r"v\d+-pm4py-.+")
+# miner flavour -> extra inductive-miner parameters
+MINERS: dict[str, dict[str, Any]] = {
+    "im": {},
+    "ocpn": {"disable_fallthroughs": True, "disable_strict_sequence_cut": True},
+}
+
+_NETS = register_derived(LRUCache("petri_nets", max_entries=get_settings().arena_net_cache_entries))
+_DISK_STATS = {"loaded": 0, "written": 0, "failed": 0}
+_DISK_LOCK = threading.Lock()
+
+
+def petri_net(ocel: Any, object_type: str, noise_threshold: float = 0.0, miner: str = "im") -> tuple[Any, Any, Any] | None:
+    """The inductive `(net, im, fm)` of `object_type`, or None when the type has
+    no events. Served from memory, then disk, then mined (and stored)."""
+    if miner not in MINERS:
+        raise ValueError(f"unknown miner {miner!r}")
+    noise = float(noise_threshold)
+    fp = ocel_fingerprint(ocel)
+    if fp is None:
+        return _mine(ocel, object_type, noise, miner)
+    base, _, fhash = fp.partition("/")
+    key = (base, fhash or "-", miner, noise, object_type)
+
+    def _load() -> tuple[Any, int]:
+        return _read_or_mine(ocel, key), 0
+
+    if not _NETS.enabled:
+        return _read_or_mine(ocel, key)
+    return _NETS.get_or_load(key, _load)
+
+
+def _mine(ocel: Any, object_type: str, noise: float, miner: str) -> tuple[Any, Any, Any] | None:
+    table = flattening.variants(ocel, object_type)
+    if not len(table):
+        return None
+    return variants.discover_petri_net(table, noise_threshold=noise, **MINERS[miner])
+
+
+def _read_or_mine(ocel: Any, key: tuple[str, str, str, float, str]) -> tuple[Any, Any, Any] | None:
+    _base, _fhash, miner, noise, object_type = key
+    path = _path(key)
+    if path is not None and os.path.isfile(path):
+        try:
+            from pm4py.objects.petri_net.importer.variants import pnml
+
+            with open(path, "rb") as fh:
+                triple = pnml.import_net_from_string(fh.read())
+            _count("loaded")
+            return triple
+        except Exception:
+            _count("failed")
+    triple = _mine(ocel, object_type, noise, miner)
+    if path is not None and triple is not None:
+        _write(path, triple)
+    return triple
+
+
+def _root() -> str | None:
+    root = get_settings().arena_net_store_dir
+    if not root:
+        return None
+    return os.path.join(root, f"v{STORE_VERSION}-pm4py-{PM4PY_VERSION}")
+
+
+def _path(key: tuple[str, str, str, float, str]) -> str | None:
+    root = _root()
+    if root is None:
+        return None
+    base, fhash, miner, noise, object_type = key
+    name = hashlib.sha1(f"{miner}|{noise!r}|{object_type}".encode("utf-8")).hexdigest()[:20]
+    return os.path.join(root, base, fhash, f"{name}.pnml")
+
+
+def _write(path: str, triple: tuple[Any, Any, Any]) -> None:
+    try:
+        from pm4py.objects.petri_net.exporter.variants import pnml
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _record_source(os.path.dirname(os.path.dirname(path)))
+        fd, staging = tempfile.mkstemp(prefix=".net-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(pnml.export_petri_as_string(*triple))
+            os.replace(staging, path)
+        except BaseException:
+            os.unlink(staging)
+            raise
+        _count("written")
+    except Exception:
+        # Best effort: a read-only or full volume only costs a re-mine.
+        _count("failed")
+
+
+def _count(what: str) -> None:
+    with _DISK_LOCK:
+        _DISK_STATS[what] += 1
+
+
+def _purge(stale: str) -> None:
+    """Drop the stored nets of a superseded export."""
+    root = _root()
+    if root is not None:
+        shutil.rmtree(os.path.join(root, stale), ignore_errors=True)
+
+
+on_superseded(_purge)
+
+
+def _record_source(log_dir: str) -> None:
+    """Note, once, which export the nets under `log_dir` were mined from."""
+    marker = os.path.join(log_dir, SOURCE)
+    key = None if os.path.exists(marker) else export_key(os.path.basename(log_dir))
+    if key is None:
+        return
+    real, size, mtime_ns = key
+    try:
+        fd, staging = tempfile.mkstemp(prefix=".source-", dir=log_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"path": real, "size": size, "mtime_ns": mtime_ns}, fh)
+        os.replace(staging, marker)
+    except OSError:
+        # Without a marker the directory is swept at the next startup: a re-mine.
+        pass
+
+
+def sweep() -> int:
+    """Remove stored nets no current export can ask for: other store layouts
+    and pm4py versions, and log directories whose recorded export is gone or
+    has been rewritten since (or that record none). Run at startup; returns how
+    many directories were removed."""
+    root = _root()
+    if root is None:
+        return 0
+    store = os.path.dirname(root)
+    removed = 0
+    for entry in _listdir(store):
+        candidate = os.path.join(store, entry)
+        if candidate != root and _LAYOUT.fullmatch(entry) and os.path.isdir(candidate):
+            shutil.rmtree(candidate, ignore_errors=True)
+            removed += 1
+    for entry in _listdir(root):
+        candidate = os.path.join(root, entry)
+        if os.path.isdir(candidate) and not _current(candidate):
+            shutil.rmtree(candidate, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _listdir(path: str) -> list[str]:
+    try:
+        return os.listdir(path)
+    except OSError:
+        return []
+
+
+def _current(log_dir: str) -> bool:
+    try:
+        with open(os.path.join(log_dir, SOURCE), encoding="utf-8") as fh:
+            src = json.load(fh)
+        st = os.stat(src["path"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return (st.st_size, st.st_mtime_ns) == (src.get("size"), src.get("mtime_ns"))
+
+
+def stats() -> dict[str, Any]:
+    """Disk-tier counters (the memory tier reports as cache ``petri_nets``)."""
+    with _DISK_LOCK:
+        return dict(_DISK_STATS, enabled=_root() is not None)
+
+
+def clear() -> None:
+    """Drop the memory tier and reset the disk counters (tests)."""
+    _NETS.clear()
+    with _DISK_LOCK:
+        for k in _DISK_STATS:
+            _DISK_STATS[k] = 0
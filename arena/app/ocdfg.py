@@ -0,0 +1,174 @@
+"""Native object-centric DFG engine — every object type in one vectorized pass.
+
+The OC-DFG is the union of per-object-type directly-follows relations. pm4py
+builds it by flattening the log once per type and mining each flattened frame;
+the same relation falls out of `ocel.relations` directly: keep the E2O rows of the
+requested types, attach each event's position and timestamp, sort once by
+(type, object, time, event position), compare every row with its successor, and
+group-count (type, activity, next activity). Node frequencies are the per-type
+(type, activity) counts of the same rows.
+
+Semantics are pm4py's, exactly: a row per distinct (object, event) pair of the
+type, ties in time broken by event order (pm4py's flattened frame is in event
+order and its DFG sort is stable), arcs listed per type in (source, target)
+order, and activities entering `node_freq` per type in pm4py's `value_counts`
+order. `app.discovery` keeps the pm4py path as a selectable fallback.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from app import encoding
+
+OCEL_EID = "ocel:eid"
+OCEL_OID = "ocel:oid"
+OCEL_ACTIVITY = "ocel:activity"
+OCEL_TYPE = "ocel:type"
+OCEL_TIME = "ocel:timestamp"
+
+
+def time_ns(series: pd.Series) -> np.ndarray:
+    """A datetime column as int64 nanoseconds since the epoch (UTC)."""
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        series = pd.to_datetime(series, utc=True)
+    if getattr(series.dt, "tz", None) is not None:
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+    return series.to_numpy(dtype="datetime64[ns]").view("int64")
+
+
+def object_types(ocel: Any) -> list[str]:
+    """Object types in first-seen order (pm4py's `ocel_get_object_types`)."""
+    return [str(t) for t in pd.unique(ocel.objects[OCEL_TYPE])]
+
+
+def lifecycle_rows(ocel: Any, types: list[str], sort_objects: bool = False) -> pd.DataFrame:
+    """The rows every per-type flattening would contain, for all `types` at once,
+    sorted by (type, object, time, event position). Objects are in first-seen
+    order, or by id with `sort_objects` (a flattened frame sorted by case).
+
+    Columns: ``type`` / ``oid`` (int codes into `types` / per-log object ids),
+    ``pos`` (event row), ``time`` (int64 ns) and ``act`` (int code into the
+    ``activities`` attribute of the returned frame's ``attrs``).
+    """
+    return _sorted_rows(_lifecycle_source(ocel, types, sort_objects), None)
+
+
+def lifecycle_partitions(
+    ocel: Any, types: list[str], objects_per_partition: int, sort_objects: bool = False
+) -> Iterator[pd.DataFrame]:
+    """`lifecycle_rows` in pieces of at most `objects_per_partition` objects each;
+    an object's whole lifecycle is always in one piece. The per-row source
+    columns (a few integers per E2O row) are built once for the whole log; the
+    sort buffers and the frame exist for one piece at a time."""
+    source = _lifecycle_source(ocel, types, sort_objects)
+    for rows in partition_rows(source["oid"], objects_per_partition):
+        yield _sorted_rows(source, rows)
+
+
+def partition_rows(oid: np.ndarray, objects_per_partition: int) -> Iterator[np.ndarray]:
+    """Indices of the rows of each run of `objects_per_partition` consecutive
+    object codes in `oid`, one piece at a time (at least one, possibly empty).
+    `oid` is argsorted once; every piece is a slice of that order."""
+    order = np.argsort(oid, kind="stable")
+    step = max(1, objects_per_partition)
+    n_objects = int(oid.max()) + 1 if len(oid) else 0
+    bounds = np.append(np.searchsorted(oid, np.arange(0, max(n_objects, 1), step), sorter=order), len(oid))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        yield order[lo:hi]
+
+
+def _lifecycle_source(ocel: Any, types: list[str], sort_objects: bool) -> dict[str, Any]:
+    events = ocel.events
+    rel = ocel.relations[[OCEL_EID, OCEL_OID, OCEL_TYPE]]
+    rel = rel[rel[OCEL_TYPE].isin(types)]
+    # pm4py flattens from the objects table: an E2O row whose object is not a
+    # known object of that type never reaches the flattened log.
+    known = ocel.objects[ocel.objects[OCEL_TYPE].isin(types)][[OCEL_OID, OCEL_TYPE]].drop_duplicates()
+    rel = rel.merge(known, on=[OCEL_OID, OCEL_TYPE], how="inner").drop_duplicates([OCEL_OID, OCEL_EID, OCEL_TYPE])
+
+    pos = encoding.positions(events[OCEL_EID], rel[OCEL_EID])
+    hit = pos >= 0
+    pos = pos[hit]
+    rel = rel[hit]
+
+    act_codes, activities = pd.factorize(events[OCEL_ACTIVITY], sort=False)
+    oid_codes, _ = pd.factorize(rel[OCEL_OID], sort=sort_objects)
+    return {
+        "type": pd.Index(types).get_indexer(rel[OCEL_TYPE]),
+        "oid": oid_codes,
+        "pos": pos,
+        "time": time_ns(events[OCEL_TIME])[pos],
+        "act": act_codes,
+        "activities": [str(a) for a in activities],
+    }
+
+
+def _sorted_rows(source: dict[str, Any], rows: np.ndarray | None) -> pd.DataFrame:
+    type_codes, oid_codes, pos, times = (source[k] if rows is None else source[k][rows] for k in ("type", "oid", "pos", "time"))
+    order = np.lexsort((pos, times, oid_codes, type_codes))
+    rows = pd.DataFrame(
+        {
+            "type": type_codes[order].astype(np.int32),
+            "oid": oid_codes[order].astype(np.int64),
+            "pos": pos[order].astype(np.int64),
+            "time": times[order],
+            "act": source["act"][pos[order]].astype(np.int32),
+        }
+    )
+    rows.attrs["activities"] = source["activities"]
+    return rows
+
+
+def successor_mask(rows: pd.DataFrame) -> np.ndarray:
+    """True where row i and row i+1 belong to the same object lifecycle."""
+    oid = rows["oid"].to_numpy()
+    typ = rows["type"].to_numpy()
+    same = np.zeros(len(rows), dtype=bool)
+    if len(rows) > 1:
+        same[:-1] = (oid[1:] == oid[:-1]) & (typ[1:] == typ[:-1])
+    return same
+
+
+def discover(ocel: Any, types: list[str]) -> tuple[dict[str, int], dict[str, set[str]], list[dict[str, Any]]]:
+    """``(node_freq, node_ots, edges)`` for `types` — the same values, in the same
+    order, as the per-type pm4py flatten + DFG loop in `app.discovery`."""
+    node_freq: dict[str, int] = {}
+    node_ots: dict[str, set[str]] = {}
+    edges: list[dict[str, Any]] = []
+    if not types:
+        return node_freq, node_ots, edges
+
+    rows = lifecycle_rows(ocel, types)
+    activities: list[str] = rows.attrs["activities"]
+    typ = rows["type"].to_numpy()
+    act = rows["act"].to_numpy()
+    pos = rows["pos"].to_numpy()
+
+    # Nodes: per (type, activity) count; value_counts order = count desc, ties by
+    # first appearance in the (event-ordered) flattened frame.
+    nodes = pd.DataFrame({"type": typ, "act": act, "pos": pos}).groupby(["type", "act"], sort=False).agg(
+        count=("pos", "size"), first=("pos", "min")
+    ).reset_index()
+    nodes = nodes.sort_values(["type", "count", "first"], ascending=[True, False, True], kind="stable")
+    for t, a, c in zip(nodes["type"], nodes["act"], nodes["count"]):
+        name, ot = activities[a], types[t]
+        node_freq[name] = node_freq.get(name, 0) + int(c)
+        node_ots.setdefault(name, set()).add(ot)
+
+    # Arcs: successor pairs inside one lifecycle, counted per (type, src, dst).
+    same = successor_mask(rows)
+    idx = np.flatnonzero(same)
+    if len(idx):
+        pairs = pd.DataFrame({"type": typ[idx], "src": act[idx], "dst": act[idx + 1]})
+        counted = pairs.groupby(["type", "src", "dst"], sort=False).size().reset_index(name="frequency")
+        counted["src_name"] = [activities[a] for a in counted["src"]]
+        counted["dst_name"] = [activities[a] for a in counted["dst"]]
+        counted = counted.sort_values(["type", "src_name", "dst_name"], kind="stable")
+        for t, s, d, f in zip(counted["type"], counted["src_name"], counted["dst_name"], counted["frequency"]):
+            edges.append({"source": s, "target": d, "object_type": types[t], "frequency": int(f)})
+
+    return node_freq, node_ots, edges
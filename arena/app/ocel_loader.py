@@ -1,16 +1,30 @@
-"""Resolve an OcelSource to a concrete file path pm4py can read, and centralise
+"""Resolve an OcelSource to a path-like handle `read_ocel` understands, and centralise
 pm4py availability so the routers can degrade gracefully when the mining engine
 is absent (the doc's 'never white-screen; fall back to last-good' discipline).
+
+Parsed logs are held in a process-wide LRU keyed by (resolved path, size, mtime):
+the Study UI fires discover + performance + conformance for one screen, and each
+of them used to re-parse the same multi-hundred-MB export. A rewritten export has
+a new size/mtime and so a new key — the cache can never serve a stale log.
+
+A source may also be a columnar snapshot directory (see app.snapshot). The first
+parse of a JSON export writes one in the background; later cold starts on the
+same export load it memory-mapped instead of decoding JSON. Every parsed or
+inline log then has its identifier columns dictionary-encoded (app.encoding).
 """
 
 from __future__ import annotations
 
-import json
+import hashlib
 import os
-import tempfile
+import threading
+import uuid
+import weakref
 from contextlib import contextmanager
-from typing import Any, Iterator
+from typing import Any, Callable, Iterator
 
+from app import encoding, snapshot
+from app.cache import LRUCache, frame_sizes
 from app.config import get_settings
 
 try:  # pm4py is heavy; import lazily so /health works even if it is missing.
@@ -28,34 +42,281 @@ class OcelUnavailable(RuntimeError):
     """No readable OCEL source could be resolved from the request/config."""
 
 
+# Parsed-log cache. Budget is read once at import (settings are process-wide);
+# inline docs are built in memory per request and deliberately bypass it.
+_PARSED = LRUCache(
+    "ocel",
+    max_bytes=get_settings().arena_ocel_cache_mb * 1024 * 1024,
+    on_evict=lambda key: _evicted(_key_fingerprint(key)),
+)
+INLINE_PREFIX = "inline:"
+_INLINE: dict[str, Any] = {}
+_CURRENT_KEY: dict[str, tuple[str, int, int]] = {}
+_CURRENT_LOCK = threading.Lock()
+
+# Fingerprint of every resident OCEL (base or derived), so caches downstream of
+# read_ocel can key on log identity without threading the path through. Keyed by
+# id(): pm4py's OCEL.__hash__ renders every frame to a string, so a hashed
+# lookup (e.g. a WeakKeyDictionary) would cost seconds per call on a large log.
+_FINGERPRINTS: dict[int, tuple["weakref.ref[Any]", str]] = {}
+# Caches whose keys start with a base-log fingerprint; purged with that log.
+_DERIVED: list[LRUCache] = []
+# Callbacks run with the fingerprint of a superseded export (e.g. on-disk stores).
+_SUPERSEDED: list[Callable[[str], None]] = []
+# Callbacks run with the fingerprint of a parse the budget evicted (state that
+# holds the parsed log itself, e.g. filtered views).
+_EVICTED: list[Callable[[str], None]] = []
+# Per-frame resident size of each resident log, measured once at load.
+OCEL_FRAMES = ("events", "objects", "relations", "o2o", "e2e", "object_changes")
+_FRAME_BYTES: dict[str, dict[str, int]] = {}
+
+_SNAPSHOT_STATS = {"loaded": 0, "written": 0, "failed": 0}
+_SNAPSHOT_INFLIGHT: set[str] = set()
+_SNAPSHOT_LOCK = threading.Lock()
+
+
 @contextmanager
 def resolve_ocel_path(ocel_path: str | None, ocel: dict[str, Any] | None) -> Iterator[str]:
-    """Yield a filesystem path to an OCEL 2.0 JSON doc for the duration of the
-    call. An inline doc is written to a private temp file (cleaned up on exit);
-    an explicit or configured path is used in place."""
+    """Yield a handle `read_ocel` accepts for the duration of the call: a path to
+    an OCEL 2.0 JSON doc or columnar snapshot directory, used in place, or — for
+    an inline doc — an ``inline:<id>`` token naming a log built directly from the
+    already-decoded dict (no temp-file round trip), released on exit."""
 
     if ocel is not None:
-        tmp = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8")
+        if not PM4PY_AVAILABLE:
+            raise OcelUnavailable(f"pm4py is not importable in this service ({PM4PY_VERSION})")
+        from app.inline_ocel import build_ocel
+
         try:
-            json.dump(ocel, tmp)
-            tmp.flush()
-            tmp.close()
-            yield tmp.name
-        finally:
-            try:
-                os.unlink(tmp.name)
-            except OSError:
-                pass
+            built = _normalize(build_ocel(ocel))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise OcelUnavailable(f"inline OCEL document is malformed: {exc}") from exc
+        with lend(built) as token:
+            yield token
         return
 
     path = ocel_path or get_settings().arena_ocel_export_path
-    if not path or not os.path.isfile(path):
+    if path in _INLINE:  # a log lent by `lend()` (e.g. the batch endpoint's filtered view)
+        yield path
+        return
+    if not path or not (os.path.isfile(path) or snapshot.snapshot_dir(path)):
         raise OcelUnavailable(f"no OCEL source: path '{path}' does not exist and no inline doc was provided")
     yield path
 
 
+@contextmanager
+def lend(ocel: Any) -> Iterator[str]:
+    """Register an already-built OCEL under an ``inline:<id>`` token that
+    `resolve_ocel_path` / `read_ocel` accept, for the duration of the block — so
+    path-taking analyses can run on a log that was loaded (and filtered) once."""
+    token = f"{INLINE_PREFIX}{uuid.uuid4().hex}"
+    _INLINE[token] = ocel
+    try:
+        yield token
+    finally:
+        _INLINE.pop(token, None)
+
+
+def _cache_key(path: str) -> tuple[str, int, int]:
+    root = snapshot.snapshot_dir(path)
+    real = os.path.realpath(os.path.join(root, snapshot.MANIFEST) if root else path)
+    st = os.stat(real)
+    return (real, st.st_size, st.st_mtime_ns)
+
+
+def _key_fingerprint(key: tuple[str, int, int]) -> str:
+    real, size, mtime = key
+    return hashlib.sha1(f"{real}:{size}:{mtime}".encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint(path: str) -> str:
+    """A short content fingerprint of the export at `path` (path + size + mtime).
+    Derived caches key on this so a new export invalidates them by construction."""
+    return _key_fingerprint(_cache_key(path))
+
+
+def export_key(fp: str) -> tuple[str, int, int] | None:
+    """The (resolved path, size, mtime) a resident base fingerprint was read
+    from, while it is the current read of that export."""
+    with _CURRENT_LOCK:
+        for key in _CURRENT_KEY.values():
+            if _key_fingerprint(key) == fp:
+                return key
+    return None
+
+
+def ocel_fingerprint(ocel: Any) -> str | None:
+    """The fingerprint a resident OCEL was registered under, or None for an
+    uncached (e.g. inline) log — derived caches must not memoize those."""
+    entry = _FINGERPRINTS.get(id(ocel))
+    if entry is None or entry[0]() is not ocel:
+        return None
+    return entry[1]
+
+
+def tag_fingerprint(ocel: Any, value: str) -> None:
+    """Register a derived OCEL (e.g. a filtered view) under its own fingerprint."""
+    key = id(ocel)
+    _FINGERPRINTS[key] = (weakref.ref(ocel, lambda _ref: _FINGERPRINTS.pop(key, None)), value)
+
+
+def register_derived(cache: LRUCache) -> LRUCache:
+    """Enrol a cache keyed by ``(base_fingerprint, ...)`` tuples so its entries
+    for a superseded export are released together with the parse itself."""
+    _DERIVED.append(cache)
+    return cache
+
+
+def on_superseded(callback: Callable[[str], None]) -> None:
+    """Run `callback(stale_fingerprint)` whenever an export is rewritten, to
+    release state a derived cache keeps outside memory."""
+    _SUPERSEDED.append(callback)
+
+
+def on_evicted(callback: Callable[[str], None]) -> None:
+    """Run `callback(fingerprint)` whenever a resident parse is evicted by the
+    cache budget, to drop derived state that would otherwise keep it alive."""
+    _EVICTED.append(callback)
+
+
+def _evicted(fp: str) -> None:
+    _forget_sizes(fp)
+    for callback in _EVICTED:
+        callback(fp)
+
+
+def _forget_sizes(fp: str) -> None:
+    for key in [k for k in _FRAME_BYTES if k.partition("/")[0] == fp]:
+        _FRAME_BYTES.pop(key, None)
+
+
+def ocel_nbytes(ocel: Any) -> int:
+    """Approximate resident size of a pm4py OCEL (all six frames)."""
+    return sum(frame_bytes(ocel).values())
+
+
+def frame_bytes(ocel: Any) -> dict[str, int]:
+    """Approximate resident size of each of `ocel`'s six frames; measured once
+    per resident log and then remembered under its fingerprint."""
+    fp = ocel_fingerprint(ocel)
+    sizes = _FRAME_BYTES.get(fp) if fp is not None else None
+    if sizes is None:
+        sizes = dict(zip(OCEL_FRAMES, frame_sizes(*(getattr(ocel, name) for name in OCEL_FRAMES))))
+        if fp is not None:
+            _FRAME_BYTES[fp] = sizes
+    return sizes
+
+
 def read_ocel(path: str):
-    """Read an OCEL 2.0 JSON export into a pm4py OCEL object."""
+    """Read an OCEL 2.0 JSON export into a pm4py OCEL object.
+
+    Served from the process-wide parsed-log cache when the file is unchanged.
+    The returned OCEL is SHARED across requests — callers must treat it as
+    read-only (every analysis here derives new frames; none mutates in place).
+    """
     if not PM4PY_AVAILABLE:
         raise OcelUnavailable(f"pm4py is not importable in this service ({PM4PY_VERSION})")
-    return pm4py.read_ocel2_json(path)  # type: ignore[union-attr]
+    if path in _INLINE:
+        return _INLINE[path]
+    if not _PARSED.enabled:
+        return _normalize(_parse(path, fingerprint(path)))
+
+    key = _cache_key(path)
+    with _CURRENT_LOCK:
+        previous = _CURRENT_KEY.get(key[0])
+        _CURRENT_KEY[key[0]] = key
+    if previous is not None and previous != key:
+        # The export was rewritten: release the superseded parse now rather than
+        # waiting for it to age out of the LRU.
+        _PARSED.discard(lambda k: k == previous)
+        stale = _key_fingerprint(previous)
+        for cache in _DERIVED:
+            cache.discard(lambda k: isinstance(k, tuple) and bool(k) and k[0] == stale)
+        _forget_sizes(stale)
+        for callback in _SUPERSEDED:
+            callback(stale)
+
+    def _load() -> tuple[Any, int]:
+        ocel = _normalize(_parse(path, _key_fingerprint(key)))
+        tag_fingerprint(ocel, _key_fingerprint(key))
+        return ocel, ocel_nbytes(ocel)
+
+    return _PARSED.get_or_load(key, _load)
+
+
+def _normalize(ocel: Any) -> Any:
+    """The post-load stage every resident log goes through: identifier columns
+    dictionary-encoded over shared dictionaries (`app.encoding`)."""
+    if get_settings().arena_encode_ids:
+        encoding.encode_ocel(ocel)
+    return ocel
+
+
+def _parse(path: str, fp: str):
+    """Parse one source: a snapshot directly, or a JSON export via its auto-written
+    snapshot when one exists (writing it in the background when it does not)."""
+    if snapshot.snapshot_dir(path):
+        return snapshot.read_snapshot(path)
+
+    root = get_settings().arena_snapshot_dir
+    if not root or not snapshot.PYARROW_AVAILABLE:
+        return pm4py.read_ocel2_json(path)  # type: ignore[union-attr]
+
+    target = snapshot.snapshot_path_for(fp, root)
+    if snapshot.snapshot_dir(target):
+        try:
+            ocel = snapshot.read_snapshot(target)
+            _SNAPSHOT_STATS["loaded"] += 1
+            return ocel
+        except Exception:
+            _SNAPSHOT_STATS["failed"] += 1
+
+    ocel = pm4py.read_ocel2_json(path)  # type: ignore[union-attr]
+    with _SNAPSHOT_LOCK:
+        if target in _SNAPSHOT_INFLIGHT:
+            return ocel
+        _SNAPSHOT_INFLIGHT.add(target)
+    # Off the request path: the caller already has its log.
+    threading.Thread(target=_write_snapshot, args=(ocel, target, path, root), daemon=True).start()
+    return ocel
+
+
+def _write_snapshot(ocel: Any, target: str, source: str, root: str) -> None:
+    try:
+        snapshot.write_snapshot(ocel, target, source=source)
+        snapshot.prune_snapshots(root, keep=target)
+        _SNAPSHOT_STATS["written"] += 1
+    except Exception:
+        # Best effort: a read-only or full volume just means JSON stays the path.
+        _SNAPSHOT_STATS["failed"] += 1
+    finally:
+        with _SNAPSHOT_LOCK:
+            _SNAPSHOT_INFLIGHT.discard(target)
+
+
+def wait_for_snapshots(timeout: float = 30.0) -> None:
+    """Block until background snapshot writes finish (tests; graceful shutdown)."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while _SNAPSHOT_INFLIGHT and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def cache_stats() -> dict[str, Any]:
+    """Hit/miss counters for the resident caches (surfaced on /health)."""
+    return {
+        "ocel": _PARSED.stats(),
+        **{cache.name: cache.stats() for cache in _DERIVED},
+        "snapshots": dict(_SNAPSHOT_STATS, enabled=bool(get_settings().arena_snapshot_dir) and snapshot.PYARROW_AVAILABLE),
+    }
+
+
+def clear_caches() -> None:
+    """Drop every resident parse and derived entry (tests; an operator 'reload' hook)."""
+    _PARSED.clear()
+    for cache in _DERIVED:
+        cache.clear()
+    _FRAME_BYTES.clear()
+    with _CURRENT_LOCK:
+        _CURRENT_KEY.clear()
@@ -3,18 +3,24 @@ each safety-critical pathway is a *standard of care expressed as process*, and a
 deviation is a real, observed departure from that standard — never a prediction.
 
 For X3 these are clinically-interpretable rule sets (derived from the event
-sequence + timing, NOT from any seeded label), evaluated per case. The engine
-groups the OCEL log by the pathway's case object and applies `evaluate`, which
-returns a list of deviation codes. Models are versioned and owner-attributable —
-the fields a governed clinical review needs.
+sequence + timing, NOT from any seeded label). Each pathway's standard is a list
+of declarative rules (`app.rules`: presence, absence, ordering, max interval,
+cadence per day, …) compiled into `evaluate_matrix`, which judges every case at
+once over a `app.case_matrix.CaseMatrix`. The hand-written per-case `evaluate`
+functions remain as the reference the compiled rules are tested against. Models
+are versioned and owner-attributable — the fields a governed clinical review needs.
 """
 
 from __future__ import annotations
 
 from typing import Any, Callable
 
+import numpy as np
 import pandas as pd
 
+from app.case_matrix import CaseMatrix
+from app.rules import compile_rules, rule_labels
+
 # SEP-3 antibiotic target: broad-spectrum antibiotics within 3 hours of
 # sepsis recognition (SSC bundle).
 SEPSIS_ABX_TARGET_MIN = 180
@@ -124,9 +130,63 @@ def evaluate_home_hospital(timeline: dict[str, Any], counts: dict[str, int], gro
     return deviations
 
 
+# --- the same standards as declarative rules (app.rules), compiled to vectorized
+# checks over every case at once. Codes and order match the evaluators above. ---
+
+SEPSIS_RULES: list[dict[str, Any]] = [
+    {"kind": "present", "activity": "lactate_order", "code": "no_lactate", "label": "Lactate not ordered"},
+    {"kind": "present", "activity": "antibiotic_administration", "code": "no_antibiotic", "label": "No antibiotic administered"},
+    {
+        "kind": "max_interval", "start": "sepsis_recognition", "end": "antibiotic_administration",
+        "minutes": SEPSIS_ABX_TARGET_MIN, "code": "antibiotic_late", "label": "Antibiotic beyond the 3-hour target",
+    },
+    {
+        "kind": "order", "before": "blood_culture_order", "after": "antibiotic_administration",
+        "code": "culture_after_antibiotic", "label": "Blood cultures drawn after antibiotics",
+    },
+    {"kind": "present", "activity": "repeat_lactate_result", "code": "no_repeat_lactate", "label": "Repeat lactate not documented"},
+]
+
+SURGICAL_SAFETY_RULES: list[dict[str, Any]] = [
+    {
+        "kind": "min_count", "activity": "Safety_Check", "count": 3, "code": "safety_step_missing",
+        "label": "A checklist step (Sign-In / Time-Out / Sign-Out) is missing",
+    },
+    {
+        "kind": "attribute_in", "activity": "Safety_Check", "attribute": "status",
+        "values": ["complete", "completed", "verified", "done", "ok", "pass", "passed"],
+        "code": "safety_check_flagged", "label": "A checklist step was flagged incomplete",
+    },
+]
+
+HOME_HOSPITAL_RULES: list[dict[str, Any]] = [
+    {
+        "kind": "max_interval", "start": "home-refer", "end": "home-activate", "minutes": HOME_ACTIVATION_SLA_MIN,
+        "code": "activation_beyond_sla", "label": "Referral-to-activation beyond the 24-hour SLA",
+    },
+    {
+        "kind": "count_per_day", "activity": "home-visit-complete", "per_day": HOME_WAIVER_VISITS_PER_DAY,
+        "start": "home-activate", "end": "home-discharge",
+        "prefer": {"attribute": "waiver_required", "values": ["true", "1", "yes"]},
+        "code": "visit_cadence_below_floor", "label": "In-person visits below the 2-per-day waiver floor",
+    },
+    {
+        "kind": "balanced", "open": "home-escalation-open", "close": "home-escalation-resolve",
+        "code": "escalation_unresolved", "label": "An escalation was opened but never resolved",
+    },
+    {
+        "kind": "attribute_max", "activity": "home-escalation-resolve", "attribute": "response_minutes",
+        "max": HOME_RESPONSE_FLOOR_MIN, "code": "escalation_response_late",
+        "label": "Escalation response beyond the 30-minute floor",
+    },
+]
+
+
 # The versioned pathway registry. `case_type` is the OCEL object the pathway is
 # grouped by; `trigger` is the activity whose presence marks a case as being on
-# the pathway; `activities` bounds the sub-log the engine extracts.
+# the pathway; `activities` bounds the sub-log the engine extracts; `rules` is
+# the declarative standard (compiled into `evaluate_matrix`, labels into
+# `deviation_labels`). A pathway without `evaluate_matrix` is judged case by case.
 PATHWAYS: dict[str, dict[str, Any]] = {
     "sepsis": {
         "label": "Sepsis bundle (SEP-3)",
@@ -147,13 +207,7 @@ PATHWAYS: dict[str, dict[str, Any]] = {
             "repeat_lactate_result",
         ],
         "evaluate": evaluate_sepsis,
-        "deviation_labels": {
-            "no_lactate": "Lactate not ordered",
-            "no_antibiotic": "No antibiotic administered",
-            "antibiotic_late": "Antibiotic beyond the 3-hour target",
-            "culture_after_antibiotic": "Blood cultures drawn after antibiotics",
-            "no_repeat_lactate": "Repeat lactate not documented",
-        },
+        "rules": SEPSIS_RULES,
     },
     "surgical_safety": {
         "label": "WHO Surgical Safety Checklist",
@@ -163,10 +217,7 @@ PATHWAYS: dict[str, dict[str, Any]] = {
         "trigger": "Safety_Check",
         "activities": ["Safety_Check"],
         "evaluate": evaluate_surgical_safety,
-        "deviation_labels": {
-            "safety_step_missing": "A checklist step (Sign-In / Time-Out / Sign-Out) is missing",
-            "safety_check_flagged": "A checklist step was flagged incomplete",
-        },
+        "rules": SURGICAL_SAFETY_RULES,
     },
     "home_hospital": {
         "label": "Home Hospital virtual-ward pathway (AHCAH)",
@@ -183,13 +234,13 @@ PATHWAYS: dict[str, dict[str, Any]] = {
             "home-discharge",
         ],
         "evaluate": evaluate_home_hospital,
-        "deviation_labels": {
-            "activation_beyond_sla": "Referral-to-activation beyond the 24-hour SLA",
-            "visit_cadence_below_floor": "In-person visits below the 2-per-day waiver floor",
-            "escalation_unresolved": "An escalation was opened but never resolved",
-            "escalation_response_late": "Escalation response beyond the 30-minute floor",
-        },
+        "rules": HOME_HOSPITAL_RULES,
     },
 }
 
+for _spec in PATHWAYS.values():
+    _spec["evaluate_matrix"] = compile_rules(_spec["rules"])
+    _spec["deviation_labels"] = rule_labels(_spec["rules"])
+
 EvaluatorFn = Callable[[dict[str, Any], dict[str, int], pd.DataFrame], list[str]]
+MatrixEvaluatorFn = Callable[[CaseMatrix], dict[str, np.ndarray]]
@@ -10,14 +10,32 @@ Two views:
 - synchronization: at events that touch several object types, how long each
   object type waited (since its own previous event) for the shared step — the
   signal that says whether a bottleneck is (e.g.) patient-side or bed-side.
+
+Hand-offs default to the native engine: every object type at once from the E2O
+relations (`app.ocdfg.lifecycle_rows` — one sort by (type, object, time), one
+successor shift) with count / median / p90 / mean per (type, source, target)
+from one grouping of the pairs. The per-type pm4py flattening loop is kept as
+the reference and fallback (`engine="pm4py"` / `arena_performance_engine`);
+both return identical rows.
+
+Exact medians and p90s hold every duration in memory. With
+`quantiles="approximate"` (automatic past `arena_performance_exact_max_events`)
+both views stream the log in object partitions into mergeable quantile sketches
+(`app.sketches`) per (type, source, target) and per (activity, type): counts and
+means stay exact, medians and p90s are within the reported relative error.
 """
 
 from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
+from app import encoding, flattening, ocdfg
 from app.config import get_settings
 from app.ocel_loader import read_ocel
+from app.sketches import SketchSet
 
 try:
     import pm4py  # type: ignore
@@ -36,26 +54,114 @@ def analyze(
     object_types: list[str] | None = None,
     top: int = 25,
     filters: "list[BaseFilter] | None" = None,
+    engine: str | None = None,
+    quantiles: str | None = None,
 ) -> dict[str, Any]:
+    """Hand-offs and synchronization waits; `engine` ("native" / "pm4py")
+    overrides `arena_performance_engine` for exact hand-offs, `quantiles`
+    ("exact" / "approximate") the size-based choice of sketched quantiles."""
     from app.filters import BaseFilter, apply_filters  # noqa: F401
 
     ocel = read_ocel(path)
     if filters:
         ocel = apply_filters(ocel, filters)
-    ceiling = get_settings().arena_max_handoff_hours * 3600
+    settings = get_settings()
+    ceiling = settings.arena_max_handoff_hours * 3600
+    if quantiles is None:
+        quantiles = "approximate" if len(ocel.events) > settings.arena_performance_exact_max_events else "exact"
+    if quantiles == "approximate":
+        accuracy = settings.arena_quantile_relative_accuracy
+        partition = settings.arena_performance_partition_objects
+        return {
+            "handoffs": _handoffs_sketched(ocel, object_types, top, ceiling, accuracy, partition),
+            "synchronization": _synchronization_sketched(ocel, object_types, top, ceiling, accuracy, partition),
+            "quantiles": {"mode": "approximate", "relative_error": accuracy},
+        }
+    handoffs = _handoffs_pm4py if (engine or settings.arena_performance_engine) == "pm4py" else _handoffs_native
     return {
-        "handoffs": _handoff_durations(ocel, object_types, top, ceiling),
+        "handoffs": handoffs(ocel, object_types, top, ceiling),
         "synchronization": _synchronization(ocel, object_types, top, ceiling),
+        "quantiles": {"mode": "exact", "relative_error": 0.0},
     }
 
 
-def _handoff_durations(ocel, object_types: list[str] | None, top: int, ceiling: int) -> list[dict[str, Any]]:
+def _handoffs_native(ocel, object_types: list[str] | None, top: int, ceiling: int) -> list[dict[str, Any]]:
+    types = [ot for ot in ocdfg.object_types(ocel) if object_types is None or ot in object_types]
+    if not types:
+        return []
+    # Objects sorted by id: the pm4py path sorts each flattened frame by case, and
+    # mean_sec sums each pair's durations in that order.
+    lifecycle = ocdfg.lifecycle_rows(ocel, types, sort_objects=True)
+    activities: list[str] = lifecycle.attrs["activities"]
+    idx = np.flatnonzero(ocdfg.successor_mask(lifecycle))
+    times = lifecycle["time"].to_numpy()
+    delta = (times[idx + 1] - times[idx]) / 1e9
+    keep = (delta >= 0) & (delta <= ceiling)
+    idx, delta = idx[keep], delta[keep]
+    if not len(idx):
+        return []
+
+    act = lifecycle["act"].to_numpy().astype(np.int64)
+    n_act = len(activities)
+    key = (lifecycle["type"].to_numpy()[idx].astype(np.int64) * n_act + act[idx]) * n_act + act[idx + 1]
+    in_order = np.argsort(key, kind="stable")   # each pair's durations in lifecycle order
+    by_value = np.lexsort((delta, key))         # ... and ascending, for the order statistics
+    keys = key[in_order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    ordered = delta[by_value]
+    median = _quantile_sorted(ordered, starts, counts, 0.5)
+    p90 = _quantile_sorted(ordered, starts, counts, 0.9)
+    durations = delta[in_order]
+
+    rows: list[dict[str, Any]] = []
+    for k, s, n, med, q90 in zip(keys[starts], starts, counts, median, p90):
+        pair, dst = divmod(int(k), n_act)
+        t, src = divmod(pair, n_act)
+        rows.append({
+            "object_type": types[t],
+            "source": activities[src],
+            "target": activities[dst],
+            "count": int(n),
+            "median_sec": round(float(med), 1),
+            "p90_sec": round(float(q90), 1),
+            # np.sum over the contiguous slice: the same pairwise summation as
+            # the pandas mean of the pm4py path (a running sum can differ by an ulp).
+            "mean_sec": round(float(np.sum(durations[s:s + n]) / n), 1),
+            "_order": (t, activities[src], activities[dst]),
+        })
+    rows.sort(key=lambda r: r.pop("_order"))
+    rows.sort(key=lambda r: -r["median_sec"])
+    return rows[:top]
+
+
+def _quantile_sorted(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Per-group `Series.quantile(q)` (linear interpolation) of groups stored
+    ascending and contiguously in `values` — numpy's formula, bit for bit."""
+    if q == 0.5:
+        # Series.median: the middle value, or the mean of the middle two.
+        lo = values[starts + (counts - 1) // 2]
+        hi = values[starts + counts // 2]
+        return np.where(counts % 2 == 1, lo, (lo + hi) / 2)
+    virtual = (counts - 1) * (q * 100 / 100)
+    below = np.floor(virtual)
+    gamma = virtual - below
+    below = below.astype(np.int64)
+    a = values[starts + below]
+    b = values[starts + np.minimum(below + 1, counts - 1)]
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
+def _handoffs_pm4py(ocel, object_types: list[str] | None, top: int, ceiling: int) -> list[dict[str, Any]]:
+    """The per-type reference: flatten each type, shift per case, and summarise
+    each (source, target) series in Python."""
     ots = [ot for ot in pm4py.ocel_get_object_types(ocel) if object_types is None or ot in object_types]  # type: ignore[union-attr]
     rows: list[dict[str, Any]] = []
 
     for ot in ots:
         try:
-            flat = pm4py.ocel_flattening(ocel, ot)  # type: ignore[union-attr]
+            flat = flattening.flatten(ocel, ot)
         except Exception:
             continue
         if flat is None or len(flat) == 0:
@@ -126,3 +232,97 @@ def _synchronization(ocel, object_types: list[str] | None, top: int, ceiling: in
 
     rows.sort(key=lambda r: -r["median_wait_sec"])
     return rows[:top]
+
+
+def _handoffs_sketched(
+    ocel, object_types: list[str] | None, top: int, ceiling: int, accuracy: float, partition: int
+) -> list[dict[str, Any]]:
+    """`_handoffs_native` over object partitions, durations folded into one
+    sketch per (type, source, target) instead of kept."""
+    types = [ot for ot in ocdfg.object_types(ocel) if object_types is None or ot in object_types]
+    if not types:
+        return []
+    sketches = SketchSet(accuracy)
+    activities: list[str] = []
+    for lifecycle in ocdfg.lifecycle_partitions(ocel, types, partition):
+        activities = lifecycle.attrs["activities"]
+        n_act = len(activities)
+        idx = np.flatnonzero(ocdfg.successor_mask(lifecycle))
+        times = lifecycle["time"].to_numpy()
+        delta = (times[idx + 1] - times[idx]) / 1e9
+        keep = (delta >= 0) & (delta <= ceiling)
+        idx = idx[keep]
+        act = lifecycle["act"].to_numpy().astype(np.int64)
+        key = (lifecycle["type"].to_numpy()[idx].astype(np.int64) * n_act + act[idx]) * n_act + act[idx + 1]
+        sketches.add(key, delta[keep])
+
+    rows: list[dict[str, Any]] = []
+    n_act = len(activities)
+    for k, sketch in sketches.items():
+        pair, dst = divmod(k, n_act)
+        t, src = divmod(pair, n_act)
+        rows.append({
+            "object_type": types[t],
+            "source": activities[src],
+            "target": activities[dst],
+            "count": sketch.count,
+            "median_sec": round(sketch.quantile(0.5), 1),
+            "p90_sec": round(sketch.quantile(0.9), 1),
+            "mean_sec": round(sketch.mean(), 1),
+            "_order": (t, activities[src], activities[dst]),
+        })
+    rows.sort(key=lambda r: r.pop("_order"))
+    rows.sort(key=lambda r: -r["median_sec"])
+    return rows[:top]
+
+
+def _synchronization_sketched(
+    ocel, object_types: list[str] | None, top: int, ceiling: int, accuracy: float, partition: int
+) -> list[dict[str, Any]]:
+    """`_synchronization` over object partitions, waits folded into one sketch
+    per (activity, object type) instead of kept. The per-row codes are built
+    once for the whole log; waits and sort buffers exist for one partition at a
+    time (`ocdfg.partition_rows`)."""
+    events = ocel.events
+    relations = ocel.relations[[OCEL_EID, OCEL_OID, OCEL_TYPE]]
+    pos = encoding.positions(events[OCEL_EID], relations[OCEL_EID])
+    hit = pos >= 0
+    pos = pos[hit]
+    relations = relations[hit]
+
+    type_codes, types = pd.factorize(relations[OCEL_TYPE], sort=False)
+    # events that genuinely synchronise ≥2 object types
+    event_types = np.unique(pos.astype(np.int64) * max(len(types), 1) + type_codes)
+    multi = np.bincount(event_types // max(len(types), 1), minlength=len(events)) >= 2
+    if not multi.any():
+        return []
+    wanted = np.array([object_types is None or str(t) in object_types for t in types], dtype=bool)
+
+    act_codes, activities = pd.factorize(events[OCEL_ACTIVITY], sort=False)
+    oid_codes, _ = pd.factorize(relations[OCEL_OID], sort=True)
+    times = ocdfg.time_ns(events[OCEL_TIME])[pos]
+    n_types = len(types)
+    sketches = SketchSet(accuracy)
+    for rows in ocdfg.partition_rows(oid_codes, partition):
+        rows = rows[np.lexsort((rows, times[rows], oid_codes[rows]))]
+        oid, t = oid_codes[rows], times[rows]
+        wait = np.full(len(rows), -1.0)
+        same = oid[1:] == oid[:-1]
+        wait[1:][same] = (t[1:][same] - t[:-1][same]) / 1e9
+        p, ot = pos[rows], type_codes[rows]
+        keep = multi[p] & (wait >= 0) & (wait <= ceiling) & wanted[ot]
+        sketches.add(act_codes[p[keep]].astype(np.int64) * n_types + ot[keep], wait[keep])
+
+    out: list[dict[str, Any]] = []
+    for k, sketch in sketches.items():
+        a, t = divmod(k, n_types)
+        out.append({
+            "activity": str(activities[a]),
+            "object_type": str(types[t]),
+            "count": sketch.count,
+            "median_wait_sec": round(sketch.quantile(0.5), 1),
+            "p90_wait_sec": round(sketch.quantile(0.9), 1),
+        })
+    out.sort(key=lambda r: (r["activity"], r["object_type"]))
+    out.sort(key=lambda r: -r["median_wait_sec"])
+    return out[:top]
@@ -13,12 +13,30 @@ pm4py shape note (verified empirically against 2.7.23.1):
                                      outer key = object_type
                                      inner key = activity label, value = bool
   Marking iterates directly over Place objects.
+
+By default (`arena_petrinet_engine = "variants"`) the per-type nets are mined
+from each object type's cached variant table (`app.variants`) with the settings
+pm4py's OC miner uses (IM, fall-throughs and the strict sequence cut disabled),
+and the double-arc flags are computed from the E2O relations directly — the same
+net without pm4py re-deriving the OC-DFG and re-projecting every trace. Nets
+are reused from `app.net_store` until the export changes.
+`engine="pm4py"` runs `discover_oc_petri_net` itself, the reference.
+
+With `sample`, the nets are mined from whole objects sampled per type
+(`app.sampling`) and the result is flagged `approximate` unless the sample
+covered every object: behaviour only unsampled objects show is missing. The
+double-arc flags always come from the full log's relations (one grouping, no
+mining): a sampled event loses its unsampled objects, so its single-object share
+would be skewed.
 """
 
 from __future__ import annotations
 
+import time
 from typing import Any
 
+from app import encoding, net_store, ocdfg, sampling
+from app.config import get_settings
 from app.ocel_loader import read_ocel
 
 try:
@@ -31,12 +49,56 @@ def _discover_ocpn(ocel: Any) -> Any:
     """Call pm4py's OC Petri-net miner, tolerating signature drift across the 2.7 line."""
     if pm4py is None:  # pragma: no cover - the route guards with _require_engine first
         raise RuntimeError("pm4py is unavailable in this sidecar build")
+    ocel = encoding.decoded(ocel)
     try:
         return pm4py.discover_oc_petri_net(ocel, noise_threshold=0.0)  # type: ignore[union-attr]
     except TypeError:
         return pm4py.discover_oc_petri_net(ocel)  # type: ignore[union-attr]
 
 
+DOUBLE_ARC_THRESHOLD = 0.8  # pm4py's default: < 80 % single-object events => variable arc
+
+
+def _discover_ocpn_variants(ocel: Any) -> dict[str, Any]:
+    """`discover_oc_petri_net(ocel, noise_threshold=0.0)`'s ``petri_nets`` and
+    ``double_arcs_on_activity``, mined from the variant tables. Object types
+    with no events get no net, as in pm4py."""
+    return {"petri_nets": _variant_nets(ocel), "double_arcs_on_activity": _double_arcs(ocel)}
+
+
+def _variant_nets(ocel: Any) -> dict[str, Any]:
+    if pm4py is None:  # pragma: no cover - the route guards with _require_engine first
+        raise RuntimeError("pm4py is unavailable in this sidecar build")
+    type_col = ocel.object_type_column
+    related = set(ocel.relations[type_col].unique())
+    petri_nets: dict[str, Any] = {}
+    for ot in sorted(str(t) for t in ocel.objects[type_col].unique() if t in related):
+        triple = net_store.petri_net(ocel, ot, noise_threshold=0.0, miner="ocpn")
+        if triple is not None:
+            petri_nets[ot] = triple
+    return petri_nets
+
+
+def _double_arcs(ocel: Any) -> dict[str, dict[str, bool]]:
+    """pm4py's ``double_arcs_on_activity`` from the E2O relations: per object
+    type, whether fewer than `DOUBLE_ARC_THRESHOLD` of an activity's events
+    involve exactly one object of the type."""
+    relations = ocel.relations
+    type_col, eid, oid, act = ocel.object_type_column, ocel.event_id_column, ocel.object_id_column, ocel.event_activity
+    events_per_activity = ocel.events[act].value_counts()
+    related = set(relations[type_col].unique())
+    double_arcs: dict[str, dict[str, bool]] = {}
+    for ot in sorted(str(t) for t in ocel.objects[type_col].unique() if t in related):
+        pairs = relations.loc[relations[type_col] == ot, [eid, oid, act]].drop_duplicates([eid, oid])
+        per_event = pairs.groupby([act, eid], observed=True, sort=False).size()
+        single = (per_event == 1).groupby(level=0, observed=True).sum()
+        double_arcs[ot] = {}
+        for a, n in single.items():
+            total = int(events_per_activity.get(a, 0))
+            double_arcs[ot][str(a)] = (n / total if total else 0) < DOUBLE_ARC_THRESHOLD
+    return double_arcs
+
+
 def _serialize_net(
     net: Any,
     im: Any,
@@ -88,8 +150,15 @@ def _serialize_net(
     }
 
 
-def discover(path: str, filters: list[Any] | None = None) -> dict[str, Any]:
-    """Discover and serialize the object-centric Petri net for the OCEL log at *path*.
+def discover(
+    path: str,
+    filters: list[Any] | None = None,
+    engine: str | None = None,
+    sample: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Discover and serialize the object-centric Petri net for the OCEL log at *path*;
+    `engine` ("variants" / "pm4py") overrides `arena_petrinet_engine`, and
+    `sample` (the fields of `SamplingSpec`) mines it from sampled objects.
 
     Returns a canonical JSON-serializable dict with three top-level keys:
       object_types  — sorted list of object type names present in the net
@@ -102,7 +171,20 @@ def discover(path: str, filters: list[Any] | None = None) -> dict[str, Any]:
 
         ocel = apply_filters(ocel, filters)
 
-    ocpn = _discover_ocpn(ocel)
+    reference = (engine or get_settings().arena_petrinet_engine) == "pm4py"
+    started = time.perf_counter()
+    if sample is None:
+        ocpn = _discover_ocpn(ocel) if reference else _discover_ocpn_variants(ocel)
+    else:
+        # A sample drops the unsampled objects of events it keeps, which would
+        # skew the single-object share; only the nets come from the sample.
+        nets, drawn = sampling.run(
+            sampling.SamplePlan(ocel, ocdfg.object_types(ocel), sample.get("seed", 0)),
+            lambda s: _discover_ocpn(s.ocel)["petri_nets"] if reference else _variant_nets(s.ocel),
+            max_objects=sample.get("max_objects"),
+            time_budget_ms=sample.get("time_budget_ms"),
+        )
+        ocpn = {"petri_nets": nets, "double_arcs_on_activity": _double_arcs(ocel)}
 
     # OCPetriNet is dict-like (supports __getitem__ / keys() / items()) but is
     # NOT a plain dict — ocpn.get() is also available via the __legacy_dict mixin.
@@ -119,7 +201,7 @@ def discover(path: str, filters: list[Any] | None = None) -> dict[str, Any]:
             continue
         nets.append(_serialize_net(net, im, fm, str(ot), double_arcs))
 
-    return {
+    result = {
         "object_types": sorted(n["object_type"] for n in nets),
         "nets": nets,
         "stats": {
@@ -129,3 +211,10 @@ def discover(path: str, filters: list[Any] | None = None) -> dict[str, Any]:
             "arcs": sum(len(n["arcs"]) for n in nets),
         },
     }
+    if sample is not None:
+        result["approximate"] = not drawn.complete
+        result["sampling"] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "by_object_type": drawn.describe(),
+        }
+    return result
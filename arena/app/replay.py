@@ -6,6 +6,13 @@ pragmatic, well-supported cousin of alignment fitness in pm4py; it measures how
 well the real behavior fits a structured control-flow model — a stronger signal
 than the copilot's DFG edge-set recall, and the honest name for what it computes.
 
+Mining and replay both run on the type's variant table (`app.variants`): each
+distinct activity sequence is replayed once and weighted by its multiplicity, so
+the cost follows the number of variants, not cases, and the fitness numbers are
+pm4py's own. Mined nets are reused from `app.net_store` across calls (and
+processes) until the export changes. `engine="pm4py"` (or `arena_replay_engine`)
+mines and replays the flattened frame directly — the reference path.
+
 Clean-room (see arena/CLEAN-ROOM.md). Read-only, PHI-free.
 """
 
@@ -13,6 +20,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from app import flattening, net_store, variants
 from app.config import get_settings
 from app.ocel_loader import read_ocel
 
@@ -26,8 +34,10 @@ def fitness(
     path: str,
     object_types: list[str] | None = None,
     filters: list[Any] | None = None,
+    engine: str | None = None,
 ) -> dict[str, Any]:
-    """Token-based replay fitness per object type + a min/mean aggregate.
+    """Token-based replay fitness per object type + a min/mean aggregate;
+    `engine` ("variants" / "pm4py") overrides `arena_replay_engine`.
 
     Returns a dict with:
       - by_object_type: list of dicts with object_type, fitness (0.0–1.0),
@@ -56,18 +66,14 @@ def fitness(
     ots = [ot for ot in all_ots if object_types is None or ot in object_types]
     ots = ots[: settings.arena_max_object_types]
 
+    score = _fitness_pm4py if (engine or settings.arena_replay_engine) == "pm4py" else _fitness_variants
     rows: list[dict[str, Any]] = []
     for ot in ots:
         try:
-            flat = pm4py.ocel_flattening(ocel, ot)  # type: ignore[union-attr]
+            result = score(ocel, ot)
         except Exception:
             continue
-        if flat is None or len(flat) == 0:
-            continue
-        try:
-            net, im, fm = pm4py.discover_petri_net_inductive(flat, noise_threshold=0.0)  # type: ignore[union-attr]
-            result = pm4py.fitness_token_based_replay(flat, net, im, fm)  # type: ignore[union-attr]
-        except Exception:
+        if result is None:
             continue
         rows.append({
             "object_type": str(ot),
@@ -81,3 +87,18 @@ def fitness(
         "min_fitness": round(min(fitnesses), 4) if fitnesses else None,
         "mean_fitness": round(sum(fitnesses) / len(fitnesses), 4) if fitnesses else None,
     }
+
+
+def _fitness_variants(ocel: Any, ot: str) -> dict[str, float] | None:
+    triple = net_store.petri_net(ocel, ot, noise_threshold=0.0)
+    if triple is None:
+        return None
+    return variants.token_replay_fitness(flattening.variants(ocel, ot), *triple)
+
+
+def _fitness_pm4py(ocel: Any, ot: str) -> dict[str, float] | None:
+    flat = flattening.flatten(ocel, ot)
+    if flat is None or len(flat) == 0:
+        return None
+    net, im, fm = pm4py.discover_petri_net_inductive(flat, noise_threshold=0.0)  # type: ignore[union-attr]
+    return pm4py.fitness_token_based_replay(flat, net, im, fm)  # type: ignore[union-attr]
@@ -0,0 +1,104 @@
+"""Combined analysis surface: POST /analyze/batch runs several analyses over one
+`OcelSource` + filter set in a single call.
+
+The Study UI wants discover, performance, conformance and replay for the same
+log and preset; as four calls each one re-resolved, re-read and re-filtered it.
+A batch resolves the source, reads it and applies the filter pipeline once, lends
+the filtered log to every analysis (`ocel_loader.lend`), and runs the analyses
+side by side on the executor's fan-out threads (`arena_batch_workers`, shared by
+all batches in the process) — they only read the shared log.
+Each analysis' params are validated up front by its own request model; a failing
+analysis is reported in its slot without failing the batch.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+from pydantic import ValidationError
+
+from app import executor
+from app.filters import BaseFilter, apply_filters, parse_filters
+from app.models import BatchRequest, BatchResponse
+from app.ocel_loader import PM4PY_AVAILABLE, OcelUnavailable, lend, read_ocel, resolve_ocel_path
+from app.routers.jobs import KINDS
+
+router = APIRouter(tags=["arena"])
+
+_SHARED = ("ocel_path", "ocel", "filters")
+
+
+@router.post("/analyze/batch", response_model=BatchResponse)
+async def analyze_batch(req: BatchRequest) -> BatchResponse:
+    if not PM4PY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
+    try:
+        filters = parse_filters(req.filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    planned: list[tuple[str, str, tuple]] = []
+    for i, spec in enumerate(req.analyses):
+        label = spec.id or spec.kind
+        shared = [k for k in _SHARED if k in spec.params]
+        if shared:
+            raise HTTPException(status_code=422, detail=f"analyses[{i}] ({label}): {', '.join(shared)} are set on the batch, not per analysis")
+        kind = KINDS[spec.kind]
+        try:
+            spec_req = kind.model.model_validate(spec.params)
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=f"analyses[{i}] ({label}): {exc.errors(include_url=False, include_context=False)}") from exc
+        planned.append((label, spec.kind, kind.args(spec_req)))
+
+    try:
+        result = await executor.run("analyze/batch", batch_job, req.ocel_path, req.ocel, filters, planned)
+        return BatchResponse(**result)
+    except OcelUnavailable as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def _run_one(token: str, label: str, kind_name: str, args: tuple) -> dict[str, Any]:
+    kind = KINDS[kind_name]
+    spec_req, *rest = args
+    started = time.perf_counter()
+    try:
+        raw = kind.job(spec_req.model_copy(update={"ocel_path": token, "ocel": None}), *rest)
+        outcome: dict[str, Any] = {"status": "ok", "result": kind.shape(raw)}
+    except OcelUnavailable as exc:
+        outcome = {"status": "error", "error": {"status_code": 422, "detail": str(exc)}}
+    except Exception as exc:  # one failing analysis must not sink the batch
+        outcome = {"status": "error", "error": {"status_code": 500, "detail": f"{type(exc).__name__}: {exc}"}}
+    return {"id": label, "kind": kind_name, "seconds": round(time.perf_counter() - started, 4), **outcome}
+
+
+def batch_job(
+    ocel_path: str | None,
+    ocel_doc: dict[str, Any] | None,
+    filters: list[BaseFilter],
+    planned: list[tuple[str, str, tuple]],
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    with resolve_ocel_path(ocel_path, ocel_doc) as path:
+        ocel = read_ocel(path)
+        loaded = time.perf_counter()
+        if filters:
+            ocel = apply_filters(ocel, filters)
+        filtered = time.perf_counter()
+
+        with lend(ocel) as token:
+            pool = executor.fanout_pool()
+            futures = [pool.submit(_run_one, token, label, kind, args) for label, kind, args in planned]
+            results = [f.result() for f in futures]
+    done = time.perf_counter()
+
+    return {
+        "results": results,
+        "timings": {
+            "load": round(loaded - started, 4),
+            "filter": round(filtered - loaded, 4),
+            "analyses": round(done - filtered, 4),
+            "total": round(done - started, 4),
+        },
+    }
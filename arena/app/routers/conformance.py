@@ -1,15 +1,32 @@
 """Conformance surface (Part X §X.7): POST /conformance checks the OCEL log
 against the reference care pathways and returns ranked, observed deviations.
-Read-only, PHI-free (case ids are the de-identified OCEL object ids).
+POST /conformance/cases pages through (or streams as NDJSON) the per-case
+verdicts of a full result computed once and held server-side.
+POST /conformance/stream feeds event batches to a named online stream
+(`app.streaming`) and returns the deviations each batch newly shows; GET reads a
+stream's running totals and DELETE drops it. Read-only, PHI-free (case ids are
+the de-identified OCEL object ids).
 """
 
 from __future__ import annotations
 
+import json
+from typing import Iterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from app import conformance
-from app.filters import parse_filters
-from app.models import ConformanceRequest, PathwayConformance
+from app import conformance, executor, streaming
+from app.filters import BaseFilter, parse_filters
+from app.models import (
+    ConformanceCasePage,
+    ConformanceCasesRequest,
+    ConformanceRequest,
+    PathwayConformance,
+    StreamBatch,
+    StreamResponse,
+)
 from app.ocel_loader import PM4PY_AVAILABLE, OcelUnavailable, resolve_ocel_path
 
 router = APIRouter(tags=["arena"])
@@ -19,19 +36,111 @@ router = APIRouter(tags=["arena"])
 async def check_conformance(req: ConformanceRequest) -> list[PathwayConformance]:
     if not PM4PY_AVAILABLE:
         raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
+    args = conformance_args(req)
+    try:
+        results = await executor.run("conformance", conformance_job, *args)
+        return [PathwayConformance(**result) for result in results]
+    except OcelUnavailable as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def conformance_args(req: ConformanceRequest) -> tuple:
     try:
-        filters = parse_filters(req.filters)
+        return (req, parse_filters(req.filters))
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def conformance_job(req: ConformanceRequest, filters: list[BaseFilter]) -> list[dict]:
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        return conformance.check(
+            path,
+            pathway_key=req.pathway,
+            filters=filters,
+            per_case=req.per_case,
+            case_ids=req.case_ids,
+        )
+
+
+DEFAULT_PAGE_SIZE = 500
+
+
+@router.post("/conformance/cases", response_model=ConformanceCasePage)
+async def conformance_cases(req: ConformanceCasesRequest):
+    if not PM4PY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
+    args = conformance_args(req)
+    query = conformance.cursor_query(req.pathway, args[1], req.case_ids, req.ocel)
     try:
-        with resolve_ocel_path(req.ocel_path, req.ocel) as path:
-            results = conformance.check(
-                path,
-                pathway_key=req.pathway,
-                filters=filters,
-                per_case=req.per_case,
-                case_ids=req.case_ids,
-            )
-        return [PathwayConformance(**result) for result in results]
+        # A cursor for another query is refused before the log is evaluated.
+        cursor = conformance.decode_cursor(req.cursor, query)
+        fp, results = await executor.run("conformance", cases_job, *args)
+        offset = conformance.resume_offset(cursor, fp)
     except OcelUnavailable as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except conformance.CursorError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+    aggregates = [{**r, "case_results": []} for r in results]
+    total = conformance.count_cases(results, req.case_ids)
+    if req.format == "ndjson":
+        return StreamingResponse(
+            _ndjson(fp, query, req, results, aggregates, offset, total), media_type="application/x-ndjson"
+        )
+    rows, next_offset = conformance.page(results, offset, req.page_size or DEFAULT_PAGE_SIZE, req.case_ids)
+    return ConformanceCasePage(
+        pathways=[PathwayConformance(**a) for a in aggregates],
+        case_results=rows,
+        total_cases=total,
+        next_cursor=None if next_offset is None else conformance.encode_cursor(fp, query, next_offset),
+    )
+
+
+def cases_job(req: ConformanceRequest, filters: list[BaseFilter]) -> tuple:
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        return conformance.evaluated(path, pathway_key=req.pathway, filters=filters)
+
+
+def _ndjson(fp, query: str, req: ConformanceCasesRequest, results, aggregates, offset: int, total: int) -> Iterator[str]:
+    """One line per pathway aggregate, one per case, then an `end` line carrying
+    the cursor to resume from when `page_size` cut the stream short."""
+    for aggregate in aggregates:
+        yield json.dumps({"kind": "pathway", **PathwayConformance(**aggregate).model_dump()}) + "\n"
+    sent = 0
+    next_cursor = None
+    for row in conformance.iter_cases(results, offset, req.case_ids):
+        if req.page_size is not None and sent == req.page_size:
+            next_cursor = conformance.encode_cursor(fp, query, offset + sent)
+            break
+        yield json.dumps({"kind": "case", **row}) + "\n"
+        sent += 1
+    yield json.dumps({"kind": "end", "total_cases": total, "next_cursor": next_cursor}) + "\n"
+
+
+@router.post("/conformance/stream", response_model=StreamResponse)
+async def ingest_stream(batch: StreamBatch) -> StreamResponse:
+    try:
+        engine = streaming.open_stream(batch.stream)
+    except streaming.StreamLimit as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    try:
+        out = await run_in_threadpool(engine.ingest, batch.events, batch.objects, batch.close, batch.flush)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return StreamResponse(**out, stats=engine.stats())
+
+
+@router.get("/conformance/stream/{stream}")
+async def stream_stats(stream: str) -> dict:
+    engine = streaming.get_stream(stream)
+    if engine is None:
+        raise HTTPException(status_code=404, detail=f"no conformance stream {stream!r}")
+    return engine.stats()
+
+
+@router.delete("/conformance/stream/{stream}")
+async def drop_stream(stream: str) -> dict:
+    engine = streaming.drop_stream(stream)
+    if engine is None:
+        raise HTTPException(status_code=404, detail=f"no conformance stream {stream!r}")
+    return engine.stats()
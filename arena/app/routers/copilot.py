@@ -2,8 +2,9 @@
 
 POST /copilot/model-fitness conformance-checks a copilot-proposed object-centric DFG
 against the OCEL log and returns its fitness/precision so the orchestrator can WITHHOLD
-any map below the floor. This is the only sidecar copilot endpoint: the LLM generation
-itself lives Laravel-side (behind ARENA_AI_ENABLED); the sidecar owns the pm4py
+any map below the floor; POST /copilot/fitness/batch scores N candidate models against
+one log in one call, building each object type's real DFG once for all of them. These
+are the only sidecar copilot endpoints: the LLM generation itself lives Laravel-side (behind ARENA_AI_ENABLED); the sidecar owns the pm4py
 adjudication because that is where the log and the miner are.
 
 Gated by `arena_ai_enabled` INDEPENDENTLY of the deterministic panes — a 404 when off,
@@ -14,30 +15,71 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
 
-from app import copilot
+from app import copilot, executor
 from app.config import get_settings
-from app.models import ModelFitnessRequest, ModelFitnessResponse
+from app.models import ModelFitnessBatchRequest, ModelFitnessBatchResponse, ModelFitnessRequest, ModelFitnessResponse
 from app.ocel_loader import PM4PY_AVAILABLE, OcelUnavailable, resolve_ocel_path
 
 router = APIRouter(tags=["arena-copilot"])
 
 
-@router.post("/copilot/model-fitness", response_model=ModelFitnessResponse)
-async def model_fitness(req: ModelFitnessRequest) -> ModelFitnessResponse:
+def _require_copilot() -> None:
     if not get_settings().arena_ai_enabled:
         # Invisible when the AI author is off — the deterministic Arena is unaffected.
         raise HTTPException(status_code=404, detail="Arena AI copilot is disabled")
     if not PM4PY_AVAILABLE:
         raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
+
+
+@router.post("/copilot/model-fitness", response_model=ModelFitnessResponse)
+async def model_fitness(req: ModelFitnessRequest) -> ModelFitnessResponse:
+    _require_copilot()
     try:
-        edges = [edge.model_dump() for edge in req.proposed_edges]
-        with resolve_ocel_path(req.ocel_path, req.ocel) as path:
-            result = copilot.model_fitness(path, edges, fitness_floor=req.fitness_floor)
-            cross = copilot.structural_cross_check(
-                path, edges, structural_floor=get_settings().arena_ai_structural_floor
-            )
-        result["structural_fitness_by_type"] = cross["structural_fitness_by_type"]
-        result["structural_warnings"] = cross["structural_warnings"]
+        result = await executor.run("copilot/model-fitness", model_fitness_job, req)
         return ModelFitnessResponse(**result)
     except OcelUnavailable as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def model_fitness_job(req: ModelFitnessRequest) -> dict:
+    edges = [edge.model_dump() for edge in req.proposed_edges]
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        result = copilot.model_fitness(path, edges, fitness_floor=req.fitness_floor)
+        cross = copilot.structural_cross_check(
+            path, edges, structural_floor=get_settings().arena_ai_structural_floor
+        )
+    result["structural_fitness_by_type"] = cross["structural_fitness_by_type"]
+    result["structural_warnings"] = cross["structural_warnings"]
+    return result
+
+
+@router.post("/copilot/fitness/batch", response_model=ModelFitnessBatchResponse)
+async def model_fitness_batch(req: ModelFitnessBatchRequest) -> ModelFitnessBatchResponse:
+    _require_copilot()
+    batch_args(req)
+    try:
+        result = await executor.run("copilot/fitness/batch", model_fitness_batch_job, req)
+        return ModelFitnessBatchResponse(**result)
+    except OcelUnavailable as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def batch_args(req: ModelFitnessBatchRequest) -> tuple:
+    limit = get_settings().arena_ai_batch_max_proposals
+    if len(req.proposals) > limit:
+        raise HTTPException(status_code=422, detail=f"{len(req.proposals)} proposals exceed the batch limit of {limit}")
+    return (req,)
+
+
+def model_fitness_batch_job(req: ModelFitnessBatchRequest) -> dict:
+    """Every proposal is scored against the same real DFGs and replayed nets; a
+    proposal's verdict equals what /copilot/model-fitness returns for it alone."""
+    settings = get_settings()
+    proposals = [[edge.model_dump() for edge in p.proposed_edges] for p in req.proposals]
+    floors = [p.fitness_floor if p.fitness_floor is not None else req.fitness_floor for p in req.proposals]
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        verdicts = copilot.model_fitness_batch(path, proposals, fitness_floor=floors)
+        crosses = copilot.structural_cross_check_batch(path, proposals, structural_floor=settings.arena_ai_structural_floor)
+    for i, (p, verdict, cross) in enumerate(zip(req.proposals, verdicts, crosses)):
+        verdict.update(cross, id=p.id if p.id is not None else str(i))
+    return {"verdicts": verdicts}
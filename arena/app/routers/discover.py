@@ -1,16 +1,18 @@
 """The X1 discovery surface: /ocel/summary and /discover. Both read a
 de-identified OCEL 2.0 log (inline doc, explicit path, or the configured export)
 and return canon-shaped JSON. Stateless and read-only — no PHI, no prod.* access.
-Errors degrade to a clean 503/422, never a 500 stack trace.
+Errors degrade to a clean 503/422, never a 500 stack trace. Mining runs on the
+bounded executor (`app.executor`), never on the event loop.
 """
 
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app import discovery, petrinet
+from app import discovery, executor, petrinet
 from app.config import get_settings
-from app.filters import parse_filters
+from app.filters import BaseFilter, parse_filters
 from app.models import DiscoverRequest, DiscoverResponse, OcelSource, PetriNetRequest, PetriNetResponse, SummaryResponse
 from app.ocel_loader import PM4PY_AVAILABLE, OcelUnavailable, resolve_ocel_path
 
@@ -26,8 +28,9 @@ def _require_engine() -> None:
 async def ocel_summary(src: OcelSource) -> SummaryResponse:
     _require_engine()
     try:
-        with resolve_ocel_path(src.ocel_path, src.ocel) as path:
-            return SummaryResponse(**discovery.summarize(path))
+        # Off the loop but outside the mining lanes: a summary never queues
+        # behind heavy discoveries.
+        return SummaryResponse(**await run_in_threadpool(summary_job, src))
     except OcelUnavailable as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
@@ -35,22 +38,9 @@ async def ocel_summary(src: OcelSource) -> SummaryResponse:
 @router.post("/discover", response_model=DiscoverResponse)
 async def discover_map(req: DiscoverRequest) -> DiscoverResponse:
     _require_engine()
-    settings = get_settings()
-    object_types = req.object_types
-    if object_types is not None:
-        object_types = object_types[: settings.arena_max_object_types]
-    try:
-        filters = parse_filters(req.filters)
-    except ValueError as exc:
-        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    args = discover_args(req)
     try:
-        with resolve_ocel_path(req.ocel_path, req.ocel) as path:
-            result = discovery.discover(
-                path,
-                object_types=object_types,
-                activity_min_freq=req.activity_min_freq,
-                filters=filters,
-            )
+        result = await executor.run("discover", discover_job, *args)
         return DiscoverResponse(**result)
     except OcelUnavailable as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
@@ -59,13 +49,59 @@ async def discover_map(req: DiscoverRequest) -> DiscoverResponse:
 @router.post("/discover/petrinet", response_model=PetriNetResponse)
 async def discover_petrinet(req: PetriNetRequest) -> PetriNetResponse:
     _require_engine()
+    args = petrinet_args(req)
     try:
-        filters = parse_filters(req.filters)
-    except ValueError as exc:
-        raise HTTPException(status_code=422, detail=str(exc)) from exc
-    try:
-        with resolve_ocel_path(req.ocel_path, req.ocel) as path:
-            result = petrinet.discover(path, filters=filters)
+        result = await executor.run("discover/petrinet", petrinet_job, *args)
         return PetriNetResponse(**result)
     except OcelUnavailable as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+# --- executor jobs (module-level so a process pool can pickle them) ---
+# `*_args` validate a request into the job's arguments (422 on bad filters); the
+# job API (`routers/jobs.py`) submits the same pairs in the background.
+
+
+def _filters(req: OcelSource) -> list[BaseFilter]:
+    try:
+        return parse_filters(req.filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def summary_args(src: OcelSource) -> tuple:
+    return (src,)
+
+
+def discover_args(req: DiscoverRequest) -> tuple:
+    object_types = req.object_types
+    if object_types is not None:
+        object_types = object_types[: get_settings().arena_max_object_types]
+    return (req, object_types, _filters(req))
+
+
+def petrinet_args(req: PetriNetRequest) -> tuple:
+    return (req, _filters(req))
+
+
+def summary_job(src: OcelSource) -> dict:
+    with resolve_ocel_path(src.ocel_path, src.ocel) as path:
+        return discovery.summarize(path)
+
+
+def discover_job(req: DiscoverRequest, object_types: list[str] | None, filters: list[BaseFilter]) -> dict:
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        return discovery.discover(
+            path,
+            object_types=object_types,
+            activity_min_freq=req.activity_min_freq,
+            filters=filters,
+            engine=req.engine,
+            sample=req.sample.model_dump() if req.sample else None,
+            ladder=req.ladder,
+        )
+
+
+def petrinet_job(req: PetriNetRequest, filters: list[BaseFilter]) -> dict:
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        return petrinet.discover(path, filters=filters, sample=req.sample.model_dump() if req.sample else None)
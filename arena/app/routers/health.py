@@ -1,6 +1,8 @@
 """Health + readiness. Always 200 (liveness); reports pm4py availability and
 whether the configured OCEL export is present as info, so the Laravel admin
-surface can show 'sidecar up but no log yet' without the endpoint failing.
+surface can show 'sidecar up but no log yet' without the endpoint failing, plus
+the resident-cache (verdict-cache, net-store) hit/miss counters and the mining
+executor's lane occupancy.
 """
 
 from __future__ import annotations
@@ -9,9 +11,9 @@ import os
 
 from fastapi import APIRouter
 
-from app import __version__
+from app import __version__, executor, jobs, net_store, verdicts
 from app.config import get_settings
-from app.ocel_loader import PM4PY_AVAILABLE, PM4PY_VERSION
+from app.ocel_loader import PM4PY_AVAILABLE, PM4PY_VERSION, cache_stats
 
 router = APIRouter(tags=["health"])
 
@@ -29,4 +31,7 @@ async def health() -> dict:
             "pm4py_version": PM4PY_VERSION,
         },
         "ocel_export_present": os.path.isfile(settings.arena_ocel_export_path),
+        "cache": {**cache_stats(), "verdicts": verdicts.stats(), "net_store": net_store.stats()},
+        "executor": executor.get_executor().stats(),
+        "jobs": jobs.get_store().stats(),
     }
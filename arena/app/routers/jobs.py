@@ -0,0 +1,125 @@
+"""Background job surface: POST /jobs, GET /jobs/{id}, GET /jobs/{id}/result.
+
+Any synchronous analysis can be submitted as a job — `kind` names the endpoint and
+`request` carries its usual body, validated by the same request model and
+argument checks (422 before anything is queued). The result, once the job has
+succeeded, is exactly the synchronous endpoint's response body.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app import jobs
+from app.config import get_settings
+from app.executor import get_executor
+from app.models import (
+    ConformanceRequest,
+    DiscoverRequest,
+    DiscoverResponse,
+    JobStatus,
+    JobSubmitRequest,
+    ModelFitnessBatchRequest,
+    ModelFitnessBatchResponse,
+    ModelFitnessRequest,
+    ModelFitnessResponse,
+    OcelSource,
+    PathwayConformance,
+    PerformanceRequest,
+    PerformanceResponse,
+    PetriNetRequest,
+    PetriNetResponse,
+    ReplayRequest,
+    ReplayResponse,
+    SummaryResponse,
+)
+from app.ocel_loader import PM4PY_AVAILABLE
+from app.routers import conformance, copilot, discover, performance, replay
+
+router = APIRouter(tags=["arena-jobs"])
+
+
+class _Kind:
+    """How to validate, run and shape one job kind."""
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        args: Callable[[Any], tuple],
+        job: Callable[..., Any],
+        response: Any,
+    ) -> None:
+        self.model = model
+        self.args = args
+        self.job = job
+        self.response = TypeAdapter(response)
+
+    def shape(self, raw: Any) -> Any:
+        return self.response.dump_python(self.response.validate_python(raw), mode="json")
+
+
+KINDS: dict[str, _Kind] = {
+    "ocel/summary": _Kind(OcelSource, discover.summary_args, discover.summary_job, SummaryResponse),
+    "discover": _Kind(DiscoverRequest, discover.discover_args, discover.discover_job, DiscoverResponse),
+    "discover/petrinet": _Kind(PetriNetRequest, discover.petrinet_args, discover.petrinet_job, PetriNetResponse),
+    "conformance": _Kind(ConformanceRequest, conformance.conformance_args, conformance.conformance_job, list[PathwayConformance]),
+    "performance": _Kind(PerformanceRequest, performance.performance_args, performance.performance_job, PerformanceResponse),
+    "replay": _Kind(ReplayRequest, replay.replay_args, replay.replay_job, ReplayResponse),
+    "copilot/model-fitness": _Kind(ModelFitnessRequest, lambda req: (req,), copilot.model_fitness_job, ModelFitnessResponse),
+    "copilot/fitness/batch": _Kind(ModelFitnessBatchRequest, copilot.batch_args, copilot.model_fitness_batch_job, ModelFitnessBatchResponse),
+}
+
+
+def _status(job: jobs.Job, deduplicated: bool = False) -> JobStatus:
+    expected = get_executor().estimate(jobs.JOBS_LANE)
+    return JobStatus(**job.describe(expected), deduplicated=deduplicated, result_url=f"/jobs/{job.id}/result")
+
+
+def _job_or_404(job_id: str) -> jobs.Job:
+    job = jobs.get_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"no job '{job_id}' (unknown or expired)")
+    return job
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(sub: JobSubmitRequest, response: Response) -> JobStatus:
+    if sub.kind.startswith("copilot/") and not get_settings().arena_ai_enabled:
+        raise HTTPException(status_code=404, detail="Arena AI copilot is disabled")
+    if sub.kind != "ocel/summary" and not PM4PY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
+
+    kind = KINDS[sub.kind]
+    try:
+        req = kind.model.model_validate(sub.request)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False)) from exc
+    args = kind.args(req)
+
+    rhash = jobs.request_hash(sub.kind, req.model_dump(mode="json"), getattr(req, "ocel_path", None))
+    job, deduplicated = jobs.get_store().submit(sub.kind, rhash, kind.job, args, kind.shape)
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return _status(job, deduplicated)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str) -> JobStatus:
+    return _status(_job_or_404(job_id))
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str, response: Response) -> Any:
+    job = _job_or_404(job_id)
+    if job.status == jobs.SUCCEEDED:
+        return job.result
+    if job.status == jobs.FAILED:
+        error = job.error or {"status_code": 500, "detail": "job failed"}
+        raise HTTPException(status_code=error["status_code"], detail=error["detail"])
+    # Not finished: 202 + the status, and when to look again.
+    expected = get_executor().estimate(jobs.JOBS_LANE)
+    response.status_code = 202
+    response.headers["Retry-After"] = str(max(1, int(expected or 1)))
+    return _status(job).model_dump()
@@ -7,9 +7,9 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
 
-from app import performance
+from app import executor, performance
 from app.config import get_settings
-from app.filters import parse_filters
+from app.filters import BaseFilter, parse_filters
 from app.models import PerformanceRequest, PerformanceResponse
 from app.ocel_loader import PM4PY_AVAILABLE, OcelUnavailable, resolve_ocel_path
 
@@ -21,18 +21,27 @@ async def analyze_performance(req: PerformanceRequest) -> PerformanceResponse:
     if not PM4PY_AVAILABLE:
         raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
 
-    settings = get_settings()
+    args = performance_args(req)
+    try:
+        result = await executor.run("performance", performance_job, *args)
+        return PerformanceResponse(**result)
+    except OcelUnavailable as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def performance_args(req: PerformanceRequest) -> tuple:
     object_types = req.object_types
     if object_types is not None:
-        object_types = object_types[: settings.arena_max_object_types]
-
+        object_types = object_types[: get_settings().arena_max_object_types]
     try:
         filters = parse_filters(req.filters)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
-    try:
-        with resolve_ocel_path(req.ocel_path, req.ocel) as path:
-            result = performance.analyze(path, object_types=object_types, top=req.top, filters=filters)
-        return PerformanceResponse(**result)
-    except OcelUnavailable as exc:
-        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return (req, object_types, filters)
+
+
+def performance_job(req: PerformanceRequest, object_types: list[str] | None, filters: list[BaseFilter]) -> dict:
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        return performance.analyze(
+            path, object_types=object_types, top=req.top, filters=filters, engine=req.engine, quantiles=req.quantiles
+        )
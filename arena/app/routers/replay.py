@@ -0,0 +1,45 @@
+"""Replay surface (Part X, Phase XO.2): POST /replay returns per-object-type
+token-based replay fitness of the (filtered) log against its own inductive net.
+Read-only, PHI-free. Full-log replay is slow — the orchestrator usually submits
+it as a background job (`/jobs`, kind "replay") instead.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+
+from app import executor, replay
+from app.config import get_settings
+from app.filters import BaseFilter, parse_filters
+from app.models import ReplayRequest, ReplayResponse
+from app.ocel_loader import PM4PY_AVAILABLE, OcelUnavailable, resolve_ocel_path
+
+router = APIRouter(tags=["arena"])
+
+
+@router.post("/replay", response_model=ReplayResponse)
+async def replay_fitness(req: ReplayRequest) -> ReplayResponse:
+    if not PM4PY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="OCPM engine (pm4py) unavailable in this sidecar build")
+    args = replay_args(req)
+    try:
+        result = await executor.run("replay", replay_job, *args)
+        return ReplayResponse(**result)
+    except OcelUnavailable as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def replay_args(req: ReplayRequest) -> tuple:
+    object_types = req.object_types
+    if object_types is not None:
+        object_types = object_types[: get_settings().arena_max_object_types]
+    try:
+        filters = parse_filters(req.filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return (req, object_types, filters)
+
+
+def replay_job(req: ReplayRequest, object_types: list[str] | None, filters: list[BaseFilter]) -> dict:
+    with resolve_ocel_path(req.ocel_path, req.ocel) as path:
+        return replay.fitness(path, object_types=object_types, filters=filters)
@@ -0,0 +1,338 @@
+"""Declarative pathway rules, compiled to vectorized checks (Part X §X.7).
+
+A care pathway's standard is a list of rule specs — plain dicts with a `kind`
+discriminator, like the filter pipeline — instead of a hand-written evaluator:
+
+    {"kind": "present", "activity": "lactate_order", "code": "no_lactate"}
+    {"kind": "max_interval", "start": "sepsis_recognition",
+     "end": "antibiotic_administration", "minutes": 180, "code": "antibiotic_late"}
+
+Each rule states a requirement; its `code` is the deviation raised where a case
+violates it. `compile_rules` turns the list into one function over a
+`CaseMatrix` that returns a boolean column per code (in rule order), each one a
+NumPy expression over every case at once — no per-case Python.
+
+Kinds: `present`, `absent`, `order`, `max_interval`, `min_count`, `balanced`,
+`count_per_day`, `attribute_in`, `attribute_max`. Timestamps compare on first
+occurrences; a rule that needs an activity the case never shows (or shows only
+with an unknown time) is not violated, except `present` / `min_count`.
+
+Every rule also has an online form for the streaming engine (`app.streaming`):
+`observe` folds one event into a small per-case accumulator and `judge` is the
+scalar `violated` over one case's running state. `online` says when a violation
+can be reported before the case closes: "monotone" (more events never undo it),
+"ordered" (likewise, while the case's events arrive in time order) or "close"
+(it hinges on something that may still arrive).
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Literal, Protocol, Sequence
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from app.case_matrix import MISSING_NS, CaseMatrix, minutes_between
+
+
+class CaseFacts(Protocol):
+    """One case's running state, as the online engine keeps it — the scalar
+    counterpart of `CaseMatrix`."""
+
+    last_time: int
+
+    def first(self, activity: str) -> int: ...
+    def count(self, activity: str) -> int: ...
+    def has(self, activity: str) -> bool: ...
+
+
+def _minutes(a_ns: int, b_ns: int) -> float | None:
+    if a_ns == MISSING_NS or b_ns == MISSING_NS:
+        return None
+    return (b_ns - a_ns) / 1e9 / 60.0
+
+
+def _number(value: Any) -> float | None:
+    """`pd.to_numeric(..., errors="coerce")` for one value (None when not numeric)."""
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            return None
+    elif isinstance(value, (int, float)):
+        value = float(value)
+    else:
+        return None
+    return None if np.isnan(value) else value
+
+
+class BaseRule(ABC, BaseModel):
+    code: str
+    label: str | None = None
+
+    online: ClassVar[str] = "close"
+
+    @abstractmethod
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        """Boolean per case of `m`: True where the case breaks this rule."""
+
+    def observe(self, acc: Any, activity: str, attrs: dict[str, Any]) -> Any:
+        """Fold one event into this rule's per-case accumulator (None at first)."""
+        return acc
+
+    @abstractmethod
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        """`violated` for one case's running state; `columns` is every event
+        attribute seen so far (the log-wide columns the batch form checks)."""
+
+
+class PresentRule(BaseRule):
+    """`activity` must occur."""
+
+    kind: Literal["present"] = "present"
+    activity: str
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        return ~m.has(self.activity)
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        return not s.has(self.activity)
+
+
+class AbsentRule(BaseRule):
+    """`activity` must not occur."""
+
+    kind: Literal["absent"] = "absent"
+    activity: str
+
+    online: ClassVar[str] = "monotone"
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        return m.has(self.activity)
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        return s.has(self.activity)
+
+
+class OrderRule(BaseRule):
+    """`before` must first occur no later than `after` (when both occur)."""
+
+    kind: Literal["order"] = "order"
+    before: str
+    after: str
+
+    online: ClassVar[str] = "ordered"
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        before, after = m.first(self.before), m.first(self.after)
+        return (before != MISSING_NS) & (after != MISSING_NS) & (before > after)
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        before, after = s.first(self.before), s.first(self.after)
+        return before != MISSING_NS and after != MISSING_NS and before > after
+
+
+class MaxIntervalRule(BaseRule):
+    """At most `minutes` from the first `start` to the first `end` (when both occur)."""
+
+    kind: Literal["max_interval"] = "max_interval"
+    start: str
+    end: str
+    minutes: float
+
+    online: ClassVar[str] = "ordered"
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        return minutes_between(m.first(self.start), m.first(self.end)) > self.minutes
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        minutes = _minutes(s.first(self.start), s.first(self.end))
+        return minutes is not None and minutes > self.minutes
+
+
+class MinCountRule(BaseRule):
+    """`activity` must occur at least `count` times."""
+
+    kind: Literal["min_count"] = "min_count"
+    activity: str
+    count: int = Field(ge=1)
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        return m.count(self.activity) < self.count
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        return s.count(self.activity) < self.count
+
+
+class BalancedRule(BaseRule):
+    """Every `open` is matched by a `close` (no more opens than closes)."""
+
+    kind: Literal["balanced"] = "balanced"
+    open: str
+    close: str
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        return m.count(self.open) > m.count(self.close)
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        return s.count(self.open) > s.count(self.close)
+
+
+class AttributeMatch(BaseModel):
+    attribute: str
+    values: list[str]  # compared case-insensitively against the value's text
+
+
+def _matches(m: CaseMatrix, match: "AttributeMatch") -> np.ndarray:
+    """Per row: the attribute's text (lower-cased) is one of the values."""
+    wanted = {v.lower() for v in match.values}
+    return m.rows[match.attribute].astype(str).str.lower().isin(wanted).to_numpy()
+
+
+def _value_matches(value: Any, values: list[str]) -> bool:
+    """`_matches` for one event's value (None when the event lacks it)."""
+    return value is not None and str(value).lower() in {v.lower() for v in values}
+
+
+class CountPerDayRule(BaseRule):
+    """At least `per_day` × full elapsed days of `activity` between the first
+    `start` and the first `end` (or the case's last event when it has no `end`);
+    partial days are not judged. With `prefer`, only rows matching it count —
+    unless the case has none, in which case every row counts."""
+
+    kind: Literal["count_per_day"] = "count_per_day"
+    activity: str
+    per_day: int = Field(ge=1)
+    start: str
+    end: str | None = None
+    prefer: AttributeMatch | None = None
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        end = m.last_time if self.end is None else np.where(m.has(self.end), m.first(self.end), m.last_time)
+        elapsed = minutes_between(m.first(self.start), end)
+        full_days = np.where(np.isnan(elapsed), 0, np.floor_divide(np.nan_to_num(elapsed), 24 * 60))
+        counted = m.count(self.activity)
+        if self.prefer is not None and self.prefer.attribute in m.columns:
+            preferred = m.row_sum(m.row_mask(self.activity) & _matches(m, self.prefer))
+            counted = np.where(preferred > 0, preferred, counted)
+        return (full_days >= 1) & (counted < self.per_day * full_days)
+
+    def observe(self, acc: Any, activity: str, attrs: dict[str, Any]) -> Any:
+        # Accumulator: how many `activity` events match `prefer`.
+        acc = acc or 0
+        if self.prefer is not None and activity == self.activity and _value_matches(attrs.get(self.prefer.attribute), self.prefer.values):
+            acc += 1
+        return acc
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        end = s.last_time if self.end is None or not s.has(self.end) else s.first(self.end)
+        elapsed = _minutes(s.first(self.start), end)
+        full_days = 0 if elapsed is None else elapsed // (24 * 60)
+        counted = acc if acc else s.count(self.activity)
+        return full_days >= 1 and counted < self.per_day * full_days
+
+
+class AttributeInRule(BaseRule):
+    """Every `activity` row's `attribute` is one of `values` (case-insensitive; a
+    missing value does not match). Silent when the log has no such attribute."""
+
+    kind: Literal["attribute_in"] = "attribute_in"
+    activity: str
+    attribute: str
+    values: list[str]
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        if self.attribute not in m.columns:
+            return np.zeros(m.n, dtype=bool)
+        match = AttributeMatch(attribute=self.attribute, values=self.values)
+        return m.row_any(m.row_mask(self.activity) & ~_matches(m, match))
+
+    online: ClassVar[str] = "monotone"
+
+    def observe(self, acc: Any, activity: str, attrs: dict[str, Any]) -> Any:
+        # Accumulator: (events with a value outside `values`, events lacking one).
+        bad, missing = acc or (0, 0)
+        if activity == self.activity:
+            value = attrs.get(self.attribute)
+            if value is None:
+                missing += 1
+            elif not _value_matches(value, self.values):
+                bad += 1
+        return bad, missing
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        bad, missing = acc or (0, 0)
+        return self.attribute in columns and (bad > 0 or missing > 0)
+
+
+class AttributeMaxRule(BaseRule):
+    """The numeric `attribute` of `activity` rows never exceeds `max` (non-numeric
+    values are ignored). Silent when the log has no such attribute."""
+
+    kind: Literal["attribute_max"] = "attribute_max"
+    activity: str
+    attribute: str
+    max: float
+
+    def violated(self, m: CaseMatrix) -> np.ndarray:
+        if self.attribute not in m.columns:
+            return np.zeros(m.n, dtype=bool)
+        values = pd.to_numeric(m.rows[self.attribute], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        return m.row_max(np.where(m.row_mask(self.activity), values, np.nan)) > self.max
+
+    online: ClassVar[str] = "monotone"
+
+    def observe(self, acc: Any, activity: str, attrs: dict[str, Any]) -> Any:
+        # Accumulator: the largest numeric value seen.
+        value = _number(attrs.get(self.attribute)) if activity == self.activity else None
+        if value is None:
+            return acc
+        return value if acc is None else max(acc, value)
+
+    def judge(self, s: CaseFacts, acc: Any, columns: set[str]) -> bool:
+        return acc is not None and acc > self.max
+
+
+_RULES: dict[str, type[BaseRule]] = {
+    "present": PresentRule,
+    "absent": AbsentRule,
+    "order": OrderRule,
+    "max_interval": MaxIntervalRule,
+    "min_count": MinCountRule,
+    "balanced": BalancedRule,
+    "count_per_day": CountPerDayRule,
+    "attribute_in": AttributeInRule,
+    "attribute_max": AttributeMaxRule,
+}
+
+
+def parse_rules(specs: Sequence[dict[str, Any]]) -> list[BaseRule]:
+    """Build typed rules from spec dicts, discriminated by `kind`."""
+    out: list[BaseRule] = []
+    for spec in specs:
+        cls = _RULES.get(str(spec.get("kind")))
+        if cls is None:
+            raise ValueError(f"unknown rule kind: {spec.get('kind')!r}")
+        out.append(cls.model_validate(spec))
+    codes = [r.code for r in out]
+    if len(set(codes)) != len(codes):
+        raise ValueError(f"duplicate deviation codes in {codes}")
+    return out
+
+
+def compile_rules(specs: Sequence[dict[str, Any]]) -> Callable[[CaseMatrix], dict[str, np.ndarray]]:
+    """One vectorized evaluator for a pathway: ``CaseMatrix -> {code: violated}``."""
+    rules = parse_rules(specs)
+
+    def evaluate(m: CaseMatrix) -> dict[str, np.ndarray]:
+        return {rule.code: np.asarray(rule.violated(m), dtype=bool) for rule in rules}
+
+    evaluate.rules = rules  # type: ignore[attr-defined]
+    return evaluate
+
+
+def rule_labels(specs: Sequence[dict[str, Any]]) -> dict[str, str]:
+    """``{code: label}`` for a pathway's deviation labels (the code if unlabeled)."""
+    return {r.code: r.label or r.code for r in parse_rules(specs)}
@@ -0,0 +1,211 @@
+"""Object-sampled discovery for exploratory clicks (Part X, Phase XO.2).
+
+An exploratory map does not need every object. A `SamplePlan` draws whole
+objects (never single events, so each sampled lifecycle is intact) per object
+type in a fixed random order; `take(n)` keeps the first `n` of each type as a
+filtered view (`app.filters.FilteredOCEL`), so a larger sample always contains
+a smaller one and the same seed draws the same objects.
+
+Every OC-DFG count is a per-type sum over objects (how often an object's
+lifecycle holds an activity, or an arc), so the sample scales back with the
+expansion estimator: a type with N objects of which n are sampled contributes
+N/n × its sampled count, with variance N²(1 − n/N)·s²/n over the per-object
+counts s². A node sums its types' estimates and variances (types are sampled
+independently). The interval is normal at the requested confidence, never below
+the count the sample itself saw. An arc no sampled object follows is absent.
+
+`run` sizes the sample: a fixed `max_objects` per type, or — under a time budget
+— rounds that double the sample while the next round (predicted as twice the
+last) still fits. A sample that covers every object is the exact answer.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import zlib
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from app import ocdfg
+from app.config import get_settings
+
+OCEL_TYPE = "ocel:type"
+
+T = TypeVar("T")
+
+
+@dataclass
+class Sample:
+    """The view of one sample plus, per object type, the objects it stands for
+    (`population`) and the objects it holds (`sampled`)."""
+
+    ocel: Any
+    population: dict[str, int]
+    sampled: dict[str, int]
+
+    @property
+    def complete(self) -> bool:
+        return all(self.sampled[t] >= n for t, n in self.population.items())
+
+    def describe(self) -> list[dict[str, Any]]:
+        return [{"object_type": t, "objects": n, "sampled": self.sampled[t]} for t, n in self.population.items()]
+
+
+class SamplePlan:
+    """A fixed random order of each object type's objects in `ocel`."""
+
+    def __init__(self, ocel: Any, types: list[str], seed: int = 0) -> None:
+        self.ocel = ocel
+        codes = pd.Index(types).get_indexer(ocel.objects[OCEL_TYPE].astype(object))
+        self._n_objects = len(codes)
+        self._order: dict[str, np.ndarray] = {}
+        for i, t in enumerate(types):
+            # Seeded per type, so a type's draw does not depend on which others are asked for.
+            rng = np.random.default_rng([seed, zlib.crc32(t.encode("utf-8"))])
+            self._order[t] = rng.permutation(np.flatnonzero(codes == i))
+
+    @property
+    def largest(self) -> int:
+        return max((len(rows) for rows in self._order.values()), default=0)
+
+    def take(self, n: int) -> Sample:
+        """The first `n` objects of every type (all of a smaller type)."""
+        from app.filters import FilteredOCEL
+
+        ob_mask = np.zeros(self._n_objects, dtype=bool)
+        for rows in self._order.values():
+            ob_mask[rows[:n]] = True
+        view = FilteredOCEL(self.ocel, np.ones(len(self.ocel.events), dtype=bool), ob_mask)
+        return Sample(
+            ocel=view,
+            population={t: len(rows) for t, rows in self._order.items()},
+            sampled={t: min(n, len(rows)) for t, rows in self._order.items()},
+        )
+
+
+def run(
+    plan: SamplePlan,
+    analyze: Callable[[Sample], T],
+    max_objects: int | None = None,
+    time_budget_ms: int | None = None,
+) -> tuple[T, Sample]:
+    """`analyze` on a sample of at most `max_objects` objects per type, grown by
+    doubling within `time_budget_ms` when one is given. Without either bound the
+    sample is `arena_sample_max_objects` per type."""
+    settings = get_settings()
+    cap = max_objects if max_objects is not None else (None if time_budget_ms else settings.arena_sample_max_objects)
+    cap = min(cap if cap is not None else plan.largest, plan.largest) or 1
+    n = cap if not time_budget_ms else min(settings.arena_sample_initial_objects, cap)
+
+    started = time.perf_counter()
+    while True:
+        round_started = time.perf_counter()
+        sample = plan.take(n)
+        result = analyze(sample)
+        if not time_budget_ms or n >= cap:
+            return result, sample
+        following = min(2 * n, cap)
+        predicted = (time.perf_counter() - round_started) * following / n
+        if (time.perf_counter() - started + predicted) * 1000 > time_budget_ms:
+            return result, sample
+        n = following
+
+
+def estimate_ocdfg(
+    sample: Sample, types: list[str], confidence: float = 0.95
+) -> tuple[dict[str, int], dict[str, set[str]], dict[str, list[int]], list[dict[str, Any]]]:
+    """``(node_freq, node_ots, node_ci, edges)`` scaled from `sample` to the
+    whole log, in `ocdfg.discover`'s order; each edge carries `frequency_ci`.
+    On a complete sample the frequencies are exact and the intervals collapse."""
+    node_freq: dict[str, int] = {}
+    node_ots: dict[str, set[str]] = {}
+    node_ci: dict[str, list[int]] = {}
+    edges: list[dict[str, Any]] = []
+    types = [t for t in types if sample.sampled.get(t)]
+    if not types:
+        return node_freq, node_ots, node_ci, edges
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    population = np.asarray([sample.population[t] for t in types], dtype=np.float64)
+    sampled = np.asarray([sample.sampled[t] for t in types], dtype=np.float64)
+
+    rows = ocdfg.lifecycle_rows(sample.ocel, types)
+    activities: list[str] = rows.attrs["activities"]
+    typ = rows["type"].to_numpy()
+    oid = rows["oid"].to_numpy()
+    act = rows["act"].to_numpy()
+    pos = rows["pos"].to_numpy()
+
+    # Nodes, in ocdfg's order: per type by sampled count desc, then first appearance.
+    n_acts = len(activities)
+    nodes = _per_object_totals(typ, oid, act, n_acts, pos).rename(columns={"key": "act"})
+    nodes = nodes.sort_values(["type", "total", "first"], ascending=[True, False, True], kind="stable")
+    est, var = _expand(nodes, population, sampled)
+    node_est: dict[str, float] = {}
+    node_var: dict[str, float] = {}
+    node_seen: dict[str, int] = {}
+    for t, a, seen, e, v in zip(nodes["type"], nodes["act"], nodes["total"], est, var):
+        name = activities[a]
+        node_est[name] = node_est.get(name, 0.0) + e
+        node_var[name] = node_var.get(name, 0.0) + v
+        node_seen[name] = node_seen.get(name, 0) + int(seen)
+        node_ots.setdefault(name, set()).add(types[t])
+    for name, e in node_est.items():
+        node_freq[name], node_ci[name] = _interval(e, node_var[name], node_seen[name], z)
+
+    # Arcs: successor pairs inside one sampled lifecycle, listed as ocdfg lists them.
+    idx = np.flatnonzero(ocdfg.successor_mask(rows))
+    if len(idx):
+        pair = act[idx].astype(np.int64) * n_acts + act[idx + 1]
+        arcs = _per_object_totals(typ[idx], oid[idx], pair, n_acts * n_acts, pos[idx])
+        arcs["src"], arcs["dst"] = np.divmod(arcs.pop("key").to_numpy(), n_acts)
+        arcs["src_name"] = [activities[a] for a in arcs["src"]]
+        arcs["dst_name"] = [activities[a] for a in arcs["dst"]]
+        arcs = arcs.sort_values(["type", "src_name", "dst_name"], kind="stable")
+        est, var = _expand(arcs, population, sampled)
+        for t, s, d, seen, e, v in zip(arcs["type"], arcs["src_name"], arcs["dst_name"], arcs["total"], est, var):
+            freq, ci = _interval(e, v, int(seen), z)
+            edges.append({"source": s, "target": d, "object_type": types[t], "frequency": freq, "frequency_ci": ci})
+
+    return node_freq, node_ots, node_ci, edges
+
+
+def _per_object_totals(typ: np.ndarray, oid: np.ndarray, key: np.ndarray, n_keys: int, pos: np.ndarray) -> pd.DataFrame:
+    """Per (type, key) over rows of one sample: the sampled count, the sum of
+    squared per-object counts, and the first event position. Groups are listed
+    in first-seen order."""
+    group, groups = pd.factorize(typ.astype(np.int64) * n_keys + key)
+    first = np.full(len(groups), np.iinfo(np.int64).max)
+    np.minimum.at(first, group, pos)
+    n_objects = int(oid.max()) + 1 if len(oid) else 1
+    per_object, owners = pd.factorize(group.astype(np.int64) * n_objects + oid)
+    y = np.bincount(per_object).astype(np.float64)
+    owner = owners // n_objects
+    return pd.DataFrame({
+        "type": groups // n_keys,
+        "key": groups % n_keys,
+        "total": np.bincount(owner, weights=y, minlength=len(groups)).astype(np.int64),
+        "squares": np.bincount(owner, weights=y * y, minlength=len(groups)),
+        "first": first,
+    })
+
+
+def _expand(totals: pd.DataFrame, population: np.ndarray, sampled: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Expansion estimates and their variances for rows of `_per_object_totals`."""
+    t = totals["type"].to_numpy()
+    big_n, n = population[t], sampled[t]
+    total = totals["total"].to_numpy(dtype=np.float64)
+    squares = totals["squares"].to_numpy(dtype=np.float64)
+    spread = np.maximum(squares - total * total / n, 0.0) / np.maximum(n - 1, 1)
+    var = np.where(n < big_n, big_n * big_n * (1 - n / big_n) * spread / n, 0.0)
+    return total * big_n / n, var
+
+
+def _interval(est: float, var: float, seen: int, z: float) -> tuple[int, list[int]]:
+    half = z * math.sqrt(var)
+    return int(round(est)), [max(seen, math.floor(est - half)), math.ceil(est + half)]
@@ -0,0 +1,170 @@
+"""Mergeable quantile sketches for the performance surface (Part X §X.6).
+
+Exact medians and p90s need every duration in memory at once; on a multi-year
+export that is the largest allocation the sidecar makes. A sketch keeps a count
+per logarithmic bucket instead (DDSketch-style): a non-negative value x > 0 falls
+in bucket ``ceil(log_γ x)`` with ``γ = (1 + α) / (1 − α)``, and every value in a
+bucket is represented by one point within relative error α of it. Zeros are
+counted exactly. Memory is bounded by the value range, not the value count
+(α = 1 % covers 1 s … 1 year in ~900 buckets).
+
+Sketches merge by adding bucket counts, so a log processed in partitions — or
+summarised per time window and combined later (`to_dict` / `from_dict`) — gives
+exactly the sketch of the whole. Quantiles follow pandas' linear interpolation
+between the two neighbouring order statistics, each estimated within α, so the
+reported quantile is within relative error α of the exact `Series.quantile`.
+Counts and means are kept exactly.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Iterator
+
+import numpy as np
+
+ZERO = np.iinfo(np.int64).min  # bucket index for exact zeros (sorts first)
+
+
+class QuantileSketch:
+    """Log-bucketed counts of non-negative values with relative accuracy α."""
+
+    __slots__ = ("relative_accuracy", "gamma", "bins", "count", "total")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.bins: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, values: np.ndarray) -> "QuantileSketch":
+        values = np.asarray(values, dtype=np.float64)
+        buckets, counts = np.unique(bucket_index(values, self.gamma), return_counts=True)
+        self._add_buckets(buckets, counts, float(np.sum(values)))
+        return self
+
+    def _add_buckets(self, buckets: np.ndarray, counts: np.ndarray, total: float) -> None:
+        bins = self.bins
+        for b, c in zip(buckets.tolist(), counts.tolist()):
+            bins[b] = bins.get(b, 0) + c
+        self.count += int(np.sum(counts))
+        self.total += total
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches of different relative accuracy")
+        for b, c in other.bins.items():
+            self.bins[b] = self.bins.get(b, 0) + c
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """≈ `Series.quantile(q)` (linear interpolation), within relative error α."""
+        if not self.count:
+            return math.nan
+        virtual = (self.count - 1) * q
+        below = math.floor(virtual)
+        gamma = virtual - below
+        a, b = self._values_at(below, min(below + 1, self.count - 1))
+        return a + (b - a) * gamma
+
+    def _values_at(self, *ranks: int) -> list[float]:
+        out: list[float] = []
+        seen = 0
+        wanted = iter(ranks)
+        rank = next(wanted)
+        for b in sorted(self.bins):
+            seen += self.bins[b]
+            while rank < seen:
+                out.append(self._value(b))
+                rank = next(wanted, None)  # type: ignore[arg-type]
+                if rank is None:
+                    return out
+        return out
+
+    def _value(self, bucket: int) -> float:
+        if bucket == ZERO:
+            return 0.0
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "total": self.total,
+            "bins": [[b, c] for b, c in sorted(self.bins.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(float(data["relative_accuracy"]))
+        sketch.bins = {int(b): int(c) for b, c in data["bins"]}
+        sketch.count = int(data["count"])
+        sketch.total = float(data["total"])
+        return sketch
+
+
+def bucket_index(values: np.ndarray, gamma: float) -> np.ndarray:
+    """Each value's bucket: ``ceil(log_γ x)``, or `ZERO` for 0."""
+    values = np.asarray(values, dtype=np.float64)
+    if np.any(values < 0) or np.any(np.isnan(values)):
+        raise ValueError("quantile sketches hold non-negative values only")
+    out = np.full(len(values), ZERO, dtype=np.int64)
+    positive = values > 0
+    out[positive] = np.ceil(np.log(values[positive]) / math.log(gamma)).astype(np.int64)
+    return out
+
+
+class SketchSet:
+    """One `QuantileSketch` per integer group key, filled a batch at a time."""
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.sketches: dict[int, QuantileSketch] = {}
+
+    def add(self, keys: np.ndarray, values: np.ndarray) -> "SketchSet":
+        """Fold `values[i]` into the sketch of `keys[i]` (one grouping per batch)."""
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if not len(keys):
+            return self
+        buckets = bucket_index(values, self.gamma)
+        order = np.lexsort((buckets, keys))
+        keys, buckets, values = keys[order], buckets[order], values[order]
+        cell = np.r_[True, (keys[1:] != keys[:-1]) | (buckets[1:] != buckets[:-1])]
+        cell_starts = np.flatnonzero(cell)
+        cell_counts = np.diff(np.r_[cell_starts, len(keys)])
+        group_starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        group_totals = np.add.reduceat(values, group_starts)
+        cell_group = np.searchsorted(group_starts, cell_starts, side="right") - 1
+        cells = np.split(np.arange(len(cell_starts)), np.flatnonzero(np.diff(cell_group)) + 1)
+        for g, span in enumerate(cells):
+            key = int(keys[group_starts[g]])
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = QuantileSketch(self.relative_accuracy)
+            sketch._add_buckets(buckets[cell_starts[span]], cell_counts[span], float(group_totals[g]))
+        return self
+
+    def merge(self, other: "SketchSet") -> "SketchSet":
+        for key, sketch in other.sketches.items():
+            mine = self.sketches.get(key)
+            if mine is None:
+                self.sketches[key] = QuantileSketch(self.relative_accuracy).merge(sketch)
+            else:
+                mine.merge(sketch)
+        return self
+
+    def items(self) -> Iterator[tuple[int, QuantileSketch]]:
+        return iter(sorted(self.sketches.items()))
+
+    def __len__(self) -> int:
+        return len(self.sketches)
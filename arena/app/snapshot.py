@@ -0,0 +1,204 @@
+"""Columnar OCEL snapshots — the cold-start fast path for large exports.
+
+JSON decoding dominates a cold request on a multi-hundred-MB export. A snapshot
+stores the six pm4py OCEL frames (events, objects, relations, o2o, e2e,
+object_changes) as uncompressed Arrow IPC files next to a `manifest.json`, and is
+loaded back through memory maps: numeric and timestamp columns are paged in by the
+OS instead of being decoded, and pandas' own schema metadata restores the dtypes.
+
+Arrow IPC rather than Parquet: Parquet pages are encoded/compressed and must be
+decoded into fresh buffers, so they cannot be memory-mapped; the IPC file format
+is the on-disk image of the in-memory columns.
+
+The sidecar writes a snapshot under `arena_snapshot_dir` the first time it parses
+a JSON export (keyed by the export's fingerprint, so a new export gets a new
+snapshot; snapshots of rewritten or deleted exports are pruned after each write
+and at startup), and `ocel_path` accepts a snapshot directory (or its manifest)
+wherever it accepts a JSON file. Convert existing exports offline with:
+
+    python -m app.snapshot /data/ocel/ocel-export.json --out /data/ocel/ocel-export.snapshot
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+from typing import Any
+
+import pandas as pd
+
+try:  # optional: without pyarrow the sidecar simply keeps reading JSON
+    import pyarrow as pa  # type: ignore
+    import pyarrow.ipc  # type: ignore  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except Exception:  # pragma: no cover - only hit in a build without pyarrow
+    pa = None  # type: ignore
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_FORMAT = "zephyrus-ocel-arrow"
+SNAPSHOT_VERSION = 1
+MANIFEST = "manifest.json"
+FRAMES = ("events", "objects", "relations", "o2o", "e2e", "object_changes")
+
+
+class SnapshotError(RuntimeError):
+    """A snapshot could not be written or read (missing pyarrow, bad manifest)."""
+
+
+def snapshot_dir(path: str | None) -> str | None:
+    """The snapshot directory `path` names (the directory or its manifest), else None."""
+    if not path:
+        return None
+    if os.path.isdir(path) and os.path.isfile(os.path.join(path, MANIFEST)):
+        return path
+    if os.path.basename(path) == MANIFEST and os.path.isfile(path):
+        return os.path.dirname(path) or "."
+    return None
+
+
+def _stringify_mixed(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """Arrow columns are single-typed; an attribute column that mixes types across
+    events (e.g. ``22`` and ``"n/a"``) is stored as strings, nulls preserved. The
+    analyses already coerce such attributes (`to_numeric`, `astype(str)`)."""
+    stringified: list[str] = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)  # type: ignore[union-attr]
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):  # type: ignore[union-attr]
+            df = df.assign(**{col: df[col].map(lambda v: v if v is None or (isinstance(v, float) and v != v) else str(v))})
+            stringified.append(str(col))
+    return df, stringified
+
+
+def write_snapshot(ocel: Any, out_dir: str, source: str | None = None) -> str:
+    """Write `ocel` as a snapshot directory at `out_dir` (atomically replacing any
+    previous one) and return the directory."""
+    if not PYARROW_AVAILABLE:
+        raise SnapshotError("pyarrow is not importable in this service")
+
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=parent)
+    try:
+        frames: dict[str, Any] = {}
+        for name in FRAMES:
+            df, stringified = _stringify_mixed(getattr(ocel, name))
+            table = pa.Table.from_pandas(df, preserve_index=False)  # type: ignore[union-attr]
+            with pa.OSFile(os.path.join(staging, f"{name}.arrow"), "wb") as sink:  # type: ignore[union-attr]
+                with pa.ipc.new_file(sink, table.schema) as writer:  # type: ignore[union-attr]
+                    writer.write_table(table)
+            frames[name] = {
+                "file": f"{name}.arrow",
+                "rows": int(table.num_rows),
+                "columns": [str(c) for c in df.columns],
+                "stringified": stringified,
+            }
+
+        manifest: dict[str, Any] = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "frames": frames,
+            "globals": ocel.globals,
+        }
+        if source is not None:
+            st = os.stat(source)
+            manifest["source"] = {"path": os.path.realpath(source), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, default=str)
+
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+        os.replace(staging, out_dir)
+        return out_dir
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def read_snapshot(path: str):
+    """Load a snapshot directory (or manifest path) into a pm4py OCEL via memory maps."""
+    if not PYARROW_AVAILABLE:
+        raise SnapshotError("pyarrow is not importable in this service")
+    from pm4py.objects.ocel.obj import OCEL as PMOCEL
+
+    root = snapshot_dir(path)
+    if root is None:
+        raise SnapshotError(f"'{path}' is not an OCEL snapshot (no {MANIFEST})")
+    with open(os.path.join(root, MANIFEST), encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    if manifest.get("format") != SNAPSHOT_FORMAT or int(manifest.get("version", 0)) > SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot format in '{root}'")
+
+    frames: dict[str, pd.DataFrame] = {}
+    for name in FRAMES:
+        spec = manifest["frames"][name]
+        with pa.memory_map(os.path.join(root, spec["file"]), "r") as source:  # type: ignore[union-attr]
+            table = pa.ipc.open_file(source).read_all()  # type: ignore[union-attr]
+        frames[name] = table.to_pandas(split_blocks=True)
+
+    return PMOCEL(globals=manifest.get("globals") or {}, **frames)
+
+
+def snapshot_path_for(export_fingerprint: str, root: str) -> str:
+    """Where the auto-written snapshot of an export with this fingerprint lives."""
+    return os.path.join(root, export_fingerprint)
+
+
+def prune_snapshots(root: str, keep: str | None = None) -> int:
+    """Remove auto-written snapshots under `root` whose source export is gone or
+    has been rewritten since (its size or mtime no longer matches the manifest),
+    other than `keep`; snapshots with no recorded source are left alone. Returns
+    how many were removed."""
+    try:
+        entries = os.listdir(root)
+    except OSError:
+        return 0
+    removed = 0
+    for entry in entries:
+        candidate = os.path.join(root, entry)
+        if candidate == keep or snapshot_dir(candidate) is None:
+            continue
+        try:
+            with open(os.path.join(candidate, MANIFEST), encoding="utf-8") as fh:
+                src = json.load(fh).get("source") or {}
+        except (OSError, ValueError):
+            continue
+        if not src.get("path"):
+            continue
+        try:
+            st = os.stat(src["path"])
+            current = (st.st_size, st.st_mtime_ns) == (src.get("size"), src.get("mtime_ns"))
+        except OSError:
+            current = False
+        if not current:
+            shutil.rmtree(candidate, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.snapshot", description="Convert an OCEL 2.0 JSON export to a columnar Arrow snapshot.")
+    parser.add_argument("export", help="path to the OCEL 2.0 JSON export")
+    parser.add_argument("--out", help="snapshot directory to write (default: <export>.snapshot)")
+    args = parser.parse_args(argv)
+
+    import pm4py  # type: ignore
+
+    out = args.out or f"{os.path.splitext(args.export)[0]}.snapshot"
+    ocel = pm4py.read_ocel2_json(args.export)
+    write_snapshot(ocel, out, source=args.export)
+    print(os.path.join(out, MANIFEST))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""Online prefix conformance (Part X §X.7) — the streaming tail of the batch
+engine in `app.conformance`. Instead of re-judging the whole projected log, an
+`OnlineConformance` keeps a compact state per (case object, pathway) — the first
+timestamp and count of each pathway activity, the last event time, and each
+rule's small accumulator (`app.rules`) — and advances it as events arrive.
+
+A deviation is reported as soon as it is certain: rules whose violation no
+later event can undo (an absent activity occurring, a flagged checklist status,
+an antibiotic beyond the 3-hour target while the case's events arrive in time
+order) fire on the event that shows it; rules about something still missing
+(no lactate, visit cadence, an unresolved escalation) are judged when the case
+closes. A case closes when the feeder says so, when its latest event time is
+more than `arena_stream_idle_hours` behind the stream's (a late event does not
+refresh it), when the stream holds more than `arena_stream_max_cases` cases (oldest-updated first), or on flush — and its
+state is then dropped, so memory is bounded by the open cases. The verdict at
+close is the batch engine's verdict for the events seen; only an event older
+than ones already seen for its case can contradict an earlier report.
+
+Events and objects use the OCEL 2.0 JSON shapes; an event's relationships
+name case objects, which must have been declared (in this batch or an earlier
+one) to be tracked. A case that reappears after being closed starts afresh.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+
+from app.case_matrix import MISSING_NS
+from app.config import get_settings
+from app.pathways import PATHWAYS
+
+
+class CaseState:
+    """One case's running facts for one pathway (see `app.rules.CaseFacts`)."""
+
+    __slots__ = ("firsts", "counts", "last_time", "reordered", "acc", "emitted")
+
+    def __init__(self, rules: int) -> None:
+        self.firsts: dict[str, int] = {}
+        self.counts: dict[str, int] = {}
+        self.last_time = MISSING_NS
+        self.reordered = False  # an event arrived older than one already seen
+        self.acc: list[Any] = [None] * rules
+        self.emitted: set[str] = set()
+
+    def first(self, activity: str) -> int:
+        return self.firsts.get(activity, MISSING_NS)
+
+    def count(self, activity: str) -> int:
+        return self.counts.get(activity, 0)
+
+    def has(self, activity: str) -> bool:
+        return activity in self.counts
+
+
+class _Case:
+    __slots__ = ("type", "touched", "states", "seq")
+
+    def __init__(self, object_type: str, touched: int) -> None:
+        self.type = object_type
+        self.touched = touched  # latest event time that reached this case
+        self.states: dict[str, CaseState] = {}
+        self.seq = 0  # its live entry in the idle heap
+
+
+def _time_ns(value: Any) -> int:
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError) as exc:  # e.g. a list, an object, an unparsable string
+        raise ValueError(f"event time is not a timestamp: {value!r}") from exc
+    if ts is pd.NaT:
+        raise ValueError(f"event time is not a timestamp: {value!r}")
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int(ts.as_unit("ns").value)
+
+
+def _iso(ns: int) -> str | None:
+    return None if ns == MISSING_NS else pd.Timestamp(ns, tz="UTC").isoformat()
+
+
+def _event(doc: dict[str, Any]) -> tuple[str, str, int, dict[str, Any], list[str]]:
+    """(id, activity, time ns, attributes, related object ids) of one OCEL 2.0 event."""
+    try:
+        eid, activity, time = str(doc["id"]), str(doc["type"]), doc["time"]
+        attributes = doc.get("attributes") or []
+        attrs = {str(a["name"]): a.get("value") for a in attributes} if isinstance(attributes, list) else dict(attributes)
+        oids = [str(r["objectId"]) for r in doc.get("relationships") or []]
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"malformed OCEL 2.0 event: {doc!r}") from exc
+    return eid, activity, _time_ns(time), attrs, oids
+
+
+class OnlineConformance:
+    """Incremental conformance over a stream of event batches (thread-safe)."""
+
+    def __init__(
+        self,
+        pathways: dict[str, dict[str, Any]] | None = None,
+        max_cases: int | None = None,
+        idle_hours: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.pathways = {k: s for k, s in (pathways or PATHWAYS).items() if "evaluate_matrix" in s}
+        self.max_cases = settings.arena_stream_max_cases if max_cases is None else max_cases
+        idle = settings.arena_stream_idle_hours if idle_hours is None else idle_hours
+        self.idle_ns = int(idle * 3600 * 1e9)
+        self._rules = {k: s["evaluate_matrix"].rules for k, s in self.pathways.items()}
+        self._activities = {k: set(s["activities"]) for k, s in self.pathways.items()}
+        self._by_type: dict[str, list[str]] = {}
+        for key, spec in self.pathways.items():
+            self._by_type.setdefault(spec["case_type"], []).append(key)
+        self._cases: OrderedDict[str, _Case] = OrderedDict()  # update order, for capacity
+        # (touched, seq, oid), least recently touched first; an entry is stale
+        # once its case is touched again (new seq) or closed.
+        self._idle: list[tuple[int, int, str]] = []
+        self._seq = 0
+        self._columns: set[str] = set()
+        self.watermark = MISSING_NS
+        self.counters = {
+            "events": 0, "deviations": 0, "closed": 0,
+            "closed_idle": 0, "closed_capacity": 0, "off_pathway": 0,
+        }
+        self.totals = {k: {"cases": 0, "conformant": 0, "deviations": {}} for k in self.pathways}
+        self.last_ingest = time.monotonic()  # wall clock, for the named-stream TTL
+        self._lock = threading.Lock()
+
+    # --- ingestion ---
+
+    def ingest(
+        self,
+        events: Iterable[dict[str, Any]] = (),
+        objects: Iterable[dict[str, Any]] = (),
+        close: Iterable[str] = (),
+        flush: bool = False,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Advance the stream by one batch; returns the deviations it newly
+        detected and the verdicts of the cases it closed. The batch is
+        validated before any state changes (ValueError on a malformed event)."""
+        parsed = sorted((_event(e) for e in events), key=lambda e: e[2])
+        try:
+            declared = [(str(o["id"]), str(o["type"])) for o in objects]
+        except (KeyError, TypeError) as exc:
+            raise ValueError("objects need an id and a type") from exc
+        out: dict[str, list[dict[str, Any]]] = {"deviations": [], "closed": []}
+        with self._lock:
+            self.last_ingest = time.monotonic()
+            if parsed:
+                self.watermark = max(self.watermark, parsed[-1][2])
+            for oid, object_type in declared:
+                if object_type in self._by_type and oid not in self._cases:
+                    self._cases[oid] = case = _Case(object_type, self.watermark)
+                    self._schedule(oid, case)
+            for eid, activity, ns, attrs, oids in parsed:
+                self.counters["events"] += 1
+                self._columns.update(attrs)
+                for oid in oids:
+                    case = self._cases.get(oid)
+                    if case is not None:
+                        self._advance(oid, case, eid, activity, ns, attrs, out["deviations"])
+            for oid in close:
+                self._close(oid, "closed", out)
+            if flush:
+                for oid in list(self._cases):
+                    self._close(oid, "flush", out)
+            self._evict(out)
+        return out
+
+    def _advance(self, oid: str, case: _Case, eid: str, activity: str, ns: int, attrs: dict[str, Any], emitted: list) -> None:
+        if ns > case.touched:
+            case.touched = ns
+            self._schedule(oid, case)
+        self._cases.move_to_end(oid)
+        for key in self._by_type[case.type]:
+            if activity not in self._activities[key]:
+                continue
+            rules = self._rules[key]
+            state = case.states.get(key)
+            if state is None:
+                state = case.states[key] = CaseState(len(rules))
+            if ns < state.last_time:
+                state.reordered = True
+            state.last_time = max(state.last_time, ns)
+            state.counts[activity] = state.counts.get(activity, 0) + 1
+            if activity not in state.firsts or ns < state.firsts[activity]:
+                state.firsts[activity] = ns
+            for i, rule in enumerate(rules):
+                state.acc[i] = rule.observe(state.acc[i], activity, attrs)
+            if not state.has(self.pathways[key]["trigger"]):
+                continue
+            for i, rule in enumerate(rules):
+                early = rule.online == "monotone" or (rule.online == "ordered" and not state.reordered)
+                if early and rule.code not in state.emitted and rule.judge(state, state.acc[i], self._columns):
+                    state.emitted.add(rule.code)
+                    emitted.append(self._deviation(key, oid, rule, eid, ns, at_close=False))
+
+    # --- closing ---
+
+    def _close(self, oid: str, reason: str, out: dict[str, list[dict[str, Any]]]) -> None:
+        case = self._cases.pop(oid, None)
+        if case is None:
+            return
+        self.counters["closed"] += 1
+        if reason in ("idle", "capacity"):
+            self.counters[f"closed_{reason}"] += 1
+        for key, state in case.states.items():
+            if not state.has(self.pathways[key]["trigger"]):
+                self.counters["off_pathway"] += 1
+                continue
+            codes = []
+            for i, rule in enumerate(self._rules[key]):
+                if rule.judge(state, state.acc[i], self._columns):
+                    codes.append(rule.code)
+                    if rule.code not in state.emitted:
+                        out["deviations"].append(self._deviation(key, oid, rule, None, state.last_time, at_close=True))
+            totals = self.totals[key]
+            totals["cases"] += 1
+            totals["conformant"] += not codes
+            for code in codes:
+                totals["deviations"][code] = totals["deviations"].get(code, 0) + 1
+            out["closed"].append({
+                "pathway": key, "case_id": oid, "conformant": not codes, "deviations": codes, "reason": reason,
+            })
+
+    def _schedule(self, oid: str, case: _Case) -> None:
+        self._seq += 1
+        case.seq = self._seq
+        heapq.heappush(self._idle, (case.touched, case.seq, oid))
+
+    def _evict(self, out: dict[str, list[dict[str, Any]]]) -> None:
+        # Idle first, least recently touched in event time (an out-of-order
+        # event does not refresh a case); then the oldest-updated past capacity.
+        while self._idle:
+            touched, seq, oid = self._idle[0]
+            case = self._cases.get(oid)
+            if case is None or case.seq != seq:
+                heapq.heappop(self._idle)
+                continue
+            if touched == MISSING_NS:  # declared before any event time was known
+                if self.watermark == MISSING_NS:
+                    break
+                heapq.heappop(self._idle)
+                case.touched = self.watermark
+                self._schedule(oid, case)
+                continue
+            if self.watermark - touched <= self.idle_ns:
+                break
+            heapq.heappop(self._idle)
+            self._close(oid, "idle", out)
+        while len(self._cases) > self.max_cases:
+            self._close(next(iter(self._cases)), "capacity", out)
+        if len(self._idle) > 2 * len(self._cases) + 64:
+            self._idle = [(c.touched, c.seq, oid) for oid, c in self._cases.items()]
+            heapq.heapify(self._idle)
+
+    def _deviation(self, key: str, oid: str, rule: Any, eid: str | None, ns: int, at_close: bool) -> dict[str, Any]:
+        self.counters["deviations"] += 1
+        return {
+            "pathway": key,
+            "case_id": oid,
+            "code": rule.code,
+            "label": self.pathways[key]["deviation_labels"].get(rule.code, rule.code),
+            "event_id": eid,
+            "time": _iso(ns),
+            "at_close": at_close,
+        }
+
+    # --- reporting ---
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "open_cases": len(self._cases),
+                "watermark": _iso(self.watermark),
+                **self.counters,
+                "pathways": {
+                    key: {
+                        **t,
+                        "deviations": dict(t["deviations"]),
+                        "conformance_rate": round(t["conformant"] / t["cases"], 4) if t["cases"] else None,
+                    }
+                    for key, t in self.totals.items()
+                },
+            }
+
+
+def stream(batches: Iterable[dict[str, Any]], engine: OnlineConformance | None = None) -> Iterator[dict[str, list[dict[str, Any]]]]:
+    """Feed `batches` (each with optional `events`, `objects`, `close`) through
+    one engine, yielding each batch's detections; every remaining case is
+    closed (flushed) after the last batch."""
+    engine = engine or OnlineConformance()
+    for batch in batches:
+        yield engine.ingest(batch.get("events", ()), batch.get("objects", ()), batch.get("close", ()))
+    yield engine.ingest(flush=True)
+
+
+# --- named streams for the HTTP surface ---
+#
+# A named stream no batch has reached for `arena_stream_ttl_seconds` (wall
+# clock) is dropped, open cases and all, so an abandoned feeder does not hold
+# one of the `arena_stream_max_streams` slots for the life of the process.
+
+_STREAMS: dict[str, OnlineConformance] = {}
+_STREAMS_LOCK = threading.Lock()
+
+
+class StreamLimit(Exception):
+    """Opening another named stream would exceed arena_stream_max_streams."""
+
+
+def _expire() -> None:
+    ttl = get_settings().arena_stream_ttl_seconds
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    for name in [n for n, e in _STREAMS.items() if now - e.last_ingest > ttl]:
+        del _STREAMS[name]
+
+
+def open_stream(name: str) -> OnlineConformance:
+    with _STREAMS_LOCK:
+        _expire()
+        engine = _STREAMS.get(name)
+        if engine is None:
+            limit = get_settings().arena_stream_max_streams
+            if len(_STREAMS) >= limit:
+                raise StreamLimit(f"{limit} conformance streams already open; close one first")
+            engine = _STREAMS[name] = OnlineConformance()
+        return engine
+
+
+def get_stream(name: str) -> OnlineConformance | None:
+    with _STREAMS_LOCK:
+        _expire()
+        return _STREAMS.get(name)
+
+
+def drop_stream(name: str) -> OnlineConformance | None:
+    with _STREAMS_LOCK:
+        return _STREAMS.pop(name, None)
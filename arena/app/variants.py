@@ -0,0 +1,220 @@
+"""Variant-compressed per-object-type logs (Part X, Phase XO.2).
+
+Replay fitness and Petri-net discovery only ever look at each case's activity
+sequence, and clinical logs repeat a handful of pathways thousands of times. A
+`VariantTable` collapses one object type's flattened log to its distinct
+sequences and their multiplicities in one vectorized pass (cases are grouped by
+length and each length's case × position matrix is deduplicated with
+`np.unique`), so everything downstream scales with the variants, not the cases:
+
+- `discover_petri_net` feeds the table to pm4py's inductive miner directly (the
+  miner works on exactly this (variant → count) form; pm4py would rebuild it
+  from the frame case by case);
+- `token_replay_fitness` replays each variant once and weights its token counts
+  by the multiplicity. Log fitness and the fitting-trace percentage are
+  integer-weighted sums of the same per-trace counts pm4py aggregates, so they
+  equal `pm4py.fitness_token_based_replay` on the frame exactly.
+
+Cases are ordered by timestamp (stably, NaT last) as pm4py's miner projects
+them; loaded logs keep events in time order, so this is also the frame order
+pm4py's replayer reads.
+
+Both drive pm4py internals (the inductive miner's UVCL classes, the token
+replayer's `Parameters`), which are used only on the pm4py series they were
+checked against (`VERIFIED_PM4PY`). On any other version they fall back to the
+public `discover_*_inductive` / `fitness_token_based_replay` on the table
+expanded back to one case per multiplicity — the same answers, uncompressed.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ocdfg import time_ns
+from app.ocel_loader import PM4PY_VERSION
+
+CASE = "case:concept:name"
+ACTIVITY = "concept:name"
+TIMESTAMP = "time:timestamp"
+
+# pm4py release series whose private miner / replayer entry points this module
+# was checked against.
+VERIFIED_PM4PY = ("2.7.",)
+
+
+def private_api_available(version: str) -> bool:
+    """Whether the variant-level pm4py internals can be used under `version`."""
+    if not version.startswith(VERIFIED_PM4PY):
+        return False
+    try:
+        from pm4py.algo.conformance.tokenreplay.variants import token_replay
+        from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL  # noqa: F401
+        from pm4py.algo.discovery.inductive.variants.im import IMUVCL  # noqa: F401
+        from pm4py.algo.discovery.inductive.variants.imf import IMFUVCL  # noqa: F401
+
+        token_replay.Parameters.CONSIDER_REMAINING_IN_FITNESS  # noqa: B018
+    except (ImportError, AttributeError):
+        return False
+    return True
+
+
+PRIVATE_API = private_api_available(PM4PY_VERSION)
+
+
+class VariantTable:
+    """Distinct activity sequences of one flattened log, most frequent first,
+    with the number of cases following each."""
+
+    __slots__ = ("variants", "counts")
+
+    def __init__(self, variants: list[tuple[Any, ...]], counts: np.ndarray) -> None:
+        self.variants = variants
+        self.counts = counts
+
+    @property
+    def cases(self) -> int:
+        return int(self.counts.sum())
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def uvcl(self) -> Counter:
+        """pm4py's univariate variant-compressed log (variant → count)."""
+        return Counter(dict(zip(self.variants, self.counts.tolist())))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.counts.nbytes + sum(8 * len(v) + 56 for v in self.variants))
+
+
+def compress(flat: pd.DataFrame) -> VariantTable:
+    """The variant table of a flattened log (pm4py's column names)."""
+    if flat is None or not len(flat):
+        return VariantTable([], np.zeros(0, dtype=np.int64))
+    cases, _ = pd.factorize(flat[CASE], sort=True)
+    acts, names = pd.factorize(flat[ACTIVITY], use_na_sentinel=False)
+    names = np.asarray(names, dtype=object)
+    ns = time_ns(flat[TIMESTAMP])
+    ns = np.where(ns == np.iinfo(np.int64).min, np.iinfo(np.int64).max, ns)  # NaT sorts last
+    order = np.lexsort((ns, cases))
+    acts = acts[order].astype(np.int64)
+    lengths = np.bincount(cases)
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+
+    variants: list[tuple[Any, ...]] = []
+    counts: list[int] = []
+    for length in np.unique(lengths).tolist():
+        first = starts[lengths == length]
+        matrix = acts[first[:, None] + np.arange(length)]
+        rows, multiplicity = np.unique(matrix, axis=0, return_counts=True)
+        variants.extend(tuple(names[row].tolist()) for row in rows)
+        counts.extend(multiplicity.tolist())
+    ranked = sorted(range(len(variants)), key=lambda i: (-counts[i], variants[i]))
+    return VariantTable([variants[i] for i in ranked], np.asarray([counts[i] for i in ranked], dtype=np.int64))
+
+
+def process_tree(table: VariantTable, noise_threshold: float = 0.0, **parameters: Any) -> Any:
+    """pm4py's inductive miner on the table — IM, or IMf when `noise_threshold`
+    > 0, as `pm4py.discover_process_tree_inductive` picks. Extra `parameters`
+    (e.g. the OC-Petri-net miner's disabled fall-throughs) pass through.
+
+    Drives the miner the way `inductive_miner.apply` does for a variant log;
+    `apply` itself never takes that branch (its ``type(obj) in [UVCL]`` check
+    compares against a typing alias) and would re-project a frame instead."""
+    if not PRIVATE_API:
+        return _public_process_tree(table, noise_threshold, **parameters)
+    from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL
+    from pm4py.algo.discovery.inductive.variants.im import IMUVCL
+    from pm4py.algo.discovery.inductive.variants.imf import IMFUVCL
+    from pm4py.objects.process_tree.utils import generic as pt_util
+    from pm4py.util import constants
+
+    parameters = {
+        "noise_threshold": noise_threshold,
+        "multiprocessing": constants.ENABLE_MULTIPROCESSING_DEFAULT,
+        "disable_fallthroughs": False,
+        **parameters,
+    }
+    miner = IMFUVCL(parameters) if noise_threshold > 0 else IMUVCL(parameters)
+    tree = pt_util.fold(miner.apply(IMDataStructureUVCL(table.uvcl()), parameters))
+    pt_util.tree_sort(tree)
+    return tree
+
+
+def discover_petri_net(table: VariantTable, noise_threshold: float = 0.0, **parameters: Any) -> tuple[Any, Any, Any]:
+    """≡ `pm4py.discover_petri_net_inductive(flat, noise_threshold)`."""
+    import pm4py
+
+    return pm4py.convert_to_petri_net(process_tree(table, noise_threshold, **parameters))
+
+
+def token_replay_fitness(table: VariantTable, net: Any, im: Any, fm: Any) -> dict[str, float]:
+    """≡ `pm4py.fitness_token_based_replay(flat, net, im, fm)`, one replay per
+    variant. `average_trace_fitness` may differ in the last bit (a weighted
+    float sum); the log fitness and fitting-trace percentage are exact."""
+    if not PRIVATE_API:
+        import pm4py
+
+        return pm4py.fitness_token_based_replay(_expanded(table), net, im, fm)
+    from pm4py.algo.conformance.tokenreplay.variants import token_replay
+    from pm4py.objects.log.obj import EventLog
+    from pm4py.util import variants_util
+
+    log = EventLog([variants_util.variant_to_trace(v, parameters={}) for v in table.variants])
+    replayed = token_replay.apply(log, net, im, fm, parameters={
+        token_replay.Parameters.CONSIDER_REMAINING_IN_FITNESS: True,
+        token_replay.Parameters.CLEANING_TOKEN_FLOOD: False,
+        token_replay.Parameters.SHOW_PROGRESS_BAR: False,
+    })
+    weights = table.counts.tolist()
+
+    def _total(key: str) -> Any:
+        return sum(w * r[key] for w, r in zip(weights, replayed))
+
+    traces = table.cases
+    fit = sum(w for w, r in zip(weights, replayed) if r["trace_is_fit"])
+    consumed, produced = _total("consumed_tokens"), _total("produced_tokens")
+    result = {"perc_fit_traces": 0.0, "average_trace_fitness": 0.0, "log_fitness": 0, "percentage_of_fitting_traces": 0.0}
+    if traces > 0 and consumed > 0 and produced > 0:
+        perc = float(100.0 * fit) / float(traces)
+        result = {
+            "perc_fit_traces": perc,
+            "average_trace_fitness": float(_total("trace_fitness")) / float(traces),
+            "log_fitness": 0.5 * (1 - _total("missing_tokens") / consumed) + 0.5 * (1 - _total("remaining_tokens") / produced),
+            "percentage_of_fitting_traces": perc,
+        }
+    return result
+
+
+def _public_process_tree(table: VariantTable, noise_threshold: float, **parameters: Any) -> Any:
+    """`process_tree` through pm4py's public API on the expanded table. Miner
+    options the public signature lacks (the OC-Petri-net miner's strict-sequence
+    cut) go through the inductive miner's algorithm facade, as pm4py's own OCPN
+    discovery does."""
+    import pm4py
+
+    flat = _expanded(table)
+    if set(parameters) <= {"disable_fallthroughs"}:
+        return pm4py.discover_process_tree_inductive(flat, noise_threshold=noise_threshold, **parameters)
+    from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+
+    variant = inductive_miner.Variants.IMf if noise_threshold > 0 else inductive_miner.Variants.IM
+    return inductive_miner.apply(flat, {"noise_threshold": noise_threshold, **parameters}, variant=variant)
+
+
+def _expanded(table: VariantTable) -> pd.DataFrame:
+    """A flattened log with the table's cases: one per multiplicity, events one
+    second apart (only their order is read)."""
+    variant = np.repeat(np.arange(len(table)), table.counts)
+    lengths = np.asarray([len(v) for v in table.variants], dtype=np.int64)[variant]
+    case = np.repeat(np.arange(len(variant)), lengths)
+    pos = np.arange(len(case)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return pd.DataFrame({
+        CASE: case.astype(str),
+        ACTIVITY: [a for v in variant.tolist() for a in table.variants[v]],
+        TIMESTAMP: pd.to_datetime(pos, unit="s", utc=True),
+    })
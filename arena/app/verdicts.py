@@ -0,0 +1,172 @@
+"""Persistent conformance verdict cache (Part X §X.7).
+
+Between two OCEL exports most cases are unchanged, and a case's verdict depends
+only on its own sub-log rows (plus the set of attribute columns the log has).
+So verdicts are stored on disk, keyed by pathway key + pathway version + a
+fingerprint of the case's ordered rows: each event's activity, timestamp and
+attributes, in (time, sub-log) order. Event and object ids are left out, so a
+re-exported (renumbered) case still hits. A new export only re-evaluates the
+cases whose fingerprint changed.
+
+Fingerprints are computed for every case of a sub-log at once: two keyed 64-bit
+row hashes (`pd.util.hash_pandas_object`), mixed with each row's position in its
+case and summed per case — 128 bits plus the row count. The store is a small
+SQLite file (`arena_verdict_cache_path`, empty disables), safe to share between
+worker processes; past `arena_verdict_cache_rows` entries the oldest go first,
+down to a low-water mark so the table is counted and pruned once per
+`_PRUNE_SLACK` of the cap written rather than on every write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+from app.config import get_settings
+
+OCEL_EID = "ocel:eid"
+OCEL_OID = "ocel:oid"
+
+_KEYS = ("arena-verdict-k1", "arena-verdict-k2")  # hash_pandas_object keys (16 chars)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_CHUNK = 500  # SQLite host-parameter budget per IN (...) lookup
+_PRUNE_SLACK = 0.1  # share of arena_verdict_cache_rows pruned below the cap
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads every input bit over the output (uint64)."""
+    with np.errstate(over="ignore"):
+        x = x ^ (x >> np.uint64(30))
+        x = x * np.uint64(0xBF58476D1CE4E5B9)
+        x = x ^ (x >> np.uint64(27))
+        x = x * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def case_fingerprints(rows: pd.DataFrame, context: str = "") -> tuple[np.ndarray, list[str]]:
+    """(case ids in first-seen order, one fingerprint per case) for a sub-log
+    whose rows are contiguous per case and in time order. `context` (e.g. a
+    digest of the pathway's rules) is folded into every fingerprint."""
+    codes, cases = pd.factorize(rows[OCEL_OID], sort=False)
+    if not len(cases):
+        return np.asarray(cases), []
+    columns = sorted(c for c in rows.columns if c not in (OCEL_EID, OCEL_OID))
+    frame = rows[columns]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    position = (np.arange(len(codes)) - np.repeat(starts, np.diff(np.r_[starts, len(codes)]))).astype(np.uint64)
+    sizes = np.diff(np.r_[starts, len(codes)])
+    sums = []
+    for key in _KEYS:
+        row = pd.util.hash_pandas_object(frame, index=False, hash_key=key).to_numpy(dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            mixed = _mix(row ^ ((position + np.uint64(1)) * _GOLDEN))
+        sums.append(np.add.reduceat(mixed, starts))
+    prefix = hashlib.sha1(f"{context}|{','.join(columns)}".encode("utf-8")).hexdigest()[:8]
+    return np.asarray(cases), [f"{prefix}{a:016x}{b:016x}{n:x}" for a, b, n in zip(*sums, sizes)]
+
+
+class VerdictStore:
+    """`{(pathway, version, fingerprint): verdict}` in SQLite (thread-safe)."""
+
+    def __init__(self, path: str, max_rows: int) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " pathway TEXT NOT NULL, version INTEGER NOT NULL, fingerprint TEXT NOT NULL, verdict TEXT NOT NULL,"
+            " PRIMARY KEY (pathway, version, fingerprint))"
+        )
+        self._db.commit()
+        # An upper bound on the row count (replaced rows are counted as new);
+        # recounted only when it crosses the cap.
+        (self._rows,) = self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+
+    def get_many(self, pathway: str, version: int, fingerprints: Iterable[str]) -> dict[str, Any]:
+        wanted = list(dict.fromkeys(fingerprints))
+        found: dict[str, Any] = {}
+        with self._lock:
+            for i in range(0, len(wanted), _CHUNK):
+                chunk = wanted[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for fp, verdict in self._db.execute(
+                    f"SELECT fingerprint, verdict FROM verdicts WHERE pathway = ? AND version = ? AND fingerprint IN ({marks})",
+                    (pathway, version, *chunk),
+                ):
+                    found[fp] = json.loads(verdict)
+        return found
+
+    def put_many(self, pathway: str, version: int, verdicts: dict[str, Any]) -> None:
+        if not verdicts:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO verdicts (pathway, version, fingerprint, verdict) VALUES (?, ?, ?, ?)",
+                [(pathway, version, fp, json.dumps(v, separators=(",", ":"))) for fp, v in verdicts.items()],
+            )
+            self._rows += len(verdicts)
+            if self._rows > self.max_rows:
+                (self._rows,) = self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+                if self._rows > self.max_rows:
+                    keep = int(self.max_rows * (1 - _PRUNE_SLACK))
+                    self._db.execute(
+                        "DELETE FROM verdicts WHERE rowid IN (SELECT rowid FROM verdicts ORDER BY rowid LIMIT ?)",
+                        (self._rows - keep,),
+                    )
+                    self._rows = keep
+            self._db.commit()
+
+    def record(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": True,
+                "path": self.path,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_STORES: dict[tuple[int, str], VerdictStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store() -> VerdictStore | None:
+    """The store for the configured path in this process, or None when disabled."""
+    settings = get_settings()
+    path = settings.arena_verdict_cache_path
+    if not path:
+        return None
+    key = (os.getpid(), path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = VerdictStore(path, settings.arena_verdict_cache_rows)
+        return store
+
+
+def stats() -> dict[str, Any]:
+    store = get_store()
+    return store.stats() if store is not None else {"enabled": False}
@@ -0,0 +1,3 @@
+"""Micro-benchmarks for the Arena sidecar's hot paths. Not collected by pytest;
+run one with e.g. ``python -m benchmarks.bench_inline_loader --encounters 5000``
+from the arena/ directory (pm4py installed). Each prints a small timing table."""
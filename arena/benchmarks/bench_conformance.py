@@ -0,0 +1,37 @@
+"""Conformance: the case × activity matrix engine vs the per-case reference loop,
+on an already-parsed log (sepsis, surgical-safety and home-hospital pathways)."""
+
+from __future__ import annotations
+
+import argparse
+
+from app import conformance
+from app.inline_ocel import build_ocel
+from app.pathways import PATHWAYS
+from benchmarks.synthetic import best_of, ocel_doc
+
+
+def _run(ocel, engine: str) -> None:
+    check = conformance._check_matrix if engine == "matrix" else conformance._check_one
+    shared = conformance._case_type_logs(ocel.events, ocel.relations, list(PATHWAYS.values()))
+    for key, spec in PATHWAYS.items():
+        check(conformance._pathway_rows(shared[spec["case_type"]], spec), spec, key, 8, per_case=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encounters", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'encounters':>10} {'events':>8} {'per-case s':>11} {'matrix s':>9} {'speed-up':>9}")
+    for n in args.encounters:
+        doc = ocel_doc(encounters=n)
+        ocel = build_ocel(doc)
+        old = best_of(lambda: _run(ocel, "per_case"), args.repeat)
+        new = best_of(lambda: _run(ocel, "matrix"), args.repeat)
+        print(f"{n:>10} {len(doc['events']):>8} {old:>11.3f} {new:>9.3f} {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
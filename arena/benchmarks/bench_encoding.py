@@ -0,0 +1,52 @@
+"""Dictionary-encoded identifiers: resident size and hot-path timings of the
+same log as parsed (string id columns) and after `app.encoding.encode_ocel`
+(categoricals over shared dictionaries)."""
+
+from __future__ import annotations
+
+import argparse
+
+from app import conformance, encoding, ocdfg, performance
+from app.cache import frame_nbytes
+from app.filters import EventTypeFilter, ObjectTypeFilter, apply_filters
+from app.inline_ocel import build_ocel
+from app.pathways import PATHWAYS
+from benchmarks.synthetic import best_of, ocel_doc
+
+CEILING = 72 * 3600
+
+
+def _size(ocel) -> int:
+    return frame_nbytes(ocel.events, ocel.objects, ocel.relations, ocel.o2o, ocel.e2e, ocel.object_changes)
+
+
+def _cases(ocel) -> dict:
+    return {
+        "filter": lambda: apply_filters(ocel, [EventTypeFilter(activities=["treat"], mode="exclude"), ObjectTypeFilter(object_types=["Encounter"])]),
+        "ocdfg": lambda: ocdfg.discover(ocel, ocdfg.object_types(ocel)),
+        "handoffs": lambda: performance._handoffs_native(ocel, None, 200, CEILING),
+        "sync": lambda: performance._synchronization(ocel, None, 200, CEILING),
+        "case logs": lambda: conformance._case_type_logs(ocel.events, ocel.relations, list(PATHWAYS.values())),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encounters", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'encounters':>10} {'step':>10} {'strings':>10} {'encoded':>10} {'ratio':>7}")
+    for n in args.encounters:
+        plain = build_ocel(ocel_doc(encounters=n))
+        encoded = encoding.encode_ocel(build_ocel(ocel_doc(encounters=n)))
+        before, after = _size(plain) / 2**20, _size(encoded) / 2**20
+        print(f"{n:>10} {'MiB':>10} {before:>10.1f} {after:>10.1f} {before / after:>6.1f}x")
+        for name, run in _cases(plain).items():
+            old = best_of(run, args.repeat)
+            new = best_of(_cases(encoded)[name], args.repeat)
+            print(f"{n:>10} {name:>10} {old:>9.3f}s {new:>9.3f}s {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
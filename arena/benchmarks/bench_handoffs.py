@@ -0,0 +1,37 @@
+"""Hand-off durations: the native single-pass engine vs the per-object-type
+flatten + shift loop, on an already-parsed log (caches cleared between runs so
+the pm4py path pays for its flattenings, as on a cold log)."""
+
+from __future__ import annotations
+
+import argparse
+
+from app import flattening, performance
+from app.inline_ocel import build_ocel
+from benchmarks.synthetic import best_of, ocel_doc
+
+CEILING = 72 * 3600
+
+
+def _pm4py(ocel) -> None:
+    flattening._FLATTENED.clear()
+    performance._handoffs_pm4py(ocel, None, 200, CEILING)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encounters", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'encounters':>10} {'events':>8} {'pm4py s':>9} {'native s':>9} {'speed-up':>9}")
+    for n in args.encounters:
+        doc = ocel_doc(encounters=n)
+        ocel = build_ocel(doc)
+        old = best_of(lambda: _pm4py(ocel), args.repeat)
+        new = best_of(lambda: performance._handoffs_native(ocel, None, 200, CEILING), args.repeat)
+        print(f"{n:>10} {len(doc['events']):>8} {old:>9.3f} {new:>9.3f} {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
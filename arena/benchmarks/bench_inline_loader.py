@@ -0,0 +1,42 @@
+"""Inline OCEL loading: the in-memory frame builder vs the old temp-file round
+trip (json.dump -> pm4py.read_ocel2_json)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+
+import pm4py
+
+from app.inline_ocel import build_ocel
+from benchmarks.synthetic import best_of, ocel_doc
+
+
+def _via_temp_file(doc: dict) -> object:
+    tmp = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8")
+    try:
+        json.dump(doc, tmp)
+        tmp.close()
+        return pm4py.read_ocel2_json(tmp.name)
+    finally:
+        os.unlink(tmp.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encounters", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'encounters':>10} {'events':>8} {'temp-file s':>12} {'in-memory s':>12} {'speed-up':>9}")
+    for n in args.encounters:
+        doc = ocel_doc(encounters=n)
+        old = best_of(lambda: _via_temp_file(doc), args.repeat)
+        new = best_of(lambda: build_ocel(doc), args.repeat)
+        print(f"{n:>10} {len(doc['events']):>8} {old:>12.3f} {new:>12.3f} {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Sampled vs exact OC-DFG and OC Petri-net discovery on an already-parsed
+resident log, with the share of exact counts the sampled intervals cover."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+
+from app import discovery, ocel_loader, petrinet
+from benchmarks.synthetic import best_of, ocel_doc
+
+TYPES = ["Encounter", "Patient"]
+
+
+def _coverage(exact: dict, sampled: dict) -> float:
+    truth = {n["id"]: n["frequency"] for n in exact["nodes"]}
+    truth.update({(e["source"], e["target"], e["object_type"]): e["frequency"] for e in exact["edges"]})
+    rows = sampled["nodes"] + sampled["edges"]
+    hits = sum(
+        r["frequency_ci"][0] <= truth[r["id"] if "id" in r else (r["source"], r["target"], r["object_type"])] <= r["frequency_ci"][1]
+        for r in rows
+    )
+    return hits / len(rows) if rows else 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encounters", type=int, nargs="+", default=[8000, 32000, 128000])
+    parser.add_argument("--max-objects", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sample = {"max_objects": args.max_objects}
+
+    print(f"{'encounters':>10} {'step':>12} {'exact s':>9} {'sampled s':>10} {'speed-up':>9} {'ci cover':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.encounters:
+            path = os.path.join(tmp, f"bench-{n}.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(ocel_doc(encounters=n), fh)
+            ocel_loader.read_ocel(path)
+            exact = discovery.discover(path, object_types=TYPES)
+            cover = _coverage(exact, discovery.discover(path, object_types=TYPES, sample=sample))
+            old = best_of(lambda: discovery.discover(path, object_types=TYPES), args.repeat)
+            new = best_of(lambda: discovery.discover(path, object_types=TYPES, sample=sample), args.repeat)
+            print(f"{n:>10} {'oc-dfg':>12} {old:>9.3f} {new:>10.3f} {old / new:>8.1f}x {cover:>9.2f}")
+            # Cold nets: the exact run would otherwise be served from the net store.
+            old = best_of(lambda: (ocel_loader.clear_caches(), petrinet.discover(path)), 1)
+            new = best_of(lambda: (ocel_loader.clear_caches(), petrinet.discover(path, sample=sample)), 1)
+            print(f"{n:>10} {'oc petri net':>12} {old:>9.3f} {new:>10.3f} {old / new:>8.1f}x {'':>9}")
+
+
+if __name__ == "__main__":
+    main()
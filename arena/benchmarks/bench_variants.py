@@ -0,0 +1,45 @@
+"""Variant-compressed replay fitness and OC Petri-net discovery vs pm4py on the
+flattened frames, on an already-parsed log (the flattening store is cleared
+between runs, so both paths pay for their flattenings and the variant path for
+its compression, as on a cold log)."""
+
+from __future__ import annotations
+
+import argparse
+
+from app import flattening, petrinet, replay
+from app.inline_ocel import build_ocel
+from benchmarks.synthetic import best_of, ocel_doc
+
+TYPES = ("Encounter", "Patient", "Bed")
+
+
+def _cold(fn):
+    def run():
+        flattening._FLATTENED.clear()
+        fn()
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encounters", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'encounters':>10} {'step':>16} {'variants':>9} {'pm4py s':>9} {'variant s':>10} {'speed-up':>9}")
+    for n in args.encounters:
+        ocel = build_ocel(ocel_doc(encounters=n))
+        for ot in TYPES:
+            distinct = len(flattening.variants(ocel, ot))
+            old = best_of(_cold(lambda: replay._fitness_pm4py(ocel, ot)), args.repeat)
+            new = best_of(_cold(lambda: replay._fitness_variants(ocel, ot)), args.repeat)
+            print(f"{n:>10} {'replay ' + ot:>16} {distinct:>9} {old:>9.3f} {new:>10.3f} {old / new:>8.1f}x")
+        old = best_of(_cold(lambda: petrinet._discover_ocpn(ocel)), args.repeat)
+        new = best_of(_cold(lambda: petrinet._discover_ocpn_variants(ocel)), args.repeat)
+        print(f"{n:>10} {'oc petri net':>16} {'':>9} {old:>9.3f} {new:>10.3f} {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
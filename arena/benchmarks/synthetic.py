@@ -0,0 +1,63 @@
+"""A synthetic, de-identified OCEL 2.0 document shaped like the ED export:
+Encounter lifecycles that share Beds and carry a Patient, plus sepsis-bundle
+activities on a share of encounters. Deterministic for a given seed."""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+ED_PATH = ["arrive", "triage", "assess", "place", "treat", "depart"]
+SEPSIS = ["sepsis_recognition", "lactate_order", "blood_culture_order", "antibiotic_administration", "repeat_lactate_result"]
+
+
+def ocel_doc(encounters: int = 1000, beds: int = 40, seed: int = 7) -> dict[str, Any]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    objects: list[dict[str, Any]] = [
+        {"id": f"bed-{b}", "type": "Bed", "attributes": [], "relationships": []} for b in range(beds)
+    ]
+    events: list[dict[str, Any]] = []
+    for n in range(encounters):
+        enc, pat, bed = f"enc-{n}", f"patient-{n}", f"bed-{rng.randrange(beds)}"
+        objects.append({"id": enc, "type": "Encounter", "attributes": [], "relationships": [{"objectId": pat, "qualifier": "of"}]})
+        objects.append({"id": pat, "type": "Patient", "attributes": [], "relationships": []})
+        t = start + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        path = list(ED_PATH)
+        if rng.random() < 0.1:
+            path.remove("treat")  # a variant
+        if rng.random() < 0.2:
+            path[3:3] = SEPSIS
+        for i, act in enumerate(path):
+            t += timedelta(minutes=rng.randrange(5, 120))
+            rels = [{"objectId": enc, "qualifier": "subject"}]
+            if act == "arrive":
+                rels.append({"objectId": pat, "qualifier": "patient"})
+            if act in ("place", "depart"):
+                rels.append({"objectId": bed, "qualifier": "resource"})
+            events.append({
+                "id": f"{enc}-e{i}",
+                "type": act,
+                "time": t.isoformat().replace("+00:00", "Z"),
+                "attributes": [{"name": "acuity", "value": f"ESI-{rng.randrange(1, 6)}"}],
+                "relationships": rels,
+            })
+    activities = sorted({e["type"] for e in events})
+    return {
+        "objectTypes": [{"name": t, "attributes": []} for t in ("Encounter", "Patient", "Bed")],
+        "eventTypes": [{"name": a, "attributes": [{"name": "acuity", "type": "string"}]} for a in activities],
+        "objects": objects,
+        "events": events,
+    }
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    """Best wall-clock seconds over `repeat` runs (min filters scheduler noise)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
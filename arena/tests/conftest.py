@@ -0,0 +1,45 @@
+"""Suite-wide fixtures: on-disk stores the sidecar would otherwise keep under
+/tmp (or leave disabled) are pointed at each test's own directory, so runs
+neither share nor accumulate state; tests that load exports from disk write
+them with ``write_export`` and opt into ``fresh_caches``."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app import ocel_loader, verdicts
+from app.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def _scratch_dirs(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "arena_snapshot_dir", str(tmp_path / "arena-snapshots"))
+    monkeypatch.setattr(settings, "arena_verdict_cache_path", str(tmp_path / "arena-verdicts.sqlite"))
+    monkeypatch.setattr(settings, "arena_net_store_dir", str(tmp_path / "arena-nets"))
+    yield
+    for key in [k for k in verdicts._STORES if k[1].startswith(str(tmp_path))]:
+        verdicts._STORES.pop(key).close()
+
+
+@pytest.fixture
+def write_export(tmp_path):
+    """Write an OCEL 2.0 document as ``<name>.json`` in the test's directory and
+    return its path."""
+
+    def _write(name: str, doc: dict) -> str:
+        p = tmp_path / f"{name}.json"
+        p.write_text(json.dumps(doc), encoding="utf-8")
+        return str(p)
+
+    return _write
+
+
+@pytest.fixture
+def fresh_caches():
+    """Empty the loader's in-process caches before and after the test."""
+    ocel_loader.clear_caches()
+    yield
+    ocel_loader.clear_caches()
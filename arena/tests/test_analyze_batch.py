@@ -0,0 +1,138 @@
+"""/analyze/batch: one load + one filter pass feeds every analysis, each result
+equals its synchronous endpoint's, and a failing analysis stays in its slot."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import ocel_loader, performance  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.synthetic import ocel_doc  # noqa: E402
+
+FILTERS = [{"kind": "event_type", "activities": ["treat"], "mode": "exclude"}]
+
+
+@pytest.fixture
+def export(tmp_path) -> str:
+    ocel_loader.clear_caches()
+    p = tmp_path / "batch-export.json"
+    p.write_text(json.dumps(ocel_doc(encounters=120, beds=8, seed=11)), encoding="utf-8")
+    return str(p)
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_batch_results_match_the_individual_endpoints(client, export) -> None:
+    analyses = [
+        {"kind": "discover", "params": {"activity_min_freq": 2}},
+        {"kind": "performance", "params": {"top": 5}},
+        {"kind": "conformance", "params": {}},
+        {"kind": "replay", "id": "fitness", "params": {"object_types": ["Encounter"]}},
+    ]
+    res = client.post("/analyze/batch", json={"ocel_path": export, "filters": FILTERS, "analyses": analyses})
+    assert res.status_code == 200
+    body = res.json()
+    assert [r["id"] for r in body["results"]] == ["discover", "performance", "conformance", "fitness"]
+    assert all(r["status"] == "ok" for r in body["results"])
+    assert set(body["timings"]) == {"load", "filter", "analyses", "total"}
+
+    for spec, got in zip(analyses, body["results"]):
+        path = {"discover": "/discover", "performance": "/performance", "conformance": "/conformance", "replay": "/replay"}[spec["kind"]]
+        single = client.post(path, json={"ocel_path": export, "filters": FILTERS, **spec["params"]})
+        assert single.status_code == 200
+        assert _without_cache_use(got["result"]) == _without_cache_use(single.json())
+
+
+def _without_cache_use(result):
+    # Verdict-cache hits/misses describe each call (the second one hits).
+    if isinstance(result, list):
+        return [{k: v for k, v in item.items() if k != "verdict_cache"} for item in result]
+    return result
+
+
+def test_batch_reads_and_filters_once(client, export) -> None:
+    analyses = [{"kind": k} for k in ("discover", "performance", "conformance", "ocel/summary")]
+    assert client.post("/analyze/batch", json={"ocel_path": export, "filters": FILTERS, "analyses": analyses}).status_code == 200
+    stats = ocel_loader.cache_stats()
+    assert (stats["ocel"]["misses"], stats["ocel"]["hits"]) == (1, 0)
+    assert (stats["filtered"]["misses"], stats["filtered"]["hits"]) == (1, 0)
+
+
+def test_a_failing_analysis_does_not_sink_the_batch(client, export, monkeypatch) -> None:
+    def broken(*_args, **_kwargs):
+        raise ValueError("synthetic failure")
+
+    monkeypatch.setattr(performance, "analyze", broken)
+    body = client.post(
+        "/analyze/batch", json={"ocel_path": export, "analyses": [{"kind": "performance"}, {"kind": "discover"}]}
+    ).json()
+    failed, ok = body["results"]
+    assert failed["status"] == "error" and failed["error"]["status_code"] == 500
+    assert "synthetic failure" in failed["error"]["detail"]
+    assert ok["status"] == "ok" and ok["result"]["stats"]["nodes"] > 0
+
+
+def test_batch_validates_every_spec_up_front(client, export) -> None:
+    def post(analyses):
+        return client.post("/analyze/batch", json={"ocel_path": export, "analyses": analyses}).status_code
+
+    assert post([]) == 422
+    assert post([{"kind": "discover", "params": {"filters": FILTERS}}]) == 422
+    assert post([{"kind": "discover", "params": {"engine": "quantum"}}]) == 422
+    assert post([{"kind": "copilot/model-fitness"}]) == 422
+    assert client.post("/analyze/batch", json={"ocel_path": "/nope.json", "analyses": [{"kind": "discover"}]}).status_code == 422
+
+
+def test_clients_cannot_name_a_lent_log(client, export) -> None:
+    from app.ocel_loader import INLINE_PREFIX, read_ocel
+
+    with ocel_loader.lend(read_ocel(export)) as token:
+        assert token.startswith(INLINE_PREFIX)
+        batch = client.post("/analyze/batch", json={"ocel_path": token, "analyses": [{"kind": "discover"}]})
+        assert batch.status_code == 422
+        assert client.post("/discover", json={"ocel_path": token}).status_code == 422
+        job = client.post("/jobs", json={"kind": "ocel/summary", "request": {"ocel_path": token}})
+        assert job.status_code == 422
+
+
+def test_concurrent_batches_share_one_bounded_pool(export, monkeypatch) -> None:
+    import threading
+
+    from app import executor
+    from app.config import get_settings
+    from app.routers import analyze
+
+    monkeypatch.setattr(get_settings(), "arena_batch_workers", 2)
+    executor.shutdown()  # rebuilt at the new size
+    threads: set[str] = set()
+    real = analyze._run_one
+
+    def _spy(*args):
+        threads.add(threading.current_thread().name)
+        return real(*args)
+
+    monkeypatch.setattr(analyze, "_run_one", _spy)
+    kind = analyze.KINDS["ocel/summary"]
+    planned = [(f"s{i}", "ocel/summary", kind.args(kind.model())) for i in range(4)]
+    results: list[dict] = []
+    batches = [
+        threading.Thread(target=lambda: results.extend(analyze.batch_job(export, None, [], planned)["results"]))
+        for _ in range(3)
+    ]
+    for t in batches:
+        t.start()
+    for t in batches:
+        t.join()
+    executor.shutdown()
+    assert len(results) == 12 and all(r["status"] == "ok" for r in results)
+    assert len(threads) <= 2
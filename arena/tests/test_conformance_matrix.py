@@ -0,0 +1,163 @@
+"""The vectorized conformance engine (pathway rules compiled from the declarative
+DSL, evaluated over a case × activity matrix) must return exactly
+what the per-case reference engine returns — counts, ranked deviations, samples,
+per-case verdicts and timelines — on the fixtures and on randomized logs that
+exercise every rule (missing steps, ties, repeated activities, mixed-type and
+missing attributes, cases off the pathway)."""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import conformance, ocel_loader  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.pathways import PATHWAYS  # noqa: E402
+from app.rules import compile_rules, rule_labels  # noqa: E402
+from tests.test_conformance import FIXTURE as CONFORMANCE_FIXTURE  # noqa: E402
+from tests.test_home_hospital_conformance import FIXTURE as HOME_FIXTURE  # noqa: E402
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _random_doc(seed: int, cases: int = 60) -> dict:
+    rng = random.Random(seed)
+    objects, events = [], []
+
+    def ev(activity: str, t: datetime, oid: str, attrs: dict | None = None) -> None:
+        events.append({
+            "id": f"e{len(events)}",
+            "type": activity,
+            "time": t.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "attributes": [{"name": k, "value": v} for k, v in (attrs or {}).items()],
+            "relationships": [{"objectId": oid, "qualifier": "subject"}],
+        })
+
+    for n in range(cases):
+        t0 = START + timedelta(hours=rng.randrange(24 * 60))
+        enc, orc, home = f"enc-{n:03d}", f"or-{n:03d}", f"home-{n:03d}"
+        objects += [
+            {"id": enc, "type": "Encounter", "attributes": [], "relationships": []},
+            {"id": orc, "type": "OR Case", "attributes": [], "relationships": []},
+            {"id": home, "type": "Home Episode", "attributes": [], "relationships": []},
+        ]
+        # Sepsis: random subset/order of the bundle, sometimes off-pathway.
+        for act in PATHWAYS["sepsis"]["activities"]:
+            if act == "sepsis_recognition" and rng.random() < 0.15:
+                continue
+            for _ in range(rng.choice([0, 1, 1, 1, 2])):
+                ev(act, t0 + timedelta(minutes=rng.choice([0, 0, 30, 90, 200, 400])), enc)
+        # Surgical safety: 1-4 checks with mixed statuses (incl. missing).
+        for _ in range(rng.randrange(1, 5)):
+            status = rng.choice(["Complete", "done", "flagged", None, 1])
+            ev("Safety_Check", t0 + timedelta(minutes=rng.randrange(120)), orc, {} if status is None else {"status": status})
+        # Home hospital: SLA, cadence with/without waiver flags, escalations.
+        refer = t0
+        ev("home-refer", refer, home)
+        if rng.random() < 0.9:
+            activate = refer + timedelta(hours=rng.choice([2, 20, 30]))
+            ev("home-activate", activate, home)
+            days = rng.randrange(0, 5)
+            for d in range(days * 2):
+                attrs = {}
+                if rng.random() < 0.5:
+                    attrs["waiver_required"] = rng.choice([True, False, "yes", "no", "1"])
+                if rng.random() < 0.8:
+                    ev("home-visit-complete", activate + timedelta(hours=12 * d + 1), home, attrs)
+            for _ in range(rng.randrange(0, 3)):
+                opened = activate + timedelta(hours=rng.randrange(1, 48))
+                ev("home-escalation-open", opened, home)
+                if rng.random() < 0.8:
+                    response = rng.choice([10, 25, 45, "n/a", "12"])
+                    ev("home-escalation-resolve", opened + timedelta(minutes=20), home, {"response_minutes": response})
+            if rng.random() < 0.7:
+                ev("home-discharge", activate + timedelta(days=days, hours=rng.randrange(0, 20)), home)
+
+    return {
+        "objectTypes": [{"name": t, "attributes": []} for t in ("Encounter", "OR Case", "Home Episode")],
+        "eventTypes": [],
+        "objects": objects,
+        "events": events,
+    }
+
+
+DOCS = {
+    "conformance": CONFORMANCE_FIXTURE,
+    "home_hospital": HOME_FIXTURE,
+    **{f"random-{seed}": _random_doc(seed) for seed in (1, 2, 3)},
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches(fresh_caches, monkeypatch):
+    # Both engines must evaluate every case here, not read stored verdicts.
+    monkeypatch.setattr(get_settings(), "arena_verdict_cache_path", "")
+    yield
+
+
+def _path(tmp_path, name: str) -> str:
+    p = tmp_path / f"{name}.json"
+    p.write_text(json.dumps(DOCS[name]), encoding="utf-8")
+    return str(p)
+
+
+@pytest.mark.parametrize("name", sorted(DOCS))
+def test_matrix_engine_matches_the_per_case_engine(tmp_path, name: str) -> None:
+    path = _path(tmp_path, name)
+    matrix = conformance.check(path, per_case=True, engine="matrix")
+    reference = conformance.check(path, per_case=True, engine="per_case")
+    assert matrix == reference
+    # Insertion order of every timeline is part of the contract too.
+    for got, want in zip(matrix, reference):
+        for a, b in zip(got["case_results"], want["case_results"]):
+            assert list(a["activity_timeline"]) == list(b["activity_timeline"])
+
+
+@pytest.mark.parametrize("name", ["random-1", "random-2"])
+def test_matrix_engine_matches_with_sampling_and_case_selection(tmp_path, name: str) -> None:
+    path = _path(tmp_path, name)
+    kwargs = {"sample_limit": 3, "per_case": True, "case_ids": ["enc-004", "or-010", "home-020", "nope"]}
+    assert conformance.check(path, engine="matrix", **kwargs) == conformance.check(path, engine="per_case", **kwargs)
+
+
+def test_random_logs_exercise_every_deviation_code(tmp_path) -> None:
+    seen: set[str] = set()
+    for name in ("random-1", "random-2", "random-3"):
+        for result in conformance.check(_path(tmp_path, name)):
+            seen |= {d["code"] for d in result["deviations"]}
+    assert seen == {code for spec in PATHWAYS.values() for code in spec["deviation_labels"]}
+
+
+@pytest.mark.parametrize("engine", ["matrix", "per_case"])
+def test_pathways_sharing_a_case_type_share_one_sub_log(tmp_path, monkeypatch, engine: str) -> None:
+    # A second Encounter pathway over an overlapping activity set.
+    rules = [
+        {"kind": "present", "activity": "lactate_result", "code": "no_lactate_result"},
+        {"kind": "order", "before": "lactate_order", "after": "vitals_sirs", "code": "lactate_before_vitals"},
+    ]
+    monkeypatch.setitem(PATHWAYS, "sirs", {
+        "label": "SIRS screen", "version": 1, "owner": "test", "case_type": "Encounter", "trigger": "vitals_sirs",
+        "activities": ["vitals_sirs", "lactate_order", "lactate_result"], "rules": rules,
+        "evaluate_matrix": compile_rules(rules), "deviation_labels": rule_labels(rules),
+    })
+    merges = []
+    real = conformance._case_type_logs
+    monkeypatch.setattr(conformance, "_case_type_logs", lambda ev, rel, specs: merges.append(len(specs)) or real(ev, rel, specs))
+
+    path = _path(tmp_path, "random-1")
+    together = conformance.check(path, per_case=True, engine=engine)
+    assert merges == [len(PATHWAYS)]
+    assert len(real(*_frames(path), list(PATHWAYS.values()))) == 3  # one frame per case type
+    alone = [conformance.check(path, pathway_key=key, per_case=True, engine=engine)[0] for key in PATHWAYS]
+    assert together == alone
+    assert together[-1]["cases"] > 0
+
+
+def _frames(path: str):
+    ocel = ocel_loader.read_ocel(path)
+    return ocel.events, ocel.relations
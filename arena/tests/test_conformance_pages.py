@@ -0,0 +1,125 @@
+"""/conformance/cases: cursor pages and the NDJSON stream cover exactly the
+per-case verdicts of a one-shot check, the full result is evaluated once for
+all pages, and a cursor is bound to the export and the query it was issued for."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import conformance, ocel_loader  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.test_conformance_matrix import DOCS  # noqa: E402
+
+
+@pytest.fixture
+def export(tmp_path) -> str:
+    ocel_loader.clear_caches()
+    p = tmp_path / "export.json"
+    p.write_text(json.dumps(DOCS["random-1"]), encoding="utf-8")
+    return str(p)
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _expected(export: str, **kwargs) -> list[dict]:
+    return [
+        {"pathway": r["pathway"], **case}
+        for r in conformance.check(export, per_case=True, **kwargs)
+        for case in r["case_results"]
+    ]
+
+
+def _all_pages(client, body: dict) -> list[dict]:
+    rows, cursor = [], None
+    while True:
+        res = client.post("/conformance/cases", json={**body, "cursor": cursor})
+        assert res.status_code == 200
+        page = res.json()
+        assert len(page["case_results"]) <= body["page_size"]
+        rows += page["case_results"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            assert page["total_cases"] == len(rows)
+            return rows
+
+
+def test_pages_cover_every_case_once_and_evaluate_once(client, export, monkeypatch) -> None:
+    calls = []
+    real = conformance._check_log
+    monkeypatch.setattr(conformance, "_check_log", lambda *a: calls.append(1) or real(*a))
+
+    rows = _all_pages(client, {"ocel_path": export, "page_size": 7})
+    assert len(calls) == 1
+    assert rows == _expected(export)
+    assert len(rows) > 7 * 3
+
+    first = client.post("/conformance/cases", json={"ocel_path": export, "page_size": 7}).json()
+    one_shot = conformance.check(export)
+    assert [{**p, "verdict_cache": None} for p in first["pathways"]] == [{**r, "verdict_cache": None} for r in one_shot]
+
+
+def test_pages_for_one_pathway_and_selected_cases(client, export) -> None:
+    wanted = ["enc-001", "enc-004", "enc-017", "enc-040", "home-001"]
+    rows = _all_pages(client, {"ocel_path": export, "pathway": "sepsis", "case_ids": wanted, "page_size": 2})
+    assert rows == _expected(export, pathway_key="sepsis", case_ids=wanted)
+
+
+def test_ndjson_streams_aggregates_then_cases(client, export) -> None:
+    res = client.post("/conformance/cases", json={"ocel_path": export, "format": "ndjson"})
+    assert res.status_code == 200 and res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    kinds = [line.pop("kind") for line in lines]
+    assert kinds == ["pathway"] * 3 + ["case"] * (len(lines) - 4) + ["end"]
+    assert lines[3:-1] == _expected(export)
+    assert lines[-1] == {"total_cases": len(lines) - 4, "next_cursor": None}
+
+    # A bounded stream hands back a cursor; a JSON page resumes from it.
+    head = client.post("/conformance/cases", json={"ocel_path": export, "format": "ndjson", "page_size": 10})
+    end = json.loads(head.text.splitlines()[-1])
+    rest = client.post("/conformance/cases", json={"ocel_path": export, "cursor": end["next_cursor"], "page_size": 10_000})
+    assert rest.json()["case_results"] == _expected(export)[10:]
+
+
+def test_cursors_are_bound_to_their_export_and_query(client, export) -> None:
+    cursor = client.post("/conformance/cases", json={"ocel_path": export, "page_size": 5}).json()["next_cursor"]
+    assert client.post("/conformance/cases", json={"ocel_path": export, "cursor": "not-a-cursor"}).status_code == 422
+    assert client.post("/conformance/cases", json={"ocel_path": export, "pathway": "sepsis", "cursor": cursor}).status_code == 422
+    # Another filter pipeline or case selection is another query, not another export.
+    filters = [{"kind": "event_type", "activities": ["treat"], "mode": "exclude"}]
+    assert client.post("/conformance/cases", json={"ocel_path": export, "filters": filters, "cursor": cursor}).status_code == 422
+    assert client.post("/conformance/cases", json={"ocel_path": export, "case_ids": ["enc-001"], "cursor": cursor}).status_code == 422
+    assert client.post("/conformance/cases", json={"ocel_path": export, "cursor": cursor}).status_code == 200
+
+    st = os.stat(export)
+    os.utime(export, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))  # a new export of the same path
+    assert client.post("/conformance/cases", json={"ocel_path": export, "cursor": cursor}).status_code == 410
+
+
+def test_a_foreign_cursor_is_refused_before_evaluation(client, export, monkeypatch) -> None:
+    cursor = client.post("/conformance/cases", json={"ocel_path": export, "page_size": 5}).json()["next_cursor"]
+    ocel_loader.clear_caches()
+    calls = []
+    real = conformance._check_log
+    monkeypatch.setattr(conformance, "_check_log", lambda *a: calls.append(1) or real(*a))
+    assert client.post("/conformance/cases", json={"ocel_path": export, "cursor": "not-a-cursor"}).status_code == 422
+    assert client.post("/conformance/cases", json={"ocel_path": export, "pathway": "sepsis", "cursor": cursor}).status_code == 422
+    assert calls == []
+
+
+def test_inline_cursors_are_bound_to_the_document(client) -> None:
+    rows = _all_pages(client, {"ocel": DOCS["random-1"], "page_size": 9})
+    assert len(rows) > 9
+    cursor = client.post("/conformance/cases", json={"ocel": DOCS["random-1"], "page_size": 9}).json()["next_cursor"]
+    assert client.post("/conformance/cases", json={"ocel": DOCS["random-1"], "cursor": cursor}).status_code == 200
+    assert client.post("/conformance/cases", json={"ocel": DOCS["random-2"], "cursor": cursor}).status_code == 422
@@ -0,0 +1,87 @@
+"""/copilot/fitness/batch scores N candidate models against one log: each
+verdict equals the single-model gate's, while the log's real per-type DFGs and
+replayed nets are built once for the whole batch."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import copilot, flattening, ocel_loader, replay  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.test_copilot import FIXTURE, REAL_EDGES, ocel_path  # noqa: E402,F401
+
+PROPOSALS = [
+    REAL_EDGES,
+    [{"object_type": "Encounter", "source": "admit", "target": "depart"},
+     {"object_type": "Ward", "source": "open", "target": "close"}],
+    REAL_EDGES[:1] + [{"object_type": "Bed", "source": "place", "target": "place"}],
+    [],
+]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "arena_ai_enabled", True)
+    ocel_loader.clear_caches()
+    with TestClient(app) as c:
+        yield c
+
+
+def test_batch_verdicts_equal_single_model_verdicts(ocel_path: str) -> None:
+    batch = copilot.model_fitness_batch(ocel_path, PROPOSALS, fitness_floor=0.4)
+    assert batch == [copilot.model_fitness(ocel_path, p, fitness_floor=0.4) for p in PROPOSALS]
+    assert [v["published"] for v in batch] == [True, False, True, False]
+    assert batch[3]["reason"] == "empty_model"
+    crosses = copilot.structural_cross_check_batch(ocel_path, PROPOSALS)
+    assert crosses == [copilot.structural_cross_check(ocel_path, p) for p in PROPOSALS]
+
+
+def test_each_real_dfg_and_replay_runs_once_per_batch(ocel_path: str, monkeypatch) -> None:
+    dfgs: list = []
+    replays: list = []
+    real_dfg, real_replay = flattening.dfg, replay.fitness
+    monkeypatch.setattr(flattening, "dfg", lambda ocel, ot, *a, **kw: dfgs.append(ot) or real_dfg(ocel, ot, *a, **kw))
+    monkeypatch.setattr(replay, "fitness", lambda *a, **kw: replays.append(kw) or real_replay(*a, **kw))
+    copilot.model_fitness_batch(ocel_path, PROPOSALS * 8)
+    copilot.structural_cross_check_batch(ocel_path, PROPOSALS * 8)
+    assert sorted(dfgs) == ["Bed", "Encounter"]
+    assert len(replays) == 1
+
+
+def test_per_proposal_floors_override_the_batch_floor(ocel_path: str) -> None:
+    half = REAL_EDGES[:1]
+    verdicts = copilot.model_fitness_batch(ocel_path, [half, half], fitness_floor=[0.4, None])
+    assert [v["published"] for v in verdicts] == [True, False]
+
+
+def test_batch_endpoint(client) -> None:
+    body = {
+        "ocel": FIXTURE,
+        "fitness_floor": 0.8,
+        "proposals": [{"id": "faithful", "proposed_edges": REAL_EDGES}, {"proposed_edges": PROPOSALS[1]},
+                      {"proposed_edges": REAL_EDGES[:1], "fitness_floor": 0.4}],
+    }
+    r = client.post("/copilot/fitness/batch", json=body)
+    assert r.status_code == 200
+    verdicts = r.json()["verdicts"]
+    assert [v["id"] for v in verdicts] == ["faithful", "1", "2"]
+    assert [v["published"] for v in verdicts] == [True, False, True]
+    single = client.post("/copilot/model-fitness", json={"ocel": FIXTURE, "proposed_edges": PROPOSALS[1], "fitness_floor": 0.8})
+    assert {k: v for k, v in verdicts[1].items() if k != "id"} == single.json()
+    assert verdicts[1]["structural_warnings"][0]["reason"] == "no_events_in_log"
+
+
+def test_batch_limits_and_gate(client, monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "arena_ai_batch_max_proposals", 2)
+    over = {"ocel": FIXTURE, "proposals": [{"proposed_edges": REAL_EDGES}] * 3}
+    assert client.post("/copilot/fitness/batch", json=over).status_code == 422
+    assert client.post("/jobs", json={"kind": "copilot/fitness/batch", "request": over}).status_code == 422
+    assert client.post("/copilot/fitness/batch", json={"ocel": FIXTURE, "proposals": []}).status_code == 422
+    monkeypatch.setattr(get_settings(), "arena_ai_enabled", False)
+    assert client.post("/copilot/fitness/batch", json={"ocel": FIXTURE, "proposals": [{}]}).status_code == 404
+    assert client.post("/jobs", json={"kind": "copilot/fitness/batch", "request": {}}).status_code == 404
@@ -0,0 +1,111 @@
+"""The unpruned OC-DFG is mined once per resident log and filter set; every
+activity_min_freq is then a slice of it equal to pruning a fresh map, and a
+threshold ladder comes back as slices of one response."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import dfg_levels, discovery, ocdfg, ocel_loader  # noqa: E402
+from app.filters import EventTypeFilter  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("fresh_caches")
+
+
+@pytest.fixture
+def mined(monkeypatch) -> list:
+    calls: list = []
+    real = ocdfg.discover
+
+    def _spy(ocel, types):
+        calls.append(types)
+        return real(ocel, types)
+
+    monkeypatch.setattr(ocdfg, "discover", _spy)
+    return calls
+
+
+def _pruned_fresh(path: str, min_freq: int) -> tuple[list, list]:
+    """Mine and prune the way /discover did before the map was cached."""
+    ocel = ocel_loader.read_ocel(path)
+    node_freq, node_ots, edges = ocdfg.discover(ocel, ocdfg.object_types(ocel))
+    nodes = [
+        {"id": a, "activity": a, "frequency": f, "object_types": sorted(node_ots[a])}
+        for a, f in node_freq.items() if f >= min_freq
+    ]
+    kept = {n["id"] for n in nodes}
+    edges = [e for e in edges if e["source"] in kept and e["target"] in kept]
+    return sorted(nodes, key=lambda n: -n["frequency"]), sorted(edges, key=lambda e: -e["frequency"])
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_every_threshold_equals_pruning_a_fresh_map(write_export, name: str) -> None:
+    path = write_export(name, FIXTURES[name])
+    top = max(n["frequency"] for n in discovery.discover(path, activity_min_freq=0)["nodes"])
+    for min_freq in range(0, top + 2):
+        result = discovery.discover(path, activity_min_freq=min_freq)
+        assert (result["nodes"], result["edges"]) == _pruned_fresh(path, min_freq)
+
+
+def test_moving_the_slider_does_not_re_mine(write_export, mined: list) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    for min_freq in (1, 50, 5, 1000, 1):
+        discovery.discover(path, activity_min_freq=min_freq)
+    assert len(mined) == 1
+    discovery.discover(path, object_types=["Encounter"])
+    discovery.discover(path, filters=[EventTypeFilter(activities=["arrive", "depart"])])
+    assert len(mined) == 3
+    assert ocel_loader.cache_stats()["dfg_graphs"]["hits"] == 4
+
+
+def test_responses_do_not_share_the_cached_graph(write_export) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    first = discovery.discover(path)
+    first["nodes"][0]["frequency"] = -1
+    first["nodes"][0]["object_types"].append("Intruder")
+    first["edges"].clear()
+    again = discovery.discover(path)
+    assert again["nodes"][0]["frequency"] > 0 and again["edges"]
+    assert "Intruder" not in again["nodes"][0]["object_types"]
+
+
+def test_level_index_lists_are_capped_and_charged_up_front() -> None:
+    nodes = [{"id": f"a{i}", "activity": f"a{i}", "frequency": i + 1, "object_types": ["T"]} for i in range(200)]
+    edges = [{"source": f"a{i}", "target": f"a{i + 1}", "object_type": "T", "frequency": 1} for i in range(199)]
+    levels = dfg_levels.GraphLevels(nodes, edges)
+    charged = levels.nbytes
+    assert charged >= dfg_levels.MAX_LEVELS * 8 * len(edges)
+    for min_freq in range(1, 202):
+        assert levels.prune(min_freq)[0] == sorted(nodes, key=lambda n: -n["frequency"])[: 201 - min_freq]
+    assert len(levels._levels) == dfg_levels.MAX_LEVELS
+    assert levels.nbytes == charged
+
+
+def test_ladder_rungs_are_slices_of_the_response(write_export) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    rungs = [0, 2, 10, 40, 10**6]
+    result = discovery.discover(path, activity_min_freq=2, ladder=rungs)
+    assert [r["activity_min_freq"] for r in result["ladder"]] == rungs
+    for rung in result["ladder"]:
+        alone = discovery.discover(path, activity_min_freq=max(rung["activity_min_freq"], 2))
+        assert result["nodes"][: rung["nodes"]] == alone["nodes"]
+        assert [result["edges"][i] for i in rung["edges"]] == alone["edges"]
+    # A rung below the response's own threshold is raised to it.
+    assert result["ladder"][0] == dict(result["ladder"][1], activity_min_freq=0)
+    assert result["ladder"][0]["nodes"] == len(result["nodes"])
+    assert result["ladder"][-1] == {"activity_min_freq": 10**6, "nodes": 0, "edges": []}
+
+
+def test_route_returns_a_ladder(tmp_path) -> None:
+    client = TestClient(app)
+    body = {"ocel": FIXTURES["synthetic"], "ladder": [1, 20]}
+    r = client.post("/discover", json=body).json()
+    assert [rung["activity_min_freq"] for rung in r["ladder"]] == [1, 20]
+    assert client.post("/discover", json={"ocel": FIXTURES["synthetic"]}).json()["ladder"] is None
+    assert client.post("/discover", json={**body, "ladder": [-1]}).status_code == 422
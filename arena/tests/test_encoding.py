@@ -0,0 +1,90 @@
+"""Dictionary-encoded identifiers: a loaded log shares one dictionary per id
+family across its frames, integer-coded joins and masks agree with the string
+operations they replace, and every analysis returns the same result with the
+encoding stage on or off."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import conformance, discovery, encoding, ocel_loader, performance, petrinet, replay  # noqa: E402
+from app.cache import frame_nbytes  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.filters import EventTypeFilter, ObjectTypeFilter, apply_filters  # noqa: E402
+from tests.test_conformance_matrix import DOCS  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+FILTERS = [EventTypeFilter(activities=["treat"], mode="exclude"), ObjectTypeFilter(object_types=["Encounter", "Bed"])]
+
+
+def _read(path: str, encode: bool, monkeypatch):
+    ocel_loader.clear_caches()
+    monkeypatch.setattr(get_settings(), "arena_encode_ids", encode)
+    return ocel_loader.read_ocel(path)
+
+
+def test_loaded_logs_share_one_dictionary_per_family(write_export, monkeypatch) -> None:
+    ocel = _read(write_export("synthetic", FIXTURES["synthetic"]), True, monkeypatch)
+    eids = ocel.events["ocel:eid"].cat.categories
+    assert ocel.relations["ocel:eid"].cat.categories is eids
+    assert ocel.relations["ocel:oid"].cat.categories is ocel.objects["ocel:oid"].cat.categories
+    assert list(ocel.objects["ocel:type"].cat.categories) == sorted(ocel.objects["ocel:type"].astype(str).unique())
+    assert list(eids) == sorted(ocel.events["ocel:eid"].astype(str))
+
+    # The shared dictionary is counted once in the resident size.
+    plain = encoding.decoded(ocel)
+    assert frame_nbytes(ocel.events, ocel.relations) < frame_nbytes(plain.events, plain.relations)
+
+
+def test_coded_joins_and_masks_match_string_operations(write_export, monkeypatch) -> None:
+    ocel = _read(write_export("synthetic", FIXTURES["synthetic"]), True, monkeypatch)
+    events, relations = ocel.events, ocel.relations
+    some = events["ocel:eid"].iloc[::7]
+    as_str = relations["ocel:eid"].astype(str)
+    assert np.array_equal(encoding.member(relations["ocel:eid"], some), as_str.isin(set(some.astype(str))).to_numpy())
+    assert np.array_equal(
+        encoding.positions(events["ocel:eid"].iloc[::3], relations["ocel:eid"]),
+        pd.Index(events["ocel:eid"].iloc[::3].astype(str)).get_indexer(as_str),
+    )
+
+
+def test_filtered_frames_match_the_string_log(write_export, monkeypatch) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    encoded = apply_filters(_read(path, True, monkeypatch), FILTERS)
+    plain = apply_filters(_read(path, False, monkeypatch), FILTERS)
+    for name in ("events", "objects", "relations", "o2o", "e2e", "object_changes"):
+        pd.testing.assert_frame_equal(encoding.decode_frame(getattr(encoded, name)), getattr(plain, name), check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda p: discovery.discover(p, engine="native"),
+        lambda p: discovery.discover(p, engine="pm4py", filters=FILTERS),
+        lambda p: performance.analyze(p, top=200),
+        lambda p: performance.analyze(p, top=200, engine="pm4py", filters=FILTERS),
+        lambda p: replay.fitness(p),
+        # Petri-net node ids are random per run: compare the net's shape.
+        lambda p: {k: v for k, v in petrinet.discover(p).items() if k != "nets"},
+    ],
+    ids=["discover", "discover-pm4py", "performance", "performance-pm4py", "replay", "petrinet"],
+)
+def test_analyses_are_unchanged_by_encoding(write_export, monkeypatch, run) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    _read(path, True, monkeypatch)
+    encoded = run(path)
+    _read(path, False, monkeypatch)
+    assert encoded == run(path)
+
+
+def test_conformance_is_unchanged_by_encoding(write_export, monkeypatch) -> None:
+    path = write_export("random-1", DOCS["random-1"])
+    results = []
+    for encode in (True, False):
+        _read(path, encode, monkeypatch)
+        results.append(conformance.check(path, per_case=True, verdict_cache=False))
+    assert results[0] == results[1]
@@ -0,0 +1,71 @@
+"""Event indexes: on a resident log the time / activity / attribute filters
+read lazily built indexes and return exactly the masks of a full scan, each
+piece is built once per log, and unfingerprinted logs keep scanning."""
+
+from __future__ import annotations
+
+import copy
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import event_index, ocel_loader  # noqa: E402
+from app.filters import EventAttributeFilter, EventTypeFilter, TimeFrameFilter  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+FILTERS = [
+    TimeFrameFilter(start="2026-01-02T00:00:00Z"),
+    TimeFrameFilter(end="2026-01-03T12:00:00+02:00"),
+    TimeFrameFilter(start="2026-01-02T00:00:00", end="2026-01-02T06:00:00Z"),
+    TimeFrameFilter(start="2030-01-01T00:00:00Z"),
+    TimeFrameFilter(),
+    EventTypeFilter(activities=["arrive", "depart", "nope"]),
+    EventTypeFilter(activities=["treat"], mode="exclude"),
+    EventTypeFilter(activities=[]),
+    EventAttributeFilter(name="acuity", values=["ESI-1", "ESI-5"]),
+    EventAttributeFilter(name="acuity", values=["ESI-2"], mode="exclude"),
+    EventAttributeFilter(name="missing", values=["x"]),
+]
+
+
+@pytest.fixture
+def ocel(tmp_path):
+    ocel_loader.clear_caches()
+    doc = copy.deepcopy(FIXTURES["synthetic"])
+    for ev in doc["events"][::5]:
+        ev["attributes"] = []  # events without the attribute (NA)
+    p = tmp_path / "synthetic.json"
+    p.write_text(json.dumps(doc), encoding="utf-8")
+    return ocel_loader.read_ocel(str(p))
+
+
+def _scan(f, ocel, monkeypatch) -> pd.Series:
+    with monkeypatch.context() as m:
+        m.setattr(event_index._INDEXES, "max_bytes", 0)
+        return f.mask(ocel).events
+
+
+@pytest.mark.parametrize("f", FILTERS, ids=[f"{f.kind}-{i}" for i, f in enumerate(FILTERS)])
+def test_indexed_masks_equal_full_scans(ocel, monkeypatch, f) -> None:
+    expected = _scan(f, ocel, monkeypatch)
+    got = f.mask(ocel).events
+    assert got.index.equals(expected.index)
+    assert got.tolist() == expected.fillna(False).astype(bool).tolist()
+
+
+def test_each_piece_is_built_once_per_log(ocel) -> None:
+    for f in FILTERS * 2:
+        f.mask(ocel)
+    stats = ocel_loader.cache_stats()["event_index"]
+    assert stats["misses"] == 3  # time, activity, attribute "acuity"
+    assert stats["entries"] == 3 and stats["hits"] > 0
+
+
+def test_unfingerprinted_logs_are_scanned(ocel) -> None:
+    twin = copy.copy(ocel)  # same frames, no registered fingerprint
+    assert event_index.time_index(twin) is None
+    f = EventTypeFilter(activities=["arrive"])
+    assert f.mask(twin).events.tolist() == f.mask(ocel).events.tolist()
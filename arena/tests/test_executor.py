@@ -0,0 +1,156 @@
+"""Mining executor: heavy jobs run off the event loop, each endpoint is bounded
+(concurrency + queue) and rejects past that with 429 + Retry-After, and /health
+keeps answering while a discovery is in flight."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import discovery, executor  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import DiscoverRequest  # noqa: E402
+from app.routers.discover import discover_job  # noqa: E402
+from tests.test_discovery import FIXTURE  # noqa: E402
+
+
+def _blocking_job(gate: threading.Event, value: int) -> int:
+    assert gate.wait(10), "test gate never opened"
+    return value
+
+
+def test_lane_queues_then_rejects_with_retry_after() -> None:
+    pool = executor.MiningExecutor(kind="thread", workers=2, concurrency=1, queue=1)
+    gate = threading.Event()
+
+    async def scenario():
+        first = asyncio.create_task(pool.run("discover", _blocking_job, gate, 1))
+        second = asyncio.create_task(pool.run("discover", _blocking_job, gate, 2))
+        await asyncio.sleep(0.05)
+        lane = pool.stats()["lanes"]["discover"]
+        assert (lane["running"], lane["waiting"]) == (1, 1)
+
+        with pytest.raises(executor.MiningRejected) as rejected:
+            await pool.run("discover", _blocking_job, gate, 3)
+        assert rejected.value.status_code == 429
+        assert rejected.value.retry_after >= 1
+
+        # Another endpoint has its own lane and is still admitted.
+        other = asyncio.create_task(pool.run("performance", _blocking_job, gate, 4))
+        gate.set()
+        return await asyncio.gather(first, second, other)
+
+    try:
+        assert asyncio.run(scenario()) == [1, 2, 4]
+        assert pool.stats()["lanes"]["discover"]["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_a_cancelled_request_keeps_its_slot_until_the_job_ends() -> None:
+    pool = executor.MiningExecutor(kind="thread", workers=2, concurrency=1, queue=0)
+    gate = threading.Event()
+
+    async def scenario():
+        request = asyncio.create_task(pool.run("discover", _blocking_job, gate, 1))
+        await asyncio.sleep(0.05)
+        request.cancel()  # the client went away; the pool thread did not
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        assert pool.stats()["lanes"]["discover"]["running"] == 1
+        with pytest.raises(executor.MiningRejected):
+            await pool.run("discover", _blocking_job, gate, 2)
+        gate.set()
+        for _ in range(100):
+            if pool.stats()["lanes"]["discover"]["running"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.stats()["lanes"]["discover"]["running"] == 0
+        return await pool.run("discover", _blocking_job, gate, 3)
+
+    try:
+        assert asyncio.run(scenario()) == 3
+        assert pool.stats()["lanes"]["discover"]["completed"] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_job_exceptions_propagate() -> None:
+    pool = executor.MiningExecutor(kind="thread", workers=1)
+
+    def boom() -> None:
+        raise ValueError("bad input")
+
+    try:
+        with pytest.raises(ValueError, match="bad input"):
+            asyncio.run(pool.run("discover", boom))
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_runs_a_real_discovery() -> None:
+    pool = executor.MiningExecutor(kind="process", workers=1)
+    req = DiscoverRequest(ocel=FIXTURE)
+    try:
+        result = asyncio.run(pool.run("discover", discover_job, req, None, []))
+    finally:
+        pool.shutdown()
+    assert result["stats"]["nodes"] > 0
+
+
+def test_health_answers_while_a_discovery_runs(monkeypatch) -> None:
+    started, release = threading.Event(), threading.Event()
+    real = discovery.discover
+
+    def slow_discover(*args, **kwargs):
+        started.set()
+        release.wait(10)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(discovery, "discover", slow_discover)
+    with TestClient(app) as client:
+        outcome: dict = {}
+        worker = threading.Thread(target=lambda: outcome.update(res=client.post("/discover", json={"ocel": FIXTURE})))
+        worker.start()
+        try:
+            assert started.wait(10)
+            health = client.get("/health")
+            assert health.status_code == 200
+            assert health.json()["executor"]["lanes"]["discover"]["running"] == 1
+        finally:
+            release.set()
+            worker.join(10)
+    assert outcome["res"].status_code == 200
+
+
+def test_saturated_route_returns_429_with_retry_after(monkeypatch) -> None:
+    pool = executor.MiningExecutor(kind="thread", workers=1, concurrency=1, queue=0)
+    monkeypatch.setattr(executor, "_EXECUTOR", pool)
+    started, release = threading.Event(), threading.Event()
+    real = discovery.discover
+
+    def slow_discover(*args, **kwargs):
+        started.set()
+        release.wait(10)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(discovery, "discover", slow_discover)
+    with TestClient(app) as client:
+        outcome: dict = {}
+        worker = threading.Thread(target=lambda: outcome.update(res=client.post("/discover", json={"ocel": FIXTURE})))
+        worker.start()
+        try:
+            assert started.wait(10)
+            rejected = client.post("/discover", json={"ocel": FIXTURE})
+            assert rejected.status_code == 429
+            assert int(rejected.headers["Retry-After"]) >= 1
+        finally:
+            release.set()
+            worker.join(10)
+    assert outcome["res"].status_code == 200
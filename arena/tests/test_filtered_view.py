@@ -0,0 +1,104 @@
+"""Lazy filtered views: `apply_filters` returns a drop-in pm4py OCEL whose frames
+equal the eager string-set pipeline's, are sliced only when first read, and
+select rows by integer position on encoded and plain logs alike."""
+
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pm4py")
+
+from pm4py.objects.ocel.obj import OCEL as PMOCEL  # noqa: E402
+
+from app import conformance, encoding, ocel_loader, performance  # noqa: E402
+from app.filters import (  # noqa: E402
+    EventAttributeFilter,
+    EventTypeFilter,
+    FilteredOCEL,
+    ObjectTypeFilter,
+    TimeFrameFilter,
+    apply_filters,
+)
+from tests.test_filters import _toy_ocel_with_graph  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+PIPELINES = [
+    [EventTypeFilter(activities=["treat"], mode="exclude")],
+    [ObjectTypeFilter(object_types=["Patient"], mode="exclude"), TimeFrameFilter(end="2026-01-03T00:00:00Z")],
+    [EventAttributeFilter(name="acuity", values=["ESI-1", "ESI-2"]), ObjectTypeFilter(object_types=["Encounter", "Patient"])],
+    [EventTypeFilter(activities=["nothing"])],
+]
+
+
+def _eager(ocel, pipeline) -> dict[str, pd.DataFrame]:
+    """The pre-view pipeline: string-set membership and six sliced frames."""
+    plain = encoding.decoded(ocel)
+    ev = pd.Series(True, index=plain.events.index)
+    ob = pd.Series(True, index=plain.objects.index)
+    for f in pipeline:
+        res = f.mask(plain)
+        ev &= res.events if res.events is not None else True
+        ob &= res.objects if res.objects is not None else True
+    oids = set(plain.objects.loc[ob, "ocel:oid"])
+    rel = plain.relations[plain.relations["ocel:oid"].isin(oids) & plain.relations["ocel:eid"].isin(set(plain.events.loc[ev, "ocel:eid"]))]
+    eids = set(rel["ocel:eid"])
+    frames = {
+        "events": plain.events[plain.events["ocel:eid"].isin(eids)],
+        "objects": plain.objects[ob],
+        "relations": rel,
+        "o2o": plain.o2o[plain.o2o["ocel:oid"].isin(oids) & plain.o2o["ocel:oid_2"].isin(oids)],
+        "e2e": plain.e2e[plain.e2e["ocel:eid"].isin(eids) & plain.e2e["ocel:eid_2"].isin(eids)],
+        "object_changes": plain.object_changes[plain.object_changes["ocel:oid"].isin(oids)],
+    }
+    return {k: v.reset_index(drop=True) for k, v in frames.items()}
+
+
+def _assert_same(view, expected: dict[str, pd.DataFrame]) -> None:
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(encoding.decode_frame(getattr(view, name)), frame, check_dtype=False)
+
+
+@pytest.fixture
+def resident(tmp_path):
+    ocel_loader.clear_caches()
+    p = tmp_path / "synthetic.json"
+    p.write_text(json.dumps(FIXTURES["synthetic"]), encoding="utf-8")
+    return ocel_loader.read_ocel(str(p))
+
+
+@pytest.mark.parametrize("i", range(len(PIPELINES)))
+def test_view_frames_equal_the_eager_pipeline(resident, i: int) -> None:
+    view = apply_filters(resident, PIPELINES[i])
+    assert isinstance(view, FilteredOCEL) and isinstance(view, PMOCEL)
+    _assert_same(view, _eager(resident, PIPELINES[i]))
+
+
+def test_unencoded_logs_with_o2o_e2e_and_changes() -> None:
+    base = _toy_ocel_with_graph()
+    e2e = pd.DataFrame({"ocel:eid": ["e1", "e2"], "ocel:eid_2": ["e2", "e3"], "ocel:qualifier": ["then", "then"]})
+    ocel = PMOCEL(
+        events=base.events, objects=base.objects, relations=base.relations,
+        o2o=base.o2o, e2e=e2e, object_changes=base.object_changes,
+    )
+    for pipeline in (
+        [ObjectTypeFilter(object_types=["Bed"], mode="exclude")],
+        [EventTypeFilter(activities=["admit"], mode="exclude")],
+        [TimeFrameFilter(start="2026-01-01T01:00:00Z"), ObjectTypeFilter(object_types=["Patient"], mode="exclude")],
+    ):
+        _assert_same(apply_filters(ocel, pipeline), _eager(ocel, pipeline))
+
+
+def test_frames_are_sliced_on_first_access(resident, tmp_path) -> None:
+    view = apply_filters(resident, PIPELINES[0])
+    assert view._frames == {}
+    conformance._case_type_logs(view.events, view.relations, list(conformance.PATHWAYS.values()))
+    performance._synchronization(view, None, 25, 72 * 3600)
+    assert set(view._frames) == {"events", "relations"}
+    assert view.events is view.events  # materialized once
+
+    # Filtering a view composes like filtering its frames.
+    again = apply_filters(view, [TimeFrameFilter(start="2026-01-02T00:00:00Z")])
+    _assert_same(again, _eager(view, [TimeFrameFilter(start="2026-01-02T00:00:00Z")]))
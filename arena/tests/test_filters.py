@@ -7,6 +7,8 @@ dropped, object filters prune relations, and filters AND-compose.
 
 from __future__ import annotations
 
+import json
+
 import pandas as pd
 import pytest
 
@@ -19,6 +21,7 @@ from app.filters import (  # noqa: E402
     ObjectTypeFilter,
     TimeFrameFilter,
     apply_filters,
+    filter_hash,
     parse_filters,
 )
 
@@ -144,3 +147,70 @@ def test_filter_prunes_o2o_and_object_changes_to_surviving_objects():
     assert set(ocel.o2o["ocel:oid_2"]) == {"pat1"}
     assert "bed1" not in set(ocel.object_changes["ocel:oid"])
     assert "enc1" in set(ocel.object_changes["ocel:oid"])
+
+
+def test_filter_hash_is_canonical_and_order_independent():
+    a = [EventTypeFilter(activities=["admit"]), ObjectTypeFilter(object_types=["Bed"], mode="exclude")]
+    b = parse_filters(
+        [
+            {"mode": "exclude", "object_types": ["Bed"], "kind": "object_type"},
+            {"kind": "event_type", "activities": ["admit"]},
+        ]
+    )
+    assert filter_hash(a) == filter_hash(b)
+    assert filter_hash(a) != filter_hash([EventTypeFilter(activities=["triage"])])
+    assert filter_hash([]) == filter_hash(None) == "-"
+
+
+def test_filtered_log_of_a_resident_export_is_memoized(tmp_path):
+    from app import ocel_loader
+    from tests.test_discovery import FIXTURE
+
+    ocel_loader.clear_caches()
+    path = tmp_path / "memo.json"
+    path.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    base = ocel_loader.read_ocel(str(path))
+
+    first = apply_filters(base, [EventTypeFilter(activities=["admit", "place"])])
+    again = apply_filters(base, parse_filters([{"kind": "event_type", "activities": ["admit", "place"]}]))
+    assert again is first
+    assert ocel_loader.cache_stats()["filtered"]["hits"] == 1
+    assert ocel_loader.ocel_fingerprint(first).startswith(ocel_loader.ocel_fingerprint(base) + "/")
+
+    # Rewriting the export drops the filtered entries derived from the old parse.
+    path.write_text(json.dumps(dict(FIXTURE, events=FIXTURE["events"][:2])), encoding="utf-8")
+    ocel_loader.read_ocel(str(path))
+    assert ocel_loader.cache_stats()["filtered"]["entries"] == 0
+
+
+def test_uncached_logs_are_never_memoized():
+    ocel = _toy_ocel()
+    flt = [EventTypeFilter(activities=["triage"])]
+    assert apply_filters(ocel, flt) is not apply_filters(ocel, flt)
+
+
+def test_views_of_an_evicted_parse_are_released(tmp_path, monkeypatch):
+    from app import ocel_loader
+    from tests.test_discovery import FIXTURE
+
+    ocel_loader.clear_caches()
+    paths = []
+    for name in ("first", "second"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(FIXTURE), encoding="utf-8")
+        paths.append(str(path))
+    base = ocel_loader.read_ocel(paths[0])
+
+    # The base's frames are measured when it is parsed, not once per view.
+    measured = []
+    real = ocel_loader.frame_sizes
+    monkeypatch.setattr(ocel_loader, "frame_sizes", lambda *f: measured.append(1) or real(*f))
+    apply_filters(base, [EventTypeFilter(activities=["admit"])])
+    apply_filters(base, [EventTypeFilter(activities=["place"])])
+    assert measured == []
+    assert ocel_loader.cache_stats()["filtered"]["entries"] == 2
+
+    monkeypatch.setattr(ocel_loader._PARSED, "max_entries", 1)
+    ocel_loader.read_ocel(paths[1])
+    assert ocel_loader.cache_stats()["ocel"]["evictions"] == 1
+    assert ocel_loader.cache_stats()["filtered"]["entries"] == 0
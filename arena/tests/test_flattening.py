@@ -0,0 +1,94 @@
+"""Shared flattening store: discovery followed by performance on one resident log
+flattens each object type once; filtered views and inline logs key separately."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import discovery, flattening, ocel_loader, performance  # noqa: E402
+from app.filters import EventTypeFilter  # noqa: E402
+from app.inline_ocel import build_ocel  # noqa: E402
+from tests.test_performance import FIXTURE  # noqa: E402
+
+
+@pytest.fixture
+def ocel_path(tmp_path) -> str:
+    ocel_loader.clear_caches()
+    p = tmp_path / "flatten-fixture.json"
+    p.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    return str(p)
+
+
+def test_discover_then_performance_reuses_every_flattening(ocel_path: str) -> None:
+    discovery.discover(ocel_path, engine="pm4py")
+    after_discover = ocel_loader.cache_stats()["flattened"]
+    assert after_discover["entries"] == 2  # Encounter + Bed
+
+    performance.analyze(ocel_path, engine="pm4py")
+    after_performance = ocel_loader.cache_stats()["flattened"]
+    assert after_performance["misses"] == after_discover["misses"]
+    assert after_performance["hits"] > after_discover["hits"]
+
+
+def test_filtered_logs_flatten_under_their_own_key(ocel_path: str) -> None:
+    discovery.discover(ocel_path, engine="pm4py")
+    discovery.discover(ocel_path, filters=[EventTypeFilter(activities=["admit", "place"])], engine="pm4py")
+    assert ocel_loader.cache_stats()["flattened"]["entries"] == 4
+
+
+def test_callers_cannot_corrupt_the_shared_frame(ocel_path: str) -> None:
+    ocel = ocel_loader.read_ocel(ocel_path)
+    flat = flattening.flatten(ocel, "Encounter")
+    flat["scratch"] = 1
+    assert "scratch" not in flattening.flatten(ocel, "Encounter").columns
+    dfg, _sa, _ea = flattening.dfg(ocel, "Encounter")
+    assert dfg[("admit", "place")] == 2
+
+
+def test_inline_logs_flatten_each_type_once_per_log_object(monkeypatch) -> None:
+    calls: list[str] = []
+    real = flattening.pm4py.ocel_flattening
+
+    def _spy(ocel, object_type):
+        calls.append(object_type)
+        return real(ocel, object_type)
+
+    monkeypatch.setattr(flattening.pm4py, "ocel_flattening", _spy)
+    ocel = build_ocel(FIXTURE)
+    assert ocel_loader.ocel_fingerprint(ocel) is None
+    flattening.flatten(ocel, "Encounter")
+    flattening.dfg(ocel, "Encounter")
+    flattening.variants(ocel, "Encounter")
+    assert calls == ["Encounter"]
+    flattening.flatten(build_ocel(FIXTURE), "Encounter")
+    assert calls == ["Encounter", "Encounter"]
+
+
+def test_lazy_fields_lock_per_entry_and_are_charged(ocel_path: str, monkeypatch) -> None:
+    ocel = ocel_loader.read_ocel(ocel_path)
+    flattening.flatten(ocel, "Encounter")
+    flattening.flatten(ocel, "Bed")
+    before = ocel_loader.cache_stats()["flattened"]["bytes"]
+
+    # Compressing one type's variants does not hold up another type's DFG.
+    gate, entered = threading.Event(), threading.Event()
+    real = flattening.variant_tables.compress
+    monkeypatch.setattr(flattening.variant_tables, "compress", lambda f: (entered.set(), gate.wait(10), real(f))[2])
+    slow = threading.Thread(target=flattening.variants, args=(ocel, "Encounter"))
+    slow.start()
+    assert entered.wait(10)
+    try:
+        assert flattening.dfg(ocel, "Bed")[0]
+    finally:
+        gate.set()
+        slow.join()
+
+    grown = ocel_loader.cache_stats()["flattened"]["bytes"]
+    assert grown > before
+    flattening.dfg(ocel, "Encounter")
+    assert ocel_loader.cache_stats()["flattened"]["bytes"] > grown
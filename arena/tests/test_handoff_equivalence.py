@@ -0,0 +1,49 @@
+"""The single-pass hand-off engine must reproduce the per-type pm4py flatten +
+shift loop exactly — same rows, same rounded statistics, same order — on every
+fixture, on type subsets and filtered views, and on a synthetic ED-shaped log
+with shared Beds and timestamp ties."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import performance  # noqa: E402
+from app.filters import EventTypeFilter, ObjectTypeFilter  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("fresh_caches")
+
+
+def _handoffs(path: str, engine: str, **kwargs) -> list[dict]:
+    return performance.analyze(path, top=10_000, engine=engine, **kwargs)["handoffs"]
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_native_matches_pm4py(write_export, name: str) -> None:
+    path = write_export(name, FIXTURES[name])
+    native = _handoffs(path, "native")
+    assert native == _handoffs(path, "pm4py")
+    assert native or name == "copilot"
+
+
+def test_native_matches_pm4py_with_type_subset_and_top(write_export) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    for kwargs in ({"object_types": ["Bed"]}, {"object_types": ["Encounter", "Nope"]}, {"object_types": []}):
+        assert _handoffs(path, "native", **kwargs) == _handoffs(path, "pm4py", **kwargs)
+    top = performance.analyze(path, top=3, engine="native")["handoffs"]
+    assert top == performance.analyze(path, top=3, engine="pm4py")["handoffs"]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [EventTypeFilter(activities=["arrive", "place", "depart"])],
+        [EventTypeFilter(activities=["treat"], mode="exclude")],
+        [ObjectTypeFilter(object_types=["Encounter"])],
+    ],
+)
+def test_native_matches_pm4py_on_filtered_logs(write_export, filters) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    assert _handoffs(path, "native", filters=filters) == _handoffs(path, "pm4py", filters=filters)
@@ -0,0 +1,109 @@
+"""In-memory construction of inline OCEL docs: the frames equal what
+`pm4py.read_ocel2_json` produces from the same doc on disk, and inline requests
+no longer touch the filesystem."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+import pandas as pd  # noqa: E402
+import pm4py  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import ocel_loader  # noqa: E402
+from app.inline_ocel import build_ocel  # noqa: E402
+from app.main import app  # noqa: E402
+from tests import test_conformance, test_home_hospital_conformance, test_performance  # noqa: E402
+
+EDGE_CASES = {
+    "objectTypes": [{"name": "A", "attributes": [{"name": "w", "type": "integer"}, {"name": "ok", "type": "boolean"}]}],
+    "eventTypes": [{"name": "x", "attributes": [{"name": "n", "type": "float"}, {"name": "d", "type": "date"}]}],
+    "objects": [
+        {
+            "id": "a1",
+            "type": "A",
+            "attributes": [
+                {"name": "w", "value": "3", "time": "1970-01-01T00:00:00Z"},
+                {"name": "w", "value": "5", "time": "2026-01-01T00:00:00Z"},  # -> object_changes
+            ],
+            "relationships": [{"objectId": "a2", "qualifier": "peer"}],
+        },
+        {"id": "a2", "type": "A", "attributes": [{"name": "w", "value": "3.0"}, {"name": "ok", "value": " TRUE "}]},
+        {"id": "a3", "type": "A", "attributes": [{"name": "w", "value": 4}, {"name": "ok", "value": 0}]},
+        {"id": "a4", "type": "A"},  # touched by no event -> dropped
+    ],
+    "events": [
+        {
+            "id": "e1",
+            "type": "x",
+            "time": "2026-01-01T00:00:00+02:00",
+            "attributes": [
+                {"name": "n", "value": "1.5"},
+                {"name": "d", "value": "2026-01-01T00:00:00Z"},
+                {"name": "s", "value": "null"},
+            ],
+            "relationships": [
+                {"objectId": "a1", "qualifier": "q"},
+                {"objectId": "a1", "qualifier": "q2"},  # duplicate link: last qualifier wins
+                {"objectId": "zz", "qualifier": "q"},  # unknown object: ignored
+            ],
+        },
+        {
+            "id": "e0",
+            "type": "x",
+            "time": "2025-12-31T00:00:00",
+            "attributes": [
+                {"name": "n", "value": "abc"},  # not a float: kept verbatim
+                {"name": "d", "value": "Jan 5 2026"},  # not ISO: dateutil's fallback
+                {"name": "s", "value": 7},
+            ],
+            "relationships": [{"objectId": "a2", "qualifier": "q"}],
+        },
+        {
+            "id": "e2",
+            "type": "x",
+            "time": "2025-12-31T00:00:00",
+            "attributes": [{"name": "n", "value": 2}, {"name": "d", "value": "NULL"}],
+            "relationships": [{"objectId": "a3", "qualifier": "q"}],
+        },
+        {"id": "e9", "type": "x", "time": "2025-12-31T00:00:00"},  # touches nothing -> dropped
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [test_conformance.FIXTURE, test_home_hospital_conformance.FIXTURE, test_performance.FIXTURE, EDGE_CASES],
+)
+def test_frames_match_the_pm4py_json_importer(doc, tmp_path) -> None:
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    expected = pm4py.read_ocel2_json(str(path))
+    built = build_ocel(doc)
+
+    for name in ("events", "objects", "o2o", "e2e", "object_changes"):
+        pd.testing.assert_frame_equal(getattr(built, name), getattr(expected, name))
+    # pm4py orders one event's relations via a set, so only the rows are contractual.
+    key = ["ocel:eid", "ocel:oid"]
+    pd.testing.assert_frame_equal(
+        built.relations.sort_values(key).reset_index(drop=True),
+        expected.relations.sort_values(key).reset_index(drop=True),
+    )
+
+
+def test_inline_source_resolves_to_an_in_memory_log(monkeypatch) -> None:
+    monkeypatch.setattr(pm4py, "read_ocel2_json", lambda *_a, **_k: pytest.fail("inline doc hit the JSON importer"))
+    with ocel_loader.resolve_ocel_path(None, test_performance.FIXTURE) as handle:
+        assert handle.startswith(ocel_loader.INLINE_PREFIX)
+        assert len(ocel_loader.read_ocel(handle).events) == len(test_performance.FIXTURE["events"])
+    with pytest.raises(OSError):
+        ocel_loader.read_ocel(handle)  # released on exit
+
+
+def test_malformed_inline_doc_is_a_clean_422() -> None:
+    res = TestClient(app).post("/ocel/summary", json={"ocel": {"events": [{"type": "x"}]}})
+    assert res.status_code == 422
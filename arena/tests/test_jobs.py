@@ -0,0 +1,117 @@
+"""Background job API: submit → poll → result returns exactly the synchronous
+endpoint's body; identical submissions share one job; finished jobs expire."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import jobs  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.test_discovery import FIXTURE  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(jobs, "_STORE", jobs.JobStore(ttl_seconds=3600, max_jobs=16))
+    with TestClient(app) as c:
+        yield c
+
+
+def _wait(client: TestClient, job_id: str) -> dict:
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] in ("succeeded", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_discover_job_result_matches_the_synchronous_endpoint(client) -> None:
+    submitted = client.post("/jobs", json={"kind": "discover", "request": {"ocel": FIXTURE}})
+    assert submitted.status_code == 202
+    body = submitted.json()
+    assert body["status"] in ("queued", "running", "succeeded")
+    assert submitted.headers["Location"] == f"/jobs/{body['id']}"
+
+    status = _wait(client, body["id"])
+    assert status["status"] == "succeeded" and status["progress"] == 1.0
+
+    result = client.get(body["result_url"])
+    assert result.status_code == 200
+    assert result.json() == client.post("/discover", json={"ocel": FIXTURE}).json()
+
+
+def test_identical_submissions_share_one_job(client) -> None:
+    first = client.post("/jobs", json={"kind": "discover", "request": {"ocel": FIXTURE}}).json()
+    second = client.post("/jobs", json={"kind": "discover", "request": {"ocel": FIXTURE}}).json()
+    assert second["id"] == first["id"] and second["deduplicated"] is True
+
+    other = client.post("/jobs", json={"kind": "discover", "request": {"ocel": FIXTURE, "activity_min_freq": 2}}).json()
+    assert other["id"] != first["id"]
+    assert client.get("/health").json()["jobs"]["deduplicated"] == 1
+
+
+def test_a_rewritten_export_is_a_new_job(client, tmp_path) -> None:
+    p = tmp_path / "export.json"
+    p.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    first = client.post("/jobs", json={"kind": "ocel/summary", "request": {"ocel_path": str(p)}}).json()
+    _wait(client, first["id"])
+
+    p.write_text(json.dumps(FIXTURE) + " ", encoding="utf-8")
+    second = client.post("/jobs", json={"kind": "ocel/summary", "request": {"ocel_path": str(p)}}).json()
+    assert second["id"] != first["id"]
+
+
+def test_a_rewritten_default_export_is_a_new_job(client, tmp_path, monkeypatch) -> None:
+    from app.config import get_settings
+
+    p = tmp_path / "nightly-export.json"
+    p.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    monkeypatch.setattr(get_settings(), "arena_ocel_export_path", str(p))
+    first = client.post("/jobs", json={"kind": "ocel/summary", "request": {}}).json()
+    _wait(client, first["id"])
+    again = client.post("/jobs", json={"kind": "ocel/summary", "request": {}}).json()
+    assert again["id"] == first["id"]
+
+    p.write_text(json.dumps(FIXTURE) + " ", encoding="utf-8")  # the nightly rewrite
+    second = client.post("/jobs", json={"kind": "ocel/summary", "request": {}}).json()
+    assert second["id"] != first["id"]
+
+
+def test_replay_job(client) -> None:
+    job = client.post("/jobs", json={"kind": "replay", "request": {"ocel": FIXTURE}}).json()
+    assert _wait(client, job["id"])["status"] == "succeeded"
+    result = client.get(job["result_url"]).json()
+    assert {row["object_type"] for row in result["by_object_type"]} == {"Encounter", "Bed"}
+
+
+def test_failed_job_reports_the_endpoint_status(client) -> None:
+    job = client.post("/jobs", json={"kind": "discover", "request": {"ocel_path": "/nonexistent/export.json"}}).json()
+    status = _wait(client, job["id"])
+    assert status["status"] == "failed" and status["error"]["status_code"] == 422
+    assert client.get(job["result_url"]).status_code == 422
+
+
+def test_invalid_requests_are_rejected_before_queueing(client) -> None:
+    assert client.post("/jobs", json={"kind": "discover", "request": {"activity_min_freq": -1}}).status_code == 422
+    assert client.post("/jobs", json={"kind": "discover", "request": {"filters": [{"kind": "nope"}]}}).status_code == 422
+    assert client.post("/jobs", json={"kind": "mine-everything", "request": {}}).status_code == 422
+    assert client.post("/jobs", json={"kind": "copilot/model-fitness", "request": {}}).status_code == 404
+    assert client.get("/jobs/does-not-exist").status_code == 404
+
+
+def test_finished_jobs_expire(client, monkeypatch) -> None:
+    job = client.post("/jobs", json={"kind": "ocel/summary", "request": {"ocel": FIXTURE}}).json()
+    _wait(client, job["id"])
+    monkeypatch.setattr(jobs.get_store(), "ttl_seconds", 0)
+    time.sleep(0.01)
+    assert client.get(f"/jobs/{job['id']}").status_code == 404
+    assert client.get(job["result_url"]).status_code == 404
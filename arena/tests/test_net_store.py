@@ -0,0 +1,178 @@
+"""Per-object-type Petri nets are mined once per (log, filters, miner, noise,
+type): replay, the OC Petri net and the copilot cross-check reuse them from
+memory, a fresh process reads them from disk, and a rewritten export drops them."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import copilot, net_store, ocel_loader, petrinet, replay, variants  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.filters import EventTypeFilter  # noqa: E402
+from tests.test_performance import FIXTURE  # noqa: E402
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch) -> str:
+    root = tmp_path / "nets"
+    monkeypatch.setattr(get_settings(), "arena_net_store_dir", str(root))
+    ocel_loader.clear_caches()
+    net_store.clear()
+    yield str(root)
+    ocel_loader.clear_caches()
+    net_store.clear()
+
+
+@pytest.fixture
+def ocel_path(tmp_path) -> str:
+    p = tmp_path / "nets-fixture.json"
+    p.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    return str(p)
+
+
+@pytest.fixture
+def mined(monkeypatch) -> list:
+    calls: list = []
+    real = variants.discover_petri_net
+
+    def _spy(table, *args, **kwargs):
+        calls.append(kwargs)
+        return real(table, *args, **kwargs)
+
+    monkeypatch.setattr(variants, "discover_petri_net", _spy)
+    return calls
+
+
+def _stored(root: str) -> list[str]:
+    return sorted(f for _dir, _sub, files in os.walk(root) for f in files if f.endswith(".pnml"))
+
+
+def test_replay_and_cross_check_mine_each_type_once(store_dir: str, ocel_path: str, mined: list) -> None:
+    first = replay.fitness(ocel_path)
+    assert len(mined) == len(first["by_object_type"]) == 2  # Encounter + Bed
+    assert replay.fitness(ocel_path) == first
+    copilot.structural_cross_check(ocel_path, [{"object_type": "Encounter", "source": "admit", "target": "place"}])
+    assert len(mined) == 2
+    assert ocel_loader.cache_stats()["petri_nets"]["hits"] >= 3
+    assert len(_stored(store_dir)) == 2
+
+
+def test_a_fresh_process_reads_nets_from_disk(store_dir: str, ocel_path: str, mined: list) -> None:
+    first = replay.fitness(ocel_path)
+    ocel_loader.clear_caches()  # a restarted worker: empty memory, same disk
+    net_store.clear()
+    assert replay.fitness(ocel_path) == first
+    assert len(mined) == 2
+    assert net_store.stats() == {"loaded": 2, "written": 0, "failed": 0, "enabled": True}
+
+
+def test_miner_noise_and_filters_key_separately(store_dir: str, ocel_path: str, mined: list) -> None:
+    ocel = ocel_loader.read_ocel(ocel_path)
+    im = net_store.petri_net(ocel, "Encounter")
+    assert net_store.petri_net(ocel, "Encounter", noise_threshold=0) is im
+    assert net_store.petri_net(ocel, "Encounter", miner="ocpn") is not im
+    assert net_store.petri_net(ocel, "Encounter", noise_threshold=0.2) is not im
+    replay.fitness(ocel_path, filters=[EventTypeFilter(activities=["admit", "place"])])
+    assert len(mined) == 3 + 2
+    assert len(_stored(store_dir)) == 5
+    assert net_store.petri_net(ocel, "Nope") is None
+
+
+def test_petrinet_discover_reuses_its_nets(store_dir: str, ocel_path: str, mined: list) -> None:
+    first = petrinet.discover(ocel_path)
+    assert {tuple(sorted(k)) for k in mined} == {("disable_fallthroughs", "disable_strict_sequence_cut", "noise_threshold")}
+    again = petrinet.discover(ocel_path)
+    assert len(mined) == 2
+    assert again["stats"] == first["stats"]
+
+
+def test_an_unreadable_net_is_mined_again(store_dir: str, ocel_path: str, mined: list) -> None:
+    first = replay.fitness(ocel_path, object_types=["Encounter"])
+    (path,) = [os.path.join(d, f) for d, _s, files in os.walk(store_dir) for f in files if f.endswith(".pnml")]
+    with open(path, "wb") as fh:
+        fh.write(b"<pnml><truncated")
+    ocel_loader.clear_caches()
+    assert replay.fitness(ocel_path, object_types=["Encounter"]) == first
+    assert len(mined) == 2
+    assert net_store.stats()["failed"] == 1
+
+
+def _chain_log(root: str, length: int) -> str:
+    events = [
+        {"id": f"e{i}", "type": f"step{i:03d}", "time": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}Z", "attributes": [],
+         "relationships": [{"objectId": "enc1", "qualifier": "subject"}]}
+        for i in range(length)
+    ]
+    doc = {
+        "objectTypes": [{"name": "Encounter", "attributes": []}],
+        "eventTypes": [{"name": e["type"], "attributes": []} for e in events],
+        "objects": [{"id": "enc1", "type": "Encounter", "attributes": [], "relationships": []}],
+        "events": events,
+    }
+    path = os.path.join(os.path.dirname(root), "chain.json")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+    return path
+
+
+def _signature(triple) -> tuple:
+    net, im, fm = triple
+    return (
+        sorted((t.name, t.label) for t in net.transitions),
+        sorted((a.source.name, a.target.name, a.weight) for a in net.arcs),
+        sorted((p.name, n) for p, n in im.items()),
+        sorted((p.name, n) for p, n in fm.items()),
+    )
+
+
+def test_a_long_sequential_net_round_trips_through_disk(store_dir: str) -> None:
+    # Deep enough (80+ steps) that pickling the arc graph would overflow the stack.
+    ocel = ocel_loader.read_ocel(_chain_log(store_dir, 100))
+    triple = net_store.petri_net(ocel, "Encounter")
+    ocel_loader.clear_caches()
+    ocel = ocel_loader.read_ocel(_chain_log(store_dir, 100))
+    again = net_store.petri_net(ocel, "Encounter")
+    assert net_store.stats()["loaded"] == 1
+    assert _signature(again) == _signature(triple)
+
+
+def test_disk_tier_can_be_disabled(store_dir: str, ocel_path: str, monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "arena_net_store_dir", "")
+    replay.fitness(ocel_path)
+    assert not os.path.exists(store_dir)
+    assert net_store.stats()["enabled"] is False
+
+
+def test_a_rewritten_export_drops_its_stored_nets(store_dir: str, ocel_path: str) -> None:
+    replay.fitness(ocel_path)
+    assert _stored(store_dir)
+    st = os.stat(ocel_path)
+    os.utime(ocel_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    ocel_loader.read_ocel(ocel_path)
+    assert not _stored(store_dir)
+
+
+def test_startup_sweeps_nets_of_exports_superseded_while_down(store_dir: str, ocel_path: str, tmp_path) -> None:
+    replay.fitness(ocel_path)
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    replay.fitness(str(other))
+    old_layout = os.path.join(store_dir, "v0-pm4py-2.6.0", "abc")
+    os.makedirs(old_layout)
+    unrecorded = os.path.join(net_store._root(), "0123456789abcdef")
+    os.makedirs(unrecorded)
+    assert net_store.sweep() == 2
+    assert len(_stored(store_dir)) == 4
+
+    # Rewritten while no worker ran: no process saw the new export.
+    st = os.stat(ocel_path)
+    os.utime(ocel_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    os.unlink(other)
+    assert net_store.sweep() == 2
+    assert not _stored(store_dir) and os.path.isdir(net_store._root())
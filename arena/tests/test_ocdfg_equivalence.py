@@ -0,0 +1,84 @@
+"""The native OC-DFG engine must reproduce the pm4py per-type flatten + DFG loop
+exactly — same nodes, edges, frequencies and order — on every fixture, on filtered
+views, and on a synthetic ED-shaped log with shared Beds and timestamp ties."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import discovery, ocdfg, ocel_loader  # noqa: E402
+from app.filters import EventTypeFilter, ObjectTypeFilter  # noqa: E402
+from benchmarks.synthetic import ocel_doc  # noqa: E402
+from tests.test_conformance import FIXTURE as CONFORMANCE_FIXTURE  # noqa: E402
+from tests.test_copilot import FIXTURE as COPILOT_FIXTURE  # noqa: E402
+from tests.test_discovery import FIXTURE as DISCOVERY_FIXTURE  # noqa: E402
+from tests.test_home_hospital_conformance import FIXTURE as HOME_FIXTURE  # noqa: E402
+from tests.test_performance import FIXTURE as PERFORMANCE_FIXTURE  # noqa: E402
+
+FIXTURES = {
+    "discovery": DISCOVERY_FIXTURE,
+    "performance": PERFORMANCE_FIXTURE,
+    "conformance": CONFORMANCE_FIXTURE,
+    "copilot": COPILOT_FIXTURE,
+    "home_hospital": HOME_FIXTURE,
+    "synthetic": ocel_doc(encounters=300, beds=12, seed=3),
+}
+
+pytestmark = pytest.mark.usefixtures("fresh_caches")
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_native_matches_pm4py(write_export, name: str) -> None:
+    path = write_export(name, FIXTURES[name])
+    assert discovery.discover(path, engine="native") == discovery.discover(path, engine="pm4py")
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_native_matches_pm4py_before_pruning(write_export, name: str) -> None:
+    ocel = ocel_loader.read_ocel(write_export(name, FIXTURES[name]))
+    ots = ocdfg.object_types(ocel)
+    native = ocdfg.discover(ocel, ots)
+    reference = discovery._mine_pm4py(ocel, ots)
+    assert list(native[0].items()) == list(reference[0].items())
+    assert native[1] == dict(reference[1])
+    assert native[2] == reference[2]
+
+
+def test_native_matches_pm4py_with_threshold_and_type_subset(write_export) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    kwargs = {"object_types": ["Bed", "Encounter"], "activity_min_freq": 40}
+    assert discovery.discover(path, engine="native", **kwargs) == discovery.discover(path, engine="pm4py", **kwargs)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [EventTypeFilter(activities=["arrive", "place", "depart"])],
+        [EventTypeFilter(activities=["treat"], mode="exclude")],
+        [ObjectTypeFilter(object_types=["Encounter"])],
+    ],
+)
+def test_native_matches_pm4py_on_filtered_logs(write_export, filters) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    assert discovery.discover(path, filters=filters, engine="native") == discovery.discover(
+        path, filters=filters, engine="pm4py"
+    )
+
+
+def test_timestamp_ties_break_by_event_order(write_export) -> None:
+    doc = {
+        "objectTypes": [{"name": "Encounter", "attributes": []}],
+        "eventTypes": [{"name": a, "attributes": []} for a in ("b", "a", "c")],
+        "objects": [{"id": "e1", "type": "Encounter", "attributes": [], "relationships": []}],
+        "events": [
+            {"id": "x1", "type": "b", "time": "2026-01-01T00:00:00Z", "attributes": [], "relationships": [{"objectId": "e1", "qualifier": "s"}]},
+            {"id": "x2", "type": "a", "time": "2026-01-01T00:00:00Z", "attributes": [], "relationships": [{"objectId": "e1", "qualifier": "s"}]},
+            {"id": "x3", "type": "c", "time": "2026-01-01T00:00:00Z", "attributes": [], "relationships": [{"objectId": "e1", "qualifier": "s"}]},
+        ],
+    }
+    path = write_export("ties", doc)
+    native = discovery.discover(path, engine="native")
+    assert native == discovery.discover(path, engine="pm4py")
+    assert {(e["source"], e["target"]) for e in native["edges"]} == {("b", "a"), ("a", "c")}
@@ -0,0 +1,106 @@
+"""Resident parsed-OCEL cache: one parse per unchanged export, a fresh parse when
+the export is rewritten, LRU eviction past the budget, and counters on /health."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import ocel_loader  # noqa: E402
+from app.cache import LRUCache  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.test_discovery import FIXTURE  # noqa: E402
+
+
+@pytest.fixture
+def ocel_path(tmp_path) -> str:
+    ocel_loader.clear_caches()
+    p = tmp_path / "cache-fixture.json"
+    p.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    return str(p)
+
+
+def test_unchanged_export_is_parsed_once(ocel_path: str) -> None:
+    first = ocel_loader.read_ocel(ocel_path)
+    second = ocel_loader.read_ocel(ocel_path)
+    assert second is first
+    stats = ocel_loader.cache_stats()["ocel"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+
+
+def test_rewritten_export_is_reparsed_and_the_old_parse_released(ocel_path: str) -> None:
+    first = ocel_loader.read_ocel(ocel_path)
+    doc = dict(FIXTURE, events=FIXTURE["events"][:3])
+    with open(ocel_path, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh)
+    st = os.stat(ocel_path)
+    os.utime(ocel_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    second = ocel_loader.read_ocel(ocel_path)
+    assert second is not first
+    assert len(second.events) == 3
+    assert ocel_loader.cache_stats()["ocel"]["entries"] == 1
+
+
+def test_fingerprint_tracks_content_identity(ocel_path: str) -> None:
+    before = ocel_loader.fingerprint(ocel_path)
+    assert ocel_loader.fingerprint(ocel_path) == before
+    with open(ocel_path, "a", encoding="utf-8") as fh:
+        fh.write(" ")
+    assert ocel_loader.fingerprint(ocel_path) != before
+
+
+def test_lru_evicts_least_recently_used_past_the_budget() -> None:
+    cache = LRUCache("t", max_bytes=10)
+    cache.put("a", 1, nbytes=4)
+    cache.put("b", 2, nbytes=4)
+    assert cache.get("a") == 1  # 'a' is now most recent
+    cache.put("c", 3, nbytes=4)  # over budget -> evict 'b'
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_budget_disables_retention() -> None:
+    cache = LRUCache("t", max_bytes=0)
+    assert cache.get_or_load("k", lambda: ("v", 1)) == "v"
+    assert cache.stats()["entries"] == 0
+
+
+def test_racing_loads_count_one_miss_and_one_hit() -> None:
+    cache = LRUCache("t", max_entries=4)
+    started, release = threading.Event(), threading.Event()
+
+    def _slow() -> tuple[str, int]:
+        started.set()
+        release.wait(5)
+        return "v", 1
+
+    loser: list = []
+    winner = threading.Thread(target=lambda: cache.get_or_load("k", _slow))
+    winner.start()
+    started.wait(5)
+    racer = threading.Thread(target=lambda: loser.append(cache.get_or_load("k", lambda: ("other", 1))))
+    racer.start()
+    release.set()
+    winner.join()
+    racer.join()
+    assert loser == ["v"]
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 1)
+
+
+def test_health_reports_cache_counters(ocel_path: str) -> None:
+    ocel_loader.read_ocel(ocel_path)
+    body = TestClient(app).get("/health").json()
+    assert body["cache"]["ocel"]["misses"] == 1
+    assert "hit_rate" in body["cache"]["ocel"]
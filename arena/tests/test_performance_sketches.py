@@ -0,0 +1,108 @@
+"""Approximate performance quantiles: sketches merge exactly across partitions,
+stay within their relative error of pandas' exact quantiles, and the sketched
+/performance rows match the exact rows (counts exactly, medians / p90s within
+the reported bound) on the fixtures and a synthetic ED-shaped log."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import ocdfg, ocel_loader, performance  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.sketches import QuantileSketch, SketchSet  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+ALPHA = 0.01
+
+
+def _within(approx: float, exact: float, alpha: float, slack: float = 0.0) -> bool:
+    return abs(approx - exact) <= alpha * abs(exact) * (1 + 1e-9) + slack
+
+
+def test_sketch_quantiles_are_within_relative_error() -> None:
+    rng = np.random.default_rng(7)
+    values = np.r_[rng.lognormal(mean=7, sigma=2, size=20_000), np.zeros(500), rng.uniform(0, 1, 300)]
+    sketch = QuantileSketch(ALPHA).add(values)
+    series = pd.Series(values)
+    for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        assert _within(sketch.quantile(q), float(series.quantile(q)), ALPHA), q
+    assert sketch.count == len(values)
+    assert sketch.mean() == pytest.approx(series.mean(), rel=1e-12)
+    assert len(sketch.bins) < 2_000
+
+
+def test_sketches_merge_across_partitions_and_round_trip() -> None:
+    rng = np.random.default_rng(11)
+    keys = rng.integers(0, 5, size=6_000)
+    values = rng.exponential(900, size=6_000)
+    whole = SketchSet(ALPHA).add(keys, values)
+    parts = [SketchSet(ALPHA).add(keys[i:i + 1_000], values[i:i + 1_000]) for i in range(0, 6_000, 1_000)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert [(k, s.bins, s.count) for k, s in merged.items()] == [(k, s.bins, s.count) for k, s in whole.items()]
+
+    for key, sketch in whole.items():
+        again = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert again.quantile(0.9) == sketch.quantile(0.9)
+        assert _within(sketch.quantile(0.9), float(pd.Series(values[keys == key]).quantile(0.9)), ALPHA)
+
+    with pytest.raises(ValueError):
+        QuantileSketch(ALPHA).add(np.array([-1.0]))
+    with pytest.raises(ValueError):
+        QuantileSketch(ALPHA).merge(QuantileSketch(0.05))
+
+
+@pytest.fixture
+def small_partitions(monkeypatch):
+    ocel_loader.clear_caches()
+    monkeypatch.setattr(get_settings(), "arena_performance_partition_objects", 37)
+    monkeypatch.setattr(get_settings(), "arena_quantile_relative_accuracy", ALPHA)
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_sketched_rows_match_exact_rows_within_the_bound(tmp_path, small_partitions, name: str) -> None:
+    p = tmp_path / f"{name}.json"
+    p.write_text(json.dumps(FIXTURES[name]), encoding="utf-8")
+    exact = performance.analyze(str(p), top=10_000, quantiles="exact")
+    approx = performance.analyze(str(p), top=10_000, quantiles="approximate")
+    assert approx["quantiles"] == {"mode": "approximate", "relative_error": ALPHA}
+    assert exact["quantiles"] == {"mode": "exact", "relative_error": 0.0}
+
+    for view, key, stats in (
+        ("handoffs", ("object_type", "source", "target"), ("median_sec", "p90_sec", "mean_sec")),
+        ("synchronization", ("activity", "object_type"), ("median_wait_sec", "p90_wait_sec")),
+    ):
+        want = {tuple(r[k] for k in key): r for r in exact[view]}
+        got = {tuple(r[k] for k in key): r for r in approx[view]}
+        assert got.keys() == want.keys()
+        for k, row in got.items():
+            assert row["count"] == want[k]["count"]
+            for stat in stats:
+                # each side is rounded to 0.1 s
+                assert _within(row[stat], want[k][stat], ALPHA, slack=0.1), (view, k, stat)
+
+
+def test_large_logs_switch_to_sketches(tmp_path, small_partitions, monkeypatch) -> None:
+    p = tmp_path / "synthetic.json"
+    p.write_text(json.dumps(FIXTURES["synthetic"]), encoding="utf-8")
+    assert performance.analyze(str(p))["quantiles"]["mode"] == "exact"
+    monkeypatch.setattr(get_settings(), "arena_performance_exact_max_events", 100)
+    assert performance.analyze(str(p))["quantiles"]["mode"] == "approximate"
+    assert performance.analyze(str(p), quantiles="exact")["quantiles"]["mode"] == "exact"
+
+
+def test_partitions_slice_one_object_order() -> None:
+    oid = np.random.default_rng(3).integers(0, 100, size=5_000)
+    pieces = list(ocdfg.partition_rows(oid, 37))
+    assert len(pieces) == 3
+    assert np.array_equal(np.sort(np.concatenate(pieces)), np.arange(len(oid)))
+    for i, rows in enumerate(pieces):
+        assert set(oid[rows]) == set(range(37 * i, min(37 * (i + 1), 100))) & set(oid)
+    assert [len(rows) for rows in ocdfg.partition_rows(np.zeros(0, dtype=np.int64), 37)] == [0]
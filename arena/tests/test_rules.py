@@ -0,0 +1,121 @@
+"""Declarative pathway rules: parsing, each rule kind's vectorized verdict on a
+hand-built sub-log, and a pathway defined by rules alone running end to end."""
+
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import conformance, pathways  # noqa: E402
+from app.case_matrix import CaseMatrix  # noqa: E402
+from app.rules import compile_rules, parse_rules  # noqa: E402
+
+ACTIVITIES = ["start", "a", "b", "open", "close", "visit", "end"]
+
+
+def _matrix(rows: list[tuple[str, str, str, dict]]) -> CaseMatrix:
+    frame = pd.DataFrame(
+        [{"ocel:oid": case, "ocel:activity": act, "ocel:timestamp": pd.Timestamp(ts, tz="UTC"), **attrs} for case, act, ts, attrs in rows]
+    )
+    return CaseMatrix(frame, ACTIVITIES)
+
+
+# c1: a then b 30 min apart, balanced escalation, 2 full days with 4 visits.
+# c2: b before a (90 min apart), an unclosed open, 2 full days with 1 visit.
+M = _matrix([
+    ("c1", "start", "2026-01-01T00:00", {}),
+    ("c1", "a", "2026-01-01T01:00", {"score": 3}),
+    ("c1", "b", "2026-01-01T01:30", {"status": "OK"}),
+    ("c1", "open", "2026-01-01T02:00", {}),
+    ("c1", "close", "2026-01-01T02:10", {}),
+    *[("c1", "visit", f"2026-01-0{d}T0{h}:00", {"flag": "no"}) for d in (1, 2) for h in (3, 4)],
+    ("c1", "end", "2026-01-03T05:00", {}),
+    ("c2", "start", "2026-01-01T00:00", {}),
+    ("c2", "b", "2026-01-01T00:30", {"status": "bad"}),
+    ("c2", "a", "2026-01-01T02:00", {"score": "12"}),
+    ("c2", "open", "2026-01-01T03:00", {}),
+    ("c2", "visit", "2026-01-01T04:00", {"flag": "yes"}),
+    ("c2", "visit", "2026-01-01T05:00", {"flag": "no"}),
+    ("c2", "visit", "2026-01-01T06:00", {"flag": "no"}),
+    ("c2", "visit", "2026-01-01T07:00", {"flag": "no"}),
+    ("c2", "end", "2026-01-03T05:00", {}),
+])
+
+
+@pytest.mark.parametrize(
+    "rule, expected",
+    [
+        ({"kind": "present", "activity": "close"}, [False, True]),
+        ({"kind": "absent", "activity": "open"}, [True, True]),
+        ({"kind": "order", "before": "a", "after": "b"}, [False, True]),
+        ({"kind": "order", "before": "a", "after": "missing"}, [False, False]),
+        ({"kind": "max_interval", "start": "start", "end": "a", "minutes": 90}, [False, True]),
+        ({"kind": "min_count", "activity": "visit", "count": 4}, [False, False]),
+        ({"kind": "min_count", "activity": "close", "count": 1}, [False, True]),
+        ({"kind": "balanced", "open": "open", "close": "close"}, [False, True]),
+        ({"kind": "count_per_day", "activity": "visit", "per_day": 2, "start": "start", "end": "end"}, [False, False]),
+        (
+            {"kind": "count_per_day", "activity": "visit", "per_day": 2, "start": "start", "end": "end",
+             "prefer": {"attribute": "flag", "values": ["YES"]}},
+            [False, True],
+        ),
+        ({"kind": "count_per_day", "activity": "visit", "per_day": 3, "start": "start"}, [True, True]),
+        ({"kind": "attribute_in", "activity": "b", "attribute": "status", "values": ["ok"]}, [False, True]),
+        ({"kind": "attribute_in", "activity": "b", "attribute": "nope", "values": ["ok"]}, [False, False]),
+        ({"kind": "attribute_max", "activity": "a", "attribute": "score", "max": 10}, [False, True]),
+    ],
+)
+def test_rule_kinds(rule: dict, expected: list[bool]) -> None:
+    evaluate = compile_rules([{**rule, "code": "x"}])
+    assert list(evaluate(M)["x"]) == expected
+
+
+def test_parse_rejects_unknown_kinds_bad_fields_and_duplicate_codes() -> None:
+    with pytest.raises(ValueError, match="unknown rule kind"):
+        parse_rules([{"kind": "eventually", "code": "x"}])
+    with pytest.raises(ValueError):
+        parse_rules([{"kind": "min_count", "activity": "a", "count": 0, "code": "x"}])
+    with pytest.raises(ValueError, match="duplicate"):
+        parse_rules([{"kind": "present", "activity": "a", "code": "x"}, {"kind": "absent", "activity": "b", "code": "x"}])
+
+
+def test_shipped_pathways_compile_with_their_labels() -> None:
+    for spec in pathways.PATHWAYS.values():
+        assert [r.code for r in spec["evaluate_matrix"].rules] == list(spec["deviation_labels"])
+
+
+def test_a_pathway_defined_only_by_rules_runs_end_to_end(tmp_path, monkeypatch) -> None:
+    rules = [
+        {"kind": "present", "activity": "place", "code": "never_placed", "label": "Never placed"},
+        {"kind": "max_interval", "start": "admit", "end": "place", "minutes": 60, "code": "slow_placement"},
+    ]
+    spec = {
+        "label": "Placement", "version": 1, "owner": "test", "case_type": "Encounter", "trigger": "admit",
+        "activities": ["admit", "place"], "rules": rules,
+        "evaluate_matrix": compile_rules(rules), "deviation_labels": {"never_placed": "Never placed", "slow_placement": "slow_placement"},
+    }
+    monkeypatch.setitem(pathways.PATHWAYS, "placement", spec)
+
+    def ev(eid: str, act: str, ts: str, oid: str) -> dict:
+        return {"id": eid, "type": act, "time": ts, "attributes": [], "relationships": [{"objectId": oid, "qualifier": "s"}]}
+
+    doc = {
+        "objectTypes": [{"name": "Encounter", "attributes": []}],
+        "eventTypes": [],
+        "objects": [{"id": f"enc{i}", "type": "Encounter", "attributes": [], "relationships": []} for i in (1, 2, 3)],
+        "events": [
+            ev("e1", "admit", "2026-01-01T00:00:00Z", "enc1"), ev("e2", "place", "2026-01-01T00:30:00Z", "enc1"),
+            ev("e3", "admit", "2026-01-01T00:00:00Z", "enc2"), ev("e4", "place", "2026-01-01T02:00:00Z", "enc2"),
+            ev("e5", "admit", "2026-01-01T00:00:00Z", "enc3"),
+        ],
+    }
+    p = tmp_path / "placement.json"
+    p.write_text(json.dumps(doc), encoding="utf-8")
+    for engine in ("matrix", "per_case"):  # no per-case evaluator: both use the rules
+        result = conformance.check(str(p), pathway_key="placement", engine=engine)[0]
+        assert (result["cases"], result["conformant"]) == (3, 1)
+        assert {d["code"]: d["count"] for d in result["deviations"]} == {"never_placed": 1, "slow_placement": 1}
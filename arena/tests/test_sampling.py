@@ -0,0 +1,138 @@
+"""Sampled discovery draws whole objects per type, scales the OC-DFG back to the
+full log with intervals that cover the exact counts, is flagged approximate,
+and a sample covering every object reproduces the exact map."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import discovery, ocel_loader, petrinet, sampling  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.synthetic import ocel_doc  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+DOC = ocel_doc(encounters=1500, beds=12, seed=5)
+TYPES = ["Encounter", "Patient"]
+
+
+@pytest.fixture
+def ocel_path(tmp_path) -> str:
+    ocel_loader.clear_caches()
+    p = tmp_path / "sampling.json"
+    p.write_text(json.dumps(DOC), encoding="utf-8")
+    return str(p)
+
+
+def _without_ci(rows: list[dict]) -> list[dict]:
+    return [{k: v for k, v in r.items() if k != "frequency_ci"} for r in rows]
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_a_complete_sample_is_the_exact_map(tmp_path, name: str) -> None:
+    p = tmp_path / f"{name}.json"
+    p.write_text(json.dumps(FIXTURES[name]), encoding="utf-8")
+    exact = discovery.discover(str(p))
+    full = discovery.discover(str(p), sample={"max_objects": 10**6})
+    assert full["approximate"] is False
+    assert _without_ci(full["nodes"]) == exact["nodes"]
+    assert _without_ci(full["edges"]) == exact["edges"]
+    assert all(r["frequency_ci"] == [r["frequency"]] * 2 for r in full["nodes"] + full["edges"])
+
+
+def test_sampled_objects_keep_whole_lifecycles(ocel_path: str) -> None:
+    ocel = ocel_loader.read_ocel(ocel_path)
+    drawn = sampling.SamplePlan(ocel, TYPES, seed=1).take(100)
+    assert drawn.sampled == {"Encounter": 100, "Patient": 100}
+    assert drawn.population == {"Encounter": 1500, "Patient": 1500}
+    kept = set(drawn.ocel.objects["ocel:oid"].astype(str))
+    rel = ocel.relations[ocel.relations["ocel:oid"].astype(str).isin(kept)]
+    assert len(drawn.ocel.relations) == len(rel)
+    bigger = sampling.SamplePlan(ocel, TYPES, seed=1).take(200)
+    assert kept <= set(bigger.ocel.objects["ocel:oid"].astype(str))
+
+
+def test_intervals_cover_the_exact_counts(ocel_path: str) -> None:
+    exact = discovery.discover(ocel_path, object_types=TYPES)
+    truth = {n["id"]: n["frequency"] for n in exact["nodes"]}
+    truth.update({(e["source"], e["target"], e["object_type"]): e["frequency"] for e in exact["edges"]})
+    covered = total = 0
+    for seed in range(10):
+        est = discovery.discover(ocel_path, object_types=TYPES, sample={"max_objects": 150, "seed": seed})
+        assert est["approximate"] is True
+        for row in est["nodes"] + est["edges"]:
+            key = row["id"] if "id" in row else (row["source"], row["target"], row["object_type"])
+            low, high = row["frequency_ci"]
+            assert low <= row["frequency"] <= high
+            covered += low <= truth[key] <= high
+            total += 1
+    assert covered / total >= 0.85
+    assert est["sampling"]["by_object_type"] == [
+        {"object_type": "Encounter", "objects": 1500, "sampled": 150},
+        {"object_type": "Patient", "objects": 1500, "sampled": 150},
+    ]
+
+
+def test_same_seed_same_estimate(ocel_path: str) -> None:
+    spec = {"max_objects": 100, "seed": 4}
+    first = discovery.discover(ocel_path, sample=spec)
+    again = discovery.discover(ocel_path, sample=spec)
+    assert first["nodes"] == again["nodes"] and first["edges"] == again["edges"]
+
+
+def test_time_budget_grows_the_sample_to_the_whole_log(ocel_path: str, monkeypatch) -> None:
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "arena_sample_initial_objects", 100)
+    roomy = discovery.discover(ocel_path, sample={"time_budget_ms": 60_000})
+    assert roomy["approximate"] is False
+    capped = discovery.discover(ocel_path, sample={"time_budget_ms": 60_000, "max_objects": 400})
+    assert {r["sampled"] for r in capped["sampling"]["by_object_type"]} == {12, 400}
+
+
+def test_sampled_petri_net_is_flagged(ocel_path: str) -> None:
+    exact = petrinet.discover(ocel_path)
+    sampled = petrinet.discover(ocel_path, sample={"max_objects": 200})
+    assert sampled["approximate"] is True
+    assert sampled["object_types"] == exact["object_types"]
+    assert "approximate" not in exact
+    assert petrinet.discover(ocel_path, sample={"max_objects": 10**6})["stats"] == exact["stats"]
+
+
+def _variable_flags(result: dict) -> dict[tuple[str, str], bool]:
+    flags = {}
+    for net in result["nets"]:
+        labels = {t["id"]: t["label"] for t in net["transitions"]}
+        for arc in net["arcs"]:
+            label = labels.get(arc["source"]) or labels.get(arc["target"])
+            if label is not None:
+                flags[(net["object_type"], label)] = arc["variable"]
+    return flags
+
+
+@pytest.mark.parametrize("engine", ["variants", "pm4py"])
+def test_sampled_petri_net_keeps_the_exact_variable_arcs(ocel_path: str, engine: str) -> None:
+    exact = _variable_flags(petrinet.discover(ocel_path, engine=engine))
+    sampled = _variable_flags(petrinet.discover(ocel_path, engine=engine, sample={"max_objects": 100}))
+    assert sampled and all(sampled[k] == exact[k] for k in sampled.keys() & exact.keys())
+    # The flags a sample would give on its own are skewed: its events lose their unsampled objects.
+    drawn = sampling.SamplePlan(ocel_loader.read_ocel(ocel_path), ["Encounter", "Patient", "Bed"]).take(100)
+    assert any(any(flags.values()) for flags in petrinet._double_arcs(drawn.ocel).values())
+
+
+def test_routes_accept_a_sample() -> None:
+    client = TestClient(app)
+    body = {"ocel": DOC, "object_types": TYPES, "sample": {"max_objects": 100, "confidence": 0.9}}
+    r = client.post("/discover", json=body).json()
+    assert r["approximate"] is True and r["sampling"]["confidence"] == 0.9
+    assert all(len(n["frequency_ci"]) == 2 for n in r["nodes"])
+    exact = client.post("/discover", json={"ocel": DOC, "object_types": TYPES}).json()
+    assert exact["approximate"] is False and exact["sampling"] is None
+    assert client.post("/discover", json={**body, "sample": {"max_objects": 1}}).status_code == 422
+    net = client.post("/discover/petrinet", json={"ocel": DOC, "sample": {"time_budget_ms": 5000}}).json()
+    assert net["sampling"]["confidence"] is None
@@ -0,0 +1,92 @@
+"""Columnar OCEL snapshots: a lossless round trip of the six frames, transparent
+`ocel_path` support, auto-write on first parse, and the offline converter."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pm4py")
+pytest.importorskip("pyarrow")
+
+import pandas as pd  # noqa: E402
+import pm4py  # noqa: E402
+
+from app import conformance, ocel_loader, snapshot  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from tests.test_home_hospital_conformance import FIXTURE  # noqa: E402
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch) -> str:
+    ocel_loader.clear_caches()
+    monkeypatch.setattr(get_settings(), "arena_snapshot_dir", str(tmp_path / "snapshots"))
+    p = tmp_path / "home-export.json"
+    p.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    return str(p)
+
+
+def _verdicts(results: list[dict]) -> list[dict]:
+    # Verdict-cache hits/misses describe each call (a repeat check hits).
+    return [{k: v for k, v in r.items() if k != "verdict_cache"} for r in results]
+
+
+def test_round_trip_preserves_every_frame(export: str, tmp_path) -> None:
+    original = pm4py.read_ocel2_json(export)
+    out = snapshot.write_snapshot(original, str(tmp_path / "snap"), source=export)
+    restored = snapshot.read_snapshot(out)
+    for name in snapshot.FRAMES:
+        pd.testing.assert_frame_equal(
+            getattr(restored, name).reset_index(drop=True),
+            getattr(original, name).reset_index(drop=True),
+            check_dtype=name in ("events", "relations", "objects"),
+        )
+    assert restored.globals == original.globals
+
+
+def test_ocel_path_accepts_a_snapshot_directory_or_manifest(export: str, tmp_path) -> None:
+    out = snapshot.write_snapshot(pm4py.read_ocel2_json(export), str(tmp_path / "snap"), source=export)
+    expected = conformance.check(export, pathway_key="home_hospital")
+    for source in (out, f"{out}/{snapshot.MANIFEST}"):
+        with ocel_loader.resolve_ocel_path(source, None) as path:
+            assert _verdicts(conformance.check(path, pathway_key="home_hospital")) == _verdicts(expected)
+
+
+def test_first_parse_writes_a_snapshot_that_later_cold_starts_load(export: str) -> None:
+    first = conformance.check(export, pathway_key="home_hospital")
+    ocel_loader.wait_for_snapshots()
+    assert ocel_loader.cache_stats()["snapshots"]["written"] >= 1
+
+    ocel_loader.clear_caches()  # a cold start on the same, unchanged export
+    loaded_before = ocel_loader.cache_stats()["snapshots"]["loaded"]
+    assert _verdicts(conformance.check(export, pathway_key="home_hospital")) == _verdicts(first)
+    assert ocel_loader.cache_stats()["snapshots"]["loaded"] == loaded_before + 1
+
+
+def test_cli_converts_an_export(export: str, tmp_path, capsys) -> None:
+    out = tmp_path / "cli.snapshot"
+    assert snapshot.main([export, "--out", str(out)]) == 0
+    manifest = json.loads((out / snapshot.MANIFEST).read_text(encoding="utf-8"))
+    assert manifest["frames"]["events"]["rows"] == len(FIXTURE["events"])
+    assert capsys.readouterr().out.strip().endswith(snapshot.MANIFEST)
+
+
+def test_snapshots_of_rewritten_or_deleted_exports_are_pruned(export: str, tmp_path) -> None:
+    root = str(tmp_path / "snapshots")
+    ocel = pm4py.read_ocel2_json(export)
+    current = snapshot.write_snapshot(ocel, snapshot.snapshot_path_for("current", root), source=export)
+    other = tmp_path / "other-export.json"
+    other.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    stale = snapshot.write_snapshot(ocel, snapshot.snapshot_path_for("stale", root), source=str(other))
+    offline = snapshot.write_snapshot(ocel, snapshot.snapshot_path_for("offline", root))
+
+    assert snapshot.prune_snapshots(root) == 0
+    other.write_text(json.dumps(FIXTURE) + " ", encoding="utf-8")  # rewritten
+    assert snapshot.prune_snapshots(root) == 1
+    assert snapshot.snapshot_dir(stale) is None and snapshot.snapshot_dir(current) == current
+    other.unlink()
+    (tmp_path / "home-export.json").unlink()  # deleted
+    assert snapshot.prune_snapshots(root, keep=current) == 0
+    assert snapshot.prune_snapshots(root) == 1
+    assert snapshot.snapshot_dir(offline) == offline
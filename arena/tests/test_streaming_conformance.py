@@ -0,0 +1,170 @@
+"""Online conformance: fed a log event by event, the stream reaches the batch
+engine's verdict for every case, reports monotone deviations on the event that
+shows them (absence checks at close), and keeps memory bounded by closing idle
+or surplus cases."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pm4py")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import conformance, ocel_loader, streaming  # noqa: E402
+from app.main import app  # noqa: E402
+from tests.test_conformance_matrix import DOCS  # noqa: E402
+
+
+def _batches(doc: dict, size: int) -> list[dict]:
+    events = sorted(doc["events"], key=lambda e: e["time"])
+    batches = [{"events": events[i:i + size]} for i in range(0, len(events), size)] or [{}]
+    batches[0]["objects"] = doc["objects"]
+    return batches
+
+
+@pytest.mark.parametrize("name", sorted(DOCS))
+def test_stream_verdicts_match_the_batch_engine(tmp_path, name: str) -> None:
+    ocel_loader.clear_caches()
+    p = tmp_path / f"{name}.json"
+    p.write_text(json.dumps(DOCS[name]), encoding="utf-8")
+    engine = streaming.OnlineConformance(idle_hours=24 * 365)
+    outputs = list(streaming.stream(_batches(DOCS[name], 17), engine))
+
+    verdicts = {(v["pathway"], v["case_id"]): v["deviations"] for out in outputs for v in out["closed"]}
+    reported = [(d["pathway"], d["case_id"], d["code"]) for out in outputs for d in out["deviations"]]
+    assert len(reported) == len(set(reported))
+    assert set(reported) == {(k, case, code) for (k, case), codes in verdicts.items() for code in codes}
+
+    stats = engine.stats()
+    for batch in conformance.check(str(p), per_case=True):
+        key = batch["pathway"]
+        assert {c: verdicts[(key, c)] for c in (r["case_id"] for r in batch["case_results"])} == {
+            r["case_id"]: r["deviations"] for r in batch["case_results"]
+        }
+        assert (stats["pathways"][key]["cases"], stats["pathways"][key]["conformant"]) == (batch["cases"], batch["conformant"])
+        assert stats["pathways"][key]["deviations"] == {d["code"]: d["count"] for d in batch["deviations"]}
+    assert stats["open_cases"] == 0
+
+
+def _ev(eid: str, activity: str, time: str, oid: str, attrs: dict | None = None) -> dict:
+    return {
+        "id": eid, "type": activity, "time": time,
+        "attributes": [{"name": k, "value": v} for k, v in (attrs or {}).items()],
+        "relationships": [{"objectId": oid, "qualifier": "subject"}],
+    }
+
+
+ENC = [{"id": "enc-1", "type": "Encounter"}]
+
+
+def test_late_antibiotic_is_flagged_on_arrival_and_absences_at_close() -> None:
+    engine = streaming.OnlineConformance()
+    first = engine.ingest([_ev("e1", "sepsis_recognition", "2026-03-01T08:00:00Z", "enc-1")], ENC)
+    assert first == {"deviations": [], "closed": []}
+
+    late = engine.ingest([_ev("e2", "antibiotic_administration", "2026-03-01T12:00:00Z", "enc-1")])
+    assert [(d["code"], d["event_id"], d["at_close"]) for d in late["deviations"]] == [("antibiotic_late", "e2", False)]
+
+    closed = engine.ingest(close=["enc-1"])
+    assert {d["code"] for d in closed["deviations"]} == {"no_lactate", "no_repeat_lactate"}
+    assert all(d["at_close"] and d["event_id"] is None for d in closed["deviations"])
+    assert closed["closed"] == [{
+        "pathway": "sepsis", "case_id": "enc-1", "conformant": False, "reason": "closed",
+        "deviations": ["no_lactate", "antibiotic_late", "no_repeat_lactate"],
+    }]
+
+
+def test_out_of_order_events_defer_ordering_rules_to_close() -> None:
+    engine = streaming.OnlineConformance()
+    engine.ingest([
+        _ev("e1", "sepsis_recognition", "2026-03-01T08:00:00Z", "enc-1"),
+        _ev("e2", "antibiotic_administration", "2026-03-01T12:00:00Z", "enc-1"),
+    ], ENC)
+    # An earlier antibiotic arrives late: the case is no longer late at all.
+    assert engine.ingest([_ev("e3", "antibiotic_administration", "2026-03-01T09:00:00Z", "enc-1")])["deviations"] == []
+    verdict = engine.ingest(close=["enc-1"])["closed"][0]
+    assert "antibiotic_late" not in verdict["deviations"]
+
+
+def test_cases_before_their_trigger_report_nothing() -> None:
+    engine = streaming.OnlineConformance()
+    out = engine.ingest([_ev("e1", "antibiotic_administration", "2026-03-01T12:00:00Z", "enc-1")], ENC, close=["enc-1"])
+    assert out == {"deviations": [], "closed": []}
+    assert engine.stats()["off_pathway"] == 1
+
+
+def test_idle_and_surplus_cases_are_closed_and_dropped() -> None:
+    engine = streaming.OnlineConformance(max_cases=3, idle_hours=1)
+    objects = [{"id": f"enc-{i}", "type": "Encounter"} for i in range(6)]
+    out = engine.ingest([_ev(f"e{i}", "sepsis_recognition", f"2026-03-01T08:0{i}:00Z", f"enc-{i}") for i in range(6)], objects)
+    assert [(v["case_id"], v["reason"]) for v in out["closed"]] == [(f"enc-{i}", "capacity") for i in range(3)]
+    assert engine.stats()["open_cases"] == 3
+
+    out = engine.ingest([_ev("e9", "sepsis_recognition", "2026-03-01T10:00:00Z", "enc-5")])
+    assert {(v["case_id"], v["reason"]) for v in out["closed"]} == {("enc-3", "idle"), ("enc-4", "idle")}
+    stats = engine.stats()
+    assert (stats["open_cases"], stats["closed_idle"], stats["closed_capacity"]) == (1, 2, 3)
+    # Objects that are no pathway's case type are never held.
+    engine.ingest(objects=[{"id": "bed-1", "type": "Bed"}])
+    assert engine.stats()["open_cases"] == 1
+
+
+def test_a_stale_case_behind_a_late_event_still_closes_as_idle() -> None:
+    engine = streaming.OnlineConformance(max_cases=10, idle_hours=2)
+    engine.ingest([_ev("e1", "sepsis_recognition", "2026-03-01T08:00:00Z", "enc-a")], [{"id": "enc-a", "type": "Encounter"}])
+    engine.ingest([_ev("e2", "sepsis_recognition", "2026-03-01T09:00:00Z", "enc-b")], [{"id": "enc-b", "type": "Encounter"}])
+    # A late event for enc-a arrives last but does not make it any less idle.
+    assert engine.ingest([_ev("e3", "lactate", "2026-03-01T07:00:00Z", "enc-a")])["closed"] == []
+    out = engine.ingest([_ev("e4", "lactate", "2026-03-01T10:30:00Z", "enc-c")])
+    assert [(v["case_id"], v["reason"]) for v in out["closed"]] == [("enc-a", "idle")]
+    out = engine.ingest([_ev("e5", "lactate", "2026-03-01T11:30:00Z", "enc-c")])
+    assert [(v["case_id"], v["reason"]) for v in out["closed"]] == [("enc-b", "idle")]
+    assert engine.stats()["closed_capacity"] == 0
+
+
+def test_stream_endpoint(monkeypatch) -> None:
+    monkeypatch.setattr(streaming, "_STREAMS", {})
+    with TestClient(app) as client:
+        res = client.post("/conformance/stream", json={
+            "stream": "ed",
+            "objects": ENC,
+            "events": [
+                _ev("e1", "sepsis_recognition", "2026-03-01T08:00:00Z", "enc-1"),
+                _ev("e2", "antibiotic_administration", "2026-03-01T12:00:00Z", "enc-1"),
+            ],
+        })
+        assert res.status_code == 200
+        assert [d["code"] for d in res.json()["deviations"]] == ["antibiotic_late"]
+        assert res.json()["stats"]["open_cases"] == 1
+
+        res = client.post("/conformance/stream", json={"stream": "ed", "flush": True})
+        assert [v["case_id"] for v in res.json()["closed"]] == ["enc-1"]
+        assert client.get("/conformance/stream/ed").json()["pathways"]["sepsis"]["cases"] == 1
+
+        bad = {"stream": "ed", "events": [_ev("e3", "sepsis_recognition", "not a time", "enc-1")]}
+        assert client.post("/conformance/stream", json=bad).status_code == 422
+        for time_value in (["2026-03-01"], {"at": 1}):
+            bad["events"][0]["time"] = time_value
+            assert client.post("/conformance/stream", json=bad).status_code == 422
+        assert client.delete("/conformance/stream/ed").status_code == 200
+        assert client.get("/conformance/stream/ed").status_code == 404
+
+
+def test_idle_named_streams_expire(monkeypatch) -> None:
+    from app.config import get_settings
+
+    monkeypatch.setattr(streaming, "_STREAMS", {})
+    monkeypatch.setattr(get_settings(), "arena_stream_max_streams", 2)
+    monkeypatch.setattr(get_settings(), "arena_stream_ttl_seconds", 60)
+    stale = streaming.open_stream("old")
+    streaming.open_stream("busy").ingest(objects=ENC)
+    with pytest.raises(streaming.StreamLimit):
+        streaming.open_stream("new")
+
+    stale.last_ingest -= 61
+    assert streaming.get_stream("old") is None
+    assert streaming.open_stream("new") is not None
+    assert set(streaming._STREAMS) == {"busy", "new"}
@@ -0,0 +1,140 @@
+"""Variant-compressed replay and Petri-net discovery must reproduce pm4py on the
+flattened frames exactly: the same fitness numbers per object type (also for
+nets the log does not fit), the same OC Petri-net shape and double arcs, with
+the variant table compressed once per resident log and object type."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+pm4py = pytest.importorskip("pm4py")
+
+from app import flattening, ocel_loader, petrinet, replay, variants  # noqa: E402
+from app.filters import EventTypeFilter  # noqa: E402
+from tests.test_ocdfg_equivalence import FIXTURES  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("fresh_caches")
+
+
+def test_compress_counts_each_distinct_sequence_in_time_order() -> None:
+    flat = pd.DataFrame({
+        "case:concept:name": ["c2", "c1", "c1", "c2", "c3", "c1", "c3", "c4"],
+        "concept:name": ["b", "a", "b", "a", "a", "c", "b", "a"],
+        "time:timestamp": pd.to_datetime([5, 1, 2, 3, 1, 9, 2, 7], unit="s", utc=True),
+    })
+    table = variants.compress(flat)
+    assert table.variants == [("a", "b"), ("a",), ("a", "b", "c")]
+    assert table.counts.tolist() == [2, 1, 1]
+    assert table.cases == 4
+    assert table.uvcl() == Counter({("a", "b"): 2, ("a",): 1, ("a", "b", "c"): 1})
+    assert len(variants.compress(flat.iloc[:0])) == 0
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_replay_fitness_matches_pm4py(write_export, name: str) -> None:
+    path = write_export(name, FIXTURES[name])
+    compressed = replay.fitness(path, engine="variants")
+    assert compressed == replay.fitness(path, engine="pm4py")
+    assert compressed["by_object_type"]
+
+
+def test_weighted_replay_matches_pm4py_on_an_unfitting_net(write_export) -> None:
+    ocel = ocel_loader.read_ocel(write_export("synthetic", FIXTURES["synthetic"]))
+    flat = flattening.flatten(ocel, "Encounter")
+    table = flattening.variants(ocel, "Encounter")
+    # A net mined from the most frequent pathway alone leaves the others unfit.
+    head = variants.VariantTable(table.variants[:1], table.counts[:1])
+    net, im, fm = variants.discover_petri_net(head)
+    expected = pm4py.fitness_token_based_replay(flat, net, im, fm)
+    actual = variants.token_replay_fitness(table, net, im, fm)
+    assert expected["log_fitness"] < 1.0
+    assert actual["log_fitness"] == expected["log_fitness"]
+    assert actual["percentage_of_fitting_traces"] == expected["percentage_of_fitting_traces"]
+    assert actual["average_trace_fitness"] == pytest.approx(expected["average_trace_fitness"], abs=1e-12)
+
+
+def test_noise_threshold_selects_imf_like_pm4py(write_export) -> None:
+    ocel = ocel_loader.read_ocel(write_export("synthetic", FIXTURES["synthetic"]))
+    flat = flattening.flatten(ocel, "Encounter")
+    expected = pm4py.discover_process_tree_inductive(flat, noise_threshold=0.3)
+    actual = variants.process_tree(flattening.variants(ocel, "Encounter"), noise_threshold=0.3)
+    assert str(actual) == str(expected)
+
+
+def _shape(result: dict) -> dict:
+    return {
+        "object_types": result["object_types"],
+        "stats": result["stats"],
+        "nets": {
+            n["object_type"]: (
+                sorted(str(t["label"]) for t in n["transitions"]),
+                sorted((a["variable"], a["weight"]) for a in n["arcs"]),
+                sum(p["initial"] for p in n["places"]), sum(p["final"] for p in n["places"]),
+            )
+            for n in result["nets"]
+        },
+    }
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_petrinet_matches_pm4py(write_export, name: str) -> None:
+    path = write_export(name, FIXTURES[name])
+    assert _shape(petrinet.discover(path, engine="variants")) == _shape(petrinet.discover(path, engine="pm4py"))
+
+
+def test_double_arcs_match_pm4py(write_export) -> None:
+    # A transfer touches two beds, so Bed's "transfer" arc is variable.
+    doc = {
+        "objectTypes": [{"name": "Encounter", "attributes": []}, {"name": "Bed", "attributes": []}],
+        "eventTypes": [{"name": a, "attributes": []} for a in ("place", "transfer")],
+        "objects": [
+            {"id": oid, "type": ot, "attributes": [], "relationships": []}
+            for oid, ot in (("enc1", "Encounter"), ("enc2", "Encounter"), ("bed1", "Bed"), ("bed2", "Bed"))
+        ],
+        "events": [
+            {"id": eid, "type": act, "time": f"2026-01-01T0{i}:00:00Z", "attributes": [],
+             "relationships": [{"objectId": o, "qualifier": "q"} for o in objs]}
+            for i, (eid, act, objs) in enumerate((
+                ("e1", "place", ("enc1", "bed1")), ("e2", "place", ("enc2", "bed2")),
+                ("e3", "transfer", ("enc1", "bed1", "bed2")),
+            ))
+        ],
+    }
+    ocel = ocel_loader.read_ocel(write_export("transfer", doc))
+    expected = petrinet._discover_ocpn(ocel)["double_arcs_on_activity"]
+    assert petrinet._discover_ocpn_variants(ocel)["double_arcs_on_activity"] == expected
+    assert expected["Bed"]["transfer"] is True
+
+
+def test_variant_table_is_compressed_once_per_log_and_filter(write_export) -> None:
+    path = write_export("synthetic", FIXTURES["synthetic"])
+    ocel = ocel_loader.read_ocel(path)
+    assert flattening.variants(ocel, "Encounter") is flattening.variants(ocel, "Encounter")
+    filtered = replay.fitness(path, filters=[EventTypeFilter(activities=["arrive", "depart"])])
+    assert filtered == replay.fitness(path, filters=[EventTypeFilter(activities=["arrive", "depart"])], engine="pm4py")
+
+
+def test_other_pm4py_versions_take_the_public_api(write_export, monkeypatch) -> None:
+    assert variants.private_api_available(pm4py.__version__)
+    assert not variants.private_api_available("3.0.0")
+
+    ocel = ocel_loader.read_ocel(write_export("synthetic", FIXTURES["synthetic"]))
+    table = flattening.variants(ocel, "Encounter")
+    head = variants.VariantTable(table.variants[:1], table.counts[:1])
+    miners = [{}, {"noise_threshold": 0.3}, {"disable_fallthroughs": True, "disable_strict_sequence_cut": True}]
+    private = [str(variants.process_tree(table, **kw)) for kw in miners]
+    fitness = variants.token_replay_fitness(table, *variants.discover_petri_net(head))
+
+    monkeypatch.setattr(variants, "PRIVATE_API", False)
+    expanded, real = [], variants._expanded
+    monkeypatch.setattr(variants, "_expanded", lambda t: expanded.append(1) or real(t))
+    assert [str(variants.process_tree(table, **kw)) for kw in miners] == private
+    public = variants.token_replay_fitness(table, *variants.discover_petri_net(head))
+    assert len(expanded) == len(miners) + 2
+    assert public["log_fitness"] == fitness["log_fitness"] < 1.0
+    assert public["percentage_of_fitting_traces"] == fitness["percentage_of_fitting_traces"]
+    assert public["average_trace_fitness"] == pytest.approx(fitness["average_trace_fitness"], abs=1e-12)
+
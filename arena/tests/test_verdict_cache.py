@@ -0,0 +1,106 @@
+"""Persistent verdict cache: a repeat check reads every verdict back, a new
+export re-evaluates only the cases it changed, and cached results equal the
+uncached engines' output."""
+
+from __future__ import annotations
+
+import copy
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pm4py")
+
+from app import conformance, verdicts  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.pathways import PATHWAYS  # noqa: E402
+from tests.test_conformance_matrix import DOCS  # noqa: E402
+
+KWARGS = {"per_case": True, "sample_limit": 4, "case_ids": ["enc-004", "or-010", "home-020", "home-031"]}
+
+
+@pytest.fixture(autouse=True)
+def store(fresh_caches, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "arena_verdict_cache_path", str(tmp_path / "verdicts.sqlite"))
+    yield
+    verdicts.get_store().close()
+    verdicts._STORES.clear()
+
+
+def _strip(results: list[dict]) -> list[dict]:
+    return [{k: v for k, v in r.items() if k != "verdict_cache"} for r in results]
+
+
+@pytest.mark.parametrize("engine", ["matrix", "per_case"])
+def test_repeat_check_hits_and_matches_the_uncached_engine(write_export, engine: str) -> None:
+    path = write_export("export", DOCS["random-1"])
+    first = conformance.check(path, engine=engine, **KWARGS)
+    second = conformance.check(path, engine=engine, **KWARGS)
+    uncached = conformance.check(path, engine=engine, verdict_cache=False, **KWARGS)
+
+    assert all(r["verdict_cache"]["hits"] == 0 for r in first)
+    assert all(r["verdict_cache"]["misses"] == 0 and r["verdict_cache"]["hit_rate"] == 1.0 for r in second)
+    assert _strip(first) == _strip(second) == _strip(uncached)
+    assert verdicts.stats()["hits"] == sum(r["verdict_cache"]["hits"] for r in second)
+
+
+def test_a_new_export_re_evaluates_only_changed_cases(write_export) -> None:
+    doc = DOCS["random-2"]
+    conformance.check(write_export("monday", doc))
+
+    changed = copy.deepcopy(doc)
+    # Renumber every event (ids are not part of a case's fingerprint) ...
+    for i, ev in enumerate(changed["events"]):
+        ev["id"] = f"x{i}"
+    # ... move one sepsis event of enc-007 and add a brand-new home episode.
+    moved = next(ev for ev in changed["events"] if ev["relationships"][0]["objectId"] == "enc-007")
+    moved["time"] = "2026-06-01T00:00:00Z"
+    changed["objects"].append({"id": "home-999", "type": "Home Episode", "attributes": [], "relationships": []})
+    changed["events"].append({
+        "id": "new", "type": "home-activate", "time": "2026-06-01T00:00:00Z", "attributes": [],
+        "relationships": [{"objectId": "home-999", "qualifier": "subject"}],
+    })
+    path = write_export("tuesday", changed)
+
+    results = {r["pathway"]: r for r in conformance.check(path, **KWARGS)}
+    assert results["sepsis"]["verdict_cache"]["misses"] == 1
+    assert results["surgical_safety"]["verdict_cache"]["misses"] == 0
+    assert results["home_hospital"]["verdict_cache"]["misses"] == 1
+    assert _strip(results.values()) == _strip(conformance.check(path, verdict_cache=False, **KWARGS))
+
+
+def test_a_pathway_version_bump_misses(write_export, monkeypatch) -> None:
+    path = write_export("export", DOCS["random-3"])
+    conformance.check(path, pathway_key="sepsis")
+    monkeypatch.setitem(PATHWAYS["sepsis"], "version", 2)
+    result = conformance.check(path, pathway_key="sepsis")[0]
+    assert result["verdict_cache"]["hits"] == 0 and result["verdict_cache"]["misses"] > 0
+
+
+def test_fingerprints_follow_content_and_order_not_ids() -> None:
+    def frame(rows):
+        return pd.DataFrame(rows, columns=["ocel:eid", "ocel:oid", "ocel:activity", "ocel:timestamp", "status"])
+
+    t = pd.Timestamp("2026-01-01T00:00:00Z")
+    base = frame([("e1", "c1", "a", t, "ok"), ("e2", "c1", "b", t, None), ("e3", "c2", "a", t, "ok")])
+    _cases, fps = verdicts.case_fingerprints(base)
+    assert fps[0] != fps[1]
+    renamed = base.assign(**{"ocel:eid": ["z1", "z2", "z3"], "ocel:oid": ["k1", "k1", "k2"]})
+    assert verdicts.case_fingerprints(renamed)[1] == fps
+    swapped = frame([("e2", "c1", "b", t, None), ("e1", "c1", "a", t, "ok"), ("e3", "c2", "a", t, "ok")])
+    assert verdicts.case_fingerprints(swapped)[1][0] != fps[0]
+    assert verdicts.case_fingerprints(base, context="v2")[1][1] != fps[1]
+
+
+def test_the_store_prunes_to_a_low_water_mark(tmp_path) -> None:
+    store = verdicts.VerdictStore(str(tmp_path / "capped.sqlite"), max_rows=100)
+    for batch in range(12):
+        store.put_many("p", 1, {f"fp-{batch}-{i}": None for i in range(10)})
+    (rows,) = store._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+    assert 90 <= rows <= 100
+    # The oldest go first.
+    assert store.get_many("p", 1, ["fp-0-0"]) == {} and store.get_many("p", 1, ["fp-11-9"]) == {"fp-11-9": None}
+    # Replacing existing rows does not grow the table.
+    store.put_many("p", 1, {"fp-11-9": ["late"]})
+    assert store.get_many("p", 1, ["fp-11-9"]) == {"fp-11-9": ["late"]}
+    store.close()